@@ -0,0 +1,238 @@
+#/*
+# * Copyright (c) 2021 Xilinx Inc. All rights reserved.
+# *
+# * SPDX-License-Identifier: BSD-3-Clause
+# */
+import sys
+import os
+import re
+import importlib
+import multiprocessing
+from pathlib import Path
+from lopper import Lopper
+import lopper
+from lopper_tree import *
+
+sys.path.append(os.path.dirname(__file__))
+from baremetalconfig_xlnx import *
+from baremetallinker_xlnx import get_memranges
+import lopper_lib
+
+# Runs a set of baremetal generator assists against a single load of the
+# system device tree. Each generator gets its own output directory, and the
+# data the generators derive from the tree (okay nodes, address-maps, memory
+# ranges) is computed once and shared through get_tree_data().
+#
+# The generators are described by a manifest:
+#
+#   jobs: 4
+#   generators:
+#     - assist: baremetaldrvlist_xlnx
+#       args: [ psu_cortexa53_0, <embeddedsw> ]
+#       outdir: drvlist
+#     - assist: baremetallinker_xlnx
+#       args: [ psu_cortexa53_0, <embeddedsw>/lib/sw_apps/hello_world/src/ ]
+#       outdir: hello_world
+#
+# and the assist is run either from the command line:
+#
+#   lopper <sdt> -- baremetal_bsp_xlnx [-j <jobs>] <manifest>
+#
+# or from an assist-v1 lop with id "module,baremetal_bsp_xlnx" and the
+# manifest passed in "options".
+#
+# Generator outdirs are relative to the lopper outdir. The generators chdir
+# and write into the current directory, so when jobs is greater than one
+# they are run in forked worker processes, never in threads.
+
+def is_compat(node, compat_string_to_test):
+    if re.search( "module,baremetal_bsp_xlnx", compat_string_to_test):
+        return xlnx_generate_bsp
+    return ""
+
+"""
+This API loads a generator assist and returns its callback
+
+Args:
+    tgt_node: is the target node the generator is run against
+    sdt: is the system device-tree
+    assist_name: is the name of the generator assist
+"""
+def load_generator(tgt_node, sdt, assist_name):
+    mod_file = sdt.assist_find( assist_name, sdt.load_paths )
+    if not mod_file:
+        print( "[ERROR]: unable to find assist (%s)" % assist_name )
+        sys.exit(1)
+
+    # import the generator by its module name, so that it shares the
+    # already imported helper modules (and their caches) with this assist
+    mod_dir = str(mod_file.resolve().parent)
+    if mod_dir not in sys.path:
+        sys.path.append( mod_dir )
+    try:
+        module = importlib.import_module( mod_file.stem )
+    except Exception as e:
+        print( "[ERROR]: could not load assist: %s: %s" % (mod_file,e) )
+        sys.exit(1)
+
+    cb_func = module.is_compat( tgt_node, "module," + mod_file.stem )
+    if not cb_func:
+        print( "[ERROR]: assist %s is not a baremetal generator" % assist_name )
+        sys.exit(1)
+
+    return cb_func
+
+"""
+This API reads the generator manifest and returns the number of jobs and
+the list of generators to run.
+
+Args:
+    manifest: is the manifest yaml file
+    outdir: is the lopper output directory
+"""
+def read_manifest(manifest, outdir):
+    try:
+        schema = load_yaml( manifest )
+    except Exception as e:
+        print( "[ERROR]: could not read generator manifest %s: %s" % (manifest,e) )
+        sys.exit(1)
+
+    generators = []
+    for index, entry in enumerate( schema.get('generators', []) ):
+        try:
+            assist_name = entry['assist']
+        except (KeyError, TypeError):
+            print( "[ERROR]: generator %s in %s has no assist" % (index,manifest) )
+            sys.exit(1)
+
+        args = entry.get( 'args', [] )
+        if not isinstance( args, list ):
+            args = str(args).split()
+        args = [ str(a) for a in args ]
+
+        # the generators run in their own outdir, so any argument that
+        # names a path must not be relative to the starting directory
+        for i, a in enumerate( args ):
+            if os.path.exists( a ) and not os.path.isabs( a ):
+                trailing = "/" if a.endswith( "/" ) else ""
+                args[i] = os.path.abspath( a ) + trailing
+
+        gen_outdir = str( entry.get( 'outdir', assist_name ) )
+        gen_outdir = os.path.join( os.path.abspath( outdir ), gen_outdir )
+
+        generators.append( (assist_name, args, gen_outdir) )
+
+    return schema.get( 'jobs', 1 ), generators
+
+"""
+This API computes the tree data shared by the generators, once per
+machine, before any of them are run.
+
+Args:
+    tgt_node: is the target node the generators are run against
+    sdt: is the system device-tree
+    machines: are the machine names passed to the generators
+"""
+def warm_tree_data(tgt_node, sdt, machines):
+    node_list = get_okay_nodes(sdt, tgt_node)
+    for machine in machines:
+        machine_options = {'args': [machine]}
+        try:
+            get_mapped_nodes(sdt, node_list, machine_options)
+            get_memranges(tgt_node, sdt, machine_options)
+        except Exception as e:
+            # the generator that needs this data reports the problem
+            if sdt.verbose > 1:
+                print( "[DBG+]: baremetal_bsp: no shared data for %s: %s" % (machine,e) )
+
+"""
+This API runs a single generator in its output directory
+
+Args:
+    tgt_node: is the target node the generator is run against
+    sdt: is the system device-tree
+    cb_func: is the generator callback
+    generator: is the (assist, args, outdir) tuple of the generator
+"""
+def run_generator(tgt_node, sdt, cb_func, generator):
+    assist_name, args, gen_outdir = generator
+    if sdt.verbose:
+        print( "[INFO]: baremetal_bsp: running %s in %s" % (assist_name,gen_outdir) )
+
+    cwd = os.getcwd()
+    try:
+        os.makedirs( gen_outdir, exist_ok=True )
+        os.chdir( gen_outdir )
+        ret = cb_func( tgt_node, sdt, {'verbose': sdt.verbose, 'outdir': gen_outdir, 'args': list(args)} )
+    except (Exception, SystemExit) as e:
+        # the generators sys.exit() on error, that fails this generator
+        # (as it does in a forked worker), not the batch
+        print( "[WARNING]: generator %s failed: %s" % (assist_name,e) )
+        ret = False
+    finally:
+        os.chdir( cwd )
+
+    if not ret:
+        print( "[WARNING]: generator %s did not complete" % assist_name )
+
+    return bool(ret)
+
+"""
+This API runs the generators in up to jobs forked worker processes.
+The workers inherit the loaded tree and the shared tree data from the
+parent, so nothing is pickled or reloaded.
+
+Args:
+    tgt_node: is the target node the generators are run against
+    sdt: is the system device-tree
+    work: is the list of (callback, generator) pairs to run
+    jobs: is the maximum number of concurrent workers
+"""
+def run_generators_forked(tgt_node, sdt, work, jobs):
+    return lopper_lib.run_forked( run_generator,
+                                  [ (tgt_node, sdt, cb_func, generator) for cb_func, generator in work ],
+                                  jobs )
+
+# tgt_node: is the baremetal config top level domain node number
+# sdt: is the system device-tree
+# options: baremetal application source path
+def xlnx_generate_bsp(tgt_node, sdt, options):
+    args = list( options['args'] )
+    jobs = None
+    if len(args) > 1 and args[0] == "-j":
+        jobs = args[1]
+        args = args[2:]
+
+    if not args:
+        print( "[ERROR]: baremetal_bsp: no generator manifest was provided" )
+        sys.exit(1)
+
+    manifest_jobs, generators = read_manifest( args[0], options.get( 'outdir', "./" ) )
+    try:
+        jobs = int( jobs if jobs is not None else manifest_jobs )
+    except ValueError:
+        print( "[ERROR]: baremetal_bsp: invalid job count %s" % jobs )
+        sys.exit(1)
+
+    work = []
+    for generator in generators:
+        cb_func = load_generator( tgt_node, sdt, generator[0] )
+        work.append( (cb_func, generator) )
+
+    machines = dict.fromkeys( [ g[1][0] for g in generators if g[1] ] )
+    warm_tree_data( tgt_node, sdt, machines )
+
+    if jobs > 1 and len(work) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        results = run_generators_forked( tgt_node, sdt, work, jobs )
+    else:
+        results = [ run_generator( tgt_node, sdt, cb_func, generator ) for cb_func, generator in work ]
+
+    failed = [ g[0] for g, ok in zip( generators, results ) if not ok ]
+    if failed:
+        print( "[WARNING]: baremetal_bsp: %s of %s generators failed: %s" %
+               (len(failed), len(generators), " ".join(failed)) )
+        if sdt.werror:
+            sys.exit(1)
+        return False
+
+    return True
@@ -78,34 +78,33 @@ def xlnx_generate_bm_bspconfig(tgt_node, sdt, options):
         if os.path.isdir(name):
             os.chdir(name)
             yamlfile = name + str(".yaml")
-            with open(yamlfile) as stream:
-                schema = yaml.safe_load(stream)
-                compatlist = compat_list(schema)
-                prop_list = schema['required']
-                match = [compat for compat in compatlist if compat == cpu_dict[machine]]
-                if match:
-                   config_struct = schema['config'][0] 
-                   outfile = tmpdir + str("/") + str("x") + name.lower() + str("_g.c")
-                   with open(outfile, 'w') as fd:
-                       fd.write('#include "x%s.h"\n' % name.lower())
-                       fd.write('\n%s %s __attribute__ ((section (".drvcfg_sec"))) = {\n' % (config_struct, config_struct + str("Table[]")))
-                       for index,prop in enumerate(prop_list):
-                           if index == 0:
-                               fd.write("\t{")
-                           try:
-                               for i in range(0, len(match_cpunodes[0][prop].value)):
-                                   fd.write("\n\t\t%s" % hex(match_cpunodes[0][prop].value[i]))
-                                   if i != (len(match_cpunodes[0][prop].value) - 1):
-                                       fd.write(",")
-                           except:
-                               fd.write("\n\t\t 0")
-                           if prop == prop_list[-1]:
-                               fd.write("  /* %s */" % prop) 
-                               fd.write("\n\t}")
-                           else:
-                               fd.write(",")
-                               fd.write("  /* %s */" % prop) 
-                       fd.write("\n};")
+            schema = load_yaml(yamlfile)
+            compatlist = compat_list(schema)
+            prop_list = schema['required']
+            match = [compat for compat in compatlist if compat == cpu_dict[machine]]
+            if match:
+               config_struct = schema['config'][0] 
+               outfile = tmpdir + str("/") + str("x") + name.lower() + str("_g.c")
+               with open(outfile, 'w') as fd:
+                   fd.write('#include "x%s.h"\n' % name.lower())
+                   fd.write('\n%s %s __attribute__ ((section (".drvcfg_sec"))) = {\n' % (config_struct, config_struct + str("Table[]")))
+                   for index,prop in enumerate(prop_list):
+                       if index == 0:
+                           fd.write("\t{")
+                       try:
+                           for i in range(0, len(match_cpunodes[0][prop].value)):
+                               fd.write("\n\t\t%s" % hex(match_cpunodes[0][prop].value[i]))
+                               if i != (len(match_cpunodes[0][prop].value) - 1):
+                                   fd.write(",")
+                       except:
+                           fd.write("\n\t\t 0")
+                       if prop == prop_list[-1]:
+                           fd.write("  /* %s */" % prop) 
+                           fd.write("\n\t}")
+                       else:
+                           fd.write(",")
+                           fd.write("  /* %s */" % prop) 
+                   fd.write("\n};")
     os.chdir(tmpdir)
     
     return True
@@ -83,66 +83,65 @@ def xlnx_generate_testapp(tgt_node, sdt, options):
                 os.chdir("data")
                 yamlfile = name + str(".yaml")
                 try:
-                    with open(yamlfile, 'r') as stream:
-                        schema = yaml.safe_load(stream)
-                        driver_compatlist = compat_list(schema)
-                        driver_nodes = []
-                        try:
-                            drvname = schema['config']
-                            drvname = drvname[0].rsplit("_", 1)[-2]
-                        except KeyError:
-                            drvname = name
-                        try:
-                            testapp_schema = schema['tapp']
-                            tmp_str = str("x") + str(name) + str(".h") 
-                            plat.buf("#include %s" % '"{}"\n'.format(tmp_str))
-                            tmp_str = str(name) + str("_header.h") 
-                            plat.buf("#include %s" % '"{}"\n'.format(tmp_str))
-                            headerfile = os.getcwd() + str("/") + tmp_str
-                            hdr_file = tmpdir + str("/") + tmp_str
-                            shutil.copyfile(headerfile, hdr_file)
-                            file_fd.write(hdr_file)
-                            file_fd.write("\n")
-                            with open(hdr_file, 'r+') as fd:
-                                content = fd.readlines()
-                                content.insert(0, "#define TESTAPP_GEN\n")
-                                fd.seek(0, 0)
-                                fd.writelines(content)
+                    schema = load_yaml(yamlfile)
+                    driver_compatlist = compat_list(schema)
+                    driver_nodes = []
+                    try:
+                        drvname = schema['config']
+                        drvname = drvname[0].rsplit("_", 1)[-2]
+                    except KeyError:
+                        drvname = name
+                    try:
+                        testapp_schema = schema['tapp']
+                        tmp_str = str("x") + str(name) + str(".h") 
+                        plat.buf("#include %s" % '"{}"\n'.format(tmp_str))
+                        tmp_str = str(name) + str("_header.h") 
+                        plat.buf("#include %s" % '"{}"\n'.format(tmp_str))
+                        headerfile = os.getcwd() + str("/") + tmp_str
+                        hdr_file = tmpdir + str("/") + tmp_str
+                        shutil.copyfile(headerfile, hdr_file)
+                        file_fd.write(hdr_file)
+                        file_fd.write("\n")
+                        with open(hdr_file, 'r+') as fd:
+                            content = fd.readlines()
+                            content.insert(0, "#define TESTAPP_GEN\n")
+                            fd.seek(0, 0)
+                            fd.writelines(content)
 
-                            for compat in driver_compatlist:
-                                for node in node_list:
-                                    compat_string = node['compatible'].value[0]
-                                    label_name = get_label(sdt, symbol_node, node)
-                                    if compat in compat_string:
-                                        driver_nodes.append(node)
-                                        dec = []
-                                        for app,prop in testapp_schema.items():
-                                            filename = os.getcwd() + str("/../examples/") + app
-                                            destination = tmpdir + str("/") + app
+                        for compat in driver_compatlist:
+                            for node in node_list:
+                                compat_string = node['compatible'].value[0]
+                                label_name = get_label(sdt, symbol_node, node)
+                                if compat in compat_string:
+                                    driver_nodes.append(node)
+                                    dec = []
+                                    for app,prop in testapp_schema.items():
+                                        filename = os.getcwd() + str("/../examples/") + app
+                                        destination = tmpdir + str("/") + app
+                                        try:
+                                            has_hwdep = testapp_schema[app]['hwproperties'][0]
                                             try:
-                                                has_hwdep = testapp_schema[app]['hwproperties'][0]
-                                                try:
-                                                    val = node[has_hwdep].value
-                                                    has_hwdep = 0
-                                                except KeyError:
-                                                    has_hwdep = 1
-                                            except KeyError:
+                                                val = node[has_hwdep].value
                                                 has_hwdep = 0
+                                            except KeyError:
+                                                has_hwdep = 1
+                                        except KeyError:
+                                            has_hwdep = 0
 
-                                            if not has_hwdep:
-                                                shutil.copyfile(filename, destination)
-                                                file_fd.write(destination)
-                                                file_fd.write("\n")
-                                                with open(destination, 'r+') as fd:
-                                                    content = fd.readlines()
-                                                    content.insert(0, "#define TESTAPP_GEN\n")
-                                                    fd.seek(0, 0)
-                                                    fd.writelines(content)
-                                                dec.append(testapp_schema[app]['declaration'])
-                                        testapp_data.update({label_name:dec})
-                                        testapp_name.update({label_name:drvname})
-                        except KeyError:
-                            testapp_schema = {}
+                                        if not has_hwdep:
+                                            shutil.copyfile(filename, destination)
+                                            file_fd.write(destination)
+                                            file_fd.write("\n")
+                                            with open(destination, 'r+') as fd:
+                                                content = fd.readlines()
+                                                content.insert(0, "#define TESTAPP_GEN\n")
+                                                fd.seek(0, 0)
+                                                fd.writelines(content)
+                                            dec.append(testapp_schema[app]['declaration'])
+                                    testapp_data.update({label_name:dec})
+                                    testapp_name.update({label_name:drvname})
+                    except KeyError:
+                        testapp_schema = {}
                 except FileNotFoundError:
                     pass
 
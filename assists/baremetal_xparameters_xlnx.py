@@ -46,7 +46,6 @@ def xlnx_generate_xparams(tgt_node, sdt, options):
     root_node = sdt.tree[tgt_node]
     root_sub_nodes = root_node.subnodes()
 
-    node_dict = {}
     node_list = []
     # Traverse the tree and find the nodes having status=ok property
     symbol_node = ""
@@ -60,8 +59,6 @@ def xlnx_generate_xparams(tgt_node, sdt, options):
             status = node["status"].value
             if "okay" in status:
                 node_list.append(node)
-                compat = node['compatible'].value
-                node_dict.update({node.abs_path:compat})
         except:
            pass
 
@@ -91,144 +88,140 @@ def xlnx_generate_xparams(tgt_node, sdt, options):
 
         if os.path.isfile(str(yaml_file_abs)):
             driver_name = str(yaml_file_abs).split('/')[-1].split('.')[0]
-            with open(str(yaml_file_abs), "r") as stream:
-                schema = yaml.safe_load(stream)
-                driver_compatlist = compat_list(schema)
-                driver_proplist = schema['required']
-                match_nodes = []
-                for comp in driver_compatlist:
-                    for node,compatible_list in sorted(node_dict.items(), key=lambda e: e[0], reverse=False):
-                       match = [x for x in compatible_list if comp == x]
-                       if match:
-                           node1 = [x for x in node_list if (x.abs_path == node)]
-                           node_list = [x for x in node_list if not(x.abs_path == node)]
-                           if node1:
-                               match_nodes.append(node1[0])
-                match_nodes = get_mapped_nodes(sdt, match_nodes, options)
-                for index, node in enumerate(match_nodes):
-                    label_name = get_label(sdt, symbol_node, node)
-                    label_name = label_name.upper()
-                    canondef_dict = {}
-                    if index == 0:
-                        plat.buf('\n#define XPAR_X%s_NUM_INSTANCES %s\n' % (driver_name.upper(), len(match_nodes)))
-                    for i, prop in enumerate(driver_proplist):
-                        pad = 0
-                        phandle_prop = 0
-                        if isinstance(prop, dict):
-                            pad = list(prop.values())[0]
-                            prop = list(prop.keys())[0]
-                            if pad == "phandle":
-                                phandle_prop = 1
+            schema = load_yaml(str(yaml_file_abs))
+            driver_compatlist = compat_list(schema)
+            driver_proplist = schema['required']
+            # a node belongs to the first driver that matches it, so only
+            # the nodes that are not yet matched are checked
+            match_nodes = sdt.tree.compat_nodes(driver_compatlist, node_list)
+            match_nodes = sorted(match_nodes, key=lambda node: node.abs_path)
+            matched = set(match_nodes)
+            node_list = [x for x in node_list if x not in matched]
+            match_nodes = get_mapped_nodes(sdt, match_nodes, options)
+            for index, node in enumerate(match_nodes):
+                label_name = get_label(sdt, symbol_node, node)
+                label_name = label_name.upper()
+                canondef_dict = {}
+                if index == 0:
+                    plat.buf('\n#define XPAR_X%s_NUM_INSTANCES %s\n' % (driver_name.upper(), len(match_nodes)))
+                for i, prop in enumerate(driver_proplist):
+                    pad = 0
+                    phandle_prop = 0
+                    if isinstance(prop, dict):
+                        pad = list(prop.values())[0]
+                        prop = list(prop.keys())[0]
+                        if pad == "phandle":
+                            phandle_prop = 1
 
-                        if i == 0:
-                            plat.buf('\n/* Definitions for peripheral %s */' % label_name)
-
-                        if prop == "reg":
-                            try:
-                                val, size = scan_reg_size(node, node[prop].value, 0)
-                                plat.buf('\n#define XPAR_%s_BASEADDR %s' % (label_name, hex(val)))
-                                plat.buf('\n#define XPAR_%s_HIGHADDR %s' % (label_name, hex(val + size -1)))
-                                canondef_dict.update({"BASEADDR":hex(val)})
-                                canondef_dict.update({"HIGHADDR":hex(val + size - 1)})
-                                if pad:
-                                    for j in range(1, pad):
-                                        try:
-                                            val, size = scan_reg_size(node, node[prop].value, j)
-                                            plat.buf('\n#define XPAR_%s_BASEADDR_%s %s' % (label_name, j, hex(val)))
-                                        except IndexError:
-                                            pass
-                            except KeyError:
-                                pass
-                        elif prop == "compatible":
-                            plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), node[prop].value[0]))
-                            canondef_dict.update({prop:node[prop].value[0]})
-                        elif prop == "interrupts":
-                            try:
-                                intr = get_interrupt_prop(sdt.FDT, node, node[prop].value)
-                                plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), intr[0]))
-                                canondef_dict.update({prop:intr[0]})
-                            except KeyError:
-                                intr = [0xFFFF]
+                    if i == 0:
+                        plat.buf('\n/* Definitions for peripheral %s */' % label_name)
 
+                    if prop == "reg":
+                        try:
+                            val, size = scan_reg_size(node, node[prop].value, 0)
+                            plat.buf('\n#define XPAR_%s_BASEADDR %s' % (label_name, hex(val)))
+                            plat.buf('\n#define XPAR_%s_HIGHADDR %s' % (label_name, hex(val + size -1)))
+                            canondef_dict.update({"BASEADDR":hex(val)})
+                            canondef_dict.update({"HIGHADDR":hex(val + size - 1)})
                             if pad:
                                 for j in range(1, pad):
                                     try:
-                                        plat.buf('\n#define XPAR_%s_%s_%s %s' % (label_name, prop.upper(), j, intr[j]))
+                                        val, size = scan_reg_size(node, node[prop].value, j)
+                                        plat.buf('\n#define XPAR_%s_BASEADDR_%s %s' % (label_name, j, hex(val)))
                                     except IndexError:
                                         pass
-                        elif prop == "interrupt-parent":
-                            try:
-                                intr_parent = get_intrerrupt_parent(sdt, node[prop].value)
-                                prop = prop.replace("-", "_")
-                                plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), hex(intr_parent)))
-                                canondef_dict.update({prop:hex(intr_parent)})
-                            except KeyError:
-                                pass
-                        elif prop == "clocks":
-                            clkprop_val = get_clock_prop(sdt, node[prop].value)
-                            plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), hex(clkprop_val)))
-                            canondef_dict.update({prop:hex(clkprop_val)})
-                        elif prop == "child,required":
-                            for j,child in enumerate(list(node.child_nodes.items())):
-                                for k,p in enumerate(pad):
-                                    val = hex(child[1][p].value[0])
-                                    p = p.replace("-", "_")
-                                    p = p.replace("xlnx,", "")
-                                    plat.buf('\n#define XPAR_%s_%s_%s %s' % (label_name, j, p.upper(), val))
-                        elif phandle_prop:
-                            try:
-                                prop_val = get_phandle_regprop(sdt, prop, node[prop].value)
-                                plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), hex(prop_val)))
-                                canondef_dict.update({prop:hex(prop_val)})
-                            except KeyError:
-                                pass
-                        elif prop == "ranges":
-                            try:
-                                device_type = node['device_type'].value[0]
-                                if device_type == "pci":
-                                    device_ispci = 1
-                            except KeyError:
-                                device_ispci = 0
-                            if device_ispci:
-                                prop_vallist = get_pci_ranges(node, node[prop].value, pad)
-                                i = 0
-                                for j, prop_val in enumerate(prop_vallist):
-                                    if j % 2:
-                                        plat.buf('\n#define XPAR_%s_%s_HIGHADDR_%s %s' % (label_name, prop.upper(), i, prop_val))
-                                        cannon_prop = prop + str("_") + str("HIGHADDR") + str("_") + str(i)
-                                        canondef_dict.update({cannon_prop:prop_val})
-                                        i += 1
-                                    else:
-                                        plat.buf('\n#define XPAR_%s_%s_BASEADDR_%s %s' % (label_name, prop.upper(), i, prop_val))
-                                        cannon_prop = prop + str("_") + str("BASEADDR") + str("_") + str(i)
-                                        canondef_dict.update({cannon_prop:prop_val})
-                        else:
-                            try:
-                                prop_val = node[prop].value
-                                # For boolean property if present LopperProp will return
-                                # empty string convert it to baremetal config struct expected value
-                                if '' in prop_val:
-                                    prop_val = [1]
-                            except KeyError:
-                                prop_val = [0]
+                        except KeyError:
+                            pass
+                    elif prop == "compatible":
+                        plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), node[prop].value[0]))
+                        canondef_dict.update({prop:node[prop].value[0]})
+                    elif prop == "interrupts":
+                        try:
+                            intr = get_interrupt_prop(sdt.FDT, node, node[prop].value)
+                            plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), intr[0]))
+                            canondef_dict.update({prop:intr[0]})
+                        except KeyError:
+                            intr = [0xFFFF]
 
-                            if ('/bits/' in prop_val):
-                                prop_val = [int(prop_val[-1][3:-1], base=16)]
+                        if pad:
+                            for j in range(1, pad):
+                                try:
+                                    plat.buf('\n#define XPAR_%s_%s_%s %s' % (label_name, prop.upper(), j, intr[j]))
+                                except IndexError:
+                                    pass
+                    elif prop == "interrupt-parent":
+                        try:
+                            intr_parent = get_intrerrupt_parent(sdt, node[prop].value)
                             prop = prop.replace("-", "_")
-                            prop = prop.replace("xlnx,", "")
-                            if len(prop_val) > 1:
-                                for k,item in enumerate(prop_val):
-                                    cannon_prop = prop + str("_") + str(k)
-                                    canondef_dict.update({cannon_prop:item})
-                                    plat.buf('\n#define XPAR_%s_%s_%s %s' % (label_name, prop.upper(), k, item))
-                            else:
-                                canondef_dict.update({prop:hex(prop_val[0])})
-                                plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), hex(prop_val[0])))
+                            plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), hex(intr_parent)))
+                            canondef_dict.update({prop:hex(intr_parent)})
+                        except KeyError:
+                            pass
+                    elif prop == "clocks":
+                        clkprop_val = get_clock_prop(sdt, node[prop].value)
+                        plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), hex(clkprop_val)))
+                        canondef_dict.update({prop:hex(clkprop_val)})
+                    elif prop == "child,required":
+                        for j,child in enumerate(list(node.child_nodes.items())):
+                            for k,p in enumerate(pad):
+                                val = hex(child[1][p].value[0])
+                                p = p.replace("-", "_")
+                                p = p.replace("xlnx,", "")
+                                plat.buf('\n#define XPAR_%s_%s_%s %s' % (label_name, j, p.upper(), val))
+                    elif phandle_prop:
+                        try:
+                            prop_val = get_phandle_regprop(sdt, prop, node[prop].value)
+                            plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), hex(prop_val)))
+                            canondef_dict.update({prop:hex(prop_val)})
+                        except KeyError:
+                            pass
+                    elif prop == "ranges":
+                        try:
+                            device_type = node['device_type'].value[0]
+                            if device_type == "pci":
+                                device_ispci = 1
+                        except KeyError:
+                            device_ispci = 0
+                        if device_ispci:
+                            prop_vallist = get_pci_ranges(node, node[prop].value, pad)
+                            i = 0
+                            for j, prop_val in enumerate(prop_vallist):
+                                if j % 2:
+                                    plat.buf('\n#define XPAR_%s_%s_HIGHADDR_%s %s' % (label_name, prop.upper(), i, prop_val))
+                                    cannon_prop = prop + str("_") + str("HIGHADDR") + str("_") + str(i)
+                                    canondef_dict.update({cannon_prop:prop_val})
+                                    i += 1
+                                else:
+                                    plat.buf('\n#define XPAR_%s_%s_BASEADDR_%s %s' % (label_name, prop.upper(), i, prop_val))
+                                    cannon_prop = prop + str("_") + str("BASEADDR") + str("_") + str(i)
+                                    canondef_dict.update({cannon_prop:prop_val})
+                    else:
+                        try:
+                            prop_val = node[prop].value
+                            # For boolean property if present LopperProp will return
+                            # empty string convert it to baremetal config struct expected value
+                            if '' in prop_val:
+                                prop_val = [1]
+                        except KeyError:
+                            prop_val = [0]
+
+                        if ('/bits/' in prop_val):
+                            prop_val = [int(prop_val[-1][3:-1], base=16)]
+                        prop = prop.replace("-", "_")
+                        prop = prop.replace("xlnx,", "")
+                        if len(prop_val) > 1:
+                            for k,item in enumerate(prop_val):
+                                cannon_prop = prop + str("_") + str(k)
+                                canondef_dict.update({cannon_prop:item})
+                                plat.buf('\n#define XPAR_%s_%s_%s %s' % (label_name, prop.upper(), k, item))
+                        else:
+                            canondef_dict.update({prop:hex(prop_val[0])})
+                            plat.buf('\n#define XPAR_%s_%s %s' % (label_name, prop.upper(), hex(prop_val[0])))
 
-                    plat.buf('\n\n/* Canonical definitions for peripheral %s */' % label_name)
-                    for prop,val in sorted(canondef_dict.items(), key=lambda e: e[0][0], reverse=False):
-                        plat.buf('\n#define XPAR_X%s_%s_%s %s' % (driver_name.upper(), index, prop.upper(), val))
-                    plat.buf('\n')
+                plat.buf('\n\n/* Canonical definitions for peripheral %s */' % label_name)
+                for prop,val in sorted(canondef_dict.items(), key=lambda e: e[0][0], reverse=False):
+                    plat.buf('\n#define XPAR_X%s_%s_%s %s' % (driver_name.upper(), index, prop.upper(), val))
+                plat.buf('\n')
                                     
     # Generate Defines for Generic Nodes
     node_list = get_mapped_nodes(sdt, node_list, options)
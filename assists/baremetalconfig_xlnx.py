@@ -22,6 +22,18 @@ import lopper
 from lopper_tree import *
 from re import *
 import yaml
+import hashlib
+import json
+import tempfile
+import weakref
+from collections import namedtuple
+
+# use the libyaml backed loader if it is available, it produces the same
+# data as the python loader
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 sys.path.append(os.path.dirname(__file__))
 from bmcmake_metadata_xlnx import *
@@ -63,6 +75,16 @@ def item_generator(json_input, lookup_key):
 
 # This API reads the schema and returns the compatible list
 def compat_list(schema):
+    # the compatible list of cached driver metadata is only computed once
+    entry = schema_metadata.get(id(schema))
+    if entry and entry['schema'] is schema and 'compat' in entry:
+        if entry['compat'] is None:
+            return None
+        return list(entry['compat'])
+
+    return schema_compat_list(schema)
+
+def schema_compat_list(schema):
     if 'compatible' in schema['properties'].keys():
         sch = schema['properties']['compatible']
         compatible_list = []
@@ -81,6 +103,129 @@ def compat_list(schema):
         compatible_list = list(set(compatible_list))
         return compatible_list
 
+# driver metadata that has already been loaded, indexed by the absolute
+# path of the yaml file
+driver_metadata = {}
+# the same metadata, indexed by the id() of the schema (see compat_list).
+# An entry is dropped when the metadata of its file is loaded again, so
+# this never holds more entries than driver_metadata.
+schema_metadata = {}
+
+# bump this if the format of the on-disk metadata cache changes
+METADATA_CACHE_VERSION = 2
+
+"""
+This API returns the directory of the on-disk driver metadata cache.
+It is LOPPER_METADATA_CACHE if set (an empty value disables the on-disk
+cache), otherwise lopper/metadata in the user's cache directory.
+"""
+def metadata_cache_dir():
+    return lopper.cache_dir('metadata', 'LOPPER_METADATA_CACHE')
+
+"""
+This API checks that a metadata cache directory (or file) can be
+trusted: it must be owned by the user, and not writable by anyone else.
+A directory that doesn't exist yet is created that way.
+
+Args:
+    path: the cache directory or file
+"""
+def metadata_cache_ok(path):
+    return lopper.cache_ok(path)
+
+"""
+This API parses a driver metadata (yaml) file into a cache entry, using
+the on-disk cache when possible. Entries are keyed by the yaml file path
+and are valid while the file's mtime and size are unchanged. If only the
+mtime has changed, a matching content hash still avoids the parse.
+
+The on-disk cache is json, and is only used if it belongs to the user
+(see metadata_cache_ok()). Metadata that doesn't survive a json round
+trip is not written to it.
+
+Args:
+    yamlfile: absolute path to the driver yaml file
+    stat: os.stat() result for yamlfile
+"""
+def load_metadata_entry(yamlfile, stat):
+    entry = None
+    cache_file = None
+    cache_dir = metadata_cache_dir()
+    if cache_dir and metadata_cache_ok(cache_dir):
+        cache_file = os.path.join(cache_dir, hashlib.sha1(yamlfile.encode()).hexdigest() + ".json")
+        try:
+            if metadata_cache_ok(cache_file):
+                with open(cache_file, 'r') as stream:
+                    entry = json.load(stream)
+            if entry['version'] != METADATA_CACHE_VERSION or entry['path'] != yamlfile:
+                entry = None
+        except Exception:
+            entry = None
+
+    if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry
+
+    with open(yamlfile, 'rb') as stream:
+        data = stream.read()
+    digest = hashlib.sha1(data).hexdigest()
+
+    if not entry or entry['hash'] != digest:
+        schema = yaml.load(data, Loader=SafeLoader)
+        entry = { 'version': METADATA_CACHE_VERSION,
+                  'path': yamlfile,
+                  'hash': digest,
+                  'schema': schema }
+        try:
+            entry['compat'] = schema_compat_list(schema)
+        except Exception:
+            # not all metadata describes compatible strings, let
+            # compat_list() report it if it is ever asked to.
+            pass
+
+    entry['mtime'] = stat.st_mtime_ns
+    entry['size'] = stat.st_size
+
+    if cache_file:
+        # the cache is an optimization, failing to write it is not an error
+        tmp_name = None
+        try:
+            data = json.dumps(entry)
+            if json.loads(data) == entry:
+                os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+                with tempfile.NamedTemporaryFile('w', dir=cache_dir, delete=False) as tmp:
+                    tmp_name = tmp.name
+                    tmp.write(data)
+                os.replace(tmp_name, cache_file)
+        except Exception:
+            if tmp_name and os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    return entry
+
+"""
+This API loads the driver metadata (yaml) file and returns the schema.
+The schema and its compatible list are cached, in the process and on
+disk (see load_metadata_entry()), so a driver's metadata is only parsed
+again if the file changes. The returned schema is shared and must not be
+modified by the caller.
+
+Args:
+    yamlfile: path to the driver yaml file
+"""
+def load_yaml(yamlfile):
+    yamlfile = os.path.abspath(yamlfile)
+    stat = os.stat(yamlfile)
+
+    entry = driver_metadata.get(yamlfile)
+    if not entry or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+        if entry:
+            del schema_metadata[id(entry['schema'])]
+        entry = load_metadata_entry(yamlfile, stat)
+        driver_metadata[yamlfile] = entry
+        schema_metadata[id(entry['schema'])] = entry
+
+    return entry['schema']
+
 """
 This API scans the device-tree node and returns the address
 and size of the reg property for the user provided index.
@@ -151,16 +296,30 @@ def get_interrupt_prop(fdt, node, value):
 
     return intr
 
+"""
+This API returns the node that a phandle refers to. The tree's phandle
+index is used, and the name the FDT has for the phandle is looked up in
+the tree's name index if the tree doesn't know the phandle.
+
+Args:
+    sdt: is the system device-tree
+    phandle: phandle value
+"""
+def get_phandle_node(sdt, phandle):
+    node = sdt.tree.pnode(phandle)
+    if node:
+        return node
+
+    name = sdt.FDT.get_name(sdt.FDT.node_offset_by_phandle(phandle))
+    return sdt.tree.name_nodes(name)[0]
+
 #Return the base address of the parent node.
 def get_phandle_regprop(sdt, prop, value):
-    parent_node = sdt.FDT.node_offset_by_phandle(value[0])
-    name = sdt.FDT.get_name(parent_node)
-    root_sub_nodes = sdt.tree['/'].subnodes()
-    parent_node = [node for node in root_sub_nodes if re.search(name, node.name)]
-    reg, size = scan_reg_size(parent_node[0], parent_node[0]['reg'].value, 0)
+    parent_node = get_phandle_node(sdt, value[0])
+    reg, size = scan_reg_size(parent_node, parent_node['reg'].value, 0)
     # Special handling for Soft Ethernet(1/2.5G, and 10G/25G MAC) axistream-connected property
     if prop == "axistream-connected":
-        compat = parent_node[0]['compatible'].value
+        compat = parent_node['compatible'].value
         axi_fifo = [item for item in compat if "xlnx,axi-fifo" in item]
         axi_dma = [item for item in compat if "xlnx,eth-dma" in item]
         axi_mcdma = [item for item in compat if "xlnx,eth-mcdma" in item]
@@ -174,17 +333,14 @@ def get_phandle_regprop(sdt, prop, value):
 
 #Return the base address of the interrupt parent.
 def get_intrerrupt_parent(sdt, value):
-    intr_parent = sdt.FDT.node_offset_by_phandle(value[0])
-    name = sdt.FDT.get_name(intr_parent)
-    root_sub_nodes = sdt.tree['/'].subnodes()
-    intr_node = [node for node in root_sub_nodes if re.search(name, node.name)]
-    reg, size = scan_reg_size(intr_node[0], intr_node[0]['reg'].value, 0)
+    intr_node = get_phandle_node(sdt, value[0])
+    reg, size = scan_reg_size(intr_node, intr_node['reg'].value, 0)
     """
     Baremetal Interrupt Parent Property Format:
         bits[0]    Interrupt parent type (0: GIC, 1: AXI INTC)
         bits[31:1] Base Address of the interrupt parent
     """
-    compat = intr_node[0]['compatible'].value
+    compat = intr_node['compatible'].value
     axi_intc = [item for item in compat if "xlnx,xps-intc-1.00.a" in item]
     if axi_intc:
         reg += 1
@@ -227,16 +383,13 @@ def scan_ranges_size(node, value, idx):
     return addr, size
 
 def get_clock_prop(sdt, value):
-    clk_parent = sdt.FDT.node_offset_by_phandle(value[0])
-    name = sdt.FDT.get_name(clk_parent)
-    root_sub_nodes = sdt.tree['/'].subnodes()
-    clk_node = [node for node in root_sub_nodes if re.search(name, node.name)]
+    clk_node = get_phandle_node(sdt, value[0])
     """
     Baremetal clock format:
         bits[0] clock parent(controller) type(0: ZynqMP clock controller)
         bits[31:1] clock value
     """
-    compat = clk_node[0]['compatible'].value
+    compat = clk_node['compatible'].value
     return value[1]
 
 def get_pci_ranges(node, value, pad):
@@ -294,68 +447,212 @@ def get_stdin(sdt, chosen_node, node_list):
     match = [x for x in node_list if re.search(x.name, serial_node)]
     return match[0]
 
-def get_mapped_nodes(sdt, node_list, options):
-    # Yocto Machine to CPU compat mapping
+# One decoded address-map entry. address and size are the cpu view of the
+# mapping, bus_cells are the raw cells of the address in the mapped node.
+AddressMapRecord = namedtuple('AddressMapRecord', ['address', 'phandle', 'bus_address', 'size', 'bus_cells'])
+
+def cells_to_int(cells):
+    val = 0
+    for c in cells:
+        val = (val << 32) | c
+    return val
+
+class AddressMap(object):
+    """Decoded address-map of a CPU cluster
+
+    The address-map is decoded once into records, and the records of
+    each mapped phandle (so checking if a node is mapped, or finding its
+    mappings, is a dictionary lookup). Overlapping and adjacent ranges
+    are kept as separate records.
+
+    The domain (subsystem) nodes that reference the cluster are also
+    resolved, and references in their access (and included resource
+    group) properties that are not mapped are reported once.
+    """
+    def __init__(self, tree, cluster):
+        self.cluster = cluster
+        self.records = []
+
+        address_map = cluster["address-map"].value
+        na = cluster["#ranges-address-cells"].value[0]
+        ns = cluster["#ranges-size-cells"].value[0]
+        record_len = na + 1 + na + ns
+        for i in range(0, len(address_map) - record_len + 1, record_len):
+            bus_cells = address_map[i+na+1:i+na+1+na]
+            self.records.append(AddressMapRecord(cells_to_int(address_map[i:i+na]),
+                                                 address_map[i+na],
+                                                 cells_to_int(bus_cells),
+                                                 cells_to_int(address_map[i+na+1+na:i+record_len]),
+                                                 bus_cells))
+
+        # records of each mapped phandle, in address-map order
+        self.phandle_records = {}
+        for r in self.records:
+            self.phandle_records.setdefault(r.phandle, []).append(r)
+
+        # mapped phandles, in address-map order
+        self.phandle_list = list(self.phandle_records)
+        self.phandles = set(self.phandle_list)
+
+        self.access_phandles = self.domain_access(tree)
+
+    def domain_access(self, tree):
+        """Collect the mapped phandles accessed by the cluster's domain
+
+        Args:
+            tree: LopperTree containing the cluster
+
+        Returns:
+            set of phandles
+        """
+        cpu_phandle = self.cluster.phandle
+        domain_node = None
+        for node in tree['/'].subnodes():
+            try:
+                cpus = node["cpus"].value
+                if cpus and cpus[0] == cpu_phandle:
+                    domain_node = node
+                    break
+            except:
+                pass
+
+        if not domain_node:
+            return set()
+
+        # Get valid node list by reading access property
+        try:
+            access_phandle_list = list(domain_node["access"].value)
+        except KeyError:
+            access_phandle_list = []
+
+        # Check whether Domain node has any shared resource group
+        try:
+            rsrc_grp = tree.pnode(domain_node["include"].value[0])
+            if rsrc_grp:
+                access_phandle_list.extend(rsrc_grp["access"].value)
+        except KeyError:
+            pass
+
+        wrong_handles = set(access_phandle_list) - self.phandles
+        if wrong_handles:
+            wrong_nodes = [node.name for node in tree['/'].subnodes() if node.phandle in wrong_handles]
+            if wrong_nodes:
+                print("[WARNING]: invalid node %s reference mentioned in access property please delete the references" % ','.join(wrong_nodes))
+
+        return set(access_phandle_list) & self.phandles
+
+    def is_mapped(self, node):
+        """Check if a node is mapped by the cluster
+
+        Args:
+            node: LopperNode object
+
+        Returns:
+            True if the node's phandle is in the address-map
+        """
+        return node.phandle in self.phandles
+
+    def node_records(self, node):
+        """Get the address-map records of a node
+
+        Args:
+            node: LopperNode object
+
+        Returns:
+            list of AddressMapRecord, in address-map order
+        """
+        return list(self.phandle_records.get(node.phandle, []))
+
+# data derived from a tree that is shared by the baremetal assists, per
+# tree: tree -> (generation, { key: data }). The data is dropped when the
+# generation of the tree changes (the tree was modified, or synced).
+tree_data = weakref.WeakKeyDictionary()
+
+"""
+This API returns the dictionary of shared derived data for the tree
+of the system device-tree. The dictionary is empty if the tree has been
+modified since the data was derived.
+
+Args:
+    sdt: is the system device-tree
+"""
+def get_tree_data(sdt):
+    generation = sdt.tree.__generation__
+    try:
+        data_generation, data = tree_data[sdt.tree]
+        if data_generation == generation:
+            return data
+    except KeyError:
+        pass
+
+    data = {}
+    tree_data[sdt.tree] = (generation, data)
+    return data
+
+"""
+This API returns the (cached) AddressMap of the CPU cluster for the
+machine in options. The map is decoded once per tree (generation), all
+baremetal assists share it.
+
+Args:
+    sdt: is the system device-tree
+    options: assist options, args[0] is the machine
+"""
+def get_address_map(sdt, options):
+    data = get_tree_data(sdt)
+    machine = options['args'][0]
+    try:
+        return data[('address-map', machine)]
+    except KeyError:
+        pass
+
     match_cpunodes = get_cpu_node(sdt, options)
+    cluster = match_cpunodes[0].parent
+    # machines can share a cluster
+    try:
+        amap = data[('address-map', cluster.abs_path)]
+    except KeyError:
+        amap = AddressMap(sdt.tree, cluster)
+        data[('address-map', cluster.abs_path)] = amap
 
-    all_phandles = []
-    address_map = match_cpunodes[0].parent["address-map"].value
-    na = match_cpunodes[0].parent["#ranges-address-cells"].value[0]
-    ns = match_cpunodes[0].parent["#ranges-size-cells"].value[0]
-    cells = na + ns
-    tmp = na
-    while tmp < len(address_map):
-        all_phandles.append(address_map[tmp])
-        tmp = tmp + cells + na + 1
-    # Remove duplicate phandle
-    all_phandles = list(dict.fromkeys(all_phandles))
+    data[('address-map', machine)] = amap
+    return amap
 
-    valid_nodes = [node for node in node_list for handle in all_phandles if handle == node.phandle]
+"""
+This API returns the nodes under tgt_node that have a status = "okay"
+property. The list is only created once per tree (generation), the
+caller gets its own copy.
 
-    # Get Access or Domain list for the given CPU/Machine
-    root_node = sdt.tree['/']
-    root_sub_nodes = root_node.subnodes()
-    domain_nodes = []
-    for node in root_sub_nodes:
+Args:
+    sdt: is the system device-tree
+    tgt_node: top level node to scan
+"""
+def get_okay_nodes(sdt, tgt_node):
+    data = get_tree_data(sdt)
+    root_node = sdt.tree[tgt_node]
+    try:
+        return list(data[('okay', root_node.abs_path)])
+    except KeyError:
+        pass
+
+    node_list = []
+    for node in root_node.subnodes():
         try:
-            is_subsystem = node["cpus"].value
-            if is_subsystem:
-                domain_nodes.append(node)
+            status = node["status"].value
+            if "okay" in status:
+                node_list.append(node)
         except:
-            pass
+           pass
 
-    if domain_nodes:
-        # Get Matched Domains for a given cpu cluster
-        cpu_phandle = match_cpunodes[0].parent.phandle
-        domain_node = [node for node in domain_nodes if node["cpus"].value[0]  == cpu_phandle]
+    data[('okay', root_node.abs_path)] = node_list
+    return list(node_list)
 
-        if domain_node:
-            # Get valid node list by reading access property
-            access_phandle_list = domain_node[0]["access"].value
+def get_mapped_nodes(sdt, node_list, options):
+    amap = get_address_map(sdt, options)
 
-            # Check whether Domain node has any shared resource group
-            try:
-               rsrc_grp_phandle = domain_node[0]["include"].value[0]
-               node = [node for node in sdt.tree['/'].subnodes() if node.phandle == rsrc_grp_phandle]
-               rsrc_grp_phanlde = node[0]["access"].value
-               access_phandle_list.extend(rsrc_grp_phanlde)
-            except KeyError:
-               pass
-
-            mapped_phandle = [handle for handle in access_phandle_list for phandle in all_phandles if handle == phandle]
-            if len(access_phandle_list) != len(mapped_phandle):
-               wrong_mapped_handle = [handle for handle in access_phandle_list if handle not in mapped_phandle]
-               wrong_nodes = [node.name for node in sdt.tree['/'].subnodes() for handle in wrong_mapped_handle if handle == node.phandle]
-               if wrong_nodes:
-                  print("[WARNING]: invalid node %s reference mentioned in access property please delete the references" % ','.join(wrong_nodes))
-
-            domain_valid_nodes = [node for node in node_list for handle in mapped_phandle if handle == node.phandle]
-            valid_nodes.extend(domain_valid_nodes)
-            # Remove duplicate nodes
-            valid_nodes = list(dict.fromkeys(valid_nodes))
-        return valid_nodes
-    else:
-        return valid_nodes
+    # nodes accessed by the cluster's domain are a subset of the mapped
+    # nodes, so only the address-map needs to be checked
+    return list(dict.fromkeys([node for node in node_list if node.phandle in amap.phandles]))
 
 # tgt_node: is the baremetal config top level domain node number
 # sdt: is the system device-tree
@@ -401,29 +698,21 @@ def xlnx_generate_bm_config(tgt_node, sdt, options):
     driver_proplist = []
     # Read the yaml file and get the driver supported compatible list
     # and config data file required driver properties
-    with open(yamlfile, 'r') as stream:
-        schema = yaml.safe_load(stream)
-        driver_compatlist = compat_list(schema)
-        driver_proplist = schema['required']
-        try:
-            config_struct = schema['config']
-        except KeyError:
-            config_struct = []
-        try:
-            driver_optproplist = schema['optional']
-        except KeyError:
-            driver_optproplist = []
-
-    driver_nodes = []
-    for compat in driver_compatlist:
-        for node in node_list:
-           compat_string = node['compatible'].value
-           for compa in compat_string:
-               if compat in compa:
-                   driver_nodes.append(node)
-
-    # Remove duplicate nodes
-    driver_nodes = list(dict.fromkeys(driver_nodes))
+    schema = load_yaml(yamlfile)
+    driver_compatlist = compat_list(schema)
+    driver_proplist = schema['required']
+    try:
+        config_struct = schema['config']
+    except KeyError:
+        config_struct = []
+    try:
+        driver_optproplist = schema['optional']
+    except KeyError:
+        driver_optproplist = []
+
+    # Use the tree's compatible index to find the driver nodes, they
+    # are returned in tree order and without duplicates
+    driver_nodes = sdt.tree.compat_nodes(driver_compatlist, node_list, substring=True)
     driver_nodes = get_mapped_nodes(sdt, driver_nodes, options)
     # config file name: x<driver_name>_g.c 
     driver_name = yamlfile.split('/')[-1].split('.')[0]
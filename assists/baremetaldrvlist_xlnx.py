@@ -33,20 +33,11 @@ def is_compat(node, compat_string_to_test):
 # tgt_node: is the baremetal config top level domain node number
 # sdt: is the system device-tree
 def xlnx_generate_bm_drvlist(tgt_node, sdt, options):
-    root_node = sdt.tree[tgt_node]
-    root_sub_nodes = root_node.subnodes()
     compatible_list = []
     driver_list = []
-    node_list = []
-    # Traverse the tree and find the nodes having status=ok property
-    # and create a compatible_list from these nodes.
-    for node in root_sub_nodes:
-        try:
-            status = node["status"].value
-            if "okay" in status:
-                node_list.append(node)
-        except:
-           pass
+    # Find the nodes having status=ok property and create a
+    # compatible_list from these nodes.
+    node_list = get_okay_nodes(sdt, tgt_node)
 
     mapped_nodelist = get_mapped_nodes(sdt, node_list, options)
     for node in mapped_nodelist:
@@ -70,19 +61,18 @@ def xlnx_generate_bm_drvlist(tgt_node, sdt, options):
                     # Traverse each driver and find supported compatible list
                     # match it aginst the compatible_list created above, if there
                     # is a match append the driver name to the driver list.
-                    with open(yamlfile, 'r') as stream:
-                        schema = yaml.safe_load(stream)
-                        driver_compatlist = compat_list(schema)
-                        for comp in driver_compatlist:
-                            for c in compatible_list:
-                                match = [x for x in c if comp == x]
-                                if match:
-                                    driver_list.append(name)
-                                    try:
-                                        if schema['depends']:
-                                            depdrv_list.append(schema['depends'])
-                                    except:
-                                        pass
+                    schema = load_yaml(yamlfile)
+                    driver_compatlist = compat_list(schema)
+                    for comp in driver_compatlist:
+                        for c in compatible_list:
+                            match = [x for x in c if comp == x]
+                            if match:
+                                driver_list.append(name)
+                                try:
+                                    if schema['depends']:
+                                        depdrv_list.append(schema['depends'])
+                                except:
+                                    pass
                 except FileNotFoundError:
                     pass
 
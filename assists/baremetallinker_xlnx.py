@@ -28,7 +28,7 @@ from lopper_tree import *
 from re import *
 
 sys.path.append(os.path.dirname(__file__))
-from baremetalconfig_xlnx import scan_reg_size, get_cpu_node
+from baremetalconfig_xlnx import scan_reg_size, get_address_map, get_tree_data
 from bmcmake_metadata_xlnx import to_cmakelist
 
 def is_compat( node, compat_string_to_test ):
@@ -39,7 +39,20 @@ def is_compat( node, compat_string_to_test ):
 # tgt_node: is the baremetal config top level domain node number
 # sdt: is the system device-tree
 # options: baremetal application source path
+# The memory ranges are only scanned once per tree (generation) and
+# machine, the caller gets its own copy.
 def get_memranges(tgt_node, sdt, options):
+    data = get_tree_data(sdt)
+    key = ('memranges', sdt.tree[tgt_node].abs_path, options['args'][0])
+    try:
+        mem_ranges = data[key]
+    except KeyError:
+        mem_ranges = scan_memranges(tgt_node, sdt, options)
+        data[key] = mem_ranges
+
+    return dict(mem_ranges)
+
+def scan_memranges(tgt_node, sdt, options):
     root_node = sdt.tree[tgt_node]
     root_sub_nodes = root_node.subnodes()
     mem_nodes = []
@@ -56,29 +69,16 @@ def get_memranges(tgt_node, sdt, options):
     versal_noc_ch_ranges =  {"DDR_CH_1": "0x50000000000", "DDR_CH_2": "0x60000000000", "DDR_CH_3": "0x70000000000"}
 
     # Yocto Machine to CPU compat mapping
-    match_cpunodes = get_cpu_node(sdt, options)
-   
-    address_map = match_cpunodes[0].parent["address-map"].value
-    all_phandles = []
-    ns = match_cpunodes[0].parent["#ranges-size-cells"].value[0]
-    na = match_cpunodes[0].parent["#ranges-address-cells"].value[0]
-    cells = na + ns
-    tmp = na
-    while tmp < len(address_map):
-        all_phandles.append(address_map[tmp])
-        tmp = tmp + cells + na + 1
+    address_map = get_address_map(sdt, options)
+    na = address_map.cluster["#ranges-address-cells"].value[0]
 
     mem_ranges = {}
     for node in mem_nodes:
         # Check whether the memory node is mapped to cpu cluster or not
-        mem_phandles = [handle for handle in all_phandles if handle == node.phandle]
         addr_list = []
-        if mem_phandles:
-           # Remove Duplicate phandle referenecs
-           mem_phandles = list(dict.fromkeys(mem_phandles))
-           indx_list = [index for index,handle in enumerate(address_map) for val in mem_phandles if handle == val]
-           for inx in indx_list:
-               start = [address_map[inx+i+1] for i in range(na)]
+        if address_map.is_mapped(node):
+           for record in address_map.node_records(node):
+               start = record.bus_cells
                if na == 2 and start[0] != 0:
                    val = str(start[1])
                    pad = 8 - len(val)
@@ -44,13 +44,12 @@ def generate_drvcmake_metadata(sdt, node_list, src_dir, options):
         return False
 
     # Get the example_schema
-    with open(yamlfile, 'r') as stream:
-        schema = yaml.safe_load(stream)
-        driver_compatlist = compat_list(schema)
-        try:
-            example_schema = schema['examples']
-        except KeyError:
-            example_schema = {}
+    schema = load_yaml(yamlfile)
+    driver_compatlist = compat_list(schema)
+    try:
+        example_schema = schema['examples']
+    except KeyError:
+        example_schema = {}
        
     driver_nodes = []
     for compat in driver_compatlist:
@@ -129,27 +128,20 @@ def generate_drvcmake_metadata(sdt, node_list, src_dir, options):
 
 def getmatch_nodes(sdt, node_list, yamlfile, options):
     # Get the example_schema
-    with open(yamlfile, 'r') as stream:
-        schema = yaml.safe_load(stream)
-        driver_compatlist = compat_list(schema)
-       
-    driver_nodes = []
-    for compat in driver_compatlist:
-        for node in node_list:
-           compat_string = node['compatible'].value[0]
-           if compat in compat_string:
-               driver_nodes.append(node)
-
+    schema = load_yaml(yamlfile)
+    driver_compatlist = compat_list(schema)
+
+    # the compatible index matches any of the node's compatible strings,
+    # only the nodes whose first compatible string matches are wanted
+    driver_nodes = sdt.tree.compat_nodes(driver_compatlist, node_list, substring=True)
+    driver_nodes = [node for node in driver_nodes
+                    if any(compat in node['compatible'].value[0] for compat in driver_compatlist)]
     driver_nodes = get_mapped_nodes(sdt, driver_nodes, options)
-    driver_nodes = list(dict.fromkeys(driver_nodes))
     return driver_nodes
 
 def getxlnx_phytype(sdt, value):
-    child_node = sdt.FDT.node_offset_by_phandle(value[0])
-    name = sdt.FDT.get_name(child_node)
-    root_sub_nodes = sdt.tree['/'].subnodes()
-    child_node = [node for node in root_sub_nodes if re.search(name, node.name)]
-    phy_type = child_node[0]['xlnx,phy-type'].value[0]
+    child_node = get_phandle_node(sdt, value[0])
+    phy_type = child_node['xlnx,phy-type'].value[0]
     return hex(phy_type)
 
 def lwip_topolgy(config):
@@ -187,9 +179,8 @@ def generate_hwtocmake_medata(sdt, node_list, src_path, repo_path, options):
         print("Driver doesn't have yaml file")
         return False
 
-    with open(yamlfile, 'r') as stream:
-        schema = yaml.safe_load(stream)
-        meta_dict = schema['required']
+    schema = load_yaml(yamlfile)
+    meta_dict = schema['required']
 
     lwip = re.search("lwip211", name)
     cmake_file = name.capitalize() + str("Example.cmake")
@@ -242,18 +233,8 @@ def to_cmakelist(pylist):
     return cmake_list
 
 def xlnx_generate_cmake_metadata(tgt_node, sdt, options):
-    root_node = sdt.tree[tgt_node]
-    root_sub_nodes = root_node.subnodes()
-
-    node_list = []
-    # Traverse the tree and find the nodes having status=ok property
-    for node in root_sub_nodes:
-        try:
-            status = node["status"].value
-            if "okay" in status:
-                node_list.append(node)
-        except:
-           pass
+    # Find the nodes having status=ok property
+    node_list = get_okay_nodes(sdt, tgt_node)
 
     src_path = options['args'][1]
     command = options['args'][2]
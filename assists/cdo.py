@@ -8,6 +8,7 @@
 # */
 
 import struct
+import array
 import sys
 import types
 import unittest
@@ -57,19 +58,22 @@ def do_expand_cdo_flags(tgt_node):
 def expand_cdo_flags(tgt_node):
     flags_names = []
     flags = []
+    # the flag references are the nodes two levels down, walk the
+    # subnodes once to collect them
+    flags_nodes = [n for n in tgt_node.subnodes() if n.depth == tgt_node.depth + 2]
+
     # find default flags
-    for n in tgt_node.subnodes():
-       if n.depth == tgt_node.depth + 2 and n.abs_path == tgt_node.abs_path + "/flags/default":
+    for n in flags_nodes:
+       if n.abs_path == tgt_node.abs_path + "/flags/default":
                default_flags = n
                break
 
     # for each flag reference
     # update flags' bits along with using default
-    for n in tgt_node.subnodes():
-        if n.depth == tgt_node.depth + 2:
-            #    set all bits according to what is provided
-            flags.extend( expand_cdo_flags_bits(n, default_flags) )
-            flags_names.append( n.name )
+    for n in flags_nodes:
+        #    set all bits according to what is provided
+        flags.extend( expand_cdo_flags_bits(n, default_flags) )
+        flags_names.append( n.name )
 
     flags_cells = 4
     return [flags_names, flags, flags_cells]
@@ -175,6 +179,7 @@ class Device():
         self.node_id = node_id
         self.flags = flags
         self.pm_reqs = [0, 0, 0, 0]
+        self.inclusion = (0x0, 0x0)
 
 
 class Subsystem():
@@ -456,65 +461,194 @@ def process_subsystem(subsystem, subsystem_node, sdt, options, included = False)
 def construct_flag_references(subsystem):
     flags_list = subsystem.sub_node.propval("flags")
     for index, flags_name in enumerate(subsystem.sub_node.propval("flags-names")):
-        ref_flags = [0x0, 0x0, 0x0, 0x0]
-
         current_base = index * 4 # 4 elements per requirement of device
+
+        # a flag reference is shared by all the devices that name it, so it
+        # is stored as an immutable tuple and copied only when used as the
+        # base of a device's requirements
+        ref_flags = [0x0, 0x0, 0x0, 0x0]
         for i in range(0,3):
             ref_flags[i] = flags_list[current_base + i]
 
-        subsystem.flag_references[flags_name] = ref_flags
+        subsystem.flag_references[flags_name] = tuple(ref_flags)
 
 
-def determine_inclusion(device_flags, other_device_flags, sub, other_sub):
+def flag_reference(sub, device_flags):
+    # return the subsystem's flag reference named by the first of a
+    # device's flags, or the subsystem's default reference
+    flags_name = device_flags[0].split("::")[0]
+    if flags_name not in sub.flag_references.keys():
+        flags_name = 'default'
 
-    # look for time share in the flags defined by each subsystem that correspond
-    # to the device
+    return sub.flag_references[flags_name]
 
-    # first get current device
-    dev_timeshare = device_flags[0].split("::")[0]
-    if dev_timeshare not in sub.flag_references.keys():
-        dev_timeshare = 'default'
 
-    dev_timeshare = copy.deepcopy(sub.flag_references[dev_timeshare])
-
-    # second get time share of other device
-    other_dev_timeshare = device_flags[0].split("::")[0]
-    if other_dev_timeshare not in other_sub.flag_references.keys():
-        other_dev_timeshare = 'default'
-
-    other_dev_timeshare = copy.deepcopy(other_sub.flag_references[other_dev_timeshare])
+def inclusion_bits(device_flags):
+    # return the inclusion bits of a device's flags, as seen from the
+    # subsystem that has the device, and as seen from another subsystem
     included = 0x0
+    other_included = 0x0
     for f in device_flags:
         if 'include' in f:
             included |= 0x1
+            other_included |= 0x8
         if 'access' in f and 'include' not in f:
             included |= 0x2
-    for f in other_device_flags:
-        if 'include' in f:
-            included |= 0x8
-        if 'access' in f and 'include' not in f:
-            included |= 0x4
+            other_included |= 0x4
+
+    return included, other_included
+
+
+def is_timeshare(ref_flags):
+    return ref_flags[0] & 0x3 == 0x3
+
+
+def determine_inclusion(device_flags, other_device_flags, sub, other_sub):
+
+    # look for time share in the flags defined by each subsystem that correspond
+    # to the device. Note: the other subsystem's reference is also looked up
+    # by the current device's flags.
+    included = inclusion_bits(device_flags)[0] | inclusion_bits(other_device_flags)[1]
 
     # determine if timeshare present in one of the flags for a device-subsystem link
-    if dev_timeshare[0] & 0x3 == 0x3:
+    if is_timeshare(flag_reference(sub, device_flags)):
         included |= 16
-    if other_dev_timeshare[0] & 0x3 == 0x3:
+    if is_timeshare(flag_reference(other_sub, device_flags)):
         included |= 32
 
     return included
 
 
 def set_dev_pm_reqs(sub, device, usage):
-    new_dev_flags = device.flags[0].split("::")[0]
+    device.pm_reqs = list(flag_reference(sub, device.flags))
 
-    if new_dev_flags not in sub.flag_references.keys():
-        new_dev_flags = 'default'
+    device.pm_reqs[0] |= usage
 
-    new_dev_flags = copy.deepcopy(sub.flag_references[new_dev_flags])
 
-    device.pm_reqs = new_dev_flags
+class PmReqsIndex():
+    # Indexes the devices of a set of subsystems. The usage of a device is
+    # determined from per device counts over the subsystems that have it,
+    # instead of comparing it against every other subsystem.
+    def __init__(self, subsystems):
+        self.subsystems = subsystems
+
+        # device (xilpm) id -> subsystems with the device, in subsystem order
+        self.device_subsystems = {}
+        for sub in subsystems:
+            for node_id, device in sub.dev_dict.items():
+                self.device_subsystems.setdefault(node_id, []).append(sub)
+                device.inclusion = inclusion_bits(device.flags)
+
+        # (subsystem, flags name) -> the reference time shares
+        self.timeshared = {}
+        # (device id, flags name) -> counts over the subsystems with the device
+        self.counts = {}
+        # flags name -> number of subsystems whose reference does not time share
+        self.not_timeshared = {}
+
+    def timeshare(self, sub, flags_name):
+        try:
+            return self.timeshared[(sub, flags_name)]
+        except KeyError:
+            ts = is_timeshare(flag_reference(sub, [flags_name]))
+            self.timeshared[(sub, flags_name)] = ts
+            return ts
+
+    def not_timeshared_count(self, flags_name):
+        try:
+            return self.not_timeshared[flags_name]
+        except KeyError:
+            count = len([sub for sub in self.subsystems if not self.timeshare(sub, flags_name)])
+            self.not_timeshared[flags_name] = count
+            return count
+
+    def device_counts(self, node_id, flags_name):
+        # returns the number of subsystems with the device that: access it
+        # directly, do not time share it, and include it without time sharing
+        try:
+            return self.counts[(node_id, flags_name)]
+        except KeyError:
+            access = 0
+            not_timeshared = 0
+            including = 0
+            for sub in self.device_subsystems[node_id]:
+                other_included = sub.dev_dict[node_id].inclusion[1]
+                if other_included & 0x4:
+                    access += 1
+                if not self.timeshare(sub, flags_name):
+                    not_timeshared += 1
+                    if other_included & 0x8:
+                        including += 1
+            self.counts[(node_id, flags_name)] = (access, not_timeshared, including)
+            return self.counts[(node_id, flags_name)]
+
+    def warn(self, sub, device, usage):
+        # report the first subsystem that conflicts with sub over a device
+        flags_name = device.flags[0].split("::")[0]
+        for other_sub in self.device_subsystems[device.node_id]:
+            if sub == other_sub:
+                continue
 
-    device.pm_reqs[0] |= usage
+            other_device = other_sub.dev_dict[device.node_id]
+            included = device.inclusion[0] | other_device.inclusion[1]
+            if self.timeshare(sub, flags_name):
+                included |= 16
+            if self.timeshare(other_sub, flags_name):
+                included |= 32
+
+            # this means neither reference this via include so raise error
+            if included & 0x6 != 0x0:
+                print('WARNING: ', hex(device.node_id), 'found in multiple domains without includes ',
+                      sub.sub_node, other_sub.sub_node, included, usage, device.flags, other_device.flags)
+                return
+            if (included & 16 != 0) and (included & 32 == 0):
+                print('WARNING: ', hex(device.node_id), 'found in multiple domains with mismatch of timeshare',
+                      sub.sub_node, other_sub.sub_node, included, usage)
+                return
+
+    def usage(self, sub, device):
+        # returns the usage of a device in a subsystem, or None if the
+        # device's requirements can't be constructed
+        usage = 0x2 # non-shared
+        flags_name = device.flags[0].split("::")[0]
+        included, other_included = device.inclusion
+        timeshare = self.timeshare(sub, flags_name)
+        users = self.device_subsystems[device.node_id]
+
+        access, not_timeshared, including = self.device_counts(device.node_id, flags_name)
+        # drop this subsystem from the counts, they are for the others
+        if other_included & 0x4:
+            access -= 1
+        if not timeshare:
+            not_timeshared -= 1
+            if other_included & 0x8:
+                including -= 1
+
+        if len(users) > 1:
+            # a device in multiple domains must be included (not accessed)
+            # by them, and time shared by all of them, or none
+            if included & 0x2 or access > 0 or (timeshare and not_timeshared > 0):
+                self.warn(sub, device, usage)
+                return None
+
+            if not timeshare:
+                if included == 0x1 and not_timeshared > 0:
+                    usage = 0x1 # update to shared
+                elif included == 0x0 and including > 0:
+                    usage = 0x1 # update to shared
+
+        # if from resource group in only domain should still be shared. That
+        # is the case if a subsystem without the device does not time share
+        # its reference.
+        if included == 0x1 and not timeshare and len(users) < len(self.subsystems):
+            if self.not_timeshared_count(flags_name) - (not_timeshared + 1) > 0:
+                usage = 0x1
+
+        for f in device.flags:
+            if 'no-restrictions' in f:
+                usage = 0x0
+
+        return usage
 
 
 def construct_pm_reqs(subsystems):
@@ -526,40 +660,16 @@ def construct_pm_reqs(subsystems):
     #        else set as non shared
     #
     #    set rest of flags per relevant reference housed in subsystem
+    #
+    # the other domains that have a device are found through an index of
+    # device id to subsystems, so the cost is linear in the number of
+    # device references, not subsystems * subsystems * devices.
+    index = PmReqsIndex(subsystems)
     for sub in subsystems:
         for device in sub.dev_dict.values():
-            usage = 0x2 # non-shared
-            included = 0x0
-            for other_sub in subsystems:
-                if sub == other_sub:
-                    continue
-
-                if device.node_id in other_sub.dev_dict.keys():
-                    other_device = other_sub.dev_dict[device.node_id]
-                    included = determine_inclusion(device.flags, other_device.flags, sub, other_sub)
-
-                    # this means neither reference this via include so raise error
-                    if included & 0x6 != 0x0:
-                        print('WARNING: ', hex(device.node_id), 'found in multiple domains without includes ',
-                              sub.sub_node, other_sub.sub_node, included, usage, device.flags, other_device.flags)
-                        return
-                    if (included & 16 != 0) and (included & 32 == 0):
-                        print('WARNING: ', hex(device.node_id), 'found in multiple domains with mismatch of timeshare',
-                              sub.sub_node, other_sub.sub_node, included, usage)
-                        return
-
-                    if included == 0x1 or included == 0x8 or included == 0x9:
-                        usage = 0x1 # update to shared
-                else:
-                    # if from resource group in only domain should still be shared
-                    included = determine_inclusion(device.flags, [], sub, other_sub)
-                    if included == 0x1:
-                        usage = 0x1
-
-            for f in device.flags:
-                if 'no-restrictions' in f:
-                    usage = 0x0
-                
+            usage = index.usage(sub, device)
+            if usage is None:
+                return
 
             set_dev_pm_reqs(sub, device, usage)
 
@@ -586,11 +696,9 @@ def sub_operations_allowed(subsystems, output):
             other_sub_id = 0x1c000000 | other_sub_id
 
             cdo_str = "# " + host_sub_str + " can  enact only non-secure ops upon " + other_sub_str
-            cdo_cmd = "pm_add_requirement "+hex(host_sub_id) + " "
-            cdo_cmd += hex(other_sub_id) + " " + hex(0x7)
 
-            print(cdo_str, file=output)
-            print(cdo_cmd, file=output)
+            output.comment(cdo_str)
+            output.command("pm_add_requirement", host_sub_id, other_sub_id, 0x7)
 
 
 # TODO hard coded for now. need to add this to spec, YAML, etc
@@ -605,16 +713,12 @@ def sub_ggs_perms(sub, output):
 
     for i in range(0x18248000, 0x18248003+1):
         dev_str = "ggs_" + hex(i & 0x7).replace('0x','')
-        dev_id = hex(i)
 
         cdo_str = "# " +cdo_sub_str + " can perform non-secure read/write "
         cdo_str += dev_str
 
-        cdo_cmd = "pm_add_requirement "+hex(cdo_sub_id)+ " "
-        cdo_cmd += dev_id + " "
-        cdo_cmd += hex(0x3)
-        print( cdo_str, file=output)
-        print( cdo_cmd, file=output)
+        output.comment(cdo_str)
+        output.command("pm_add_requirement", cdo_sub_id, i, 0x3)
 
 
 # TODO hard coded for now. need to add this to spec, YAML, etc
@@ -629,16 +733,12 @@ def sub_pggs_perms(sub, output):
 
     for i in range(0x1824c004, 0x1824c007+1):
         dev_str = "pggs_" + hex((i & 0x7) - 0x4).replace('0x','')
-        dev_id = hex(i)
 
         cdo_str = "# " +cdo_sub_str + " can perform non-secure read/write "
         cdo_str += dev_str
 
-        cdo_cmd = "pm_add_requirement "+hex(cdo_sub_id)+ " "
-        cdo_cmd += dev_id + " "
-        cdo_cmd += hex(0x3)
-        print( cdo_str, file=output)
-        print( cdo_cmd, file=output)
+        output.comment(cdo_str)
+        output.command("pm_add_requirement", cdo_sub_id, i, 0x3)
 
 
 # TODO hard coded for now. need to add this to spec, YAML, etc
@@ -650,8 +750,8 @@ def sub_reset_perms(sub, output):
     cdo_sub_str = "subsystem_"+ str(sub_id)
     cdo_sub_id = 0x1c000000 | sub_id
 
-    print("#",cdo_sub_str, " can enact only non-secure system-reset (rst_pmc)", file=output)
-    print("pm_add_requirement "+hex(cdo_sub_id)+ " 0xc410002 0x1", file=output)
+    output.comment("#",cdo_sub_str, " can enact only non-secure system-reset (rst_pmc)")
+    output.command("pm_add_requirement", cdo_sub_id, 0xc410002, 0x1)
 
 
 def sub_perms(subsystems, output):
@@ -664,6 +764,162 @@ def sub_perms(subsystems, output):
         sub_reset_perms(sub, output)
 
 
+# Binary CDO
+#
+# A binary CDO is a header of five little endian 32 bit words:
+#
+#    - the number of header words that follow (4)
+#    - the identification word ("XNLX")
+#    - the CDO version
+#    - the length of the commands, in words
+#    - the checksum: the one's complement of the sum of the header words
+#
+# followed by the commands. Each command is a header word:
+#
+#    [31:24] reserved, [23:16] payload length, [15:8] module id, [7:0] api id
+#
+# and then the payload words. A payload that is too long for the length
+# field has a length of 0xff in the header, and the length in the next word.
+CDO_HEADER_WORDS = 5
+CDO_IDENTIFICATION = 0x584c4e58
+CDO_VERSION = 0x200
+CDO_LONG_LENGTH = 0xff
+
+CDO_MODULE_PM = 0x2
+
+# command name: (module id, api id)
+cdo_commands = {
+    "pm_add_subsystem": (CDO_MODULE_PM, 0x36),
+    "pm_add_requirement": (CDO_MODULE_PM, 0x3c),
+}
+cdo_command_names = { v: k for k, v in cdo_commands.items() }
+
+
+def cdo_checksum(words):
+    return ~sum(words) & 0xffffffff
+
+
+class CdoBinaryWriter():
+    """Streaming writer for binary CDO commands
+
+    The commands are packed into a word buffer that is written to the
+    output file every chunk_words words, so the size of the configuration
+    does not change the memory used. The header is written as a
+    placeholder and filled in by close(), once the length is known.
+
+    Args:
+       output (file): binary file to write, must be seekable
+       chunk_words (int,optional): number of words buffered between writes
+    """
+    def __init__(self, output, chunk_words = 4096):
+        self.output = output
+        self.chunk_words = chunk_words
+        self.length = 0
+        self.words = array.array('I')
+        self.output.write( bytes( CDO_HEADER_WORDS * 4 ) )
+
+    def command(self, name, args):
+        try:
+            module_id, api_id = cdo_commands[name]
+        except KeyError:
+            print( "[ERROR]: cdo: no binary encoding for command %s" % name )
+            sys.exit(1)
+
+        if len(args) < CDO_LONG_LENGTH:
+            self.words.append( len(args) << 16 | module_id << 8 | api_id )
+        else:
+            self.words.append( CDO_LONG_LENGTH << 16 | module_id << 8 | api_id )
+            self.words.append( len(args) )
+        self.words.extend( args )
+
+        if len(self.words) >= self.chunk_words:
+            self.flush()
+
+    def flush(self):
+        if sys.byteorder == "big":
+            self.words.byteswap()
+        self.words.tofile( self.output )
+        self.length += len(self.words)
+        self.words = array.array('I')
+
+    def close(self):
+        self.flush()
+        header = [ CDO_HEADER_WORDS - 1, CDO_IDENTIFICATION, CDO_VERSION, self.length ]
+        header.append( cdo_checksum( header ) )
+        self.output.seek( 0 )
+        self.output.write( struct.pack( "<%dI" % CDO_HEADER_WORDS, *header ) )
+        self.output.close()
+
+
+class CdoOutput():
+    """CDO output, written as text and optionally as binary
+
+    Args:
+       text (file): text file to write
+       binary (CdoBinaryWriter,optional): binary writer for the commands
+    """
+    def __init__(self, text, binary = None):
+        self.text = text
+        self.binary = binary
+
+    def comment(self, *strings):
+        print( *strings, file=self.text )
+
+    def command(self, name, *args):
+        print( " ".join( [name] + [hex(a) for a in args] ), file=self.text )
+        if self.binary:
+            self.binary.command( name, args )
+
+    def close(self):
+        self.text.close()
+        if self.binary:
+            self.binary.close()
+
+
+def cdo_decode(data):
+    """Decode a binary CDO
+
+    Args:
+       data (bytes): the binary CDO
+
+    Returns:
+       list of tuples: (command name, list of args) for each command.
+       Raises ValueError if the header or a command is not valid.
+    """
+    if len(data) < CDO_HEADER_WORDS * 4 or len(data) % 4:
+        raise ValueError( "truncated binary CDO (%s bytes)" % len(data) )
+
+    words = struct.unpack( "<%dI" % (len(data) // 4), data )
+    header = words[:CDO_HEADER_WORDS]
+    if header[1] != CDO_IDENTIFICATION:
+        raise ValueError( "not a binary CDO (identification %s)" % hex(header[1]) )
+    if header[4] != cdo_checksum( header[:4] ):
+        raise ValueError( "binary CDO header checksum mismatch" )
+    if header[3] != len(words) - CDO_HEADER_WORDS:
+        raise ValueError( "binary CDO length mismatch (%s vs %s words)" %
+                          (header[3], len(words) - CDO_HEADER_WORDS) )
+
+    commands = []
+    i = CDO_HEADER_WORDS
+    while i < len(words):
+        cmd = words[i]
+        length = (cmd >> 16) & 0xff
+        i += 1
+        if length == CDO_LONG_LENGTH:
+            length = words[i]
+            i += 1
+        if i + length > len(words):
+            raise ValueError( "binary CDO command %s is truncated" % hex(cmd) )
+        try:
+            name = cdo_command_names[((cmd >> 8) & 0xff, cmd & 0xff)]
+        except KeyError:
+            raise ValueError( "unknown binary CDO command %s" % hex(cmd) )
+        commands.append( (name, list(words[i:i + length])) )
+        i += length
+
+    return commands
+
+
 def cdo_write( root_node, sdt, options ):
     try:
         verbose = options['verbose']
@@ -680,6 +936,18 @@ def cdo_write( root_node, sdt, options ):
             print("[DBG++]: CDO plugin unable to find domains node")
         return True
 
+    # -b <file> / --binary=<file>: also write the commands as a binary CDO
+    try:
+        opts, args = getopt.getopt( options["args"], "b:", [ "binary=" ] )
+    except getopt.GetoptError as e:
+        print( "[ERROR]: cdo: %s" % e )
+        sys.exit(1)
+
+    binfile = None
+    for o, a in opts:
+        if o in ( "-b", "--binary" ):
+            binfile = a
+
     subsystems = valid_subsystems(domain_node, sdt, options)
 
     for sub in subsystems:
@@ -690,18 +958,31 @@ def cdo_write( root_node, sdt, options ):
     # generate xilpm reqs for each device
     construct_pm_reqs(subsystems)
 
-    if (len(options["args"]) > 0):
-        if re.match(options["args"][0], "regulator"):
-            outfile = options["args"][1]
+    if (len(args) > 0):
+        if re.match(args[0], "regulator"):
+            outfile = args[1]
             gen_board_topology( domain_node, sdt, output )
         else:
-            outfile = options["args"][0]
+            outfile = args[0]
     else:
         outfile = "subsystem.cdo"
 
-    output = open( outfile, "w")
-    print( "# Lopper CDO export", file=output )
-    print( "version 2.0", file=output )
+    binary = None
+    if binfile:
+        binary = CdoBinaryWriter( open( binfile, "wb" ) )
+
+    output = CdoOutput( open( outfile, "w"), binary )
+    try:
+        cdo_write_commands( subsystems, output )
+    finally:
+        output.close()
+
+    return True
+
+
+def cdo_write_commands( subsystems, output ):
+    output.comment( "# Lopper CDO export" )
+    output.comment( "version 2.0" )
     for sub in subsystems:
         # determine subsystem ID
         sub_id = sub.sub_node.propval("id")
@@ -710,8 +991,8 @@ def cdo_write( root_node, sdt, options ):
         cdo_sub_str = "subsystem_"+ hex(sub_id)
         cdo_sub_id = 0x1c000000 | sub_id
         # add subsystem
-        print( "# "+cdo_sub_str, file=output)
-        print( "pm_add_subsystem "+hex(cdo_sub_id), file=output )
+        output.comment( "# "+cdo_sub_str )
+        output.command( "pm_add_subsystem", cdo_sub_id )
 
     # add CDO commands for permissions
     sub_perms(subsystems, output)
@@ -731,15 +1012,6 @@ def cdo_write( root_node, sdt, options ):
 
             req_description = "# "+cdo_sub_str+' '+xilinx_versal_device_names[device.node_id]
 
-            # form CDO flags in string for python
-            req_str = 'pm_add_requirement ' + hex(cdo_sub_id) + ' ' + hex(device.node_id)
-            for req in device.pm_reqs:
-                req_str += ' ' + hex(req)
-
             # write CDO
-            print(req_description, file=output)
-            print(req_str, file=output)
-
-
-    return True
-
+            output.comment( req_description )
+            output.command( "pm_add_requirement", cdo_sub_id, device.node_id, *device.pm_reqs )
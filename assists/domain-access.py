@@ -21,9 +21,11 @@ from pathlib import PurePath
 from io import StringIO
 import contextlib
 import importlib
+import multiprocessing
 from lopper import Lopper
 from lopper import LopperFmt
 from lopper_tree import LopperAction
+from lopper_tree import LopperTreePrinter
 import lopper
 import lopper_lib
 from itertools import chain
@@ -31,6 +33,8 @@ from itertools import chain
 def is_compat( node, compat_string_to_test ):
     if re.search( "access-domain,domain-v1", compat_string_to_test):
         return core_domain_access
+    if re.search( "module,domain-access", compat_string_to_test):
+        return core_domains_extract
     return ""
 
 # tests for a bit that is set, going fro 31 -> 0 from MSB to LSB
@@ -40,28 +44,31 @@ def check_bit_set(n, k):
 
     return False
 
-# tgt_node: is the domain node number
-# sdt: is the system device tree
-def core_domain_access( tgt_node, sdt, options ):
-    try:
-        verbose = options['verbose']
-    except:
-        verbose = 0
-
-    # reset the treewide ref counting
-    sdt.tree.ref = 0
-    domain_node = sdt.tree[tgt_node]
-
-    if verbose:
-        print( "[INFO]: cb: core_domain_access( %s, %s, %s )" % (domain_node, sdt, verbose))
-
+"""
+This API works out which nodes of the tree a domain references: the nodes
+it has access to (directly, or through included resource groups) and its
+cpus. The tree is not modified, the returned plan is passed to
+lopper_lib.node_sweep() (or node_sweep_plans()) to prune the tree.
+
+Args:
+    tree: is the tree the domain is in
+    domain_node: is the domain node
+    verbose: is the verbosity level
+
+Returns:
+    tuple: the (marks, scopes, compatibles, nodes) sweep plan
+"""
+def domain_access_plan( tree, domain_node, verbose = 0 ):
+    # the nodes the domain references are marked, and the unmarked nodes are
+    # swept from the tree in a single pass (step 5)
+    marks = {}
     direct_node_refs = []
 
     # 1) direct access = <> nodes
-    a_nodes = lopper_lib.node_accesses( sdt.tree, domain_node )
+    a_nodes = lopper_lib.node_accesses( tree, domain_node )
     for anode in a_nodes:
-        # add a refcount to the node and it's parents
-        sdt.tree.ref_all( anode, True )
+        # mark the node, it's parents and subnodes
+        lopper_lib.node_mark( marks, anode, True )
         direct_node_refs.append( anode )
 
     # 2) are there resource group includes ?, they can have access = <> as well
@@ -71,14 +78,18 @@ def core_domain_access( tgt_node, sdt, options ):
         includes = None
 
     if includes:
-        include_nodes = lopper_lib.includes( sdt.tree, domain_node["include"] )
+        include_nodes = lopper_lib.includes( tree, domain_node["include"] )
 
         for i in include_nodes:
-            a_nodes = lopper_lib.node_accesses( sdt.tree, i )
+            a_nodes = lopper_lib.node_accesses( tree, i )
             for anode in a_nodes:
-                sdt.tree.ref_all( anode, True )
+                lopper_lib.node_mark( marks, anode, True )
                 direct_node_refs.append( anode )
 
+    # unreferenced simple-bus nodes are always dropped
+    sweep_compatibles = [ "simple-bus" ]
+    unrefd_cpus = []
+
     # 3) cpus access
     try:
         cpu_prop = domain_node['cpus']
@@ -88,41 +99,18 @@ def core_domain_access( tgt_node, sdt, options ):
         cpu_prop = None
 
     if cpu_prop:
-        refd_cpus, unrefd_cpus = lopper_lib.cpu_refs( sdt.tree, cpu_prop, verbose )
+        refd_cpus, unrefd_cpus = lopper_lib.cpu_refs( tree, cpu_prop, verbose, marks )
         if refd_cpus:
-            ref_nodes = sdt.tree.refd( "/cpus.*/cpu.*" )
-
             # now we do two types of refcount delete
-            #   - betweenthe cpu clusters
-            #   - on the cpus within a cluster
-
-            # The following filter code will check for nodes that are compatible to
-            # cpus,cluster and if they haven't been referenced, delete them.
-            xform_path = "/"
-            prop = "cpus,cluster"
-            code = """
-                     p = node.propval('compatible')
-                     if p and "{0}" in p:
-                         if node.ref <= 0:
-                             return True
-
-                     return False
-                   """.format( prop )
-
+            #   - between the cpu clusters: clusters (compatible with cpus,cluster)
+            #     that haven't been referenced are dropped
+            #   - on the cpus within a cluster: unreferenced subcpus are dropped
+            sweep_compatibles.append( "cpus,cluster" )
             if verbose:
-                print( "[INFO]: core_domain_access: filtering on:\n------%s\n-------\n" % code )
-
-            # the action will be taken if the code block returns 'true'
-            # Lopper.node_filter( sdt, xform_path, LopperAction.DELETE, code, verbose )
-            sdt.tree.filter( xform_path, LopperAction.DELETE, code, None, verbose )
-
-            for s in unrefd_cpus:
-                try:
-                    if verbose:
-                        print( "[INFO]: core_domain_access: deleting unrefernced subcpu: %s" % s.abs_path )
-                    sdt.tree.delete( s )
-                except Exception as e:
-                    print( "[WARNING]: %s" % e )
+                for s in unrefd_cpus:
+                    print( "[INFO]: core_domain_access: deleting unrefernced subcpu: %s" % s.abs_path )
+        else:
+            unrefd_cpus = []
 
     # 4) directly accessed nodes. Check their type. If they are busses,
     #    we have some sedoncary processing to do.
@@ -144,52 +132,18 @@ def core_domain_access( tgt_node, sdt, options ):
                 print( "[INFO]: core_domain_access: reserved memory processing for: %s" % anode.name )
             nodes_to_filter.append( anode.parent )
 
-    # 5) filter nodes that don't have refcounts
-    #
-    # filter #1:
-    #    - starting at /
-    #    - drop any unreferenced nodes that are of type simple-bus
-    prop = "simple-bus"
-    code = """
-           p = node.propval( 'compatible' )
-           if p and "{0}" in p:
-               r = node.ref
-               if r <= 0:
-                   return True
-               else:
-                   return False
-           else:
-               return False
-           """.format( prop )
-
-    if verbose:
-        print( "[INFO]: core_domain_access: filtering on:\n------%s\n-------\n" % code )
-
-    sdt.tree.filter( "/", LopperAction.DELETE, code, None, verbose )
-
-    # filter #2:
-    #    - starting at simple-bus nodes
-    #    - drop any unreferenced elements
-
-    # filter #3:
-    #    - starting at reserved memory parent
-    #    - drop any unreferenced elements
-
-    for n in nodes_to_filter:
-        code = """
-               p = node.ref
-               if p <= 0:
-                   return True
-               else:
-                   return False
-               """
-        if verbose:
-            print( "[INFO]: core_domain_access: filtering on:\n------%s\n-------\n" % code )
-
-        sdt.tree.filter( n + "/", LopperAction.DELETE, code, None, verbose )
+    return marks, nodes_to_filter, sweep_compatibles, unrefd_cpus
 
+"""
+This API updates the top level memory node of a (pruned) tree to match
+the memory property of a domain.
 
-    # 6) memory node processing
+Args:
+    tree: is the tree to update
+    domain_node: is the domain node
+    verbose: is the verbosity level
+"""
+def domain_memory( tree, domain_node, verbose = 0 ):
     try:
         memory_int = domain_node['memory'].int()
         memory_hex = domain_node['memory'].hex()
@@ -205,7 +159,7 @@ def core_domain_access( tgt_node, sdt, options ):
 
     # 1) find if there's a top level memory node
     try:
-        memory_node = sdt.tree["/memory@.*"]
+        memory_node = tree["/memory@.*"]
     except:
         memory_node = None
 
@@ -230,6 +184,38 @@ def core_domain_access( tgt_node, sdt, options ):
         except:
             pass
 
+# tgt_node: is the domain node number
+# sdt: is the system device tree
+def core_domain_access( tgt_node, sdt, options ):
+    try:
+        verbose = options['verbose']
+    except:
+        verbose = 0
+
+    # reset the treewide ref counting
+    sdt.tree.ref( 0 )
+    domain_node = sdt.tree[tgt_node]
+
+    if verbose:
+        print( "[INFO]: cb: core_domain_access( %s, %s, %s )" % (domain_node, sdt, verbose))
+
+    marks, nodes_to_filter, sweep_compatibles, unrefd_cpus = domain_access_plan( sdt.tree, domain_node, verbose )
+
+    # 5) sweep nodes that are not marked
+    #
+    #    - starting at /, drop any unreferenced nodes that are of type
+    #      simple-bus (and cpus,cluster, if the cpus were processed)
+    #    - starting at simple-bus nodes, drop any unreferenced elements
+    #    - starting at reserved memory parent, drop any unreferenced elements
+    #    - drop the unreferenced subcpus
+    if verbose:
+        print( "[INFO]: core_domain_access: sweeping unreferenced nodes (%s)" % ",".join( sweep_compatibles ) )
+
+    lopper_lib.node_sweep( sdt.tree, marks, nodes_to_filter, sweep_compatibles, unrefd_cpus, verbose )
+
+    # 6) memory node processing
+    domain_memory( sdt.tree, domain_node, verbose )
+
     # final) deal with unreferenced nodes
     refd_nodes = sdt.tree.refd()
     if verbose:
@@ -251,3 +237,151 @@ def core_domain_access( tgt_node, sdt, options ):
     #sys.exit(1)
 
     return True
+
+# Extracts every domain of a system device tree in a single run. The tree
+# is loaded (and the lops run) once, the access plans of all the domains
+# are computed against it and the tree is walked once to find the nodes
+# each domain drops. Each domain's tree is then written from the same
+# export of the full tree, copying only the nodes on the path to a dropped
+# node, so the full tree is never modified.
+#
+# The assist is run from the command line:
+#
+#   lopper -O <outdir> <sdt> -- domain-access [-j <jobs>] [domain ...]
+#
+# and writes <outdir>/<domain name>.dts for each domain. If no domains are
+# passed, every node in /domains with a cpus, access or include property is
+# extracted. When jobs is greater than one, the domains are written by
+# forked worker processes.
+
+"""
+This API finds the domain nodes to extract
+
+Args:
+    tree: is the system device tree
+    names: are domain names or paths, if empty all domains are returned
+"""
+def domain_nodes( tree, names ):
+    domains = []
+    if names:
+        for name in names:
+            try:
+                if name.startswith( "/" ):
+                    domains.append( tree[name] )
+                else:
+                    domains.append( tree["/domains/" + name] )
+            except:
+                print( "[ERROR]: domain-access: domain %s not found" % name )
+                sys.exit(1)
+    else:
+        try:
+            domains_node = tree["/domains"]
+        except:
+            domains_node = None
+
+        if domains_node:
+            for node in domains_node.child_nodes.values():
+                for p in [ "cpus", "access", "include" ]:
+                    if node.propval( p ) != ['']:
+                        domains.append( node )
+                        break
+
+    return domains
+
+"""
+This API writes the pruned tree of a single domain
+
+Args:
+    sdt: is the system device tree
+    dct: is the export of the full tree
+    domain_node: is the domain node
+    deleted: are the paths of the nodes the domain does not reference
+    outfile: is the output file
+"""
+def domain_write( sdt, dct, domain_node, deleted, outfile ):
+    if sdt.verbose:
+        print( "[INFO]: domain-access: writing %s (%s nodes dropped)" % (outfile,len(deleted)) )
+
+    printer = LopperTreePrinter( True, outfile, sdt.verbose )
+    printer.strict = not sdt.permissive
+    printer.load( lopper_lib.export_prune( dct, deleted ) )
+
+    domain_memory( printer, domain_node, sdt.verbose )
+
+    printer.exec()
+
+    return True
+
+# tgt_node: is the target node (unused, all domains are processed)
+# sdt: is the system device tree
+# options: [-j <jobs>] [domain ...]
+def core_domains_extract( tgt_node, sdt, options ):
+    try:
+        verbose = options['verbose']
+    except:
+        verbose = 0
+
+    try:
+        args = options['args']
+    except:
+        args = []
+
+    try:
+        opts, names = getopt.getopt( args, "j:", [ "jobs=" ] )
+    except getopt.GetoptError as e:
+        print( "[ERROR]: domain-access: %s" % e )
+        sys.exit(1)
+
+    jobs = 1
+    for o, a in opts:
+        if o in ( "-j", "--jobs" ):
+            try:
+                jobs = int( a )
+            except ValueError:
+                print( "[ERROR]: domain-access: invalid job count %s" % a )
+                sys.exit(1)
+
+    try:
+        outdir = options['outdir']
+    except:
+        outdir = "./"
+
+    domains = domain_nodes( sdt.tree, names )
+    if not domains:
+        print( "[WARNING]: domain-access: no domains found" )
+        return True
+
+    # 1) the access plans of all domains, against the unmodified tree
+    sdt.tree.ref( 0 )
+    plans = []
+    for domain_node in domains:
+        if verbose:
+            print( "[INFO]: domain-access: planning domain %s" % domain_node.abs_path )
+        plans.append( domain_access_plan( sdt.tree, domain_node, verbose ) )
+
+    # 2) one walk of the tree finds the nodes dropped by each domain
+    sdt.tree.sync( None, True )
+    deletes = lopper_lib.node_sweep_plans( sdt.tree, plans )
+
+    # 3) the pruned trees are written from a single export, the paths are
+    #    collected after the export, since it can adjust them
+    dct = sdt.tree.export()
+    work = []
+    for domain_node, deleted in zip( domains, deletes ):
+        outfile = os.path.join( outdir, domain_node.name + ".dts" )
+        work.append( (sdt, dct, domain_node, set( [ n.abs_path for n in deleted ] ), outfile) )
+
+    if jobs > 1 and len(work) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        results = lopper_lib.run_forked( domain_write, work, jobs )
+    else:
+        results = [ domain_write( *w ) for w in work ]
+
+    failed = [ d.name for d, ok in zip( domains, results ) if not ok ]
+    if failed:
+        print( "[WARNING]: domain-access: %s of %s domains failed: %s" %
+               (len(failed), len(domains), " ".join(failed)) )
+        if sdt.werror:
+            sys.exit(1)
+        return False
+
+    return True
@@ -22,6 +22,9 @@ from pathlib import PurePath
 from io import StringIO
 import contextlib
 import importlib
+import multiprocessing
+import multiprocessing.connection
+from collections import OrderedDict
 from lopper import Lopper
 from lopper import LopperFmt
 from lopper_tree import LopperAction
@@ -107,6 +110,315 @@ def property_set( property_name, property_val, node, fdt=None ):
     if fdt:
         node.sync( fdt )
 
+def node_mark( marks, node, subnodes = False, parents = True ):
+    """Mark a node as referenced
+
+    Marks are collected in a dictionary (by node id), and the nodes that
+    are not marked are deleted by node_sweep(). Marking a node and its
+    parents and subnodes is equivalent to tree.ref_all( node, True ).
+
+    Args:
+       marks (dict): the marked nodes
+       node (LopperNode): the node to mark
+       subnodes (boolean,optional): mark the subnodes of the node
+       parents (boolean,optional): mark the parent nodes of the node
+
+    Returns:
+       Nothing
+    """
+    marks[id(node)] = node
+
+    if parents:
+        p = node.parent
+        while p is not None:
+            marks[id(p)] = p
+            p = p.parent
+
+    if subnodes:
+        kids = list( node.child_nodes.values() )
+        while kids:
+            n = kids.pop()
+            marks[id(n)] = n
+            kids.extend( n.child_nodes.values() )
+
+def node_mark_refs( marks, node, property_mask = [] ):
+    """Mark a node and all the nodes it references
+
+    The phandles in the properties of the node are followed (and the
+    phandles in the properties of the nodes they reference, etc), and each
+    node that is found is marked along with its parents. This marks the
+    same nodes as node.resolve_all_refs(), with each node visited once.
+
+    Args:
+       marks (dict): the marked nodes
+       node (LopperNode): the node to start from
+       property_mask (list of regex,optional): properties to not follow
+
+    Returns:
+       Nothing
+    """
+    if type(property_mask) != list:
+        property_mask = [ property_mask ]
+
+    visited = set()
+    to_visit = [ node ]
+    while to_visit:
+        n = to_visit.pop()
+        if id(n) in visited:
+            continue
+        visited.add( id(n) )
+
+        node_mark( marks, n )
+
+        for p in n:
+            skip = False
+            for m in property_mask:
+                if re.search( m, p.name ):
+                    skip = True
+            if skip:
+                continue
+
+            for ph_node in p.resolve_phandles():
+                if ph_node.abs_path != n.abs_path:
+                    to_visit.append( ph_node )
+
+def node_sweep_plans( tree, plans ):
+    """Find the unmarked nodes of a tree, for one or more sweep plans
+
+    A plan is a (marks, scopes, compatibles, nodes) tuple, as passed to
+    node_sweep(). The tree is walked once for all of the plans, and the
+    nodes that each plan would delete are returned. The tree is not
+    modified.
+
+    Args:
+       tree (LopperTree): the tree to walk
+       plans (list of tuples): the (marks, scopes, compatibles, nodes) plans
+
+    Returns:
+       list: a list of deleted nodes (LopperNode) for each plan
+    """
+    checks = []
+    for marks, scopes, compatibles, nodes in plans:
+        checks.append( (marks,
+                        set( [ id(n) for n in scopes ] ),
+                        compatibles,
+                        set( [ id(n) for n in nodes ] )) )
+
+    deletes = [ [] for p in plans ]
+
+    # each entry in the walk has the plans that have not deleted the node
+    # (or one of its parents), and whether the node is in their scope
+    walk = [ (tree["/"], [ (i, False) for i in range(len(plans)) ]) ]
+    while walk:
+        node, active = walk.pop()
+        compat = None
+
+        keep = []
+        for i, in_scope in active:
+            marks, scope_ids, compatibles, delete_ids = checks[i]
+            in_scope = in_scope or id(node) in scope_ids
+
+            delete = id(node) in delete_ids
+            if not delete and id(node) not in marks:
+                if in_scope:
+                    delete = True
+                elif compatibles:
+                    if compat is None:
+                        compat = node.propval( 'compatible' )
+                    if compat:
+                        for c in compatibles:
+                            if c in compat:
+                                delete = True
+
+            if delete:
+                deletes[i].append( node )
+            else:
+                keep.append( (i, in_scope) )
+
+        if keep:
+            for child in reversed( list( node.child_nodes.values() ) ):
+                walk.append( (child, keep) )
+
+    return deletes
+
+def node_sweep( tree, marks, scopes = [], compatibles = [], nodes = [], verbose = 0 ):
+    """Delete the unmarked nodes of a tree
+
+    The tree is walked once, and an unmarked node is deleted (along with
+    its subnodes) if it is, or is below, one of the scope nodes, or if it
+    is compatible with one of the compatible strings. The passed nodes are
+    deleted whether they are marked or not.
+
+    The marked nodes that remain have their refcount set, so they are
+    returned by tree.refd().
+
+    Args:
+       tree (LopperTree): the tree to sweep
+       marks (dict): the marked nodes
+       scopes (list of LopperNode,optional): nodes to delete unmarked subnodes of
+       compatibles (list of strings,optional): delete unmarked nodes with these
+                                               compatible strings
+       nodes (list of LopperNode,optional): nodes to delete
+       verbose (int,optional): verbosity level
+
+    Returns:
+       list (LopperNode): the deleted nodes
+    """
+    # a tree that needs a sync will not delete nodes
+    tree.sync( None, True )
+
+    deletes = node_sweep_plans( tree, [ (marks, scopes, compatibles, nodes) ] )[0]
+
+    for n in deletes:
+        if verbose:
+            print( "[INFO]: deleting node %s" % n.abs_path )
+        tree.delete( n )
+
+    for n in marks.values():
+        n.ref = 1
+
+    return deletes
+
+def export_prune( dct, paths ):
+    """Copy a tree export, without the nodes at the passed paths
+
+    Only the node dictionaries that lead to a removed node are copied. The
+    rest of the export (unchanged nodes and all property values) is shared
+    with the source, so the source must not be modified while the copy is
+    in use.
+
+    Args:
+       dct (dict): a tree export (see LopperTree.export())
+       paths (set of strings): absolute paths of the nodes to remove
+
+    Returns:
+       dict: the pruned export, suitable for LopperTree.load()
+    """
+    if not paths:
+        return dct
+
+    copy = set()
+    for p in paths:
+        while p != "/" and p:
+            p = os.path.dirname( p )
+            copy.add( p )
+
+    def prune( d ):
+        new_dct = OrderedDict()
+        for k, v in d.items():
+            if k.startswith( '/' ):
+                if k in paths:
+                    continue
+                if k in copy:
+                    v = prune( v )
+            new_dct[k] = v
+        return new_dct
+
+    return prune( dct )
+
+def run_forked( target, work, jobs ):
+    """Run a function against a list of arguments, in forked workers
+
+    Up to jobs worker processes are run at once. Workers inherit the state
+    of the parent (i.e. a loaded tree) copy-on-write, so nothing is pickled
+    or reloaded, and any changes a worker makes are not seen by the parent.
+
+    Args:
+       target (function): the function to run, a true return is success
+       work (list of tuples): the arguments for each call of the function
+       jobs (int): the maximum number of concurrent workers
+
+    Returns:
+       list of booleans: the success of each call
+    """
+    ctx = multiprocessing.get_context( "fork" )
+    results = [False] * len(work)
+    pending = list( enumerate( work ) )
+    running = {}
+
+    while pending or running:
+        while pending and len(running) < jobs:
+            index, args = pending.pop(0)
+            sys.stdout.flush()
+            proc = ctx.Process( target=_run_forked_worker, args=(target, args) )
+            proc.start()
+            running[proc.sentinel] = (index, proc)
+
+        for sentinel in multiprocessing.connection.wait( list(running.keys()) ):
+            index, proc = running.pop( sentinel )
+            proc.join()
+            results[index] = proc.exitcode == 0
+
+    return results
+
+def _run_forked_worker( target, args ):
+    ret = target( *args )
+    sys.stdout.flush()
+    sys.exit( 0 if ret else 1 )
+
+class NodeStaging():
+    """A detached staging area for nodes that are being added to a tree
+
+    Adding a node to a tree (without dont_sync) syncs the entire tree, so
+    building a set of new nodes one tree.add() at a time costs a tree sync
+    per node. Instead, the nodes are added to a staging area, where they
+    are linked to their staged parent (forming detached subtrees), and the
+    staged subtrees are grafted into the tree with a single sync by
+    commit(). If commit() is not called, the tree is not modified.
+
+    Lookups by path (staging[path]) return a staged node if there is one,
+    and the node in the tree otherwise.
+    """
+    def __init__( self, tree ):
+        self.tree = tree
+        self.nodes = OrderedDict()
+
+    def __getitem__( self, path ):
+        try:
+            return self.nodes[path]
+        except KeyError:
+            return self.tree[path]
+
+    def add( self, node ):
+        """Stage a node
+
+        Args:
+           node (LopperNode): the node, with its absolute path set
+
+        Returns:
+           Nothing
+        """
+        if not node.name:
+            node.name = os.path.basename( node.abs_path )
+
+        try:
+            parent = self.nodes[os.path.dirname( node.abs_path )]
+            parent.add( node )
+        except KeyError:
+            pass
+
+        self.nodes[node.abs_path] = node
+
+    def commit( self ):
+        """Graft the staged nodes into the tree
+
+        Args:
+           None
+
+        Returns:
+           list (LopperNode): the root nodes of the grafted subtrees
+        """
+        roots = [ n for p, n in self.nodes.items() if not os.path.dirname( p ) in self.nodes ]
+        for n in roots:
+            self.tree.add( n, True )
+
+        if roots:
+            self.tree.sync()
+
+        self.nodes = OrderedDict()
+
+        return roots
+
 def node_ancestors_of_type( node, ctype ):
     ret_nodes = []
 
@@ -195,7 +507,7 @@ def is_compat( node, compat_string ):
     return x != []
 
 # process cpus, and update their references appropriately
-def cpu_refs( tree, cpu_prop, verbose = 0 ):
+def cpu_refs( tree, cpu_prop, verbose = 0, marks = None ):
     refd_cpus = []
 
     if not cpu_prop:
@@ -237,8 +549,11 @@ def cpu_refs( tree, cpu_prop, verbose = 0 ):
             if check_bit_set( cpu_mask, idx ):
                 try:
                     sub_cpu_node = sub_cpus[idx]
-                    # refcount it AND the parent
-                    tree.ref_all( sub_cpu_node, True )
+                    # refcount (or mark) it AND the parent
+                    if marks is None:
+                        tree.ref_all( sub_cpu_node, True )
+                    else:
+                        node_mark( marks, sub_cpu_node, True )
                     refd_cpus.append( sub_cpu_node )
                 except:
                     pass
@@ -30,20 +30,19 @@ from re import *
 
 sys.path.append(os.path.dirname(__file__))
 from openamp_xlnx_common import *
+import lopper_lib
 
 RPU_PATH = "/rpu@ff9a0000"
 
 def trim_ipis(sdt):
     unneeded_props = ["compatible", "xlnx,ipi-bitmask","interrupts", "xlnx,ipi-id", "xlnx,ipi-target-count",  "xlnx,cpu-name", "xlnx,buffer-base", "xlnx,buffer-index", "xlnx,int-id", "xlnx,bit-position"]
 
-    amba_sub_nodes = sdt.tree['/amba'].subnodes()
-    for node in amba_sub_nodes:
-      node_compat = node.propval("compatible")
-      if node_compat != [""]:
-       if 'xlnx,zynqmp-ipi-mailbox' in node_compat:
+    amba_node = sdt.tree['/amba']
+    # the compatible index finds the mailboxes, rather than a walk of /amba
+    for node in sdt.tree.cnodes('xlnx,zynqmp-ipi-mailbox'):
+      if node == amba_node or node.abs_path.startswith(amba_node.abs_path + "/"):
          for i in unneeded_props:
            node[i].value = ""
-         node.sync(sdt.FDT)
 
 def is_compat( node, compat_string_to_test ):
     if re.search( "openamp,xlnx-rpu", compat_string_to_test):
@@ -56,8 +55,6 @@ def update_mbox_cntr_intr_parent(sdt):
   # set mailbox controller interrupt-parent to this phandle
   mailbox_cntr_node = sdt.tree["/zynqmp_ipi1"]
   mailbox_cntr_node["interrupt-parent"].value = a72_gic_node.phandle
-  sdt.tree.sync()
-  sdt.tree.resolve()
 
 # 1 for master, 0 for slave
 # for each openamp channel, return mapping of role to resource group
@@ -119,7 +116,7 @@ def check_bit_set(n, k):
 #        otherwise return error
 #        if lockstep valid cpus-mask is 0x3 needed to denote both being used
 #  
-def construct_carveouts(sdt, rsc_group_node, core, openamp_app_inputs):
+def construct_carveouts(sdt, staging, rsc_group_node, core, openamp_app_inputs):
   # static var that persists beyond lifetime of first function call
   # this is needed as there may be more than 1 openamp channel
   # so multiple carveouts' phandles are required
@@ -155,7 +152,7 @@ def construct_carveouts(sdt, rsc_group_node, core, openamp_app_inputs):
     new_node + LopperProp(name="phandle",value=construct_carveouts.carveout_phandle)
     new_node.phandle = new_node
 
-    sdt.tree.add(new_node)
+    staging.add(new_node)
     print("added node: ",new_node)
 
     carveout_phandle_list.append(construct_carveouts.carveout_phandle)
@@ -163,12 +160,12 @@ def construct_carveouts(sdt, rsc_group_node, core, openamp_app_inputs):
 
   return carveout_phandle_list
 
-def construct_mem_region(sdt, domain_node, rsc_group_node, core, openamp_app_inputs):
+def construct_mem_region(sdt, staging, domain_node, rsc_group_node, core, openamp_app_inputs):
   # add reserved mem if not present
   res_mem_node = None
   carveout_phandle_list = None
   try:
-    res_mem_node = sdt.tree["/reserved-memory"]
+    res_mem_node = staging["/reserved-memory"]
     print("found pre-existing reserved mem node")
   except:
     res_mem_node = LopperNode(-1, "/reserved-memory")
@@ -176,10 +173,10 @@ def construct_mem_region(sdt, domain_node, rsc_group_node, core, openamp_app_inp
     res_mem_node + LopperProp(name="#size-cells",value=2)
     res_mem_node + LopperProp(name="ranges",value=[])
 
-    sdt.tree.add(res_mem_node)
+    staging.add(res_mem_node)
     print("added reserved mem node ", res_mem_node)
 
-  return construct_carveouts(sdt, rsc_group_node, core, openamp_app_inputs)
+  return construct_carveouts(sdt, staging, rsc_group_node, core, openamp_app_inputs)
 
 
 # set pnode id for current rpu node
@@ -202,7 +199,6 @@ def set_rpu_pnode(sdt, r5_node, rpu_config, core, platform, remote_domain):
      rpu_pnode = rpu_pnodes[core]
 
   r5_node + LopperProp(name="pnode-id", value = rpu_pnodes[core])
-  r5_node.sync(sdt.FDT)
 
   return
 
@@ -213,13 +209,11 @@ def setup_mbox_info(sdt, domain_node, r5_node, mbox_ctr):
   
   r5_node + LopperProp(name="mboxes",value=[mbox_ctr.phandle,0,mbox_ctr.phandle,1])
   r5_node + LopperProp(name="mbox-names", value = ["tx", "rx"]);
-  sdt.tree.sync()
-  r5_node.sync(sdt.FDT)
   return
   
 # based on rpu_cluster_config + cores determine which tcm nodes to use
 # add tcm nodes to device tree
-def setup_tcm_nodes(sdt, r5_node, platform, rsc_group_node):
+def setup_tcm_nodes(sdt, staging, r5_node, platform, rsc_group_node):
   tcm_nodes = {}
   if platform == SOC_TYPE.VERSAL:
     tcm_pnodes = {
@@ -248,25 +242,25 @@ def setup_tcm_nodes(sdt, r5_node, platform, rsc_group_node):
       tcm_node = LopperNode(-1, node_name)
       tcm_node + LopperProp(name="pnode-id",value=tcm_pnodes[key])
       tcm_node + LopperProp(name="reg",value=[0,tcm_to_hex[key],0,0x10000])
-      sdt.tree.add(tcm_node)
+      staging.add(tcm_node)
       bank +=1
       print('added ',tcm_node.abs_path)
 
   return 0
 
-def setup_r5_core_node(rpu_config, sdt, domain_node, rsc_group_node, core, remoteproc_node, platform, remote_domain, mbox_ctr, openamp_app_inputs):
+def setup_r5_core_node(rpu_config, sdt, staging, domain_node, rsc_group_node, core, remoteproc_node, platform, remote_domain, mbox_ctr, openamp_app_inputs):
   carveout_phandle_list = None
   r5_node = None
   # add r5 node if not present
   try:
-    r5_node = sdt.tree["/rpu@ff9a0000/r5_"+str(core)]
+    r5_node = staging["/rpu@ff9a0000/r5_"+str(core)]
     print("node already exists: ", r5_node)
   except:
     r5_node = LopperNode(-1, "/rpu@ff9a0000/r5_"+str(core))
     r5_node + LopperProp(name="#address-cells",value=2)
     r5_node + LopperProp(name="#size-cells",value=2)
     r5_node + LopperProp(name="ranges",value=[])
-    sdt.tree.add(r5_node)
+    staging.add(r5_node)
     print("added r5 node ", r5_node)
     print("add props for ",str(r5_node))
   # props
@@ -279,7 +273,7 @@ def setup_r5_core_node(rpu_config, sdt, domain_node, rsc_group_node, core, remot
     print("setup_mbox_info failed")
     return ret
 
-  carveout_phandle_list = construct_mem_region(sdt, domain_node, rsc_group_node, core, openamp_app_inputs)
+  carveout_phandle_list = construct_mem_region(sdt, staging, domain_node, rsc_group_node, core, openamp_app_inputs)
   if carveout_phandle_list == -1:
     print("construct_mem_region failed")
     return ret
@@ -295,7 +289,7 @@ def setup_r5_core_node(rpu_config, sdt, domain_node, rsc_group_node, core, remot
       return -1
 
   # tcm nodes do not exist. set them up
-  setup_tcm_nodes(sdt, r5_node, platform, rsc_group_node)
+  setup_tcm_nodes(sdt, staging, r5_node, platform, rsc_group_node)
            
 # add props to remoteproc node
 def set_remoteproc_node(remoteproc_node, sdt, rpu_config):
@@ -312,8 +306,9 @@ def set_remoteproc_node(remoteproc_node, sdt, rpu_config):
 
 core = []
 # this should only add nodes  to tree
+# staging: the new nodes are staged here, and grafted into the tree by the caller
 # openamp_app_inputs: dictionary to fill with openamp header info for openamp code base later on
-def construct_remoteproc_node(remote_domain, rsc_group_node, sdt, domain_node,  platform, mbox_ctr, openamp_app_inputs):
+def construct_remoteproc_node(remote_domain, rsc_group_node, sdt, staging, domain_node,  platform, mbox_ctr, openamp_app_inputs):
   rpu_cluster_node = remote_domain.parent
   rpu_config = None # split or lockstep
   cpus_prop_val = rpu_cluster_node.propval("cpus")
@@ -355,17 +350,14 @@ def construct_remoteproc_node(remote_domain, rsc_group_node, sdt, domain_node,
   # setup remoteproc node if not already present
   remoteproc_node = None
   try:
-    remoteproc_node = sdt.tree["/rpu@ff9a0000"]
+    remoteproc_node = staging["/rpu@ff9a0000"]
   except:
     print("remoteproc node not present. now add it to tree")
     remoteproc_node = LopperNode(-1, "/rpu@ff9a0000")
     set_remoteproc_node(remoteproc_node, sdt, rpu_config)
-    sdt.tree.add(remoteproc_node, dont_sync = True)
-    remoteproc_node.sync(sdt.FDT)
-    remoteproc_node.resolve_all_refs()
-    sdt.tree.sync()
+    staging.add(remoteproc_node)
 
-  return setup_r5_core_node(rpu_config, sdt, domain_node, rsc_group_node, core, remoteproc_node, platform, remote_domain, mbox_ctr, openamp_app_inputs)
+  return setup_r5_core_node(rpu_config, sdt, staging, domain_node, rsc_group_node, core, remoteproc_node, platform, remote_domain, mbox_ctr, openamp_app_inputs)
 
 def find_mbox_cntr(remote_domain, sdt, domain_node, rsc_group):
   # if there are multiple openamp channels
@@ -471,6 +463,11 @@ def parse_openamp_domain(sdt, options, tgt_node):
 
   }
 
+  # the remoteproc, r5, tcm and carveout nodes of all channels are built
+  # in a detached staging area, and grafted into the tree in one step when
+  # every channel has been processed
+  staging = lopper_lib.NodeStaging(sdt.tree)
+
   # if master, find corresponding  slave
   # if none report error
   channel_idx = 0
@@ -573,7 +570,7 @@ def parse_openamp_domain(sdt, options, tgt_node):
 
 
     # should only add nodes to tree
-    ret = construct_remoteproc_node(remote_domain, current_rsc_group, sdt, domain_node, platform, mbox_ctr, openamp_app_inputs)
+    ret = construct_remoteproc_node(remote_domain, current_rsc_group, sdt, staging, domain_node, platform, mbox_ctr, openamp_app_inputs)
     if ret == -1:
       print("construct_remoteproc_node failed")
       return ret
@@ -588,6 +585,8 @@ def parse_openamp_domain(sdt, options, tgt_node):
   # ensure that extra ipi mboxes do not have props that interfere with linux boot
   trim_ipis(sdt) 
 
+  staging.commit()
+
   print("ret true")
   return True
 
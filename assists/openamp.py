@@ -25,6 +25,7 @@ from lopper import Lopper
 from lopper import LopperFmt
 from lopper_tree import LopperAction
 import lopper
+import lopper_lib
 
 def is_compat( node, compat_string_to_test ):
     if re.search( "openamp,domain-v1", compat_string_to_test):
@@ -57,6 +58,7 @@ def openamp_process_cpus( sdt, domain_node, verbose = 0 ):
 
     cpu_prop_list = list( chunks(cpu_prop_values,3) )
     sub_cpus_all = []
+    marks = {}
 
     # loop through the nodes, we want to refcount the sub-cpu nodes
     # and their parents, we'll delete anything that isn't used later.
@@ -88,46 +90,31 @@ def openamp_process_cpus( sdt, domain_node, verbose = 0 ):
             if check_bit_set( cpu_mask, idx ):
                 try:
                     sub_cpu_node = sub_cpus[idx]
-                    # refcount it AND the parent
-                    sdt.tree.ref_all( sub_cpu_node, True )
+                    # mark it AND the parent
+                    lopper_lib.node_mark( marks, sub_cpu_node, True )
                 except:
                     pass
 
     # now we do two types of refcount delete
     #   - on the cpu clusters
     #   - on the cpus within a cluster
-    ref_nodes = sdt.tree.refd( "/cpus.*/cpu.*" )
+    ref_nodes = [ n for n in marks.values() if re.search( "/cpus.*/cpu.*", n.abs_path ) ]
     if verbose:
         print( "[INFO]: openamp: referenced cpus are: %s" % ref_nodes )
         for r in ref_nodes:
             print( "         %s" % r.abs_path )
 
-    # The following filter code will check for nodes that are compatible to
-    # cpus,cluster and if they haven't been referenced, delete them.
-    xform_path = "/"
-    prop = "cpus,cluster"
-    code = """
-             p = node.propval('compatible')
-             if p and "{0}" in p:
-                 if node.ref <= 0:
-                     return True
-
-             return False
-           """.format( prop )
+    # Nodes that are compatible to cpus,cluster and haven't been referenced
+    # are deleted, as are the unreferenced sub-cpus of the referenced clusters
+    unrefd_cpus = []
+    for s in sub_cpus_all:
+        if s not in ref_nodes:
+            unrefd_cpus.append( s )
 
     if verbose:
-        print( "[INFO]: filtering on:\n------%s\n-------\n" % code )
+        print( "[INFO]: sweeping unreferenced cpus and clusters" )
 
-    # the action will be taken if the code block returns 'true'
-    # Lopper.node_filter( sdt, xform_path, LopperAction.DELETE, code, verbose )
-    sdt.tree.filter( xform_path, LopperAction.DELETE, code, None, verbose )
-
-    for s in sub_cpus_all:
-        if s not in ref_nodes:
-            try:
-                sdt.tree.delete( s )
-            except Exception as e:
-                print( "[WARNING]: %s" % e )
+    lopper_lib.node_sweep( sdt.tree, marks, [], [ "cpus,cluster" ], unrefd_cpus, verbose )
 
 # all the logic for applying a openamp domain to a device tree.
 # this is a really long routine that will be broken up as more examples
@@ -151,16 +138,12 @@ def process_domain( tgt_node, sdt, options ):
     # for a second patch to drop any nodes that are not accessed, and hence should
     # be removed
     node_access_tracker = {}
-    # we want to track child nodes of "/", if they are of type simple-bus AND they are
-    # referenced by a <access> value in the domain
-    node_access_tracker['/'] = [ "/", "simple-bus" ]
 
     sdt.tree.ref( 0 )
 
     # do not consider address-map phandles as references
-    all_refs = domain_node.resolve_all_refs( [ ".*address-map.*" ] )
-    for n in all_refs:
-        n.ref = 1
+    marks = {}
+    lopper_lib.node_mark_refs( marks, domain_node, [ ".*address-map.*" ] )
 
     # "access" is a list of tuples: phandles + flags
     access_list = []
@@ -192,8 +175,8 @@ def process_domain( tgt_node, sdt, options ):
             if re.search( "simple-bus", node_type ):
                 if verbose > 1:
                     print( "[INFO]: access is a simple-bus (%s), leaving all nodes" % node_name)
-                # refcount the bus (this node)
-                anode.ref = 1
+                # mark the bus (this node)
+                lopper_lib.node_mark( marks, anode, parents = False )
             else:
                 # The node is *not* a simple bus, so we must do more processing
                 # a) If the node parent is something other than zero, the node is nested, so
@@ -214,76 +197,35 @@ def process_domain( tgt_node, sdt, options ):
                             continue
 
                     # if the parent is a simple bus, then something within the bus had an
-                    # <access>. We need to refcount and delete anything that isn't accessed.
+                    # <access>. We need to mark and delete anything that isn't accessed.
                     if re.search( "simple-bus", parent_node_type ):
-                        # refcount the bus
                         if not node_parent.abs_path in node_access_tracker:
-                            node_access_tracker[node_parent.abs_path] = [ node_parent.abs_path, "*" ]
+                            node_access_tracker[node_parent.abs_path] = node_parent
 
                         if verbose > 1:
                             print( "[INFO]: node's (%s)  parent is a simple-bus (%s), dropping sibling nodes" % (anode.abs_path, parent_node_name))
 
-                        sdt.tree.ref_all( anode, True )
+                        lopper_lib.node_mark( marks, anode, True )
                     elif re.search( "reserved-memory", parent_node_type ):
                         if verbose > 1:
                             print( "[INFO]: reserved memory processing for: %s" % node_name)
 
                         if not node_parent.abs_path in node_access_tracker:
-                            node_access_tracker[node_parent.abs_path] = [ node_parent.abs_path, "*" ]
-
-                        # Increment a reference to the current node, since we've added the parent node
-                        # to a list of nodes that we'll use to check for referenced children later. Anything
-                        # with no reference, will be removed.
-                        anode.ref = 1
-
-        # filter #1:
-        #    - starting at /
-        #    - drop any unreferenced nodes that are of type simple-bus
-
-        # filter #2:
-        #    - starting at simple-bus nodes
-        #    - drop any unreferenced elements
-
-        # filter #3:
-        #    - starting at reserved memory parent
-        #    - drop any unreferenced elements
-
-        for n, value in node_access_tracker.values():
-            # xform_path is the path to the node that was tracked, so this is a potential
-            # delete to any children of that node, that haven't been accessed. If you
-            # started from / .. you could delete a lot of nodes by mistake, so be careful!
-
-            xform_path = n
-            if value == "*":
-                code = """
-                       p = node.ref
-                       if p <= 0:
-                           return True
-                       else:
-                           return False
-                       """
-            else:
-                prop = value
-                code = """
-                       p = node.propval( 'compatible' )
-                       if p and "{0}" in p:
-                           r = node.ref
-                           if r <= 0:
-                               return True
-                           else:
-                               return False
-                       else:
-                           return False
-                       """.format( prop )
-
-            if verbose:
-                print( "[INFO]: filtering on:\n------%s\n-------\n" % code )
-
-            # the action will be taken if the code block returns 'true'
-            if n == "/":
-                sdt.tree.filter( "/", LopperAction.DELETE, code, None, verbose )
-            else:
-                sdt.tree.filter( n + "/", LopperAction.DELETE, code, None, verbose )
+                            node_access_tracker[node_parent.abs_path] = node_parent
+
+                        # Mark the current node, since we've added the parent node to a list
+                        # of nodes that we'll use to check for marked children later. Anything
+                        # that isn't marked, will be removed.
+                        lopper_lib.node_mark( marks, anode, parents = False )
+
+        # sweep:
+        #    - starting at /, drop any unreferenced nodes that are of type simple-bus
+        #    - starting at simple-bus nodes, drop any unreferenced elements
+        #    - starting at reserved memory parent, drop any unreferenced elements
+        if verbose:
+            print( "[INFO]: sweeping unreferenced nodes" )
+
+        lopper_lib.node_sweep( sdt.tree, marks, list( node_access_tracker.values() ), [ "simple-bus" ], [], verbose )
 
     # we must sync the tree, since its numbering may have changed due to the
     # node_filter deleting things
@@ -64,13 +64,68 @@ def property_set( property_name, property_val, node, fdt=None ):
     if fdt:
         node.sync()
 
+class LabelTable():
+    """Label to node resolution for a subsystem expansion
+
+    Each label referenced by the subsystem specification is looked up
+    once, and phandles for the referenced nodes are allocated from a
+    running counter, rather than searching the tree's labels and phandles
+    for every reference.
+
+    A label is first looked up exactly, and only if there is no node with
+    that exact label is it used as a regex against the tree's labels.
+
+    Args:
+       tree (LopperTree): tree to resolve labels against
+       verbose (int,optional): verbosity level
+    """
+    def __init__(self, tree, verbose = 0):
+        self.tree = tree
+        self.verbose = verbose
+        self.nodes = {}
+        self.next_phandle = 0
+
+    def node(self, label):
+        try:
+            return self.nodes[label]
+        except KeyError:
+            pass
+        except TypeError:
+            return None
+
+        nodes = self.tree.lnodes( label, exact=True )
+        if not nodes:
+            nodes = self.tree.lnodes( label )
+
+        if nodes:
+            node = nodes[0]
+        else:
+            node = None
+
+        self.nodes[label] = node
+
+        return node
+
+    def phandle(self, node):
+        # as phandle_or_create(), a node without a phandle can also be -1
+        # (i.e. loaded without libfdt)
+        if node.phandle <= 0:
+            if not self.next_phandle:
+                self.next_phandle = self.tree.phandle_gen()
+            node.phandle = self.next_phandle
+            self.next_phandle += 1
+            if self.verbose:
+                print( "[DBG]: generated phandle %s for node: %s" % (node.phandle,node.abs_path ))
+
+        return node.phandle
+
 def val_as_bool( val ):
     if val == "False":
         return False
     elif val == "True":
         return True
 
-def firewall_expand( tree, subnode, verbose = 0 ):
+def firewall_expand( tree, subnode, verbose = 0, labels = None ):
     try:
         firewall_domain = subnode["domain"][0]
     except:
@@ -113,21 +168,20 @@ def firewall_expand( tree, subnode, verbose = 0 ):
         if verbose:
             print( "[DBG]: firewall: block and domain, generating firewallconf" )
 
-        try:
-            tgt_node = tree.lnodes( firewall_domain )[0]
-        except:
+        if not labels:
+            labels = LabelTable( tree, verbose )
+
+        tgt_node = labels.node( firewall_domain )
+        if not tgt_node:
             if verbose:
                 print( "[DBG]: WARNING: could not find node %s" % firewall_domain )
-            tgt_node = None
 
         firewall_priority = 0
 
         tgt_node_phandle = 0xdeadbeef
         if tgt_node:
-            if tgt_node.phandle == 0:
-                tgt_node_phandle = tgt_node.phandle_or_create()
-                if verbose:
-                    print( "[DBG]: generated phandle %s for node: %s" % (tgt_node.phandle,tgt_node.abs_path ))
+            if tgt_node.phandle <= 0:
+                tgt_node_phandle = labels.phandle( tgt_node )
 
         if firewall_block:
             if type(firewall_block) == int:
@@ -152,7 +206,7 @@ def firewall_expand( tree, subnode, verbose = 0 ):
 
 
 
-def access_expand( tree, subnode, verbose = 0 ):
+def access_expand( tree, subnode, verbose = 0, labels = None ):
     ## access processing
     # /*
     # * Access specifies which resources this domain
@@ -198,6 +252,9 @@ def access_expand( tree, subnode, verbose = 0 ):
     access_field_count = 1
     flag_list = []
 
+    if not labels:
+        labels = LabelTable( tree, verbose )
+
     for a in access_chunks:
         dev = a['dev']
         try:
@@ -207,21 +264,12 @@ def access_expand( tree, subnode, verbose = 0 ):
 
         dev_handle =  0xdeadbeef
         if dev:
-            try:
-                dev_node = tree.lnodes( dev )[0]
-            except:
-                if verbose:
-                    print( "[DBG]: WARNING: could not find node %s" % dev )
-                dev_node = None
-
+            dev_node = labels.node( dev )
             if dev_node:
-                if dev_node.phandle == 0:
-                    dev_node.phandle_or_create()
-                    if verbose:
-                        print( "[DBG]: generated phandle %s for node: %s" % (dev_node.phandle,dev_node.abs_path ))
-
-                dev_handle = dev_node.phandle
+                dev_handle = labels.phandle( dev_node )
             else:
+                if verbose:
+                    print( "[DBG]: WARNING: could not find node %s" % dev )
                 dev_handle = 0xdeadbeef
 
         flags_value = 0
@@ -300,12 +348,15 @@ def memory_expand( tree, subnode, memory_start = 0xbeef, prop_name = 'memory', v
     property_set( prop_name, mem_list, subnode )
 
 
-def cpu_expand( tree, subnode, verbose = 0):
+def cpu_expand( tree, subnode, verbose = 0, labels = None ):
     ## cpu processing
     cpus = subnode.props( "cpus" )
     if not cpus:
         return
 
+    if not labels:
+        labels = LabelTable( tree, verbose )
+
     cpus_chunks = [cpus[0][0]]
     cpus_list = []
     for c in cpus_chunks:
@@ -321,21 +372,15 @@ def cpu_expand( tree, subnode, verbose = 0):
         else:
             cluster = c
 
-        try:
-            cluster_node = tree.lnodes( cluster )[0]
-        except:
+        cluster_node = labels.node( cluster )
+        if not cluster_node:
             try:
                 cluster_node = tree.nodes( cluster )[0]
             except:
                 cluster_node = None
 
         if cluster_node:
-            if cluster_node.phandle == 0:
-                ph = cluster_node.phandle_or_create()
-                if verbose:
-                    print( "[DBG]: subsystem assist: generated phandle %s for node: %s" % (cluster_node.phandle,cluster_node.abs_path ))
-
-            cluster_handle = cluster_node.phandle
+            cluster_handle = labels.phandle( cluster_node )
         else:
             cluster_handle = 0xdeadbeef
 
@@ -500,7 +545,11 @@ def subsystem_expand( tgt_node, sdt, verbose = 0 ):
     # add the cells properties
     property_set( "#address-cells", 2, domain_node )
     property_set( "#size-cells", 2, domain_node )
-    domain_node.sync()
+
+    # labels referenced by the subsystems are resolved once, for all
+    # of the domains
+    labels = LabelTable( tree, verbose )
+    expanded = [ domain_node ]
 
     #domains = sdt.tree.nodes( "/domains/[^/]*$" )
     domain_count = 0
@@ -523,16 +572,20 @@ def subsystem_expand( tgt_node, sdt, verbose = 0 ):
             property_set( "xilinx,subsystem", 1, subnode )
 
             ## cpu processing
-            cpu_expand( tree, subnode, verbose )
+            cpu_expand( tree, subnode, verbose, labels )
 
             ## memory processing
             memory_expand( tree, subnode, verbose )
 
             ## access processing
-            access_expand( tree, subnode, verbose )
+            access_expand( tree, subnode, verbose, labels )
 
-            subnode.sync()
+            expanded.append( subnode )
 
         domain_count += 1
 
+    # the properties are all written, sync the changed nodes once
+    for node in expanded:
+        node.sync()
+
     return True
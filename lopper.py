@@ -18,6 +18,10 @@ import getopt
 import re
 import subprocess
 import shutil
+import time
+import pickle
+import select
+import signal
 from pathlib import Path
 from pathlib import PurePath
 from io import StringIO
@@ -39,6 +43,7 @@ import lopper
 
 from lopper_tree import LopperNode, LopperTree, LopperTreePrinter, LopperProp
 import lopper_tree
+import lopper_trace
 
 try:
     from lopper_yaml import *
@@ -74,6 +79,48 @@ def lopper_type(cls):
 # default to FDT front/backend
 lopper_type(lopper_fdt.LopperFDT)
 
+def cache_dir( name, env = None ):
+    """Return the directory of a lopper cache
+
+    Args:
+       name (string): the cache, i.e. "metadata"
+       env (string,optional): an environment variable that overrides the
+                              directory. An empty value disables the cache
+
+    Returns:
+       string: the directory (lopper/<name> in $XDG_CACHE_HOME or ~/.cache),
+               "" if the cache is disabled
+    """
+    if env:
+        try:
+            return os.environ[env]
+        except KeyError:
+            pass
+
+    cache_home = os.environ.get( 'XDG_CACHE_HOME' ) or os.path.expanduser( '~/.cache' )
+    return os.path.join( cache_home, 'lopper', name )
+
+def cache_ok( path ):
+    """Check that a cache directory (or file) can be trusted
+
+    It must be owned by the user, and not writable by anyone else. A path
+    that doesn't exist yet is ok (create it that way).
+
+    Args:
+       path (string): the cache directory or file
+
+    Returns:
+       boolean: True if the cache can be used
+    """
+    try:
+        st = os.stat( path )
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
 class LopperAssist:
     """Internal class to contain the details of a lopper assist
 
@@ -123,6 +170,12 @@ class LopperSDT:
         self.load_paths = []
         self.permissive = False
         self.merge = False
+        self.include_paths = ""
+        # assist timeouts (seconds) by module name, "" is the default
+        self.assist_timeouts = {}
+        self.assist_profile = False
+        # (calls, seconds) by assist
+        self.assist_times = {}
 
     def setup(self, sdt_file, input_files, include_paths, force=False, libfdt=True):
         """executes setup and initialization tasks for a system device tree
@@ -160,44 +213,7 @@ class LopperSDT:
 
         self.use_libfdt = libfdt
 
-        current_dir = os.getcwd()
-
-        lop_files = []
-        sdt_files = []
-        for ifile in input_files:
-            if re.search( ".dts$", ifile ):
-                # an input file is either a lopper operation file, or part of the
-                # system device tree. We can check for compatibility to decide which
-                # it is.
-                with open(ifile) as f:
-                    datafile = f.readlines()
-                    found = False
-                    for line in datafile:
-                        if not found:
-                            if re.search( "system-device-tree-v1,lop", line ):
-                                lop_files.append( ifile )
-                                found = True
-
-                if not found:
-                    sdt_files.append( ifile )
-            elif re.search( ".dtb$", ifile ):
-                lop_files.append( ifile )
-            elif re.search( ".yaml$", ifile ):
-                if yaml_support:
-                    with open(ifile) as f:
-                        datafile = f.readlines()
-                        found = False
-                        for line in datafile:
-                            if not found:
-                                if re.search( "system-device-tree-v1,lop", line ):
-                                    lop_files.append( ifile )
-                                    found = True
-
-                    if not found:
-                        sdt_files.append( ifile )
-                else:
-                    print( "[ERROR]. YAML support is not loaded, check dependencies" )
-                    sys.exit(1)
+        lop_files, sdt_files = self.input_files_split( input_files )
 
         # is the sdt a dts ?
         sdt_extended_trees = []
@@ -241,8 +257,9 @@ class LopperSDT:
             # we need the original location of the main SDT file on the search path
             # in case there are dtsi files, etc.
             include_paths += " " + str(sdt_file.parent) + " "
-            self.dtb = Lopper.dt_compile( fp, input_files, include_paths, force, self.outdir,
-                                          self.save_temps, self.verbose, self.enhanced )
+            with lopper_trace.phase( "compile", "setup" ):
+                self.dtb = Lopper.dt_compile( fp, input_files, include_paths, force, self.outdir,
+                                              self.save_temps, self.verbose, self.enhanced )
 
             if self.use_libfdt:
                 self.FDT = Lopper.dt_to_fdt(self.dtb, 'rb')
@@ -254,11 +271,15 @@ class LopperSDT:
                 self.FDT = self.dtb
                 self.dtb = ""
 
-            dct = Lopper.export( self.FDT )
-
             self.tree = LopperTree()
             self.tree.strict = not self.permissive
-            self.tree.load( dct )
+            # the export is passed directly, so it can be released as soon
+            # as the tree is loaded
+            with lopper_trace.phase( "export", "setup" ):
+                dct = Lopper.export( self.FDT )
+            with lopper_trace.phase( "load", "setup" ):
+                self.tree.load( dct )
+            dct = None
 
             # join any extended trees to the one we just created
             for t in sdt_extended_trees:
@@ -300,7 +321,10 @@ class LopperSDT:
             # or .. is this really input type necessary ?!
 
             self.dtb = None
-            self.FDT = Lopper.fdt()
+            if self.use_libfdt:
+                self.FDT = Lopper.fdt()
+            else:
+                self.FDT = None
             self.tree = lt
         else:
             # the system device tree is a dtb
@@ -322,6 +346,81 @@ class LopperSDT:
             print( "   output: %s" % self.output_file )
             print( "" )
 
+        # saved, so that lops can be loaded against the tree later
+        self.include_paths = include_paths
+
+        self.lops_load( lop_files, force )
+
+    def input_files_split( self, input_files ):
+        """split input files into lopper operation and system device tree files
+
+        An input file is either a lopper operation file, or part of the system
+        device tree. The compatible string of lop files is used to tell them
+        apart (a .dtb input is always a lop file).
+
+        Args:
+           input_files (list): list of input files (.dts, .dtb or .yaml)
+
+        Returns:
+           tuple: (list of lop files, list of system device tree files)
+
+        """
+        lop_files = []
+        sdt_files = []
+        for ifile in input_files:
+            if re.search( ".dts$", ifile ):
+                # an input file is either a lopper operation file, or part of the
+                # system device tree. We can check for compatibility to decide which
+                # it is.
+                with open(ifile) as f:
+                    datafile = f.readlines()
+                    found = False
+                    for line in datafile:
+                        if not found:
+                            if re.search( "system-device-tree-v1,lop", line ):
+                                lop_files.append( ifile )
+                                found = True
+
+                if not found:
+                    sdt_files.append( ifile )
+            elif re.search( ".dtb$", ifile ):
+                lop_files.append( ifile )
+            elif re.search( ".yaml$", ifile ):
+                if yaml_support:
+                    with open(ifile) as f:
+                        datafile = f.readlines()
+                        found = False
+                        for line in datafile:
+                            if not found:
+                                if re.search( "system-device-tree-v1,lop", line ):
+                                    lop_files.append( ifile )
+                                    found = True
+
+                    if not found:
+                        sdt_files.append( ifile )
+                else:
+                    print( "[ERROR]. YAML support is not loaded, check dependencies" )
+                    sys.exit(1)
+
+        return lop_files, sdt_files
+
+    def lops_load( self, lop_files, force = False ):
+        """load lopper operation files
+
+        The lop files are compiled (if required) and added to the lops of the
+        system device tree.
+
+        Args:
+           lop_files (list): list of lop files (.dts, .dtb or .yaml)
+           force (bool,optional): flag indicating if files should be overwritten and compilation
+                                  forced. Default is False.
+
+        Returns:
+           Nothing
+
+        """
+        include_paths = self.include_paths
+
         # Individually compile the input files. At some point these may be
         # concatenated with the main SDT if dtc is doing some of the work, but for
         # now, libfdt is doing the transforms so we compile them separately
@@ -331,8 +430,9 @@ class LopperSDT:
                 # TODO: this may need an output directory option, right now it drops
                 #       it where lopper is called from (which may not be writeable.
                 #       hence why our output_dir is set to "./"
-                compiled_file = Lopper.dt_compile( lop.dts, "", include_paths, force, self.outdir,
-                                                   self.save_temps, self.verbose )
+                with lopper_trace.phase( ifile, "lop-load" ):
+                    compiled_file = Lopper.dt_compile( lop.dts, "", include_paths, force, self.outdir,
+                                                       self.save_temps, self.verbose )
                 if not compiled_file:
                     print( "[ERROR]: could not compile file %s" % ifile )
                     sys.exit(1)
@@ -342,9 +442,8 @@ class LopperSDT:
                 else:
                     lop.dtb = ""
                     lop.fdt = None
-                    dct = Lopper.export( compiled_file )
                     lop.tree = LopperTree()
-                    lop.tree.load( dct )
+                    lop.tree.load( Lopper.export( compiled_file ) )
 
                 self.lops.append( lop )
             elif re.search( ".yaml$", ifile ):
@@ -444,6 +543,7 @@ class LopperSDT:
         #       not cleaning up the concatenated compiled. pp file, since
         #       it is created with mktmp()
 
+    @lopper_trace.traced( "write", "output" )
     def write( self, tree = None, output_filename = None, overwrite = True, enhanced = False ):
         """Write a system device tree to a file
 
@@ -502,7 +602,7 @@ class LopperSDT:
                 print( "[ERROR]: output file %s exists and force overwrite is not enabled" % output_filename )
                 sys.exit(1)
 
-            yaml = LopperYAML( None, self.tree )
+            yaml = LopperYAML( None, tree_to_write )
             yaml.to_yaml( output_filename )
         else:
             # we use the outfile extension as a mask
@@ -514,7 +614,8 @@ class LopperSDT:
                         out_tree = LopperTreePrinter( True, output_filename, self.verbose )
                         out_tree.load( tree_to_write.export() )
                         out_tree.strict = not self.permissive
-                        if not cb_func( 0, out_tree, { 'outfile': output_filename, 'verbose' : self.verbose } ):
+                        ret = self.assist_call( cb_func, 0, out_tree, { 'outfile': output_filename, 'verbose' : self.verbose } )
+                        if not ret:
                             print( "[WARNING]: output assist returned false, check for errors ..." )
                     except Exception as e:
                         print( "[WARNING]: output assist %s failed: %s" % (cb_func,e) )
@@ -773,6 +874,183 @@ class LopperSDT:
 
         return cb_func
 
+    def assist_timeout( self, module_name ):
+        """Return the timeout of an assist
+
+        Args:
+           module_name (string): the module of the assist (without .py)
+
+        Returns:
+           float: the timeout in seconds, or 0 if the assist has no timeout
+        """
+        try:
+            return self.assist_timeouts[module_name]
+        except KeyError:
+            return self.assist_timeouts.get( "", 0 )
+
+    def assist_call( self, cb_func, cb_node, cb_sdt, options ):
+        """Call an assist
+
+        The call is timed, traced and counted against the assist in the tree
+        metrics. If assist profiling is enabled, a cProfile of the call is
+        written to the output directory (as <module>.<function>-<n>.prof).
+
+        If the assist has a timeout (see assist_timeout()), it is run in a
+        forked worker, which is killed if it doesn't complete in time. The
+        tree, as modified by the worker, replaces the tree of the system
+        device tree (other changes the assist makes to the system device tree
+        are lost). Nodes of the old tree are no longer part of it, the
+        selected nodes are carried over to the new tree by path. The metrics
+        and trace events recorded by the worker are added to this process'.
+
+        Args:
+           cb_func (function): the assist function
+           cb_node (LopperNode or int): the node argument of the assist
+           cb_sdt (LopperSDT or LopperTree): the tree argument of the assist
+           options (dict): the options of the assist
+
+        Returns:
+           The return value of the assist
+
+        Raises:
+           TimeoutError: if the assist timed out
+        """
+        # assists loaded from a file have the file name as their module name
+        module_name = re.sub( r"\.py$", "", cb_func.__module__ )
+        name = "%s.%s" % (module_name, cb_func.__name__)
+        timeout = self.assist_timeout( module_name )
+        try:
+            count, seconds = self.assist_times[name]
+        except KeyError:
+            count, seconds = 0, 0.0
+
+        start = time.perf_counter()
+        try:
+            with lopper_trace.phase( name, "assist", { "timeout": timeout } if timeout else None ):
+                with lopper_tree.metrics.scope( "assist:%s" % module_name ):
+                    if timeout:
+                        return self._assist_worker( cb_func, cb_node, cb_sdt, options, name, count, timeout )
+
+                    return self._assist_profiled( cb_func, cb_node, cb_sdt, options, name, count )
+        finally:
+            elapsed = time.perf_counter() - start
+            self.assist_times[name] = ( count + 1, seconds + elapsed )
+            if self.verbose:
+                print( "[INFO]: assist %s: %.3fs" % (name, elapsed) )
+
+    def _assist_profiled( self, cb_func, cb_node, cb_sdt, options, name, count ):
+        if not self.assist_profile:
+            return cb_func( cb_node, cb_sdt, options )
+
+        import cProfile
+
+        profile_file = os.path.join( self.outdir, "%s-%s.prof" % (name, count) )
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall( cb_func, cb_node, cb_sdt, options )
+        finally:
+            profile.dump_stats( profile_file )
+            if self.verbose:
+                print( "[INFO]: assist %s: profile written to %s" % (name, profile_file) )
+
+    def _assist_worker( self, cb_func, cb_node, cb_sdt, options, name, count, timeout ):
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        rfd, wfd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # the worker: run the assist, and send back its result and tree,
+            # with the metrics and trace events it recorded
+            os.close( rfd )
+            try:
+                lopper_tree.metrics.reset()
+                events = 0
+                if lopper_trace.tracer is not None:
+                    events = len( lopper_trace.tracer.events )
+                syncs = self.tree.__syncs__
+                try:
+                    ret = self._assist_profiled( cb_func, cb_node, cb_sdt, options, name, count )
+                    result = { 'ret': bool( ret ) }
+                    if cb_sdt is self:
+                        result['tree'] = self.tree.export()
+                        result['syncs'] = self.tree.__syncs__ - syncs
+                        result['touched'] = self.tree.__touched__
+                        result['selected'] = [ n.abs_path for n in self.tree.__selected__ ]
+                except SystemExit as e:
+                    result = { 'exit': e.code }
+                except BaseException as e:
+                    result = { 'error': "%s: %s" % (type(e).__name__, e) }
+
+                result['metrics'] = lopper_tree.metrics.ops
+                if lopper_trace.tracer is not None:
+                    result['events'] = lopper_trace.tracer.events[events:]
+
+                with os.fdopen( wfd, "wb" ) as f:
+                    pickle.dump( result, f )
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit( 0 )
+
+        os.close( wfd )
+        data = b""
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    os.kill( pid, signal.SIGKILL )
+                    raise TimeoutError( "assist %s did not complete in %ss" % (name, timeout) )
+
+                ready, _, _ = select.select( [ rfd ], [], [], remaining )
+                if ready:
+                    chunk = os.read( rfd, 1 << 16 )
+                    if not chunk:
+                        break
+                    data += chunk
+        finally:
+            os.close( rfd )
+            os.waitpid( pid, 0 )
+
+        if not data:
+            raise RuntimeError( "assist %s worker exited without a result" % name )
+
+        result = pickle.loads( data )
+        lopper_tree.metrics.merge( result['metrics'] )
+        if lopper_trace.tracer is not None:
+            # the worker's trace is a copy of this one, so its events have
+            # the same origin
+            lopper_trace.tracer.events.extend( result.get( 'events', [] ) )
+
+        if 'exit' in result:
+            sys.exit( result['exit'] )
+        if 'error' in result:
+            raise RuntimeError( result['error'] )
+
+        if 'tree' in result:
+            # the tree is replaced by the worker's. A load into the existing
+            # tree would keep the values of the properties that the worker
+            # changed (and the properties it deleted), so a new tree is built
+            # from the export. Its generation continues from the old tree, so
+            # views cached against the old generation are not reused.
+            tree = LopperTree()
+            tree.strict = self.tree.strict
+            tree.__dbg__ = self.tree.__dbg__
+            tree.__generation__ = self.tree.__generation__
+            tree.load( result['tree'] )
+            # the sync and touched counts continue from the old tree (for
+            # the phases being traced), and the selection is carried over
+            tree.__syncs__ = self.tree.__syncs__ + result['syncs']
+            tree.__touched__ = self.tree.__touched__
+            if tree.__touched__ is not None and result['touched']:
+                tree.__touched__.update( result['touched'] )
+            tree.__selected__ = [ tree.__nodes__[p] for p in result['selected']
+                                  if p in tree.__nodes__ ]
+            self.tree = tree
+
+        return result['ret']
+
     def exec_lop( self, lop_node, lops_tree, options = None ):
         """Executes a a lopper operation (lop)
 
@@ -889,6 +1167,10 @@ class LopperSDT:
             #    select_1 = "/path/or/regex/to/nodes:prop:val";
             #    select_2 = ":prop2:val2";
             #
+            # nodes can also be selected with selectors (see lopper_selector),
+            # the nodes matching any of the selectors are added to the selection:
+            #    query = "/amba [compatible=xlnx,zynqmp-ipi-mailbox][!status]";
+            #
             selected_nodes = []
             selected_nodes_possible = []
             for sel in select_props:
@@ -1019,6 +1301,25 @@ class LopperSDT:
                         for n in selected_nodes:
                             print( "    %s" % n )
 
+            try:
+                select_queries = lop_node['query'].value
+            except:
+                select_queries = []
+
+            for q in select_queries:
+                try:
+                    query_nodes = tree.query( q )
+                except ValueError as e:
+                    print( "[ERROR]: select lop: %s" % e )
+                    sys.exit(1)
+
+                if self.verbose > 1:
+                    print( "[DBG++]: query %s selected: %s" % (q,[n.abs_path for n in query_nodes]) )
+
+                for n in query_nodes:
+                    if not n in selected_nodes:
+                        selected_nodes.append( n )
+
             # update the tree selection with our results
             tree.__selected__ = selected_nodes
 
@@ -1060,18 +1361,24 @@ class LopperSDT:
             except:
                 output_regex = []
 
-            if not output_regex:
+            # output nodes can also be selectors (see lopper_selector)
+            try:
+                output_queries = lop_node['query'].value
+            except:
+                output_queries = []
+
+            if not output_regex and not output_queries:
                 if tree.__selected__:
                     output_nodes = tree.__selected__
 
-            if not output_regex and not output_nodes:
+            if not output_regex and not output_queries and not output_nodes:
                 return False
 
             if self.verbose > 1:
                 print( "[DBG+]: output regex: %s" % output_regex )
 
             output_tree = None
-            if output_regex:
+            if output_regex or output_queries:
                 output_nodes = []
                 # select some nodes!
                 if "*" in output_regex:
@@ -1131,7 +1438,18 @@ class LopperSDT:
                         except Exception as e:
                             print( "[WARNING]: except caught during output processing: %s" % e )
 
-                if output_regex:
+                    for q in output_queries:
+                        try:
+                            query_nodes = tree.query( q )
+                        except ValueError as e:
+                            print( "[ERROR]: output lop: %s" % e )
+                            sys.exit(1)
+
+                        for o in query_nodes:
+                            if not o in output_nodes:
+                                output_nodes.append( o )
+
+                if output_regex or output_queries:
                     if self.verbose > 2:
                         print( "[DBG++] output lop, final nodes:" )
                         for oo in output_nodes:
@@ -1321,7 +1639,11 @@ class LopperSDT:
             if cb_funcs:
                 for cb_func in cb_funcs:
                     try:
-                        if not cb_func( cb_node, self, { 'verbose' : self.verbose, 'outdir' : self.outdir, 'args': cb_opts } ):
+                        # an assist run in a worker replaces the tree
+                        if cb_node.tree is not self.tree:
+                            cb_node = self.tree[cb_node.abs_path]
+                        ret = self.assist_call( cb_func, cb_node, self, { 'verbose' : self.verbose, 'outdir' : self.outdir, 'args': cb_opts } )
+                        if not ret:
                             print( "[WARNING]: the assist returned false, check for errors ..." )
                     except Exception as e:
                         print( "[WARNING]: assist %s failed: %s" % (cb_func,e) )
@@ -1980,6 +2302,7 @@ class LopperSDT:
                     print( "[ERROR]: (%s) %s" % (x.dts,e) )
                     sys.exit(1)
                 lops_tree.load( dct )
+                dct = None
 
                 x.tree = lops_tree
 
@@ -2031,7 +2354,9 @@ class LopperSDT:
                     if self.verbose:
                         print( "[INFO]: ------> processing lop: %s" % f.abs_path )
 
-                    self.exec_lop( f, fdt_tree )
+                    with lopper_trace.phase( f.abs_path, "lop", { "type": f.type[0] if f.type else "", "file": x.dts }, self ):
+                        with lopper_tree.metrics.scope( "%s:%s" % (os.path.basename( x.dts ), f.abs_path) ):
+                            self.exec_lop( f, fdt_tree )
 
 
 class LopperFile:
@@ -2058,6 +2383,9 @@ def usage():
     print('  -i, --input         process supplied input device tree description')
     print('  -a, --assist        load specified python assist (for node or output processing)' )
     print('  -A, --assist-paths  colon separated lists of paths to search for assist loading' )
+    print('    , --assist-timeout=[<assist>=]<seconds>  run assists (or the named assist) in a worker process,' )
+    print('                      and fail them if they take longer than <seconds>' )
+    print('    , --assist-profile write a cProfile of each assist call to the output directory' )
     print('    , --enhanced      when writing output files, do enhanced processing (this includes phandle replacement, comments, etc' )
     print('    . --auto          automatically run any assists passed via -a' )
     print('    , --permissive    do not enforce fully validated properties (phandles, etc)' )
@@ -2071,10 +2399,15 @@ def usage():
     print('  -h, --help          display this help and exit')
     print('  -O, --outdir        directory to use for output files')
     print('    , --server        after processing, start a server for ReST API calls')
+    print('    , --trace=<file>  write the timing, memory use and tree changes of the setup, lops')
+    print('                      and output phases to <file>' )
+    print('    , --trace-format  format of the --trace file: json (default) or chrome (trace event format)' )
+    print('    , --metrics=<file> count and time tree operations (sync, export, load, searches), by lop and')
+    print('                      assist, and write them to <file> ("-" for stdout) on exit' )
     print('    , --version       output the version and exit')
     print('')
 
-def main():
+def main( argv = None ):
     global inputfiles
     global output
     global output_file
@@ -2100,6 +2433,11 @@ def main():
     global xlate
     global libfdt
     global overlay
+    global trace_file
+    global trace_format
+    global metrics_file
+    global assist_timeouts
+    global assist_profile
 
     debug = False
     sdt = None
@@ -2122,13 +2460,21 @@ def main():
     libfdt = True
     xlate = []
     overlay = False
+    trace_file = ""
+    trace_format = "json"
+    metrics_file = ""
+    assist_timeouts = {}
+    assist_profile = False
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "A:t:dfvdhi:o:a:SO:Dx:",
+        if argv is None:
+            argv = sys.argv[1:]
+        opts, args = getopt.getopt(argv, "A:t:dfvdhi:o:a:SO:Dx:",
                                    [ "debug", "assist-paths=", "outdir", "enhanced",
                                      "save-temps", "version", "werror","target=", "dump",
                                      "force","verbose","help","input=","output=","dryrun",
                                      "assist=","server", "auto", "permissive", "xlate=",
-                                     "no-libfdt", "overlay" ] )
+                                     "no-libfdt", "overlay", "trace=", "trace-format=", "metrics=",
+                                     "assist-timeout=", "assist-profile" ] )
     except getopt.GetoptError as err:
         print('%s' % str(err))
         usage()
@@ -2182,6 +2528,24 @@ def main():
             overlay = True
         elif o in ('-x', '--xlate'):
             xlate.append(a)
+        elif o in ('--trace' ):
+            trace_file = a
+        elif o in ('--trace-format' ):
+            if a not in [ "json", "chrome" ]:
+                print( "[ERROR]: unknown trace format: %s" % a )
+                sys.exit(1)
+            trace_format = a
+        elif o in ('--metrics' ):
+            metrics_file = a
+        elif o in ('--assist-timeout' ):
+            assist_name, _, timeout = a.rpartition( "=" )
+            try:
+                assist_timeouts[assist_name] = float( timeout )
+            except ValueError:
+                print( "[ERROR]: invalid assist timeout: %s" % a )
+                sys.exit(1)
+        elif o in ('--assist-profile' ):
+            assist_profile = True
         elif o in ('--version'):
             print( "%s" % LOPPER_VERSION )
             sys.exit(0)
@@ -2292,24 +2656,16 @@ def main():
             inputfiles.append( x )
 
 
-if __name__ == "__main__":
-
-    # Main processes the command line, and sets some global variables we
-    # use below
-    main()
-
-    if not libfdt:
-        import lopper_dt
-        lopper_type(lopper_dt.LopperDT)
-
-    if dump_dtb:
-        Lopper.dtb_dts_export( sdt, verbose )
-        sys.exit(0)
+def sdt_options( device_tree ):
+    """Apply the command line options to a system device tree
 
-    device_tree = LopperSDT( sdt )
+    Args:
+       device_tree (LopperSDT): the system device tree
 
-    atexit.register(at_exit_cleanup)
+    Returns:
+       Nothing
 
+    """
     # set some flags before we process the tree.
     device_tree.dryrun = dryrun
     device_tree.verbose = verbose
@@ -2323,8 +2679,21 @@ if __name__ == "__main__":
     device_tree.load_paths = load_paths
     device_tree.permissive = permissive
     device_tree.merge = overlay
+    device_tree.assist_timeouts = assist_timeouts
+    device_tree.assist_profile = assist_profile
 
-    device_tree.setup( sdt, inputfiles, "", force, libfdt )
+def sdt_process( device_tree ):
+    """Process a system device tree, as described by the command line
+
+    The assists are loaded, the lops are run and the output is written.
+
+    Args:
+       device_tree (LopperSDT): the system device tree (after setup)
+
+    Returns:
+       Nothing
+
+    """
     device_tree.assists_setup( cmdline_assists )
 
     if auto_run:
@@ -2344,13 +2713,14 @@ if __name__ == "__main__":
 
     if debug:
         import cProfile
-        cProfile.run( 'device_tree.perform_lops()' )
+        cProfile.runctx( 'device_tree.perform_lops()', globals(), locals() )
     else:
         device_tree.perform_lops()
 
     if not dryrun:
         # write any changes to the FDT, before we do our write
-        Lopper.sync( device_tree.FDT, device_tree.tree.export() )
+        with lopper_trace.phase( "sync", "output" ):
+            Lopper.sync( device_tree.FDT, device_tree.tree.export() )
         device_tree.write( enhanced = device_tree.enhanced )
     else:
         print( "[INFO]: --dryrun was passed, output file %s not written" % output )
@@ -2367,8 +2737,39 @@ if __name__ == "__main__":
 
         if rest_support:
             lopper_rest.sdt = device_tree
-            lopper_rest.app.run()  # run our Flask app
+            lopper_rest.serve()
 
         sys.exit(1)
 
     device_tree.cleanup()
+
+if __name__ == "__main__":
+
+    # Main processes the command line, and sets some global variables we
+    # use below
+    main()
+
+    if trace_file:
+        lopper_trace.start( trace_file, trace_format )
+
+    if metrics_file:
+        lopper_tree.metrics.enable()
+        atexit.register( lopper_tree.metrics.dump, metrics_file )
+
+    if not libfdt:
+        import lopper_dt
+        lopper_type(lopper_dt.LopperDT)
+
+    if dump_dtb:
+        Lopper.dtb_dts_export( sdt, verbose )
+        sys.exit(0)
+
+    device_tree = LopperSDT( sdt )
+
+    atexit.register(at_exit_cleanup)
+
+    sdt_options( device_tree )
+
+    device_tree.setup( sdt, inputfiles, "", force, libfdt )
+
+    sdt_process( device_tree )
@@ -12,6 +12,7 @@ import os
 import shutil
 import subprocess
 from lopper_fmt import LopperFmt
+import lopper_trace
 from string import printable
 from pathlib import Path
 from pathlib import PurePath
@@ -55,6 +56,7 @@ class lopper_base:
     phandle_possible_prop_dict = {}
 
     ### --- base methods
+    @lopper_trace.traced( "cpp", "setup" )
     def dt_preprocess( dts_file, includes, outdir="./", verbose=0 ):
         """Compile a dts file to a dtb
 
@@ -0,0 +1,1096 @@
+#!/usr/bin/env python3
+
+#/*
+# * Copyright (c) 2021 Xilinx Inc. All rights reserved.
+# *
+# * SPDX-License-Identifier: BSD-3-Clause
+# */
+
+import sys
+import os
+import gc
+import atexit
+import getopt
+import json
+import platform
+import random
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+import urllib.error
+from pathlib import Path
+from collections import OrderedDict
+
+from lopper_tree import *
+
+from lopper import *
+import lopper
+
+lopper_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append( lopper_directory + "/assists" )
+
+def timed( fn, *args ):
+    """Run a function and time it
+
+    Args:
+       fn (function): function to run
+       args: arguments to the function
+
+    Returns:
+       tuple: (return value of fn, elapsed seconds)
+
+    """
+    start = time.perf_counter()
+    ret = fn( *args )
+    return ret, time.perf_counter() - start
+
+# results of all of the benchmarks run, for --json
+results = []
+
+def report( name, timings, config = "" ):
+    """Print the timings of a benchmark
+
+    The timings are also added to the results.
+
+    Args:
+       name (string): benchmark name
+       timings (list of tuples): (phase, seconds) pairs
+       config (string,optional): the benchmark configuration (i.e. the
+                                 synthetic tree spec)
+
+    Returns:
+       Nothing
+
+    """
+    total = 0
+    if config:
+        print( "[BENCH]: %s: %s" % (name, config) )
+    for phase, seconds in timings:
+        total += seconds
+        print( "[BENCH]: %s: %-24s %10.4fs" % (name, phase, seconds) )
+        results.append( { "benchmark": name, "config": config, "phase": phase, "seconds": seconds } )
+    print( "[BENCH]: %s: %-24s %10.4fs" % (name, "total", total) )
+
+def traced( fn, *args ):
+    """Run a function and measure the (python) memory it allocates
+
+    Memory is traced with tracemalloc, from the start of the call. Memory
+    allocated before the call (and freed during it) is not counted.
+
+    Args:
+       fn (function): function to run
+       args: arguments to the function
+
+    Returns:
+       tuple: (return value of fn, bytes still allocated after the call,
+               peak bytes allocated during the call)
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        ret = fn( *args )
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return ret, current, peak
+
+def report_memory( name, sizes, config = "" ):
+    """Print the memory use of a benchmark
+
+    The sizes are also added to the results (as bytes).
+
+    Args:
+       name (string): benchmark name
+       sizes (list of tuples): (phase, retained bytes, peak bytes)
+       config (string,optional): the benchmark configuration
+
+    Returns:
+       Nothing
+
+    """
+    if config:
+        print( "[BENCH]: %s: %s" % (name, config) )
+    for phase, retained, peak in sizes:
+        print( "[BENCH]: %s: %-24s %10.2fMB retained %10.2fMB peak" % (name, phase, retained / 1e6, peak / 1e6) )
+        results.append( { "benchmark": name, "config": config, "phase": phase + " retained", "bytes": retained } )
+        results.append( { "benchmark": name, "config": config, "phase": phase + " peak", "bytes": peak } )
+
+def synthetic_subsystems( subsystem_count, seed = 1 ):
+    """Generate a tree with a synthetic set of Xilinx subsystems
+
+    The tree has one device node per Versal PM device, resource groups
+    that are shared (via "include") between the subsystems, and a private
+    device (via "access") for as many subsystems as there are free
+    devices. This is the input shape processed by the CDO assist.
+
+    Args:
+       subsystem_count (int): the number of subsystems to generate
+       seed (int,optional): random seed, so the trees are reproducible
+
+    Returns:
+       LopperTree: the generated tree
+
+    """
+    from xlnx_versal_power import xilinx_versal_device_names
+
+    rand = random.Random( seed )
+    tree = LopperTree()
+
+    # one node per PM device that can be in an access list
+    device_ids = sorted( [ d for d in xilinx_versal_device_names.keys() if d & 0xfffff000 == 0x18224000 ] )
+    phandle = 1
+    device_phandles = {}
+    for index, device_id in enumerate( device_ids ):
+        node = LopperNode( -1, "/bus/device@%x" % index )
+        node["compatible"] = [ "lopper,bench-device" ]
+        node["power-domains"] = [ 1, device_id ]
+        tree.add( node, True )
+        node.phandle = phandle
+        device_phandles[device_id] = phandle
+        phandle += 1
+
+    rand.shuffle( device_ids )
+    group_count = max( 4, subsystem_count // 10 )
+    group_devices = device_ids[:len(device_ids) // 2]
+    private_devices = device_ids[len(device_ids) // 2:]
+
+    group_phandles = []
+    for g in range( group_count ):
+        members = rand.sample( group_devices, min( 4, len(group_devices) ) )
+        node = LopperNode( -1, "/domains/resource_group_%s" % g )
+        node["access"] = [ device_phandles[d] for d in members ]
+        node["access-flags-names"] = [ "default" ] * len(members)
+        tree.add( node, True )
+        node.phandle = phandle
+        group_phandles.append( phandle )
+        phandle += 1
+
+    for s in range( subsystem_count ):
+        node = LopperNode( -1, "/domains/subsystem_%s" % s )
+        node["compatible"] = [ "xilinx,subsystem-v1" ]
+        node["id"] = [ s + 1 ]
+        node["flags-names"] = [ "default" ]
+        node["flags"] = [ 0x4, 0xfffff, 0x0, 0x0 ]
+        node["include"] = rand.sample( group_phandles, 2 )
+        if s < len(private_devices):
+            node["access"] = [ device_phandles[private_devices[s]] ]
+            node["access-flags-names"] = [ "default" ]
+        tree.add( node, True )
+
+    tree.sync()
+
+    return tree
+
+def bench_cdo( subsystem_count, outdir, verbose = 0 ):
+    """Benchmark CDO generation for a synthetic set of subsystems
+
+    Args:
+       subsystem_count (int): the number of subsystems to generate
+       outdir (string): directory for the generated CDO
+       verbose (int,optional): verbosity level
+
+    Returns:
+       list of tuples: (phase, seconds) pairs
+
+    """
+    import cdo
+
+    tree, t_gen = timed( synthetic_subsystems, subsystem_count )
+
+    sdt = LopperSDT( None )
+    sdt.tree = tree
+    domain_node = tree["/domains"]
+
+    def subsystems():
+        subs = cdo.valid_subsystems( domain_node, sdt, {} )
+        for sub in subs:
+            cdo.process_subsystem( sub, sub.sub_node, sdt, {} )
+            cdo.construct_flag_references( sub )
+        return subs
+
+    subs, t_process = timed( subsystems )
+    ret, t_reqs = timed( cdo.construct_pm_reqs, subs )
+
+    outfile = os.path.join( outdir, "bench.cdo" )
+    ret, t_write = timed( cdo.cdo_write, tree["/"], sdt, { 'verbose': verbose, 'args': [ outfile ] } )
+
+    if verbose:
+        print( "[INFO]: %s subsystems, cdo written to %s" % (len(subs), outfile) )
+
+    return [ ("generate tree", t_gen),
+             ("process subsystems", t_process),
+             ("construct pm reqs", t_reqs),
+             ("cdo write", t_write) ]
+
+def load_sdt( sdt_file, lop_files, outdir, libfdt, verbose = 0 ):
+    """Load a system device tree and run lops against it
+
+    Args:
+       sdt_file (string): system device tree file
+       lop_files (list of strings): lop files to run against the tree
+       outdir (string): directory for the generated files
+       libfdt (boolean): use libfdt to load the tree
+       verbose (int,optional): verbosity level
+
+    Returns:
+       LopperSDT: the loaded system device tree
+
+    """
+    sdt = LopperSDT( sdt_file )
+    sdt.dryrun = False
+    sdt.verbose = verbose
+    sdt.werror = False
+    sdt.outdir = outdir
+    sdt.save_temps = False
+    sdt.cleanup_flag = True
+    sdt.use_libfdt = libfdt
+
+    sdt.setup( sdt_file, lop_files, "", True, libfdt = libfdt )
+    sdt.perform_lops()
+
+    return sdt
+
+def bench_domains( sdt_file, lop_files, outdir, libfdt, verbose = 0 ):
+    """Benchmark pruning a system device tree to its domains
+
+    Every node in /domains with a cpus or access property is pruned with
+    the domain-access and openamp assists. Pruning is destructive, so the
+    tree is loaded (and the lops run) again for each domain and assist.
+    The domains are then extracted together, from a single load, by the
+    multi-domain mode of domain-access (this includes writing them).
+
+    Args:
+       sdt_file (string): system device tree file
+       lop_files (list of strings): lop files to run before pruning (i.e.
+                                    the domain lops for a board)
+       outdir (string): directory for the generated files
+       libfdt (boolean): use libfdt to load the tree
+       verbose (int,optional): verbosity level
+
+    Returns:
+       list of tuples: (phase, seconds) pairs
+
+    """
+    import importlib
+
+    timings = []
+    assists = [ ("domain-access", "core_domain_access"), ("openamp", "process_domain") ]
+
+    sdt, t_load = timed( load_sdt, sdt_file, lop_files, outdir, libfdt, verbose )
+    timings.append( ("load", t_load) )
+
+    domains = []
+    try:
+        for node in sdt.tree["/domains"].child_nodes.values():
+            if node.propval( "cpus" ) != [''] or node.propval( "access" ) != ['']:
+                domains.append( node.abs_path )
+    except KeyError:
+        pass
+
+    if not domains:
+        print( "[WARNING]: no domains found in %s" % sdt_file )
+
+    for assist_name, func in assists:
+        prune = getattr( importlib.import_module( assist_name ), func )
+        for domain in domains:
+            sdt = load_sdt( sdt_file, lop_files, outdir, libfdt, verbose )
+            count = len( sdt.tree.__nodes__ )
+            ret, t_prune = timed( prune, domain, sdt, { 'verbose': verbose } )
+            if verbose:
+                print( "[INFO]: %s: %s: %s -> %s nodes" % (assist_name, domain, count, len( sdt.tree.__nodes__ )) )
+            timings.append( ("%s %s" % (assist_name, os.path.basename( domain )), t_prune) )
+
+    # all of the domains, from a single load of the tree
+    if domains:
+        extract = getattr( importlib.import_module( "domain-access" ), "core_domains_extract" )
+        sdt = load_sdt( sdt_file, lop_files, outdir, libfdt, verbose )
+        ret, t_extract = timed( extract, "/", sdt, { 'verbose': verbose, 'outdir': outdir,
+                                                      'args': [ os.path.basename( d ) for d in domains ] } )
+        timings.append( ("domain-access all domains", t_extract) )
+
+    return timings
+
+def bench_rest( url, paths, clients, request_count, verbose = 0 ):
+    """Load test a lopper ReST server (lopper.py --server)
+
+    The paths are requested round robin, by concurrent clients, until
+    request_count requests have been made.
+
+    Args:
+       url (string): base url of the server (i.e. http://127.0.0.1:5000)
+       paths (list of strings): paths (and queries) to request
+       clients (int): number of concurrent clients
+       request_count (int): total number of requests
+       verbose (int,optional): verbosity level
+
+    Returns:
+       dictionary: requests, errors, seconds, throughput (requests/s) and
+                   p50, p99 and max latencies (seconds)
+
+    """
+    latencies = []
+    errors = []
+    next_request = [ 0 ]
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                n = next_request[0]
+                if n >= request_count:
+                    return
+                next_request[0] += 1
+
+            req = urllib.request.Request( url + paths[n % len(paths)],
+                                          headers={ "Accept-Encoding": "gzip" } )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen( req ) as r:
+                    r.read()
+                error = None
+            except (urllib.error.URLError, OSError) as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                latencies.append( elapsed )
+                if error:
+                    errors.append( error )
+
+    threads = [ threading.Thread( target=client ) for c in range( clients ) ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+
+    if errors and verbose:
+        for e in errors[:5]:
+            print( "[WARNING]: request failed: %s" % e )
+
+    latencies.sort()
+    def percentile( p ):
+        if not latencies:
+            return 0
+        return latencies[min( len(latencies) - 1, int( len(latencies) * p ) )]
+
+    return { "requests": len(latencies),
+             "errors": len(errors),
+             "seconds": seconds,
+             "throughput": len(latencies) / seconds if seconds else 0,
+             "p50": percentile( 0.50 ),
+             "p99": percentile( 0.99 ),
+             "max": latencies[-1] if latencies else 0 }
+
+# the defaults of a synthetic system device tree (see synthetic_sdt())
+sdt_spec_defaults = OrderedDict( [ ("nodes", 1000),
+                                   ("depth", 3),
+                                   ("phandles", 0.3),
+                                   ("domains", 4),
+                                   ("yaml", 1),
+                                   ("seed", 1) ] )
+
+def sdt_spec( spec ):
+    """Parse a synthetic system device tree spec
+
+    A spec is a comma separated list of <key>=<value> (see
+    sdt_spec_defaults), i.e. "nodes=10000,depth=5". Missing keys take
+    their default value, "default" (or "") is all of the defaults.
+
+    Args:
+       spec (string): the spec
+
+    Returns:
+       OrderedDict: the spec values
+    """
+    values = OrderedDict( sdt_spec_defaults )
+    if spec in [ "", "default" ]:
+        return values
+
+    for item in spec.split( "," ):
+        try:
+            k, v = item.split( "=" )
+            k = k.strip()
+            values[k] = type( sdt_spec_defaults[k] )( v )
+        except (ValueError, KeyError):
+            print( "[ERROR]: invalid tree spec: %s (keys are: %s)" % (item, ",".join( sdt_spec_defaults.keys() )) )
+            sys.exit(1)
+
+    return values
+
+def spec_string( spec ):
+    return ",".join( [ "%s=%s" % (k,v) for k, v in spec.items() ] )
+
+def synthetic_sdt( output_filename, nodes = 1000, depth = 3, phandles = 0.3, domains = 4, seed = 1 ):
+    """Write a synthetic system device tree
+
+    The tree is modeled on device-trees/system-device-tree.dts: two cpu
+    clusters, a clock controller, a bus (amba) with an interrupt
+    controller, nested simple-bus nodes and devices, reserved memory and
+    openamp domains that reference the cpus and some of the devices.
+
+    Args:
+       output_filename (string): the dts file to write
+       nodes (int,optional): the (approximate) number of nodes in the tree
+       depth (int,optional): the levels of nested buses below amba
+       phandles (float,optional): the fraction of devices that reference
+                                  (by phandle) a clock and another device
+       domains (int,optional): the number of domains
+       seed (int,optional): random seed, so the trees are reproducible
+
+    Returns:
+       int: the number of nodes written
+    """
+    rand = random.Random( seed )
+    kinds = [ "serial", "ethernet", "i2c", "spi", "gpio", "dma", "timer", "usb" ]
+
+    # the buses, as (path, level) pairs. Each bus has two buses below it,
+    # down to the requested depth.
+    buses = [ ( "amba", 0 ) ]
+    level_buses = [ buses[0] ]
+    for level in range( 1, depth + 1 ):
+        next_buses = []
+        for parent, l in level_buses:
+            for b in range( 2 ):
+                next_buses.append( ( "%s/bus_%s_%s" % (parent, level, len(next_buses)), level ) )
+        buses += next_buses
+        level_buses = next_buses
+
+    fixed = 12 + 2 * domains
+    device_count = max( 1, nodes - fixed - len(buses) )
+
+    # devices, by bus
+    bus_devices = { b: [] for b, l in buses }
+    for d in range( device_count ):
+        bus_devices[buses[d % len(buses)][0]].append( d )
+
+    def device( d, indent ):
+        kind = kinds[d % len(kinds)]
+        hi = d >> 15
+        lo = 0x80000000 + (d & 0x7fff) * 0x10000
+        lines = [ "%sdev_%s: %s@%x {" % (indent, d, kind, (hi << 32) | lo),
+                  "%s\tcompatible = \"lopper,bench-%s\", \"%s\";" % (indent, kind, kind),
+                  "%s\treg = <0x%x 0x%x 0x0 0x10000>;" % (indent, hi, lo),
+                  "%s\tstatus = \"%s\";" % (indent, "disabled" if rand.random() < 0.1 else "okay"),
+                  "%s\tinterrupt-parent = <&gic>;" % indent,
+                  "%s\tinterrupts = <0x0 0x%x 0x4>;" % (indent, d % 0x3c0) ]
+        if rand.random() < phandles:
+            lines.append( "%s\tclocks = <&clk 0x%x>;" % (indent, d % 0x100) )
+            lines.append( "%s\tlopper,bench-peer = <&dev_%s>;" % (indent, rand.randrange( device_count )) )
+        lines.append( "%s};" % indent )
+        return lines
+
+    def bus( path, level ):
+        indent = "\t" * (level + 1)
+        name = path.split( "/" )[-1]
+        if level == 0:
+            lines = [ "%samba: amba {" % indent ]
+        else:
+            lines = [ "%s%s {" % (indent, name) ]
+        lines += [ "%s\tcompatible = \"simple-bus\";" % indent,
+                   "%s\t#address-cells = <0x2>;" % indent,
+                   "%s\t#size-cells = <0x2>;" % indent,
+                   "%s\tranges;" % indent ]
+        if level == 0:
+            lines += [ "%s\tgic: interrupt-controller@f9000000 {" % indent,
+                       "%s\t\tcompatible = \"arm,gic-v3\";" % indent,
+                       "%s\t\t#interrupt-cells = <0x3>;" % indent,
+                       "%s\t\treg = <0x0 0xf9000000 0x0 0x80000>;" % indent,
+                       "%s\t\tinterrupt-controller;" % indent,
+                       "%s\t};" % indent ]
+        for d in bus_devices[path]:
+            lines += device( d, indent + "\t" )
+        for b, l in buses:
+            if l == level + 1 and b.rsplit( "/", 1 )[0] == path:
+                lines += bus( b, l )
+        lines.append( "%s};" % indent )
+        return lines
+
+    def cluster( label, name, compatible, count ):
+        lines = [ "\t%s: %s {" % (label, name),
+                  "\t\t#address-cells = <0x1>;",
+                  "\t\t#size-cells = <0x0>;",
+                  "\t\t#cpus-mask-cells = <0x1>;",
+                  "\t\tcompatible = \"cpus,cluster\";" ]
+        for c in range( count ):
+            lines += [ "\t\tcpu@%s {" % c,
+                       "\t\t\tcompatible = %s;" % compatible,
+                       "\t\t\tdevice_type = \"cpu\";",
+                       "\t\t\treg = <0x%x>;" % c,
+                       "\t\t\tclocks = <&clk 0x4d>;",
+                       "\t\t};" ]
+        lines.append( "\t};" )
+        return lines
+
+    lines = [ "/dts-v1/;",
+              "",
+              "/ {",
+              "\tcompatible = \"lopper,bench-sdt\";",
+              "\t#address-cells = <0x2>;",
+              "\t#size-cells = <0x2>;",
+              "\tmodel = \"lopper synthetic system device tree (%s devices)\";" % device_count ]
+    lines += cluster( "cpus_a72", "cpus", "\"arm,cortex-a72\", \"arm,armv8\"", 2 )
+    lines += cluster( "cpus_r5", "cpus-cluster@0", "\"arm,cortex-r5\"", 2 )
+    lines += [ "\tclk: clock-controller {",
+               "\t\t#clock-cells = <0x1>;",
+               "\t\tcompatible = \"xlnx,versal-clk\";",
+               "\t};" ]
+    lines += bus( "amba", 0 )
+
+    lines += [ "\treserved-memory {",
+               "\t\t#address-cells = <0x2>;",
+               "\t\t#size-cells = <0x2>;",
+               "\t\tranges;" ]
+    for m in range( domains ):
+        lines += [ "\t\tmemory_%s: memory_%s@%x {" % (m, m, m * 0x8000000),
+                   "\t\t\tcompatible = \"openamp,domain-memory-v1\";",
+                   "\t\t\treg = <0x0 0x%x 0x0 0x8000000>;" % (m * 0x8000000),
+                   "\t\t};" ]
+    lines.append( "\t};" )
+
+    lines += [ "\tdomains {",
+               "\t\t#address-cells = <0x2>;",
+               "\t\t#size-cells = <0x2>;" ]
+    for m in range( domains ):
+        if m % 2:
+            cpus = "<&cpus_a72 0x3 0x0>"
+        else:
+            cpus = "<&cpus_r5 0x1 0x80000000>"
+        access = [ "<&memory_%s 0x1>" % m ]
+        access += [ "<&dev_%s 0x0>" % d for d in rand.sample( range( device_count ), min( 16, device_count ) ) ]
+        lines += [ "\t\topenamp_%s {" % m,
+                   "\t\t\tcompatible = \"openamp,domain-v1\";",
+                   "\t\t\t#address-cells = <0x2>;",
+                   "\t\t\t#size-cells = <0x2>;",
+                   "\t\t\tmemory = <0x0 0x%x 0x0 0x8000000>;" % (m * 0x8000000),
+                   "\t\t\tcpus = %s;" % cpus,
+                   "\t\t\taccess = %s;" % ", ".join( access ),
+                   "\t\t};" ]
+    lines.append( "\t};" )
+
+    lines += [ "\tmemory@0 {",
+               "\t\tdevice_type = \"memory\";",
+               "\t\treg = <0x0 0x0 0x0 0x80000000>;",
+               "\t};",
+               "};" ]
+
+    with open( output_filename, "w" ) as f:
+        f.write( "\n".join( lines ) + "\n" )
+
+    return fixed + len(buses) + device_count
+
+# the lops run by the suite, by phase. Each is run against the tree on its own.
+suite_lops = [ ( "lop select", [ 'compatible = "system-device-tree-v1,lop,select-v1";',
+                                 'select_1;',
+                                 'select_2 = "/amba/.*:status:okay";',
+                                 'select_3 = ":compatible:.*lopper,bench-serial.*";' ] ),
+               ( "lop select query", [ 'compatible = "system-device-tree-v1,lop,select-v1";',
+                                       'select_1;',
+                                       'query = "/amba/** [status=okay][clocks]";' ] ),
+               ( "lop modify props", [ 'compatible = "system-device-tree-v1,lop,modify";',
+                                       'modify = "/amba/.*ethernet.*:lopper,bench-prop:0x1";' ] ),
+               ( "lop modify delete", [ 'compatible = "system-device-tree-v1,lop,modify";',
+                                        'modify = "/amba/bus_1_0::";' ] ) ]
+
+def suite_lop( output_filename, lop ):
+    lines = [ "/dts-v1/;",
+              "",
+              "/ {",
+              "\tcompatible = \"system-device-tree-v1\";",
+              "\tlops {",
+              "\t\tlop_0 {" ]
+    lines += [ "\t\t\t" + l for l in lop ]
+    lines += [ "\t\t};", "\t};", "};" ]
+
+    with open( output_filename, "w" ) as f:
+        f.write( "\n".join( lines ) + "\n" )
+
+def bench_rest_endpoints( sdt, request_count = 20 ):
+    """Benchmark the ReST endpoints, in process
+
+    Each endpoint is requested with an empty response cache (cold), and
+    then request_count times from the cache (warm).
+
+    Args:
+       sdt (LopperSDT): the tree to serve
+       request_count (int,optional): warm requests per endpoint
+
+    Returns:
+       list of tuples: (phase, seconds) pairs, seconds per request
+    """
+    import lopper_rest
+
+    lopper_rest.sdt = sdt
+    client = lopper_rest.app.test_client()
+    phandle = min( sdt.tree.__pnodes__.keys() or [ 1 ] )
+
+    endpoints = [ ( "domains", "/domains" ),
+                  ( "tree", "/tree" ),
+                  ( "nodes path", "/nodes?path=/amba/.*&details=True&limit=100" ),
+                  ( "nodes select", "/nodes?select=[status=okay][clocks]" ),
+                  ( "phandle", "/phandle/%s" % phandle ) ]
+
+    timings = []
+    for name, path in endpoints:
+        with lopper_rest.response_cache_lock:
+            lopper_rest.response_cache.clear()
+        r, t_cold = timed( client.get, path )
+        if r.status_code != 200:
+            print( "[WARNING]: rest: %s returned %s" % (path, r.status_code) )
+
+        start = time.perf_counter()
+        for i in range( request_count ):
+            client.get( path )
+        t_warm = (time.perf_counter() - start) / request_count
+
+        timings += [ ( "rest %s cold" % name, t_cold ), ( "rest %s warm" % name, t_warm ) ]
+
+    queries = "".join( [ json.dumps( { "select": "[status=okay]", "limit": 10 } ) + "\n" ] * 100 )
+    def bulk():
+        return client.post( "/bulk", data=queries, content_type="application/x-ndjson" ).get_data()
+    ret, t_bulk = timed( bulk )
+    timings.append( ( "rest bulk 100 queries", t_bulk ) )
+
+    lopper_rest.sdt = None
+    return timings
+
+def bench_suite( spec, outdir, libfdt, verbose = 0 ):
+    """Benchmark the core lopper operations against a synthetic tree
+
+    Args:
+       spec (OrderedDict): the synthetic tree (see sdt_spec())
+       outdir (string): directory for the generated files
+       libfdt (boolean): use libfdt to load the tree
+       verbose (int,optional): verbosity level
+
+    Returns:
+       list of tuples: (phase, seconds) pairs
+    """
+    import importlib
+
+    timings = []
+    sdt_file = os.path.join( outdir, "bench-sdt.dts" )
+    count, t_gen = timed( synthetic_sdt, sdt_file, spec["nodes"], spec["depth"],
+                          spec["phandles"], spec["domains"], spec["seed"] )
+    timings.append( ("generate", t_gen) )
+
+    sdt, t_setup = timed( load_sdt, sdt_file, [], outdir, libfdt, verbose )
+    timings.append( ("setup", t_setup) )
+    if verbose:
+        print( "[INFO]: suite: %s nodes (%s generated)" % (len( sdt.tree.__nodes__ ), count) )
+
+    dct, t_export = timed( sdt.tree.export )
+    timings.append( ("export", t_export) )
+
+    def load():
+        tree = LopperTree()
+        tree.load( dct )
+        return tree
+    tree, t_load = timed( load )
+    timings.append( ("load", t_load) )
+
+    ret, t_sync = timed( sdt.tree.sync )
+    timings.append( ("sync", t_sync) )
+
+    # lops, each against a fresh copy of the tree
+    pristine = sdt.tree
+    def fresh():
+        tree = LopperTree()
+        tree.strict = pristine.strict
+        tree.load( pristine.export() )
+        return tree
+
+    for phase, lop in suite_lops:
+        lop_file = os.path.join( outdir, "bench-lop.dts" )
+        suite_lop( lop_file, lop )
+        sdt.tree = fresh()
+        sdt.lops = []
+        sdt.lops_load( [ lop_file ], True )
+        ret, t_lop = timed( sdt.perform_lops )
+        timings.append( (phase, t_lop) )
+
+    sdt.tree = fresh()
+    code = "return node.propval( 'status' ) == [ 'disabled' ]"
+    ret, t_filter = timed( sdt.tree.filter, "/amba/", LopperAction.DELETE, code )
+    timings.append( ("filter", t_filter) )
+
+    # domain pruning
+    prune = getattr( importlib.import_module( "domain-access" ), "core_domain_access" )
+    for m in range( spec["domains"] ):
+        sdt.tree = fresh()
+        ret, t_prune = timed( prune, "/domains/openamp_%s" % m, sdt, { 'verbose': verbose } )
+        timings.append( ("domain-access openamp_%s" % m, t_prune) )
+
+    # outputs
+    sdt.tree = pristine
+    outputs = [ "dts" ]
+    if libfdt:
+        outputs.append( "dtb" )
+    if spec["yaml"] and lopper.yaml_support:
+        outputs.append( "yaml" )
+    for ext in outputs:
+        output_file = os.path.join( outdir, "bench-out.%s" % ext )
+        ret, t_write = timed( sdt.write, sdt.tree, output_file, True )
+        timings.append( ("write %s" % ext, t_write) )
+
+    if "yaml" in outputs:
+        yaml_file = os.path.join( outdir, "bench-sdt.yaml" )
+        shutil.copyfile( os.path.join( outdir, "bench-out.yaml" ), yaml_file )
+        try:
+            ysdt, t_yaml = timed( load_sdt, yaml_file, [], outdir, libfdt, verbose )
+            timings.append( ("setup yaml", t_yaml) )
+        except Exception as e:
+            # the yaml importer doesn't read back every tree that is written
+            print( "[WARNING]: yaml system device tree could not be loaded: %s" % e )
+
+    try:
+        import lopper_rest
+        rest_support = True
+    except Exception as e:
+        print( "[WARNING]: rest support is not loaded, skipping rest endpoints: %s" % e )
+        rest_support = False
+
+    if rest_support:
+        timings += bench_rest_endpoints( sdt )
+
+    return timings
+
+def bench_memory( spec, outdir, libfdt, verbose = 0 ):
+    """Measure the memory use of loading and syncing a synthetic tree
+
+    Args:
+       spec (OrderedDict): the synthetic tree (see sdt_spec())
+       outdir (string): directory for the generated files
+       libfdt (boolean): use libfdt to load the tree
+       verbose (int,optional): verbosity level
+
+    Returns:
+       list of tuples: (phase, retained bytes, peak bytes)
+    """
+    sizes = []
+    sdt_file = os.path.join( outdir, "bench-sdt.dts" )
+    count = synthetic_sdt( sdt_file, spec["nodes"], spec["depth"],
+                           spec["phandles"], spec["domains"], spec["seed"] )
+
+    sdt, retained, peak = traced( load_sdt, sdt_file, [], outdir, libfdt, verbose )
+    sizes.append( ("setup", retained, peak) )
+    if verbose:
+        print( "[INFO]: memory: %s nodes (%s generated)" % (len( sdt.tree.__nodes__ ), count) )
+
+    dct, retained, peak = traced( sdt.tree.export )
+    sizes.append( ("export", retained, peak) )
+
+    def load():
+        tree = LopperTree()
+        tree.load( dct )
+        return tree
+    tree, retained, peak = traced( load )
+    sizes.append( ("load", retained, peak) )
+    del tree
+    del dct
+
+    # the tree must not keep the export it was loaded from alive, so this
+    # retains no more than "load"
+    def export_load():
+        tree = LopperTree()
+        tree.load( sdt.tree.export() )
+        return tree
+    tree, retained, peak = traced( export_load )
+    sizes.append( ("export and load", retained, peak) )
+    del tree
+
+    ret, retained, peak = traced( sdt.tree.sync )
+    sizes.append( ("sync", retained, peak) )
+
+    output_file = os.path.join( outdir, "bench-out.dts" )
+    ret, retained, peak = traced( sdt.write, sdt.tree, output_file, True )
+    sizes.append( ("write dts", retained, peak) )
+
+    return sizes
+
+def bench_repeat( fn, repeat, *args ):
+    """Run a benchmark more than once, and keep the best time of each phase
+
+    Args:
+       fn (function): the benchmark, returning (phase, seconds) pairs
+       repeat (int): the number of runs
+       args: arguments to the benchmark
+
+    Returns:
+       list of tuples: (phase, seconds) pairs, the minimum of the runs
+    """
+    best = OrderedDict()
+    for r in range( repeat ):
+        for phase, seconds in fn( *args ):
+            best[phase] = min( seconds, best.get( phase, seconds ) )
+
+    return list( best.items() )
+
+def results_write( output_filename ):
+    """Write the results of the benchmarks as json
+
+    Args:
+       output_filename (string): the file to write ("-" for stdout)
+
+    Returns:
+       Nothing
+    """
+    data = OrderedDict( [ ("lopper", LOPPER_VERSION),
+                          ("python", platform.python_version()),
+                          ("platform", platform.platform()),
+                          ("libfdt", libfdt),
+                          ("date", time.strftime( "%Y-%m-%dT%H:%M:%S%z" )),
+                          ("results", results) ] )
+
+    if output_filename == "-":
+        json.dump( data, sys.stdout, indent=1 )
+        print( "" )
+    else:
+        with open( output_filename, "w" ) as f:
+            json.dump( data, f, indent=1 )
+
+def results_compare( baseline_filename, threshold, minimum = 0.001, minimum_bytes = 65536 ):
+    """Compare the results to a baseline (a --json file of an earlier run)
+
+    Args:
+       baseline_filename (string): the baseline results
+       threshold (float): the ratio to the baseline that is a regression
+       minimum (float,optional): phases faster than this (seconds) in the
+                                 baseline are not compared, they are noise
+       minimum_bytes (int,optional): the same, for memory results
+
+    Returns:
+       list: the regressed results (dicts, with the baseline seconds and ratio)
+    """
+    try:
+        with open( baseline_filename ) as f:
+            baseline = json.load( f )
+    except (OSError, ValueError) as e:
+        print( "[ERROR]: cannot read baseline %s: %s" % (baseline_filename, e) )
+        sys.exit(1)
+
+    # results are seconds, or bytes (memory)
+    base = {}
+    for r in baseline.get( "results", [] ):
+        unit = "bytes" if "bytes" in r else "seconds"
+        base[(r["benchmark"], r["config"], r["phase"], unit)] = r[unit]
+
+    regressions = []
+    for r in results:
+        unit = "bytes" if "bytes" in r else "seconds"
+        try:
+            b = base[(r["benchmark"], r["config"], r["phase"], unit)]
+        except KeyError:
+            continue
+        if b < (minimum_bytes if unit == "bytes" else minimum):
+            continue
+
+        ratio = r[unit] / b
+        flag = ""
+        if ratio > threshold:
+            flag = " [REGRESSION]"
+            regressions.append( dict( r, baseline=b, ratio=ratio ) )
+        if unit == "bytes":
+            print( "[BENCH]: compare: %s: %-24s %10.2fMB %10.2fMB %6.2fx%s" %
+                   (r["benchmark"], r["phase"], b / 1e6, r[unit] / 1e6, ratio, flag) )
+        else:
+            print( "[BENCH]: compare: %s: %-24s %10.4fs %10.4fs %6.2fx%s" %
+                   (r["benchmark"], r["phase"], b, r[unit], ratio, flag) )
+
+    return regressions
+
+def usage():
+    prog = os.path.basename(sys.argv[0])
+    print('Usage: %s [OPTION]' % prog)
+    print('  -v, --verbose       enable verbose/debug processing (specify more than once for more verbosity)')
+    print('  -O, --outdir        directory to use (and keep) output files in, it is created if needed.')
+    print('                      default: a temporary directory, removed on exit')
+    print('    , --cdo=<n>       benchmark CDO generation for <n> synthetic subsystems' )
+    print('    , --domains=<sdt> benchmark pruning <sdt> to each of its domains. Lop files to apply')
+    print('                      first (i.e. lops/lop-versal-vck190_*) are passed as arguments' )
+    print('    , --no-libfdt     use the python dtlib backend instead of libfdt' )
+    print('    , --rest=<url>    load test the ReST server at <url>. Paths to request (i.e. /nodes?path=/cpus.*)' )
+    print('                      are passed as arguments (default: /domains, /nodes and /tree queries)' )
+    print('    , --clients=<n>   concurrent clients for --rest (default: 8)' )
+    print('    , --requests=<n>  total requests for --rest (default: 1000)' )
+    print('    , --suite=<spec>  benchmark setup, export/load, lops, filtering, domain pruning, output')
+    print('                      writing and the ReST endpoints against a synthetic tree. <spec> is')
+    print('                      "default" or <key>=<value>,... with keys: %s' % ",".join( sdt_spec_defaults.keys() ) )
+    print('                      (i.e. nodes=10000,depth=5). Can be passed more than once' )
+    print('    , --memory=<spec> measure the (tracemalloc) memory retained and peak of the setup, export,')
+    print('                      load, sync and dts output of a synthetic tree (see --suite for <spec>)' )
+    print('    , --generate=<file> write the synthetic tree of the (first) --suite spec to <file> and exit' )
+    print('    , --repeat=<n>    run each --suite <n> times, and report the best time of each phase' )
+    print('    , --json=<file>   write the results as json to <file> ("-" for stdout)' )
+    print('    , --baseline=<file> compare the results to a --json file of an earlier run, exit with an')
+    print('                      error if any phase regressed by more than --threshold' )
+    print('    , --threshold=<r> ratio to the baseline that is a regression (default: 1.25)' )
+    print('  -h, --help          display this help and exit')
+    print('')
+
+def main():
+    global verbose
+    global outdir
+    global cdo_subsystems
+    global domains_sdt
+    global lop_files
+    global libfdt
+    global rest_url
+    global rest_clients
+    global rest_requests
+    global suite_specs
+    global memory_specs
+    global generate_file
+    global repeat
+    global json_file
+    global baseline_file
+    global threshold
+
+    verbose = 0
+    outdir = None
+    cdo_subsystems = 0
+    domains_sdt = None
+    lop_files = []
+    libfdt = True
+    rest_url = None
+    rest_clients = 8
+    rest_requests = 1000
+    suite_specs = []
+    memory_specs = []
+    generate_file = None
+    repeat = 1
+    json_file = None
+    baseline_file = None
+    threshold = 1.25
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "vO:h", [ "no-libfdt", "cdo=", "domains=", "outdir=", "verbose", "help",
+                                                           "rest=", "clients=", "requests=", "suite=", "memory=",
+                                                           "generate=", "repeat=", "json=", "baseline=",
+                                                           "threshold=" ])
+    except getopt.GetoptError as err:
+        print('%s' % str(err))
+        usage()
+        sys.exit(2)
+
+    if opts == [] and args == []:
+        usage()
+        sys.exit(1)
+
+    for o, a in opts:
+        if o in ('-v', "--verbose"):
+            verbose = verbose + 1
+        elif o in ('-h', '--help'):
+            usage()
+            sys.exit(0)
+        elif o in ('-O', '--outdir'):
+            outdir = a
+        elif o in ('--cdo'):
+            cdo_subsystems = int(a)
+        elif o in ('--domains'):
+            domains_sdt = a
+        elif o in ( '--no-libfdt' ):
+            libfdt = False
+        elif o in ( '--rest' ):
+            rest_url = a.rstrip( "/" )
+        elif o in ( '--clients' ):
+            rest_clients = int(a)
+        elif o in ( '--requests' ):
+            rest_requests = int(a)
+        elif o in ( '--suite' ):
+            suite_specs.append( sdt_spec( a ) )
+        elif o in ( '--memory' ):
+            memory_specs.append( sdt_spec( a ) )
+        elif o in ( '--generate' ):
+            generate_file = a
+        elif o in ( '--repeat' ):
+            repeat = int(a)
+        elif o in ( '--json' ):
+            json_file = a
+        elif o in ( '--baseline' ):
+            baseline_file = a
+        elif o in ( '--threshold' ):
+            threshold = float(a)
+        else:
+            assert False, "unhandled option"
+
+    lop_files = args
+
+
+if __name__ == "__main__":
+
+    main()
+
+    if libfdt:
+        import lopper_fdt
+        lopper.lopper_type(lopper_fdt.LopperFDT)
+    else:
+        import lopper_dt
+        lopper.lopper_type(lopper_dt.LopperDT)
+
+    if generate_file:
+        spec = sdt_spec( "" )
+        if suite_specs:
+            spec = suite_specs[0]
+        count = synthetic_sdt( generate_file, spec["nodes"], spec["depth"], spec["phandles"],
+                               spec["domains"], spec["seed"] )
+        print( "[INFO]: wrote %s (%s nodes)" % (generate_file, count) )
+        sys.exit(0)
+
+    if not outdir:
+        # the benchmark files are only kept when -O is passed
+        outdir = tempfile.mkdtemp( prefix="lopper-bench-" )
+        atexit.register( shutil.rmtree, outdir, True )
+    else:
+        try:
+            os.makedirs( outdir, exist_ok=True )
+        except OSError as e:
+            print( "[ERROR]: cannot create output directory %s: %s" % (outdir,e) )
+            sys.exit(1)
+
+    if cdo_subsystems:
+        report( "cdo", bench_cdo( cdo_subsystems, outdir, verbose ) )
+
+    if domains_sdt:
+        report( "domains", bench_domains( domains_sdt, lop_files, outdir, libfdt, verbose ) )
+
+    if rest_url:
+        paths = lop_files
+        if not paths:
+            paths = [ "/domains", "/nodes?path=/.*", "/nodes?path=/.*&details=True&limit=50", "/tree" ]
+        rest_results = bench_rest( rest_url, paths, rest_clients, rest_requests, verbose )
+        print( "[BENCH]: rest: %s requests (%s errors), %s clients, %.4fs" %
+               (rest_results["requests"], rest_results["errors"], rest_clients, rest_results["seconds"]) )
+        print( "[BENCH]: rest: %-24s %10.1f req/s" % ("throughput", rest_results["throughput"]) )
+        for p in [ "p50", "p99", "max" ]:
+            print( "[BENCH]: rest: %-24s %10.4fs" % ("latency " + p, rest_results[p]) )
+        rest_config = "url=%s,clients=%s,requests=%s" % (rest_url, rest_clients, rest_requests)
+        # throughput is recorded as its inverse, so all results are seconds
+        # (and bigger is worse)
+        if rest_results["requests"]:
+            results.append( { "benchmark": "rest", "config": rest_config, "phase": "per request",
+                              "seconds": rest_results["seconds"] / rest_results["requests"] } )
+        for p in [ "p50", "p99", "max" ]:
+            results.append( { "benchmark": "rest", "config": rest_config, "phase": "latency " + p,
+                              "seconds": rest_results[p] } )
+
+    for spec in suite_specs:
+        report( "suite", bench_repeat( bench_suite, repeat, spec, outdir, libfdt, verbose ), spec_string( spec ) )
+
+    for spec in memory_specs:
+        report_memory( "memory", bench_memory( spec, outdir, libfdt, verbose ), spec_string( spec ) )
+
+    if json_file:
+        results_write( json_file )
+
+    if baseline_file:
+        regressions = results_compare( baseline_file, threshold )
+        if regressions:
+            print( "[ERROR]: %s phases regressed by more than %sx" % (len(regressions), threshold) )
+            sys.exit(1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+#/*
+# * Copyright (c) 2021 Xilinx Inc. All rights reserved.
+# *
+# * SPDX-License-Identifier: BSD-3-Clause
+# */
+
+import sys
+import os
+import json
+import array
+import socket
+import tempfile
+
+# A stand in for lopper.py, that runs the command line in a resident lopper
+# daemon (lopper_daemon.py). The arguments are the same as lopper.py's:
+#
+#   lopper_client.py -f -i lops/lop-load.dts <sdt> <output>
+#
+# The daemon runs the job in the client's working directory and environment,
+# and writes to the client's stdout and stderr. The exit code of the client
+# is the exit code of the job.
+#
+# If no daemon is listening on the socket ($LOPPER_DAEMON_SOCKET, or the
+# default daemon socket), lopper.py is run directly. Only the standard
+# library is imported, so the client starts quickly.
+
+lopper_directory = os.path.dirname(os.path.realpath(__file__))
+
+def daemon_socket():
+    try:
+        return os.environ['LOPPER_DAEMON_SOCKET']
+    except KeyError:
+        return os.path.join( tempfile.gettempdir(), "lopper-%s.sock" % os.getuid() )
+
+def send_request( conn, argv ):
+    """Send a job request to the daemon
+
+    Args:
+       conn (socket): the daemon connection
+       argv (list): the lopper command line arguments
+
+    Returns:
+       Nothing
+    """
+    request = { 'argv': argv,
+                'cwd': os.getcwd(),
+                'env': dict( os.environ ) }
+    data = json.dumps( request ).encode() + b"\n"
+
+    # our stdin, stdout and stderr go with the first chunk of the request
+    fds = array.array( "i", [ 0, 1, 2 ] )
+    sent = conn.sendmsg( [ data ], [ (socket.SOL_SOCKET, socket.SCM_RIGHTS, fds) ] )
+    conn.sendall( data[sent:] )
+
+def recv_reply( conn ):
+    data = b""
+    while not data.endswith( b"\n" ):
+        chunk = conn.recv( 4096 )
+        if not chunk:
+            break
+        data += chunk
+
+    return json.loads( data.decode() )
+
+if __name__ == "__main__":
+
+    conn = socket.socket( socket.AF_UNIX, socket.SOCK_STREAM )
+    try:
+        conn.connect( daemon_socket() )
+    except (FileNotFoundError, ConnectionRefusedError):
+        # no daemon, run lopper directly
+        lopper_py = os.path.join( lopper_directory, "lopper.py" )
+        os.execv( sys.executable, [ sys.executable, lopper_py ] + sys.argv[1:] )
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    try:
+        send_request( conn, sys.argv[1:] )
+        reply = recv_reply( conn )
+    except (OSError, ValueError) as e:
+        print( "[ERROR]: lopper daemon request failed: %s" % e )
+        sys.exit(1)
+
+    sys.exit( reply['exit'] )
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+
+#/*
+# * Copyright (c) 2021 Xilinx Inc. All rights reserved.
+# *
+# * SPDX-License-Identifier: BSD-3-Clause
+# */
+
+import sys
+import os
+import re
+import getopt
+import json
+import array
+import signal
+import socket
+import socketserver
+import hashlib
+import shutil
+import subprocess
+import tempfile
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+
+import lopper
+import lopper_trace
+
+# A resident lopper. The daemon imports lopper (and its dependencies) once,
+# and keeps the system device trees it loads in memory, so that repeated
+# invocations against the same tree skip the python startup, the
+# compilation of the tree and the tree load.
+#
+# Jobs are lopper.py command lines, sent by lopper_client.py over a unix
+# domain socket along with the client's working directory, environment and
+# stdin/stdout/stderr. Each job is run in a forked child of the daemon: the
+# child gets a copy-on-write clone of the cached tree, runs the lops and
+# assists of the job against it and writes its outputs, exactly as
+# lopper.py would. The cached tree is never modified.
+#
+# Trees are cached by the content of the system device tree, after it is
+# preprocessed (so any file that it includes is part of the key), the
+# content of the files that are merged into it, and the options that change
+# how it is loaded. Lop files are loaded for each job.
+
+def daemon_socket():
+    """Return the path of the daemon socket
+
+    LOPPER_DAEMON_SOCKET is used if set, otherwise the socket is in the
+    temporary directory, with the user id in its name.
+
+    Args:
+       None
+
+    Returns:
+       string: the socket path
+    """
+    try:
+        return os.environ['LOPPER_DAEMON_SOCKET']
+    except KeyError:
+        return os.path.join( tempfile.gettempdir(), "lopper-%s.sock" % os.getuid() )
+
+def recv_request( conn ):
+    """Receive a job request from a client
+
+    A request is a single line of json, the client's stdin, stdout and stderr
+    are passed with it as SCM_RIGHTS ancillary data.
+
+    Args:
+       conn (socket): the client connection
+
+    Returns:
+       tuple: (request dictionary, list of file descriptors)
+    """
+    fds = array.array( "i" )
+    data = b""
+    while not data.endswith( b"\n" ):
+        msg, ancdata, flags, addr = conn.recvmsg( 65536, socket.CMSG_LEN( 3 * fds.itemsize ) )
+        if not msg:
+            break
+        data += msg
+        for level, ctype, cdata in ancdata:
+            if level == socket.SOL_SOCKET and ctype == socket.SCM_RIGHTS:
+                cdata = cdata[:len(cdata) - (len(cdata) % fds.itemsize)]
+                fds.frombytes( cdata )
+
+    return json.loads( data.decode() ), list( fds )
+
+def exit_code( e ):
+    """Convert a SystemExit to a process exit code"""
+    if e.code is None:
+        return 0
+    if isinstance( e.code, int ):
+        return e.code
+    print( e.code, file=sys.stderr )
+    return 1
+
+def preprocessed_digest( sdt_file, sdt_files, include_paths, outdir ):
+    """Return a digest of a device tree source, after preprocessing
+
+    The dts files are concatenated and preprocessed as LopperSDT.setup()
+    does, so the digest covers every file that cpp includes (wherever it
+    finds them, i.e. through -I paths in LOPPER_PPFLAGS) and the macros
+    that are defined for it. Line markers are not part of the digest.
+
+    Args:
+       sdt_file (string): the system device tree (dts)
+       sdt_files (list): input files that are merged into the tree
+       include_paths (string): space separated include directories
+       outdir (string): the output directory of the job
+
+    Returns:
+       bytes: the digest (sha256)
+    """
+    line_marker = re.compile( rb'^\s*#\s*(line\s+)?\d+(\s|$)' )
+
+    with tempfile.TemporaryDirectory( prefix="lopper-daemon-" ) as tmpdir:
+        fp = sdt_file
+        if sdt_files:
+            fp = os.path.join( tmpdir, os.path.basename( sdt_file ) )
+            with open( fp, 'wb' ) as wfd:
+                for f in [ sdt_file ] + sdt_files:
+                    if re.search( ".dts$", f ):
+                        with open( f, 'rb' ) as fd:
+                            shutil.copyfileobj( fd, wfd )
+
+        includes = "%s %s %s " % (include_paths, Path( sdt_file ).parent, outdir)
+        preprocessed = lopper.Lopper.dt_preprocess( fp, includes, tmpdir )
+
+        h = hashlib.sha256()
+        with open( preprocessed, 'rb' ) as f:
+            for line in f:
+                if not line_marker.match( line ):
+                    h.update( line )
+
+    return h.digest()
+
+def tree_key( sdt_file, sdt_files, libfdt, options, include_paths = "", outdir = "./" ):
+    """Return the cache key of a system device tree
+
+    A dts system device tree is preprocessed to compute its key (see
+    preprocessed_digest()), other inputs are keyed by their content.
+
+    Args:
+       sdt_file (string): the system device tree
+       sdt_files (list): input files that are merged into the tree
+       libfdt (boolean): whether libfdt is used to load the tree
+       options (list): other options that change how the tree is loaded
+       include_paths (string,optional): space separated include directories
+       outdir (string,optional): the output directory of the job
+
+    Returns:
+       string: the key (a sha256 digest), None if the tree can't be
+               preprocessed (and shouldn't be cached)
+    """
+    h = hashlib.sha256()
+    h.update( repr( (libfdt, options) ).encode() )
+
+    files = [ sdt_file ] + sdt_files
+    if re.search( ".dts$", sdt_file ):
+        try:
+            h.update( preprocessed_digest( sdt_file, sdt_files, include_paths, outdir ) )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+        # the dts files are covered by the digest
+        files = [ f for f in files if not re.search( ".dts$", f ) ]
+
+    for f in files:
+        f = Path( f ).resolve()
+        h.update( str(f).encode() )
+        with open( f, 'rb' ) as fd:
+            h.update( hashlib.sha256( fd.read() ).digest() )
+
+    return h.hexdigest()
+
+class LopperDaemon:
+    """A resident lopper, with a cache of loaded system device trees
+
+    Attributes:
+      - trees (OrderedDict): cached LopperSDT objects, by key, least recently used first
+      - max_trees (int): the maximum number of cached trees
+      - verbose (int): verbosity level of the daemon
+      - hits, misses (int): cache statistics
+    """
+    def __init__( self, max_trees = 4, verbose = 0 ):
+        self.trees = OrderedDict()
+        self.max_trees = max_trees
+        self.verbose = verbose
+        self.hits = 0
+        self.misses = 0
+
+    def load( self, sdt_files ):
+        """Return the (cached) system device tree for the current job
+
+        The lopper globals must have been set from the job's command line
+        (lopper.main()).
+
+        Args:
+           sdt_files (list): the input files that are merged into the tree
+
+        Returns:
+           LopperSDT: the loaded tree
+        """
+        key = tree_key( lopper.sdt, sdt_files, lopper.libfdt,
+                        [ lopper.permissive, lopper.overlay, lopper.enhanced_print ],
+                        outdir = lopper.outdir )
+        try:
+            device_tree = self.trees.pop( key )
+            self.trees[key] = device_tree
+            self.hits += 1
+            return device_tree
+        except KeyError:
+            self.misses += 1
+
+        device_tree = lopper.LopperSDT( lopper.sdt )
+        lopper.sdt_options( device_tree )
+        device_tree.setup( lopper.sdt, sdt_files, "", True, lopper.libfdt )
+
+        # the tree is in memory, the compiled temporaries aren't needed
+        device_tree.cleanup()
+
+        if key is None:
+            # the load reported why the tree couldn't be preprocessed
+            return device_tree
+
+        self.trees[key] = device_tree
+        while len(self.trees) > self.max_trees:
+            self.trees.popitem( last=False )
+
+        return device_tree
+
+    def run_job( self, device_tree, lop_files ):
+        """Run a job against a tree, in the current process
+
+        Args:
+           device_tree (LopperSDT): the tree to process
+           lop_files (list): the lop files of the job
+
+        Returns:
+           int: the exit code of the job
+        """
+        try:
+            if lopper.dump_dtb:
+                lopper.Lopper.dtb_dts_export( lopper.sdt, lopper.verbose )
+                return 0
+
+            if lopper.trace_file:
+                lopper_trace.start( lopper.trace_file, lopper.trace_format )
+
+            if lopper.metrics_file:
+                lopper.lopper_tree.metrics.enable()
+
+            lopper.sdt_options( device_tree )
+            device_tree.lops = []
+            device_tree.assists = []
+            device_tree.lops_load( lop_files, lopper.force )
+
+            lopper.sdt_process( device_tree )
+        except SystemExit as e:
+            return exit_code( e )
+        except Exception as e:
+            traceback.print_exc()
+            return 1
+        finally:
+            # the job exits without running atexit handlers
+            lopper_trace.stop()
+            if lopper.lopper_tree.metrics.enabled:
+                try:
+                    lopper.lopper_tree.metrics.dump( lopper.metrics_file )
+                except OSError as e:
+                    print( "[WARNING]: could not write metrics %s: %s" % (lopper.metrics_file,e) )
+
+        return 0
+
+    def run( self, request, fds ):
+        """Run a job request
+
+        The command line is parsed and the tree loaded (or found in the cache)
+        by the daemon, and the job is run by a forked child. The client's
+        stdout and stderr are used for all of the output of the job (including
+        that of the tree load, and any tools it runs).
+
+        Args:
+           request (dict): the job request (argv, cwd, env)
+           fds (list): the client's stdin, stdout and stderr
+
+        Returns:
+           int: the exit code of the job
+        """
+        cwd = os.getcwd()
+        environ = dict( os.environ )
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = [ os.dup( 1 ), os.dup( 2 ) ]
+        try:
+            os.dup2( fds[1], 1 )
+            os.dup2( fds[2], 2 )
+            os.chdir( request['cwd'] )
+            os.environ.clear()
+            os.environ.update( request['env'] )
+
+            try:
+                lopper.main( request['argv'] )
+
+                if lopper.server:
+                    print( "[ERROR]: --server is not supported by the lopper daemon" )
+                    return 1
+
+                if lopper.libfdt:
+                    lopper.lopper_type( lopper.lopper_fdt.LopperFDT )
+                else:
+                    import lopper_dt
+                    lopper.lopper_type( lopper_dt.LopperDT )
+
+                device_tree = None
+                lop_files = []
+                if not lopper.dump_dtb:
+                    lop_files, sdt_files = lopper.LopperSDT( lopper.sdt ).input_files_split( lopper.inputfiles )
+                    device_tree = self.load( sdt_files )
+            except SystemExit as e:
+                return exit_code( e )
+            except Exception as e:
+                traceback.print_exc()
+                return 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+
+            pid = os.fork()
+            if pid == 0:
+                code = 1
+                try:
+                    os.dup2( fds[0], 0 )
+                    code = self.run_job( device_tree, lop_files )
+                finally:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit( code )
+
+            pid, status = os.waitpid( pid, 0 )
+            if os.WIFEXITED( status ):
+                return os.WEXITSTATUS( status )
+
+            return 1
+        finally:
+            os.dup2( saved_fds[0], 1 )
+            os.dup2( saved_fds[1], 2 )
+            for fd in saved_fds:
+                os.close( fd )
+            os.chdir( cwd )
+            os.environ.clear()
+            os.environ.update( environ )
+
+class LopperDaemonHandler( socketserver.BaseRequestHandler ):
+    def handle( self ):
+        fds = []
+        try:
+            request, fds = recv_request( self.request )
+            if len(fds) != 3:
+                raise ValueError( "expected 3 file descriptors, got %s" % len(fds) )
+
+            code = self.server.daemon.run( request, fds )
+            if self.server.daemon.verbose:
+                print( "[INFO]: daemon: %s: exit %s (%s cache hits, %s misses)" %
+                       (" ".join( request['argv'] ), code, self.server.daemon.hits, self.server.daemon.misses) )
+        except Exception as e:
+            print( "[WARNING]: daemon: invalid request: %s" % e )
+            code = 1
+        finally:
+            for fd in fds:
+                os.close( fd )
+
+        self.request.sendall( json.dumps( { 'exit': code } ).encode() + b"\n" )
+
+class LopperDaemonServer( socketserver.UnixStreamServer ):
+    def __init__( self, path, daemon ):
+        self.daemon = daemon
+
+        # a socket left behind by a daemon that didn't exit cleanly
+        if os.path.exists( path ):
+            os.unlink( path )
+
+        # only the user that started the daemon can connect to it
+        umask = os.umask( 0o077 )
+        try:
+            super().__init__( path, LopperDaemonHandler )
+        finally:
+            os.umask( umask )
+
+def usage():
+    prog = os.path.basename(sys.argv[0])
+    print('Usage: %s [OPTION]' % prog)
+    print('  -v, --verbose       enable verbose/debug processing (specify more than once for more verbosity)')
+    print('  -s, --socket        unix socket to listen on (default: $LOPPER_DAEMON_SOCKET or %s)' % daemon_socket() )
+    print('    , --max-trees=<n> maximum number of system device trees to keep loaded (default: 4)' )
+    print('  -h, --help          display this help and exit')
+    print('')
+    print('Jobs are submitted with lopper_client.py, which takes the same arguments as lopper.py')
+    print('')
+
+def main():
+    global verbose
+    global socket_path
+    global max_trees
+
+    verbose = 0
+    socket_path = daemon_socket()
+    max_trees = 4
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "vs:h", [ "verbose", "socket=", "max-trees=", "help" ])
+    except getopt.GetoptError as err:
+        print('%s' % str(err))
+        usage()
+        sys.exit(2)
+
+    for o, a in opts:
+        if o in ('-v', "--verbose"):
+            verbose = verbose + 1
+        elif o in ('-h', '--help'):
+            usage()
+            sys.exit(0)
+        elif o in ('-s', '--socket'):
+            socket_path = a
+        elif o in ('--max-trees'):
+            try:
+                max_trees = int(a)
+            except ValueError:
+                print( "[ERROR]: invalid tree count %s" % a )
+                sys.exit(1)
+        else:
+            assert False, "unhandled option"
+
+if __name__ == "__main__":
+
+    main()
+
+    daemon = LopperDaemon( max_trees, verbose )
+    server = LopperDaemonServer( socket_path, daemon )
+
+    def shutdown( signum, frame ):
+        raise KeyboardInterrupt
+
+    signal.signal( signal.SIGTERM, shutdown )
+
+    if verbose:
+        print( "[INFO]: lopper daemon listening on %s" % socket_path )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink( socket_path )
+        except OSError:
+            pass
+
+        if verbose:
+            print( "[INFO]: lopper daemon exiting (%s cache hits, %s misses)" % (daemon.hits, daemon.misses) )
@@ -9,22 +9,329 @@
 # * SPDX-License-Identifier: BSD-3-Clause
 # */
 
-import requests
 import getopt
 import sys
 import os
 import json
+import gzip
+import tempfile
+import contextlib
+import http.client
+import urllib.parse
+from pathlib import Path
+from collections import OrderedDict
 
 # a simple script to replace calls like this:
 # curl http://127.0.0.1:5000/domains | python3 -c 'import json,sys;print( json.load(sys.stdin))'
+#
+# It can also run many node queries (bulk mode) against a server, over a
+# single connection, or against a local system device tree (without a
+# server). Local trees are loaded once, and then kept as a snapshot in a
+# cache directory.
 
-VERSION="0.1-alpha"
+VERSION="0.2-alpha"
+
+# queries sent per bulk request
+bulk_batch = 500
+
+class LopperQueryClient:
+    """A client of a lopper ReST server (lopper.py --server)
+
+    Requests are made over a single (keep-alive) connection, which is
+    re-opened if the server closes it.
+
+    Attributes:
+       - host, port: the server
+       - conn (HTTPConnection): the connection
+    """
+    def __init__( self, url ):
+        u = urllib.parse.urlsplit( url )
+        if u.scheme != "http" or not u.hostname:
+            raise ValueError( "invalid server url: %s" % url )
+        self.host = u.hostname
+        self.port = u.port or 80
+        self.conn = None
+
+    def request( self, method, path, body = None, headers = {} ):
+        """Make a request
+
+        Args:
+           method (string): GET, POST, etc
+           path (string): the path (and query) to request
+           body (bytes,optional): the request body
+           headers (dict,optional): request headers
+
+        Returns:
+           HTTPResponse: the response. It must be read before the next request
+        """
+        for attempt in range( 2 ):
+            if not self.conn:
+                self.conn = http.client.HTTPConnection( self.host, self.port )
+            try:
+                self.conn.request( method, path, body, headers )
+                return self.conn.getresponse()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    ConnectionResetError, BrokenPipeError):
+                # the server closed the (idle) connection, reconnect once
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+    def get( self, path ):
+        """GET a path
+
+        Args:
+           path (string): the path (and query) to request
+
+        Returns:
+           tuple: (status, response body bytes)
+        """
+        r = self.request( "GET", path, headers={ "Accept-Encoding": "gzip" } )
+        data = r.read()
+        if r.getheader( "Content-Encoding" ) == "gzip":
+            data = gzip.decompress( data )
+
+        return r.status, data
+
+    def bulk( self, queries ):
+        """Run queries with the bulk endpoint
+
+        The queries are sent in batches, and the results are streamed back.
+
+        Args:
+           queries (iterable of dict): the queries
+
+        Returns:
+           generator: a json string (line) per query
+        """
+        batch = []
+        for q in queries:
+            batch.append( q )
+            if len(batch) >= bulk_batch:
+                yield from self.bulk_batch( batch )
+                batch = []
+        if batch:
+            yield from self.bulk_batch( batch )
+
+    def bulk_batch( self, batch ):
+        body = "".join( [ json.dumps( q ) + "\n" for q in batch ] ).encode()
+        r = self.request( "POST", "/bulk", body, { "Content-Type": "application/x-ndjson" } )
+        if r.status != 200:
+            raise ValueError( "bulk request failed: %s %s" % (r.status, r.read().decode().strip()) )
+
+        while True:
+            line = r.readline()
+            if not line:
+                break
+            yield line.decode().rstrip( "\n" )
+
+def query_cache_dir():
+    """Return the directory that local tree snapshots are cached in
+
+    LOPPER_QUERY_CACHE is used if set (an empty value disables the cache),
+    otherwise lopper/query in the user's cache directory.
+
+    Args:
+       None
+
+    Returns:
+       string: the directory
+    """
+    import lopper
+    return lopper.cache_dir( "query", "LOPPER_QUERY_CACHE" )
+
+# the types and formats of properties, as they are found in a tree export
+snapshot_types = { t.__name__: t for t in [ list, str, int, dict, bool, float ] }
+
+def snapshot_encode( obj ):
+    """json encode the values of a tree export that json doesn't handle
+
+    Args:
+       obj: a value of the export
+
+    Returns:
+       dict: the encoded value. TypeError if it can't be encoded
+    """
+    from lopper_fmt import LopperFmt
+
+    if isinstance( obj, LopperFmt ):
+        return { "__lopper_fmt__": obj.name }
+    if isinstance( obj, type ) and snapshot_types.get( obj.__name__ ) is obj:
+        return { "__lopper_type__": obj.__name__ }
+
+    raise TypeError( "%s can't be stored in a snapshot" % type(obj).__name__ )
+
+def snapshot_decode( pairs ):
+    """Decode a json object of a tree snapshot (see snapshot_encode())
+
+    Args:
+       pairs (list): the (key, value) pairs of the object
+
+    Returns:
+       OrderedDict, or the decoded value
+    """
+    from lopper_fmt import LopperFmt
+
+    if len(pairs) == 1:
+        key, value = pairs[0]
+        if key == "__lopper_fmt__":
+            return LopperFmt[value]
+        if key == "__lopper_type__":
+            return snapshot_types[value]
+
+    return OrderedDict( pairs )
+
+def local_tree( sdt_file, libfdt, verbose = 0 ):
+    """Load a system device tree for local queries
+
+    The loaded tree is saved as a snapshot (json, keyed by the content of
+    the preprocessed tree), which is loaded in place of the tree by later
+    queries. Snapshots are only used from a cache directory that belongs
+    to the user (see lopper.cache_ok()).
+
+    Args:
+       sdt_file (string): the system device tree
+       libfdt (boolean): use libfdt to load the tree
+       verbose (int,optional): verbosity level
+
+    Returns:
+       LopperSDT: the system device tree
+    """
+    import lopper
+    from lopper_daemon import tree_key
+
+    if libfdt:
+        import lopper_fdt
+        lopper.lopper_type( lopper_fdt.LopperFDT )
+    else:
+        import lopper_dt
+        lopper.lopper_type( lopper_dt.LopperDT )
+
+    cache_dir = query_cache_dir()
+    key = tree_key( sdt_file, [], libfdt, [] )
+
+    device_tree = lopper.LopperSDT( sdt_file )
+
+    # the tree can't be preprocessed (the load reports why), or the cache
+    # is disabled or not ours
+    cache_ok = key is not None and cache_dir and lopper.cache_ok( cache_dir )
+    if cache_ok:
+        snapshot = os.path.join( cache_dir, key + ".json" )
+
+    if cache_ok and lopper.cache_ok( snapshot ):
+        try:
+            with open( snapshot ) as f:
+                dct = json.load( f, object_pairs_hook=snapshot_decode )
+            device_tree.tree = lopper.LopperTree()
+            device_tree.tree.load( dct )
+            if verbose:
+                print( "[INFO]: loaded %s from snapshot %s" % (sdt_file, snapshot), file=sys.stderr )
+            return device_tree
+        except (OSError, ValueError, KeyError):
+            pass
+
+    outdir = tempfile.mkdtemp( prefix="lopper-query-" )
+    try:
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = False
+        device_tree.outdir = outdir
+        device_tree.save_temps = False
+        device_tree.cleanup_flag = True
+        device_tree.use_libfdt = libfdt
+        # stdout carries the query results
+        with contextlib.redirect_stdout( sys.stderr ):
+            device_tree.setup( sdt_file, [], "", True, libfdt = libfdt )
+            device_tree.cleanup()
+    finally:
+        import shutil
+        shutil.rmtree( outdir, ignore_errors=True )
+
+    if cache_ok:
+        try:
+            data = json.dumps( device_tree.tree.export(), default=snapshot_encode )
+            os.makedirs( cache_dir, mode=0o700, exist_ok=True )
+            with tempfile.NamedTemporaryFile( "w", dir=cache_dir, delete=False ) as f:
+                f.write( data )
+            os.replace( f.name, snapshot )
+        except (OSError, TypeError, ValueError) as e:
+            print( "[WARNING]: could not save tree snapshot: %s" % e, file=sys.stderr )
+
+    return device_tree
+
+def local_bulk( device_tree, queries ):
+    """Run queries against a local tree
+
+    Args:
+       device_tree (LopperSDT): the tree to query
+       queries (iterable of dict): the queries
+
+    Returns:
+       generator: a json string (line) per query, as returned by the server
+    """
+    from lopper_rest import nodes_query
+
+    for q in queries:
+        try:
+            node_data, total = nodes_query( device_tree.tree, q )
+            result = { "query": q, "total": total, "nodes": node_data }
+        except (ValueError, TypeError, AttributeError) as e:
+            result = { "query": q, "error": str(e) }
+
+        yield json.dumps( result )
+
+def read_queries( f, details ):
+    """Read bulk queries
+
+    A query is a line of json (the arguments of the /nodes endpoint, see
+    lopper_rest.nodes_query()), a phandle (a number) or a selector.
+
+    Args:
+       f (file): the file to read
+       details (boolean): return the properties of the nodes (selector and
+                          phandle queries)
+
+    Returns:
+       generator: the queries (dictionaries)
+    """
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith( "#" ):
+            continue
+
+        if line.startswith( "{" ):
+            try:
+                yield json.loads( line )
+            except ValueError as e:
+                print( "[ERROR]: invalid query: %s: %s" % (line,e) )
+                sys.exit(1)
+            continue
+
+        try:
+            q = { "phandle": int( line, 0 ) }
+        except ValueError:
+            q = { "select": line }
+
+        if details:
+            q["details"] = True
+
+        yield q
 
 def usage():
     prog = os.path.basename(sys.argv[0])
     print('Usage: %s [OPTION] url [<output file>]...' % prog)
     print('  -v, --verbose       enable verbose/debug processing (specify more than once for more verbosity)')
     print('  -j, --json          print unprocessed json response' )
+    print('  -o, --output        output file')
+    print('  -f, --force         force overwrite output file(s)')
+    print('  -b, --bulk=<file>   run the queries in <file> ("-" for stdin), one per line, and output')
+    print('                      the results as ndjson. A query is a json object (/nodes arguments),')
+    print('                      a phandle or a selector. url is the server (i.e. http://127.0.0.1:5000)')
+    print('  -d, --details       return node properties for phandle and selector bulk queries')
+    print('  -l, --local=<sdt>   query a system device tree directly, without a server. url is')
+    print('                      then the path (i.e. /nodes?select=cpu@*), and is not needed for --bulk')
+    print('    , --no-libfdt     use the python dtlib backend instead of libfdt (--local)' )
     print('    , --version       output the version and exit')
     print('')
     print(' This is a simple script to replace curl and python on the command line' )
@@ -34,14 +341,27 @@ def usage():
 
 def main():
     global verbose
-    global json
+    global json_output
     global url
+    global output
+    global force
+    global bulk
+    global details
+    global local_sdt
+    global libfdt
 
     url = None
     verbose = 0
-    json = False
+    json_output = False
+    output = None
+    force = False
+    bulk = None
+    details = False
+    local_sdt = None
+    libfdt = True
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "vj", [ "version", "json"])
+        opts, args = getopt.getopt(sys.argv[1:], "vjo:fb:dl:", [ "version", "json", "verbose", "output=", "force",
+                                                                "bulk=", "details", "local=", "no-libfdt" ])
     except getopt.GetoptError as err:
         print('%s' % str(err))
         usage()
@@ -54,8 +374,20 @@ def main():
     for o, a in opts:
         if o in ('-v', "--verbose"):
             verbose = verbose + 1
-        elif o in ('--json'):
-            json=True
+        elif o in ('-j', '--json'):
+            json_output=True
+        elif o in ('-o', '--output'):
+            output = a
+        elif o in ('-f', '--force'):
+            force = True
+        elif o in ('-b', '--bulk'):
+            bulk = a
+        elif o in ('-d', '--details'):
+            details = True
+        elif o in ('-l', '--local'):
+            local_sdt = a
+        elif o in ('--no-libfdt'):
+            libfdt = False
         elif o in ('--version'):
             print( "%s" % VERSION )
             sys.exit(0)
@@ -63,58 +395,95 @@ def main():
             assert False, "unhandled option"
 
     # any args should be <url> <output file>
-    module_name = ""
-    module_args= []
-    module_args_found = False
     for idx, item in enumerate(args):
-        # validate that the system device tree file exists
         if idx == 0:
             url = item
-        else:
-            if item == "--":
-                module_args_found = True
-
-            # the last input is the output file. It can't already exist, unless
-            # --force was passed
-            if not module_args_found:
-                if idx == 1:
-                    if output:
-                        print( "Error: output was already provided via -o\n")
-                        usage()
-                        sys.exit(1)
-                    else:
-                        output = item
-                        output_file = Path(output)
-                        if output_file.exists():
-                            if not force:
-                                print( "Error: output file %s exists, and -f was not passed" % output )
-                                sys.exit(1)
+        elif idx == 1:
+            if output:
+                print( "Error: output was already provided via -o\n")
+                usage()
+                sys.exit(1)
             else:
-                # module arguments
-                if not item == "--":
-                    if not module_name:
-                        module_name = item
-                    else:
-                        module_args.append( item )
-
-    if not url:
+                output = item
+
+    if output:
+        output_file = Path(output)
+        if output_file.exists():
+            if not force:
+                print( "Error: output file %s exists, and -f was not passed" % output )
+                sys.exit(1)
+
+    if not url and not (bulk and local_sdt):
         print( "[ERROR]: no url was supplied\n" )
         usage()
         sys.exit(1)
 
-    if verbose:
-        print( "[INFO]: url: %s" % url )
-
-    r = requests.get( url )
-    if not r:
-        print( r )
-    else:
-        if json:
-            print( r.text )
-        else:
-            print( r.json() )
+    if local_sdt and not Path(local_sdt).exists():
+        print( "[ERROR]: system device tree %s does not exist" % local_sdt )
+        sys.exit(1)
 
+    if verbose and url:
+        print( "[INFO]: url: %s" % url, file=sys.stderr )
 
 if __name__ == "__main__":
     main()
 
+    if output:
+        out = open( output, "w" )
+    else:
+        out = sys.stdout
+
+    device_tree = None
+    client = None
+    if local_sdt:
+        device_tree = local_tree( local_sdt, libfdt, verbose )
+    else:
+        try:
+            client = LopperQueryClient( url )
+        except ValueError as e:
+            print( "[ERROR]: %s" % e )
+            sys.exit(1)
+
+    try:
+        if bulk:
+            if bulk == "-":
+                queries = read_queries( sys.stdin, details )
+            else:
+                try:
+                    queries = read_queries( open( bulk ), details )
+                except OSError as e:
+                    print( "[ERROR]: cannot read queries: %s" % e )
+                    sys.exit(1)
+
+            if device_tree:
+                results = local_bulk( device_tree, queries )
+            else:
+                results = client.bulk( queries )
+
+            for line in results:
+                print( line, file=out )
+        else:
+            if device_tree:
+                import lopper_rest
+                lopper_rest.sdt = device_tree
+                u = urllib.parse.urlsplit( url )
+                r = lopper_rest.app.test_client().get( u.path + ("?" + u.query if u.query else "") )
+                status, data = r.status_code, r.get_data()
+            else:
+                u = urllib.parse.urlsplit( url )
+                status, data = client.get( u.path + ("?" + u.query if u.query else "") )
+
+            if status >= 400:
+                print( "[ERROR]: %s: %s" % (status, data.decode().strip()) )
+                sys.exit(1)
+
+            if json_output:
+                print( data.decode().rstrip( "\n" ), file=out )
+            elif data:
+                print( json.loads( data ), file=out )
+    except (OSError, ValueError) as e:
+        print( "[ERROR]: query failed: %s" % e )
+        sys.exit(1)
+    finally:
+        if output:
+            out.close()
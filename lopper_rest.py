@@ -8,13 +8,20 @@
 # */
 
 from flask import Flask
-from flask import jsonify
-from flask import send_file
+from flask import request
+from flask import Response
 from flask_restful import Resource, Api, reqparse
-import pandas as pd
-import ast
-import tempfile
+import gzip
+import io
 import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from contextlib import redirect_stdout
 
 from collections import OrderedDict
 import lopper
@@ -24,77 +31,748 @@ api = Api(app)
 
 sdt = None
 
+class LopperRWLock:
+    """A reader/writer lock
+
+    Any number of readers can hold the lock at once, a writer holds it
+    alone. A waiting writer blocks new readers, so that a stream of queries
+    can't starve it.
+    """
+    def __init__( self ):
+        self.cond = threading.Condition()
+        self.readers = 0
+        self.writer = False
+        self.writers_waiting = 0
+
+    def acquire_read( self ):
+        with self.cond:
+            while self.writer or self.writers_waiting:
+                self.cond.wait()
+            self.readers += 1
+
+    def release_read( self ):
+        with self.cond:
+            self.readers -= 1
+            if not self.readers:
+                self.cond.notify_all()
+
+    def acquire_write( self ):
+        with self.cond:
+            self.writers_waiting += 1
+            while self.writer or self.readers:
+                self.cond.wait()
+            self.writers_waiting -= 1
+            self.writer = True
+
+    def release_write( self ):
+        with self.cond:
+            self.writer = False
+            self.cond.notify_all()
+
+    @contextmanager
+    def read( self ):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write( self ):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+# Requests are served by multiple threads. Queries hold the tree lock for
+# reading, anything that modifies the tree (or replaces sdt) must hold it
+# for writing.
+tree_lock = LopperRWLock()
+
+# bumped when the served tree is replaced (a rollback), it starts from the
+# time so that a restarted server doesn't reuse the ETags of an old one.
+tree_epoch = int( time.time() * 1000 )
+
+# named copies of the tree, for rollback and experiments
+snapshots = OrderedDict()
+
+# Responses are cached by request (path, query and whether the client takes
+# gzip), and are valid for as long as the tree is at the generation they
+# were built against. Any modification of the tree bumps its generation.
+response_cache = OrderedDict()
+response_cache_size = 64
+response_cache_lock = threading.Lock()
+
+# responses smaller than this are not worth compressing
+compress_min_size = 1024
+
+def tree_generation():
+    """Return the generation of the served tree
+
+    The generation identifies the tree (the epoch changes when the tree
+    is replaced) and its modification count.
+
+    Args:
+       None
+
+    Returns:
+       string: the generation
+    """
+    return "%x-%x" % (tree_epoch, sdt.tree.__generation__)
+
+def cached_response( build ):
+    """Build, or return the cached, response to the current request
+
+    The response carries an ETag of the tree generation, and a client that
+    already has it (If-None-Match) is answered with a 304. The body is json,
+    gzip compressed if the client accepts it.
+
+    Args:
+       build (function): returns (data, status, headers) for the request,
+                         data is encoded as json
+
+    Returns:
+       Response: the flask response
+    """
+    generation = tree_generation()
+    compress = request.accept_encodings.quality( "gzip" ) > 0
+
+    for etag in [ generation, generation + "-gz" ]:
+        if request.if_none_match.contains( etag ):
+            response = Response( status=304 )
+            response.set_etag( etag )
+            return response
+
+    key = ( request.full_path, compress )
+    with response_cache_lock:
+        try:
+            cached_generation, body, status, headers = response_cache[key]
+            if cached_generation == generation:
+                response_cache.move_to_end( key )
+                return Response( body, status, headers, mimetype="application/json" )
+        except KeyError:
+            pass
+
+    data, status, headers = build()
+
+    body = json.dumps( data ).encode() + b"\n"
+    headers = dict( headers )
+    headers["Vary"] = "Accept-Encoding"
+    headers["X-Lopper-Generation"] = generation
+    etag = generation
+    if compress and len(body) >= compress_min_size:
+        body = gzip.compress( body, 6 )
+        headers["Content-Encoding"] = "gzip"
+        etag = generation + "-gz"
+
+    if status == 200:
+        headers["ETag"] = '"%s"' % etag
+        with response_cache_lock:
+            response_cache[key] = ( generation, body, status, headers )
+            while len(response_cache) > response_cache_size:
+                response_cache.popitem( last=False )
+
+    return Response( body, status, headers, mimetype="application/json" )
+
+def nodes_query( tree, query ):
+    """Find the nodes for a query, and describe them
+
+    Args:
+       tree (LopperTree): the tree to query
+       query (dict): the query. Nodes are found by "path" (regex),
+                     "select" (selector) or "phandle". Optional: "details"
+                     (return properties), "props" (the properties to return,
+                     a list or comma separated string, implies details),
+                     "depth" (levels of subnodes of the matches to add),
+                     "offset" and "limit" (the window of results to return)
+
+    Returns:
+       tuple: (OrderedDict: node path -> properties (or None), count of the
+              matching nodes). ValueError if the query is invalid
+    """
+    if query.get( "select" ):
+        node_list = tree.query( query["select"] )
+    elif query.get( "path" ):
+        node_list = tree.nodes( query["path"] )
+    elif query.get( "phandle" ) != None:
+        phandle = query["phandle"]
+        if type(phandle) == str:
+            phandle = int( phandle, 0 )
+        node = tree.pnode( phandle )
+        node_list = [ node ] if node else []
+    else:
+        raise ValueError( "path, select or phandle is required" )
+
+    details = query.get( "details" ) in [ True, "True" ]
+    props = query.get( "props" )
+    if props:
+        if type(props) == str:
+            props = [ p.strip() for p in props.split(",") if p.strip() ]
+        details = True
+
+    depth = query.get( "depth" ) or 0
+    if depth > 0:
+        seen = set()
+        expanded = []
+        for n in node_list:
+            for s in n.subnodes( max_depth=depth ):
+                if not s.abs_path in seen:
+                    seen.add( s.abs_path )
+                    expanded.append( s )
+        node_list = expanded
+
+    total = len(node_list)
+    start = max( query.get( "offset" ) or 0, 0 )
+    if query.get( "limit" ) != None:
+        node_list = node_list[start:start + max( query["limit"], 0 )]
+    else:
+        node_list = node_list[start:]
+
+    node_data = OrderedDict()
+    if not details:
+        for n in node_list:
+            node_data[n.abs_path] = None
+    else:
+        for n in node_list:
+            prop_dict = OrderedDict()
+            if props:
+                for p in props:
+                    try:
+                        prop_dict[p] = n.__props__[p].string_val
+                    except KeyError:
+                        pass
+            else:
+                for p in n.__props__:
+                    prop_dict[p] = n.__props__[p].string_val
+
+            node_data[n.abs_path] = prop_dict
+
+    return node_data, total
+
 class Domains(Resource):
 
     def get(self):
-        try:
-            domains = sdt.tree.nodes( "/domains/[^/]*$" )
-        except:
-            domains = []
-
-        domain_names = ""
-        if domains:
-            # this just dumps the domain names comma separated. We loop
-            # up to the last element, adding the ",". We then add the
-            # last element after the loop, no "," .. we could also just
-            # remove the trailing "," after the loop, but the list slicing
-            # seems a bit faster.
-            for d in domains[:-1]:
-                domain_names += d.abs_path + ","
-            domain_names = domain_names + domains[-1].abs_path
-
-        return domain_names, 200
+        if not sdt:
+            return "", 204
+
+        def build():
+            try:
+                domains = sdt.tree.nodes( "/domains/[^/]*$" )
+            except:
+                domains = []
+
+            # the domain names, comma separated
+            domain_names = ",".join( [ d.abs_path for d in domains ] )
+
+            return domain_names, 200, {}
+
+        with tree_lock.read():
+            return cached_response( build )
 
 class Tree(Resource):
     def get(self):
-        fpp = tempfile.NamedTemporaryFile( delete=True )
-
-        if sdt:
-            lp = lopper.LopperTreePrinter( sdt.tree.fdt, False, fpp.name )
-            lp.exec()
+        parser = reqparse.RequestParser()
 
-            with open(fpp.name, 'r') as f:
-                filecontents = f.read()
+        # the node to print (and its subnodes), and how many levels of
+        # subnodes to print. By default, the whole tree.
+        parser.add_argument('path', required=False, default="/", location='args')
+        parser.add_argument('depth', type=int, required=False, location='args')
+        args = parser.parse_args()
 
-            # json = json.dumps(filecontents, ensure_ascii=False)
-            return filecontents, 200
-        else:
+        if not sdt:
             return "", 204
 
+        def build():
+            try:
+                node = sdt.tree[args['path']]
+            except:
+                return "node %s not found" % args['path'], 404, {}
+
+            output = io.StringIO()
+            node.print( output, max_depth=args['depth'] )
+
+            return output.getvalue(), 200, {}
+
+        with tree_lock.read():
+            return cached_response( build )
+
 class Nodes(Resource):
     def get(self):
         parser = reqparse.RequestParser()
 
-        parser.add_argument('path', required=True)
-        parser.add_argument('details', required=False)
+        # nodes are found by path regex, or selector (see lopper_selector)
+        parser.add_argument('path', required=False, location='args')
+        parser.add_argument('select', required=False, location='args')
+        parser.add_argument('details', required=False, location='args')
+        # comma separated list of properties to return (implies details)
+        parser.add_argument('props', required=False, location='args')
+        # levels of subnodes of the matching nodes to also return
+        parser.add_argument('depth', type=int, required=False, default=0, location='args')
+        # the window of the (tree ordered) results to return
+        parser.add_argument('offset', type=int, required=False, default=0, location='args')
+        parser.add_argument('limit', type=int, required=False, location='args')
         args = parser.parse_args()
 
+        if not args['path'] and not args['select']:
+            return "path or select is required", 400
+
+        if not sdt:
+            return "", 204
+
+        def build():
+            try:
+                node_data, total = nodes_query( sdt.tree, args )
+            except ValueError as e:
+                return str(e), 400, {}
+
+            return node_data, 200, { "X-Total-Count": str(total) }
+
+        with tree_lock.read():
+            return cached_response( build )
+
+class Bulk(Resource):
+    def post(self):
+        """Run many node queries in one request
+
+        The request body has a query per line (ndjson). A query is a json
+        object, with the arguments of /nodes (path or select, details, props,
+        depth, offset and limit), or phandle. The response is streamed, with a
+        line of json per query (in order): { "query": <the query>,
+        "total": <count>, "nodes": <the /nodes result> }, or { "query": <the
+        query>, "error": <message> }.
+
+        The queries see the same generation of the tree.
+        """
+        queries = []
+        for line in request.get_data().splitlines():
+            if not line.strip():
+                continue
+            try:
+                queries.append( json.loads( line ) )
+            except ValueError as e:
+                return "invalid query: %s: %s" % (line[:64],e), 400
+
+        if not sdt:
+            return "", 204
+
+        def generate():
+            with tree_lock.read():
+                for q in queries:
+                    try:
+                        node_data, total = nodes_query( sdt.tree, q )
+                        result = { "query": q, "total": total, "nodes": node_data }
+                    except (ValueError, TypeError, AttributeError) as e:
+                        result = { "query": q, "error": str(e) }
+
+                    yield json.dumps( result ) + "\n"
+
+        return Response( generate(), 200, { "X-Lopper-Generation": tree_generation() },
+                         mimetype="application/x-ndjson" )
+
+class Phandle(Resource):
+    def get(self, phandle):
         try:
-            details = args['details']
-            if details == "True":
-                details = True
-            else:
-                details = False
-        except:
-            details = False
+            phandle = int( phandle, 0 )
+        except ValueError:
+            return "invalid phandle %s" % phandle, 400
 
-        node_data = OrderedDict()
+        if not sdt:
+            return "", 204
 
-        node_list = sdt.tree.nodes( args['path'] )
+        def build():
+            node = sdt.tree.pnode( phandle )
+            if not node:
+                return "phandle %s not found" % hex(phandle), 404, {}
 
-        if not details:
-            for n in node_list:
-                node_data[n.abs_path] = None
-        else:
-            for n in node_list:
-                prop_dict = OrderedDict()
-                for p in n.__props__:
-                    prop_dict[p] = n.__props__[p].string_val
+            prop_dict = OrderedDict()
+            for p in node.__props__:
+                prop_dict[p] = node.__props__[p].string_val
+
+            return { node.abs_path: prop_dict }, 200, {}
+
+        with tree_lock.read():
+            return cached_response( build )
+
+def tree_copy( tree ):
+    """Copy a tree
+
+    Args:
+       tree (LopperTree): the tree to copy
+
+    Returns:
+       LopperTree: the copy
+    """
+    new_tree = lopper.LopperTree()
+    new_tree.strict = tree.strict
+    new_tree.load( tree.export() )
+
+    return new_tree
+
+def tree_replace( tree ):
+    """Replace the served tree
 
-                node_data[n.abs_path] = prop_dict
+    The caller must hold the tree lock for writing.
 
-        return node_data, 200
+    Args:
+       tree (LopperTree): the new tree
+
+    Returns:
+       Nothing
+    """
+    global tree_epoch
+
+    sdt.tree = tree
+    tree_epoch += 1
+    with response_cache_lock:
+        response_cache.clear()
+
+def tree_state( tree ):
+    """Return the nodes and property values of a tree
+
+    Args:
+       tree (LopperTree): the tree
+
+    Returns:
+       dictionary: property values (lists), by property name, by node path
+    """
+    state = {}
+    for n in tree.__nodes__.values():
+        # values are copied, so later changes to the tree don't show up in
+        # the state. They are normally lists, but can be set as scalars.
+        state[n.abs_path] = { p.name: list( p.value ) if isinstance( p.value, list ) else [ p.value ]
+                              for p in n.__props__.values() }
+
+    return state
+
+def tree_diff( before, after ):
+    """Summarize the changes between two tree states
+
+    Args:
+       before (dictionary): tree_state() before the change
+       after (dictionary): tree_state() after the change
+
+    Returns:
+       dictionary: nodes added, deleted and modified (with the properties
+                   added, deleted and changed in each)
+    """
+    added = [ n for n in after if not n in before ]
+    deleted = [ n for n in before if not n in after ]
+    modified = OrderedDict()
+    for n, props in after.items():
+        try:
+            old_props = before[n]
+        except KeyError:
+            continue
+        if props == old_props:
+            continue
+
+        modified[n] = { "props_added": [ p for p in props if not p in old_props ],
+                        "props_deleted": [ p for p in old_props if not p in props ],
+                        "props_changed": [ p for p in props if p in old_props and props[p] != old_props[p] ] }
+
+    return { "nodes_added": added, "nodes_deleted": deleted, "nodes_modified": modified }
+
+def tree_apply( tree, setup ):
+    """Run lops against a tree
+
+    The lops and assists queued by setup() are run, through the lops
+    processing of the sdt, against a copy of the passed tree (the served tree
+    or a snapshot). The lops and assists of the sdt itself are not run again.
+
+    Warnings are treated as errors (as with --werror), so a failing assist
+    fails the lops. If the lops fail (or exit), the copy is dropped, and the
+    passed tree is never left partially modified. The caller replaces the
+    passed tree with the returned one (see target_replace()).
+
+    The caller must hold the tree lock for writing.
+
+    Args:
+       tree (LopperTree): the tree to modify
+       setup (function): queues the lops to run on the sdt (lops_load() etc)
+
+    Returns:
+       tuple: (success boolean, dictionary: the lopper output and the diff
+              of the tree, LopperTree: the modified tree, or None if the
+              lops failed or didn't change the tree)
+    """
+    work_tree = tree_copy( tree )
+    generation = work_tree.__generation__
+
+    ok = True
+    output = io.StringIO()
+    saved = ( sdt.tree, sdt.lops, sdt.assists, sdt.werror )
+    try:
+        sdt.tree = work_tree
+        sdt.lops = []
+        sdt.assists = []
+        sdt.werror = True
+        with redirect_stdout( output ):
+            setup()
+            sdt.perform_lops()
+        # an assist run in a worker (--assist-timeout) replaces the tree
+        work_tree = sdt.tree
+    except SystemExit as e:
+        ok = False
+    except Exception as e:
+        ok = False
+        output.write( traceback.format_exc() )
+    finally:
+        sdt.tree, sdt.lops, sdt.assists, sdt.werror = saved
+
+    diff = { "nodes_added": [], "nodes_deleted": [], "nodes_modified": {} }
+    if not ok or work_tree.__generation__ == generation:
+        work_tree = None
+    else:
+        diff = tree_diff( tree_state( tree ), tree_state( work_tree ) )
+
+    return ok, { "ok": ok, "output": output.getvalue(), "diff": diff }, work_tree
+
+def target_tree( snapshot ):
+    """Return the tree a modification is for
+
+    Args:
+       snapshot (string): snapshot name, or None for the served tree
+
+    Returns:
+       LopperTree: the tree, KeyError if the snapshot doesn't exist
+    """
+    if snapshot:
+        return snapshots[snapshot]
+
+    return sdt.tree
+
+def target_replace( snapshot, tree ):
+    """Replace the tree a modification is for
+
+    The caller must hold the tree lock for writing.
+
+    Args:
+       snapshot (string): snapshot name, or None for the served tree
+       tree (LopperTree): the new tree
+
+    Returns:
+       Nothing
+    """
+    if snapshot:
+        snapshots[snapshot] = tree
+    else:
+        tree_replace( tree )
+
+class Lops(Resource):
+    def post(self):
+        """Apply a lop file (the request body) to the tree
+
+        ?format=dts|dtb|yaml gives the type of the lop file. A dtb is
+        recognized by its magic, dts is the default. ?snapshot=<name> applies
+        the lop to a snapshot rather than the served tree.
+        """
+        parser = reqparse.RequestParser()
+        parser.add_argument('format', required=False, location='args')
+        parser.add_argument('snapshot', required=False, location='args')
+        args = parser.parse_args()
+
+        if not sdt:
+            return "", 204
+
+        data = request.get_data()
+        if not data:
+            return "no lop file passed", 400
+
+        lop_format = args['format']
+        if not lop_format:
+            lop_format = "dts"
+            if data[:4] == b"\xd0\x0d\xfe\xed":
+                lop_format = "dtb"
+
+        if not lop_format in [ "dts", "dtb", "yaml" ]:
+            return "invalid lop format %s" % lop_format, 400
+        if lop_format == "yaml" and not lopper.yaml_support:
+            return "YAML support is not loaded, check dependencies", 400
+
+        lop_dir = tempfile.mkdtemp( prefix="lopper-rest-" )
+        try:
+            lop_file = os.path.join( lop_dir, "lop." + lop_format )
+            with open( lop_file, "wb" ) as f:
+                f.write( data )
+
+            with tree_lock.write():
+                try:
+                    tree = target_tree( args['snapshot'] )
+                except KeyError:
+                    return "snapshot %s not found" % args['snapshot'], 404
+
+                ok, result, new_tree = tree_apply( tree, lambda: sdt.lops_load( [ lop_file ], True ) )
+                if new_tree:
+                    target_replace( args['snapshot'], new_tree )
+                result["generation"] = tree_generation()
+        finally:
+            shutil.rmtree( lop_dir, ignore_errors=True )
+
+        if not ok:
+            return result, 400
+
+        return result, 200
+
+class Assists(Resource):
+    def post(self):
+        """Run an assist against the tree
+
+        The request is json: { "assist": <name>, "args": [ <arg>, .. ],
+        "snapshot": <name> }. This is the same as passing the assist after
+        "--" on the lopper command line. args and snapshot are optional.
+        """
+        req = request.get_json( silent=True )
+        if not req or not "assist" in req:
+            return "no assist passed", 400
+
+        if not sdt:
+            return "", 204
+
+        name = req["assist"]
+        assist_args = req.get( "args", [] )
+        if not sdt.assist_find( name ):
+            return "assist %s not found" % name, 404
+
+        def setup():
+            sdt.assists_setup( [ name ] )
+            sdt.assist_autorun_setup( name, assist_args )
+
+        with tree_lock.write():
+            try:
+                tree = target_tree( req.get( "snapshot" ) )
+            except KeyError:
+                return "snapshot %s not found" % req.get( "snapshot" ), 404
+
+            ok, result, new_tree = tree_apply( tree, setup )
+            if new_tree:
+                target_replace( req.get( "snapshot" ), new_tree )
+            result["generation"] = tree_generation()
+
+        if not ok:
+            return result, 400
+
+        return result, 200
+
+class Snapshots(Resource):
+    def get(self):
+        with tree_lock.read():
+            return OrderedDict( [ (name, { "nodes": len( tree.__nodes__ ) })
+                                  for name, tree in snapshots.items() ] ), 200
+
+    def post(self):
+        """Snapshot the served tree
+
+        The request is json: { "name": <name> }
+        """
+        req = request.get_json( silent=True )
+        if not req or not req.get( "name" ):
+            return "no snapshot name passed", 400
+
+        if not sdt:
+            return "", 204
+
+        with tree_lock.write():
+            snapshots[req["name"]] = tree_copy( sdt.tree )
+
+        return { "snapshot": req["name"] }, 201
+
+class Snapshot(Resource):
+    def delete(self, name):
+        with tree_lock.write():
+            try:
+                del snapshots[name]
+            except KeyError:
+                return "snapshot %s not found" % name, 404
+
+        return "", 204
+
+class SnapshotRollback(Resource):
+    def post(self, name):
+        """Replace the served tree with (a copy of) a snapshot"""
+        if not sdt:
+            return "", 204
+
+        with tree_lock.write():
+            try:
+                tree = tree_copy( snapshots[name] )
+            except KeyError:
+                return "snapshot %s not found" % name, 404
+
+            diff = tree_diff( tree_state( sdt.tree ), tree_state( tree ) )
+            tree_replace( tree )
+
+            return { "ok": True, "diff": diff, "generation": tree_generation() }, 200
+
+class Metrics(Resource):
+    def get(self):
+        """The tree operation metrics (see lopper_tree.LopperMetrics)"""
+        return lopper.lopper_tree.metrics.report(), 200
+
+    def post(self):
+        """Enable, disable or reset the metrics
+
+        The request is json: { "enable": <boolean>, "reset": <boolean> }
+        """
+        req = request.get_json( silent=True )
+        if req is None:
+            return "no json body passed", 400
+
+        metrics = lopper.lopper_tree.metrics
+        # the metered operations are swapped in and out, don't do that
+        # under a running query
+        with tree_lock.write():
+            if req.get( "reset" ):
+                metrics.reset()
+            if "enable" in req:
+                if req["enable"]:
+                    metrics.enable()
+                else:
+                    metrics.disable()
+
+        return metrics.report(), 200
 
 api.add_resource(Domains, '/domains')  # '/domains' is an entry point
 api.add_resource(Tree, '/tree')  # '/tree' is an entry point
-api.add_resource(Nodes, '/nodes')  # '/tree' is an entry point
+api.add_resource(Nodes, '/nodes')  # '/nodes' is an entry point
+api.add_resource(Phandle, '/phandle/<string:phandle>')
+api.add_resource(Bulk, '/bulk')
+api.add_resource(Lops, '/lops')
+api.add_resource(Assists, '/assists')
+api.add_resource(Snapshots, '/snapshots')
+api.add_resource(Snapshot, '/snapshots/<string:name>')
+api.add_resource(SnapshotRollback, '/snapshots/<string:name>/rollback')
+api.add_resource(Metrics, '/metrics')
+
+def serve( host = None, port = None, threads = None ):
+    """Serve the ReST API
+
+    Requests are handled concurrently. waitress is used if it is available,
+    otherwise the (threaded) werkzeug server.
+
+    Args:
+       host (string,optional): address to listen on. Default: $LOPPER_REST_HOST or 127.0.0.1
+       port (int,optional): port to listen on. Default: $LOPPER_REST_PORT or 5000
+       threads (int,optional): waitress worker threads. Default: $LOPPER_REST_THREADS or 8
+
+    Returns:
+       Nothing
+    """
+    if not host:
+        host = os.environ.get( 'LOPPER_REST_HOST', "127.0.0.1" )
+    if not port:
+        port = int( os.environ.get( 'LOPPER_REST_PORT', 5000 ) )
+    if not threads:
+        threads = int( os.environ.get( 'LOPPER_REST_THREADS', 8 ) )
+
+    try:
+        import waitress
+    except ImportError:
+        waitress = None
+
+    if waitress:
+        waitress.serve( app, host=host, port=port, threads=threads )
+    else:
+        from werkzeug.serving import make_server
+        server = make_server( host, port, app, threaded=True )
+        server.serve_forever()
@@ -15,12 +15,14 @@ import types
 import os
 import re
 import shutil
+import json
 import filecmp
 from pathlib import Path
 from pathlib import PurePath
 import tempfile
 from enum import Enum
 import textwrap
+import contextlib
 from collections import UserDict
 from collections import OrderedDict
 import copy
@@ -556,6 +558,313 @@ def setup_assist_lops( outdir ):
     return outdir + "/lops-assists.dts"
 
 
+def setup_edit_assist( outdir ):
+    with open( outdir + "/lops-edit-assist.dts", "w") as w:
+            w.write("""\
+/dts-v1/;
+
+/ {
+        compatible = "system-device-tree-v1";
+        lops {
+                lop_0 {
+                        compatible = "system-device-tree-v1,lop,select-v1";
+                        select_1;
+                        select_2 = "/cpus/.*:compatible:.*arm,cortex-a72.*";
+                };
+                lop_1 {
+                        compatible = "system-device-tree-v1,lop,assist-v1";
+                        node = "/amba";
+                        id = "module,sanity-edit";
+                };
+                // the selection is kept over the assist
+                lop_2 {
+                        compatible = "system-device-tree-v1,lop,modify";
+                        modify = ":sanity-selected:yes";
+                };
+        };
+};
+            """)
+
+    with open( outdir + "/sanity_edit_assist.py", "w") as w:
+            w.write("""\
+import re
+import lopper_trace
+from lopper_tree import LopperNode
+
+def is_compat( node, compat_string_to_test ):
+    if re.search( "module,.*sanity[-_]edit", compat_string_to_test ):
+        return edit
+    return ""
+
+def edit( tgt_node, sdt, options ):
+    sdt.tree['/amba']['compatible'] = [ "changed" ]
+    del sdt.tree['/']['model']
+    sdt.tree['/cpus/cpu@0']['singleval'] = [ 0x5 ]
+    if "fail" in options.get( 'args', [] ):
+        raise Exception( "failed after a partial edit" )
+
+    sdt.tree.delete( sdt.tree['/anode_to_delete'] )
+
+    with lopper_trace.phase( "sanity-edit-add", "assist-step" ):
+        new_node = LopperNode( -1, "/amba/sanity-edit" )
+        new_node['compatible'] = [ "sanity,edit" ]
+        sdt.tree.add( new_node )
+        sdt.tree.sync()
+
+    return True
+            """)
+
+    return outdir + "/lops-edit-assist.dts", outdir + "/sanity_edit_assist.py"
+
+
+def setup_rest_lops( outdir ):
+    with open( outdir + "/lops-rest.dts", "w") as w:
+            w.write("""\
+/dts-v1/;
+
+/ {
+        compatible = "system-device-tree-v1";
+        lops {
+                lop_0 {
+                        compatible = "system-device-tree-v1,lop,modify";
+                        modify = "/amba_apu:compatible:rest-lop";
+                };
+        };
+};
+            """)
+
+    return outdir + "/lops-rest.dts"
+
+
+def setup_selector_lops( outdir ):
+    with open( outdir + "/lops-selector.dts", "w") as w:
+            w.write("""\
+/dts-v1/;
+
+/ {
+        compatible = "system-device-tree-v1";
+        lops {
+                lop_0 {
+                        compatible = "system-device-tree-v1,lop,select-v1";
+                        select_1;
+                        query = "/amba > [status=okay]", ":phandle(3)";
+                };
+                lop_1 {
+                        compatible = "system-device-tree-v1,lop,modify";
+                        modify = ":selector-prop:selected";
+                };
+                lop_2 {
+                        compatible = "system-device-tree-v1,lop,output";
+                        outfile = "selector-output.dts";
+                        query = "/cpus/cpu@*", "[compatible$=-its]";
+                };
+        };
+};
+            """)
+
+    return outdir + "/lops-selector.dts"
+
+def setup_daemon_tree( outdir, value ):
+    inc_dir = outdir + "/daemon-include"
+    os.makedirs( inc_dir, exist_ok=True )
+    with open( inc_dir + "/daemon-tester.h", "w") as w:
+            w.write( "#define DAEMON_TEST_VALUE %s\n" % value )
+
+    with open( outdir + "/daemon-tester.dts", "w") as w:
+            w.write("""\
+/dts-v1/;
+
+#include "daemon-tester.h"
+
+/ {
+        compatible = "xlnx,versal";
+        #address-cells = <0x2>;
+        #size-cells = <0x2>;
+
+        daemon-test {
+                compatible = "daemon,test";
+                value = <DAEMON_TEST_VALUE>;
+        };
+};
+""")
+
+    return outdir + "/daemon-tester.dts", inc_dir
+
+
+def setup_baremetal_tree( outdir ):
+    with open( outdir + "/baremetal-tester.dts", "w") as w:
+            w.write("""\
+/dts-v1/;
+
+/ {
+        compatible = "xlnx,versal";
+        #address-cells = <0x2>;
+        #size-cells = <0x2>;
+
+        cpus_a72: cpus-a72@0 {
+                compatible = "cpus,cluster";
+                #address-cells = <0x1>;
+                #size-cells = <0x0>;
+                #ranges-address-cells = <0x2>;
+                #ranges-size-cells = <0x2>;
+                address-map = <0x0 0x0 &ddr 0x0 0x0 0x0 0x80000000>,
+                              <0x0 0xff000000 &serial0 0x0 0xff000000 0x0 0x1000>,
+                              <0x0 0xff001000 &serial1 0x0 0xff001000 0x0 0x1000>,
+                              <0x0 0xff000800 &gpio 0x0 0xff000800 0x0 0x1000>,
+                              <0x8 0x0 &ddr 0x8 0x0 0x0 0x80000000>;
+
+                cpu@0 {
+                        compatible = "arm,cortex-a72";
+                        device_type = "cpu";
+                        reg = <0x0>;
+                };
+        };
+
+        amba {
+                compatible = "simple-bus";
+                #address-cells = <0x2>;
+                #size-cells = <0x2>;
+                ranges;
+
+                serial0: serial@ff000000 {
+                        compatible = "arm,pl011";
+                        status = "okay";
+                        reg = <0x0 0xff000000 0x0 0x1000>;
+                };
+
+                serial1: serial@ff001000 {
+                        compatible = "arm,pl011";
+                        status = "okay";
+                        reg = <0x0 0xff001000 0x0 0x1000>;
+                };
+
+                gpio: gpio@ff000800 {
+                        compatible = "xlnx,versal-gpio-1.0";
+                        status = "okay";
+                        reg = <0x0 0xff000800 0x0 0x1000>;
+                };
+
+                i2c@ff020000 {
+                        compatible = "cdns,i2c-r1p14";
+                        status = "okay";
+                        reg = <0x0 0xff020000 0x0 0x1000>;
+                };
+        };
+
+        ddr: memory@0 {
+                compatible = "xlnx,psv-ddr-1.0";
+                device_type = "memory";
+                reg = <0x0 0x0 0x0 0x80000000>;
+        };
+
+        domains {
+                apu {
+                        compatible = "openamp,domain-v1";
+                        cpus = <&cpus_a72 0x3 0x0>;
+                        access = <&serial0 &serial1 &gpio>;
+                };
+        };
+};
+""")
+
+    return outdir + "/baremetal-tester.dts"
+
+
+def setup_subsystem_tree( outdir ):
+    with open( outdir + "/subsystem-tester.dts", "w") as w:
+            w.write("""\
+/dts-v1/;
+
+/ {
+        compatible = "xlnx,versal";
+        #address-cells = <0x2>;
+        #size-cells = <0x2>;
+
+        cpus_a72: cpus-a72@0 {
+                compatible = "cpus,cluster";
+                #address-cells = <0x1>;
+                #size-cells = <0x0>;
+                cpu@0 {
+                        compatible = "arm,cortex-a72";
+                        device_type = "cpu";
+                        reg = <0x0>;
+                };
+        };
+
+        cpus_r5: cpus-r5@1 {
+                compatible = "cpus,cluster";
+                #address-cells = <0x1>;
+                #size-cells = <0x0>;
+                phandle = <0x30>;
+                cpu@0 {
+                        compatible = "arm,cortex-r5";
+                        device_type = "cpu";
+                        reg = <0x0>;
+                };
+        };
+
+        amba {
+                compatible = "simple-bus";
+                #address-cells = <0x2>;
+                #size-cells = <0x2>;
+                ranges;
+
+                serial01: serial@ff010000 {
+                        compatible = "arm,pl011";
+                        reg = <0x0 0xff010000 0x0 0x1000>;
+                };
+
+                serial0: serial@ff000000 {
+                        compatible = "arm,pl011";
+                        reg = <0x0 0xff000000 0x0 0x1000>;
+                };
+
+                ethernet0: ethernet@ff0c0000 {
+                        compatible = "cdns,gem";
+                        reg = <0x0 0xff0c0000 0x0 0x1000>;
+                        phandle = <0x20>;
+                };
+        };
+};
+""")
+
+    with open( outdir + "/subsystem-domains.yaml", "w") as w:
+            w.write("""\
+domains:
+    sanity_apu:
+        cpus:
+            - cluster: cpus_a72
+              cpumask: 0x3
+              mode:
+                  secure: true
+        memory:
+            - start: 0x0
+              size: 0x80000000
+        access:
+            - dev: serial0
+              flags:
+                  requested: True
+            - dev: ethernet0
+            - dev: missing_dev
+    sanity_rpu:
+        cpus:
+            - cluster: cpus_r5
+              cpumask: 0x1
+              mode:
+                  el: 1
+        access:
+            - dev: serial0
+            - dev: serial01
+              flags:
+                  secure: True
+        firewallconf:
+            domain: sanity_apu
+            block: never
+""")
+
+    return outdir + "/subsystem-tester.dts", outdir + "/subsystem-domains.yaml"
+
+
 def setup_device_tree( outdir ):
     with open( outdir + "/tester.dts", "w") as w:
             w.write("""\
@@ -1135,6 +1444,65 @@ ocp:
     return outdir + "/yaml-tester.yaml"
 
 
+def setup_cdo_tree( outdir ):
+    with open( outdir + "/cdo-tester.dts", "w") as w:
+            w.write("""\
+/dts-v1/;
+
+/ {
+        #address-cells = <0x02>;
+        #size-cells = <0x02>;
+
+        amba {
+                usb0: usb@ff9d0000 {
+                        compatible = "xlnx,versal-dwc3";
+                        power-domains = <0x01 0x18224018>;
+                };
+                gem0: ethernet@ff0c0000 {
+                        compatible = "cdns,versal-gem";
+                        power-domains = <0x01 0x18224019>;
+                };
+                gem1: ethernet@ff0d0000 {
+                        compatible = "cdns,versal-gem";
+                        power-domains = <0x01 0x1822401a>;
+                };
+                spi0: spi@ff040000 {
+                        compatible = "cdns,spi-r1p6";
+                        power-domains = <0x01 0x1822401b>;
+                };
+        };
+
+        domains {
+                resource_group_1: resource_group_1 {
+                        access = <&gem0 &gem1>;
+                        access-flags-names = "default", "default";
+                };
+
+                subsystem_1 {
+                        compatible = "xilinx,subsystem-v1";
+                        id = <0x1>;
+                        flags-names = "default";
+                        flags = <0x4 0xfffff 0x0 0x0>;
+                        include = <&resource_group_1>;
+                        access = <&usb0>;
+                        access-flags-names = "default";
+                };
+
+                subsystem_2 {
+                        compatible = "xilinx,subsystem-v1";
+                        id = <0x2>;
+                        flags-names = "default";
+                        flags = <0x4 0xfffff 0x0 0x0>;
+                        include = <&resource_group_1>;
+                        access = <&spi0>;
+                        access-flags-names = "default";
+                };
+        };
+};
+""")
+
+    return outdir + "/cdo-tester.dts"
+
 def setup_fdt( device_tree, outdir ):
     dt = Lopper.dt_compile( device_tree, "", "", True, outdir )
 
@@ -1843,6 +2211,183 @@ def tree_sanity_test( fdt, verbose=0 ):
         test_failed( "propval dict access" )
 
 
+def tree_metrics_sanity_test( fdt, verbose=0 ):
+    print( "[TEST]: start: tree metrics test" )
+    tree = LopperTree()
+    tree.load( Lopper.export( fdt ) )
+
+    metrics = lopper_tree.metrics
+    originals = { (cls, method): globals()[cls].__dict__[method] for cls, method, op in metrics.operations }
+    metrics.reset()
+    metrics.enable()
+    try:
+        metered = [ k for k, fn in originals.items() if globals()[k[0]].__dict__[k[1]] is fn ] == []
+
+        tree.nodes( "/amba_apu/.*" )
+        with metrics.scope( "x" ):
+            tree.sync()
+            tree.nodes( "/cpus/.*" )
+            tree.nodes( "/amba/.*" )
+            tree.query( "/cpus/cpu@*" )
+            with metrics.scope( "y" ):
+                tree.lnodes( "cpus_a72" )
+        report = metrics.report()
+    finally:
+        metrics.disable()
+
+    def count( op, context ):
+        try:
+            return report["operations"][op]["by"][context]["count"]
+        except KeyError:
+            return 0
+
+    ops = report["operations"]
+    if metered and report["enabled"] and \
+       count( "tree.sync", "x" ) == 1 and count( "tree.sync", "lopper" ) == 0 and \
+       count( "tree.nodes", "x" ) == 2 and count( "tree.nodes", "lopper" ) == 1 and \
+       count( "tree.query", "x" ) == 1 and count( "tree.lnodes", "y" ) == 1 and \
+       count( "tree.lnodes", "x" ) == 0 and \
+       ops["tree.nodes"]["count"] == 3 and ops["tree.sync"]["seconds"] > 0 and \
+       count( "tree.load", "x" ) >= 1 and \
+       ops["tree.sync"]["seconds"] >= ops["tree.load"]["by"]["x"]["seconds"]:
+        test_passed( "metrics counts by context" )
+    else:
+        test_failed( "metrics counts by context (%s %s)" % (metered,report) )
+
+    # disabled, the original operations are back, and nothing is counted
+    tree.sync()
+    if LopperTree.sync is originals[("LopperTree","sync")] and \
+       all( [ globals()[k[0]].__dict__[k[1]] is fn for k, fn in originals.items() ] ) and \
+       not metrics.report()["enabled"] and metrics.report()["operations"] == report["operations"]:
+        test_passed( "metrics disable" )
+    else:
+        test_failed( "metrics disable" )
+
+    metrics.reset()
+    if metrics.report()["operations"] == {}:
+        test_passed( "metrics reset" )
+    else:
+        test_failed( "metrics reset" )
+
+def tree_index_sanity_test( fdt, verbose=0 ):
+    print( "[TEST]: start: tree index test" )
+    tree = LopperTree()
+    tree.load( Lopper.export( fdt ) )
+
+    def paths( nodes ):
+        return [ n.abs_path for n in nodes ]
+
+    def compat_scan( compat ):
+        # the linear scan that the compatible index replaces
+        return [ n.abs_path for n in tree if "compatible" in n.__props__ and compat in n["compatible"].value ]
+
+    def check_compat_index( msg ):
+        compats = set()
+        for n in tree:
+            if "compatible" in n.__props__:
+                compats.update( [ c for c in n["compatible"].value if type(c) == str ] )
+        compats.update( tree.__cnodes__.keys() )
+        bad = [ c for c in compats if paths( tree.cnodes( c ) ) != compat_scan( c ) ]
+        if bad:
+            test_failed( "compatible index, %s (%s)" % (msg,bad) )
+        else:
+            test_passed( "compatible index, %s" % msg )
+
+    check_compat_index( "after load" )
+
+    if paths( tree.compat_nodes( [ "arm,mmu-500", "arm,cortex-a72" ] ) ) == [ "/cpus/cpu@0", "/cpus/cpu@1", "/amba_apu/smmu@fd800000" ] and \
+       paths( tree.compat_nodes( "gic-v3", substring = True ) ) == [ "/amba_apu/interrupt-controller@f9000000",
+                                                                    "/amba_apu/interrupt-controller@f9000000/gic-its@f9020000",
+                                                                    "/amba_apu/interrupt-controller@f9f00000" ] and \
+       paths( tree.compat_nodes( "arm,gic-v3", nodes = [ tree["/amba_apu/interrupt-controller@f9f00000"], tree["/cpus/cpu@0"],
+                                                          tree["/amba_apu/interrupt-controller@f9000000"] ] ) ) == \
+                                                      [ "/amba_apu/interrupt-controller@f9f00000", "/amba_apu/interrupt-controller@f9000000" ]:
+        test_passed( "compatible lists, substrings and candidate nodes" )
+    else:
+        test_failed( "compatible lists, substrings and candidate nodes" )
+
+    # setting a compatible, by assignment, property value and property
+    tree["/amba_apu/timer"]["compatible"] = [ "sanity,timer" ]
+    tree["/amba_apu/smmu@fd800000"]["compatible"].value = [ "sanity,smmu", "arm,mmu-500" ]
+    tree["/cpus/cpu@1"]["compatible"] = LopperProp( "compatible", -1, tree["/cpus/cpu@1"], [ "sanity,cpu" ] )
+    tree["/cpus/idle-states"]["compatible"] = [ "sanity,idle" ]
+    tree["/cpus/cpu@0"].delete( "compatible" )
+    if paths( tree.cnodes( "arm,armv8-timer" ) ) == [] and paths( tree.cnodes( "sanity,timer" ) ) == [ "/amba_apu/timer" ] and \
+       paths( tree.cnodes( "sanity,smmu" ) ) == [ "/amba_apu/smmu@fd800000" ] and \
+       paths( tree.cnodes( "arm,cortex-a72" ) ) == [] and paths( tree.cnodes( "sanity,cpu" ) ) == [ "/cpus/cpu@1" ] and \
+       paths( tree.cnodes( "sanity,idle" ) ) == [ "/cpus/idle-states" ]:
+        test_passed( "compatible index, compatible set" )
+    else:
+        test_failed( "compatible index, compatible set" )
+    check_compat_index( "after compatible changes" )
+
+    # deleting a node drops it, and its subnodes
+    tree.delete( tree["/amba_apu/interrupt-controller@f9000000"] )
+    if paths( tree.cnodes( "arm,gic-v3" ) ) == [ "/amba_apu/interrupt-controller@f9f00000" ] and \
+       paths( tree.cnodes( "arm,gic-v3-its" ) ) == []:
+        test_passed( "compatible index, node delete" )
+    else:
+        test_failed( "compatible index, node delete (%s)" % paths( tree.cnodes( "arm,gic-v3-its" ) ) )
+    check_compat_index( "after node delete" )
+
+    # adding a subtree adds its nodes, in tree order
+    bus = LopperNode( -1, "/sanity-bus" )
+    bus["compatible"] = [ "simple-bus" ]
+    dev = LopperNode( -1, "/sanity-bus/dev@0", name = "dev@0" )
+    dev["compatible"] = [ "sanity,dev", "arm,gic-v3" ]
+    bus.child_nodes[dev.abs_path] = dev
+    tree.add( bus )
+    if paths( tree.cnodes( "arm,gic-v3" ) ) == [ "/amba_apu/interrupt-controller@f9f00000", "/sanity-bus/dev@0" ] and \
+       paths( tree.cnodes( "simple-bus" ) ) == [ "/amba", "/amba_apu", "/sanity-bus" ]:
+        test_passed( "compatible index, subtree add" )
+    else:
+        test_failed( "compatible index, subtree add (%s)" % paths( tree.cnodes( "arm,gic-v3" ) ) )
+    check_compat_index( "after subtree add" )
+
+    tree.load( tree.export() )
+    check_compat_index( "after reload" )
+
+    def check_name_index( msg ):
+        # compare the name and label lookups to a scan of the tree
+        names = set( [ n.name for n in tree ] ) | set( tree.__namenodes__.keys() )
+        bad = [ name for name in names if paths( tree.name_nodes( name ) ) != [ n.abs_path for n in tree if n.name == name ] ]
+        labels = set( [ n.label for n in tree if n.label ] ) | set( tree.__lnodes__.keys() )
+        bad += [ "#" + l for l in labels if paths( tree.lnodes( l, exact = True ) ) != [ n.abs_path for n in tree if n.label == l ] ]
+        if bad:
+            test_failed( "name and label index, %s (%s)" % (msg,bad) )
+        else:
+            test_passed( "name and label index, %s" % msg )
+
+    check_name_index( "after load" )
+
+    tree["/amba_apu/timer"].label = "sanity_timer"
+    tree["/cpus/cpu@1"].label = "sanity_cpu"
+    tree["/amba/interrupt-multiplex"].name = "sanity-mux"
+    tree["/cpus/cpu@1"].label = "sanity_cpu1"
+    if paths( tree.name_nodes( "sanity-mux" ) ) == [ "/amba/interrupt-multiplex" ] and \
+       tree.name_nodes( "interrupt-multiplex" ) == [] and \
+       paths( tree.lnodes( "sanity_timer", exact = True ) ) == [ "/amba_apu/timer" ] and \
+       paths( tree.lnodes( "sanity_cpu1", exact = True ) ) == [ "/cpus/cpu@1" ] and \
+       tree.lnodes( "sanity_cpu", exact = True ) == [] and \
+       paths( tree.lnodes( "sanity_cpu" ) ) == [ "/cpus/cpu@1" ]:
+        test_passed( "name and label index, rename and relabel" )
+    else:
+        test_failed( "name and label index, rename and relabel" )
+    check_name_index( "after rename" )
+
+    tree.delete( tree["/amba_apu"] )
+    if tree.name_nodes( "timer" ) == [] and tree.lnodes( "sanity_timer", exact = True ) == [] and \
+       tree.name_nodes( "interrupt-controller@f9f00000" ) == []:
+        test_passed( "name and label index, node delete" )
+    else:
+        test_failed( "name and label index, node delete" )
+    check_name_index( "after node delete" )
+
+    tree.load( tree.export() )
+    check_name_index( "after reload" )
+
+    print( "[TEST]: end: tree index test\n" )
+
 def lops_code_test( device_tree, lop_file, verbose ):
 
     device_tree.setup( dt, [lop_file], "", True, libfdt = libfdt )
@@ -1944,6 +2489,58 @@ def lops_code_test( device_tree, lop_file, verbose ):
 
     output.reset()
 
+def trace_sanity_test( device_tree, lop_file, outdir, verbose ):
+    import lopper_trace
+
+    device_tree.setup( dt, [lop_file], "", True, libfdt=libfdt )
+
+    # the lops that are run, to compare with the traced lops
+    executed = []
+    exec_lop = device_tree.exec_lop
+    def exec_lop_counted( lop_node, lops_tree, options = None ):
+        executed.append( lop_node.abs_path )
+        return exec_lop( lop_node, lops_tree, options )
+    device_tree.exec_lop = exec_lop_counted
+
+    print( "[TEST]: trace of lops: %s" % lop_file )
+    trace_file = outdir + "/sanity-trace.json"
+    if os.path.exists( trace_file ):
+        os.remove( trace_file )
+    trace = lopper_trace.start( trace_file )
+    try:
+        device_tree.perform_lops()
+    finally:
+        lopper_trace.stop()
+        del device_tree.exec_lop
+
+    try:
+        with open( trace_file ) as f:
+            data = json.load( f )
+    except (OSError, ValueError) as e:
+        data = { "events": [], "summary": [] }
+
+    lop_events = [ e for e in data["events"] if e["category"] == "lop" ]
+    if executed and [ e["name"] for e in lop_events ] == executed and \
+       all( [ "nodes_touched" in e and "syncs" in e and "maxrss_growth_kb" in e for e in lop_events ] ) and \
+       any( [ e["nodes_touched"] > 0 and e["syncs"] > 0 for e in lop_events ] ) and \
+       sorted( [ (t["name"], t["count"]) for t in data["summary"] if t["category"] == "lop" ] ) == \
+       sorted( [ (n, executed.count( n )) for n in set( executed ) ] ):
+        test_passed( "trace lop events" )
+    else:
+        test_failed( "trace lop events (%s: %s)" % (executed,lop_events) )
+
+    chrome_file = outdir + "/sanity-trace-chrome.json"
+    trace.write( chrome_file, "chrome" )
+    with open( chrome_file ) as f:
+        chrome = json.load( f )
+    chrome_lops = [ e for e in chrome.get( "traceEvents", [] ) if e["cat"] == "lop" ]
+    if chrome_lops and len( chrome_lops ) == len( lop_events ) and \
+       all( [ e["ph"] == "X" and e["dur"] >= 0 for e in chrome["traceEvents"] ] ) and \
+       all( [ "syncs" in e["args"] and "maxrss_growth_kb" in e["args"] for e in chrome_lops ] ):
+        test_passed( "trace chrome format" )
+    else:
+        test_failed( "trace chrome format (%s)" % chrome.get( "traceEvents" ) )
+
 def lops_sanity_test( device_tree, lop_file, verbose ):
     if not libfdt:
         return
@@ -2090,6 +2687,1033 @@ def assists_sanity_test( device_tree, lop_file, verbose ):
 
     device_tree.cleanup()
 
+def assist_timeout_sanity_test( dt, outdir, verbose ):
+    lop_file, assist_file = setup_edit_assist( outdir )
+
+    import lopper_trace
+
+    # the same assist, run in process and in a worker (--assist-timeout),
+    # must leave the same tree behind, and record the same metrics and trace
+    trees = []
+    runs = []
+    metrics = lopper_tree.metrics
+    for timeout in [ 0, 60 ]:
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.output_file = outdir + "/assist-timeout-output.dts"
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        device_tree.setup( dt, [lop_file], "", True, libfdt = libfdt )
+        device_tree.assists_setup( [ assist_file ] )
+        if timeout:
+            device_tree.assist_timeouts = { "": timeout }
+
+        print( "[TEST]: running property editing assist (timeout: %s)" % timeout )
+        metrics.reset()
+        metrics.enable()
+        trace = lopper_trace.start( outdir + "/assist-timeout-trace.json" )
+        try:
+            device_tree.perform_lops()
+        finally:
+            lopper_trace.stop()
+            metrics.disable()
+
+        lop_event = [ e for e in trace.events if e["category"] == "lop" and e["name"].endswith( "/lop_1" ) ]
+        runs.append( { "syncs": [ e["syncs"] for e in lop_event ],
+                       "nodes_touched": [ e["nodes_touched"] for e in lop_event ],
+                       "steps": [ e["name"] for e in trace.events if e["category"] == "assist-step" ],
+                       "assist syncs": metrics.ops.get( ("tree.sync","assist:sanity_edit_assist"), [0] )[0],
+                       "selected": [ n.abs_path for n in device_tree.tree if n.propval( "sanity-selected" ) != [''] ] } )
+
+        tree_values = OrderedDict()
+        for n in device_tree.tree:
+            tree_values[n.abs_path] = [ (p.name,p.value) for p in n.__props__.values() ]
+        trees.append( tree_values )
+
+        device_tree.cleanup()
+
+    inline_tree, worker_tree = trees
+    compatibles = [ dict( t["/amba"] )["compatible"] for t in trees ]
+    if compatibles == [ ["changed"], ["changed"] ]:
+        test_passed( "assist property edit" )
+    else:
+        test_failed( "assist property edit (%s)" % compatibles )
+
+    if inline_tree == worker_tree:
+        test_passed( "assist timeout worker tree matches in process tree" )
+    else:
+        for path in OrderedDict.fromkeys( list(inline_tree) + list(worker_tree) ):
+            if inline_tree.get( path ) != worker_tree.get( path ):
+                print( "    %s: %s != %s" % (path,inline_tree.get( path ),worker_tree.get( path )) )
+        test_failed( "assist timeout worker tree matches in process tree" )
+
+    inline_run, worker_run = runs
+    if worker_run["assist syncs"] > 0 and worker_run["assist syncs"] == inline_run["assist syncs"]:
+        test_passed( "assist timeout worker metrics" )
+    else:
+        test_failed( "assist timeout worker metrics (%s)" % runs )
+
+    if worker_run["steps"] == [ "sanity-edit-add" ] and worker_run["steps"] == inline_run["steps"]:
+        test_passed( "assist timeout worker trace events" )
+    else:
+        test_failed( "assist timeout worker trace events (%s)" % runs )
+
+    if worker_run["syncs"] and worker_run["syncs"][0] > 0 and worker_run["nodes_touched"][0] > 0 and \
+       worker_run["syncs"] == inline_run["syncs"] and worker_run["nodes_touched"] == inline_run["nodes_touched"]:
+        test_passed( "assist timeout worker syncs and touched nodes" )
+    else:
+        test_failed( "assist timeout worker syncs and touched nodes (%s)" % runs )
+
+    if worker_run["selected"] and worker_run["selected"] == inline_run["selected"]:
+        test_passed( "assist timeout worker keeps the selection" )
+    else:
+        test_failed( "assist timeout worker keeps the selection (%s)" % runs )
+
+def domains_sanity_test( dt, outdir, verbose ):
+    import importlib
+    sys.path.append( os.path.dirname(os.path.realpath(__file__)) + "/assists" )
+    domain_access = importlib.import_module( "domain-access" )
+
+    def load():
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        device_tree.setup( dt, [], "", True, libfdt = libfdt )
+
+        # a second domain, with one of the ethernets and the first cpu
+        domain = LopperNode( -1, "/domains/sanity_domain" )
+        domain["compatible"] = [ "openamp,domain-v1" ]
+        domain["cpus"] = [ device_tree.tree["/cpus"].phandle, 0x1, 0x0 ]
+        domain["access"] = [ device_tree.tree["/amba/ethernet@ff0d0000"].phandle ]
+        device_tree.tree.add( domain )
+
+        return device_tree
+
+    # the reference: each domain pruned from its own load of the tree
+    domains = [ "openamp_r5", "sanity_domain" ]
+    ref_dir = outdir + "/domains-ref"
+    os.makedirs( ref_dir, exist_ok=True )
+    for d in domains:
+        device_tree = load()
+        domain_access.core_domain_access( "/domains/" + d, device_tree, { 'verbose': verbose } )
+        printer = LopperTreePrinter( True, ref_dir + "/" + d + ".dts" )
+        printer.load( device_tree.tree.export() )
+        printer.exec()
+        device_tree.cleanup()
+
+    print( "[TEST]: domain-access, all domains from a single load" )
+    for args in [ [], [ "-j", "2" ] ]:
+        extract_dir = outdir + "/domains-extract" + "".join( args )
+        shutil.rmtree( extract_dir, ignore_errors=True )
+        os.makedirs( extract_dir )
+
+        device_tree = load()
+        node_count = len( device_tree.tree.__nodes__ )
+        ret = domain_access.core_domains_extract( "/", device_tree, { 'verbose': verbose, 'outdir': extract_dir,
+                                                                       'args': args } )
+        device_tree.cleanup()
+
+        outputs = sorted( os.listdir( extract_dir ) )
+        differ = [ d for d in domains if not os.path.exists( extract_dir + "/" + d + ".dts" ) or
+                   not filecmp.cmp( extract_dir + "/" + d + ".dts", ref_dir + "/" + d + ".dts", shallow=False ) ]
+        if ret and outputs == [ d + ".dts" for d in domains ] and not differ and \
+           len( device_tree.tree.__nodes__ ) == node_count:
+            test_passed( "domain-access multi-domain extraction %s" % " ".join( args ) )
+        else:
+            test_failed( "domain-access multi-domain extraction %s (%s, differ: %s)" % (" ".join( args ),outputs,differ) )
+
+def node_staging_sanity_test( device_tree, outdir, verbose ):
+    sys.path.append( os.path.dirname(os.path.realpath(__file__)) + "/assists" )
+    import lopper_lib
+
+    device_tree.setup( dt, [], "", True, libfdt = libfdt )
+    tree = device_tree.tree
+    node_count = len( tree.__nodes__ )
+
+    print( "[TEST]: node staging" )
+    # a staged subtree (rproc -> r5 -> tcm), and a staged node below a node
+    # of the tree, as the openamp assist builds them
+    staging = lopper_lib.NodeStaging( tree )
+    rproc = LopperNode( -1, "/sanity-rproc" )
+    rproc + LopperProp( name="compatible", value="xlnx,zynqmp-r5-remoteproc" )
+    staging.add( rproc )
+    r5 = LopperNode( -1, "/sanity-rproc/r5_0" )
+    r5 + LopperProp( name="phandle", value=0x5ed0 )
+    staging.add( r5 )
+    tcm = LopperNode( -1, "/sanity-rproc/r5_0/tcm@ffe00000" )
+    tcm + LopperProp( name="phandle", value=0x5ed1 )
+    tcm + LopperProp( name="reg", value=[ 0, 0xffe00000, 0, 0x10000 ] )
+    staging.add( tcm )
+    mbox = LopperNode( -1, "/amba/sanity-mbox" )
+    mbox + LopperProp( name="phandle", value=0x5ed2 )
+    staging.add( mbox )
+    staging["/sanity-rproc/r5_0"] + LopperProp( name="mboxes", value=[ 0x5ed2, 0, 0x5ed2, 1 ] )
+
+    if staging["/sanity-rproc/r5_0/tcm@ffe00000"] is tcm and staging["/amba"] is tree["/amba"] and \
+       len( tree.__nodes__ ) == node_count and tree.pnode( 0x5ed0 ) is None:
+        test_passed( "node staging, tree unmodified before commit" )
+    else:
+        test_failed( "node staging, tree unmodified before commit" )
+
+    roots = staging.commit()
+    grafted = [ n.abs_path for n in tree if "sanity" in n.abs_path ]
+    if [ n.abs_path for n in roots ] == [ "/sanity-rproc", "/amba/sanity-mbox" ] and \
+       grafted == [ "/amba/sanity-mbox", "/sanity-rproc", "/sanity-rproc/r5_0", "/sanity-rproc/r5_0/tcm@ffe00000" ] and \
+       len( tree.__nodes__ ) == node_count + 4 and tree["/sanity-rproc/r5_0/tcm@ffe00000"].parent is tree["/sanity-rproc/r5_0"] and \
+       tree["/sanity-rproc/r5_0/tcm@ffe00000"]["reg"].value == [ 0, 0xffe00000, 0, 0x10000 ]:
+        test_passed( "node staging, nested nodes grafted" )
+    else:
+        test_failed( "node staging, nested nodes grafted (%s)" % grafted )
+
+    phandles = [ (p, tree.pnode( p ).abs_path if tree.pnode( p ) else None) for p in [ 0x5ed0, 0x5ed1, 0x5ed2 ] ]
+    if phandles == [ (0x5ed0, "/sanity-rproc/r5_0"), (0x5ed1, "/sanity-rproc/r5_0/tcm@ffe00000"),
+                     (0x5ed2, "/amba/sanity-mbox") ] and \
+       tree["/sanity-rproc/r5_0"].phandle == 0x5ed0 and \
+       tree["/sanity-rproc/r5_0"]["mboxes"].value == [ 0x5ed2, 0, 0x5ed2, 1 ]:
+        test_passed( "node staging, phandles kept" )
+    else:
+        test_failed( "node staging, phandles kept (%s)" % phandles )
+
+def selector_sanity_test( device_tree, outdir, verbose ):
+    device_tree.setup( dt, [], "", True, libfdt = libfdt )
+    tree = device_tree.tree
+    # the sanity tree's labels are not loaded without --enhanced
+    tree['/amba_apu/smmu@fd800000'].label = "iommu"
+
+    print( "[TEST]: selectors" )
+    cases = [
+        ( "/cpus/cpu@*", [ "/cpus/cpu@0", "/cpus/cpu@1", "/cpus/cpu@2" ] ),
+        ( "/**/gic-its@*", [ "/amba_apu/interrupt-controller@f9000000/gic-its@f9020000" ] ),
+        ( "/** [status=okay]", [ "/amba/ethernet@ff0c0000", "/amba/ethernet@ff0d0000", "/amba_apu/smmu@fd800000" ] ),
+        ( "/amba > *", [ "/amba/interrupt-multiplex", "/amba/interrupt-controller@f9f00000",
+                         "/amba/ethernet@ff0c0000", "/amba/ethernet@ff0d0000" ] ),
+        ( "/amba_apu > [interrupts]", [ "/amba_apu/interrupt-controller@f9000000", "/amba_apu/smmu@fd800000",
+                                        "/amba_apu/timer" ] ),
+        ( "/amba_apu *[reg]", [ "/amba_apu/interrupt-controller@f9000000",
+                                "/amba_apu/interrupt-controller@f9000000/gic-its@f9020000",
+                                "/amba_apu/smmu@fd800000" ] ),
+        ( "/amba/ethernet@ff0c0000 phy@*", [ "/amba/ethernet@ff0c0000/phy@1", "/amba/ethernet@ff0c0000/phy@2" ] ),
+        ( "cpu@2, cpu@0", [ "/cpus/cpu@0", "/cpus/cpu@2" ] ),
+        ( "[compatible=arm,cortex-a72]", [ "/cpus/cpu@0", "/cpus/cpu@1", "/cpus/cpu@2" ] ),
+        ( "/cpus > [compatible!=arm,cortex-a72]", [ "/cpus/idle-states" ] ),
+        ( "[compatible~=^arm,gic]", [ "/amba/interrupt-controller@f9f00000", "/amba_apu/interrupt-controller@f9000000",
+                                      "/amba_apu/interrupt-controller@f9000000/gic-its@f9020000" ] ),
+        ( "[compatible^=cdns][reg*=0xff0d]", [ "/amba/ethernet@ff0d0000" ] ),
+        ( "[reg=1]", [ "/cpus/cpu@1", "/cpus/cpu@2", "/amba/ethernet@ff0c0000/phy@1" ] ),
+        ( "/cpus > [reg=0x1]", [ "/cpus/cpu@1", "/cpus/cpu@2" ] ),
+        ( "/amba/ethernet@ff0c0000 > [reg!=1]", [ "/amba/ethernet@ff0c0000/phy@2" ] ),
+        ( ":phandle(3)", [ "/amba_apu/smmu@fd800000" ] ),
+        ( "#iommu", [ "/amba_apu/smmu@fd800000" ] ),
+        ( ":compatible(simple-bus) > [status]", [ "/amba/ethernet@ff0c0000", "/amba/ethernet@ff0d0000",
+                                                  "/amba_apu/smmu@fd800000" ] ),
+        ( "/domains/openamp_r5 -> *", [ "/cpus", "/amba/interrupt-controller@f9f00000", "/amba/ethernet@ff0c0000",
+                                        "/memory@00000000", "/tcm" ] ),
+        ( "/amba [!compatible]", [ "/amba/ethernet@ff0c0000/phy@1", "/amba/ethernet@ff0c0000/phy@2" ] ),
+    ]
+    for selector, expected in cases:
+        try:
+            result = [ n.abs_path for n in tree.query( selector ) ]
+        except ValueError as e:
+            result = str(e)
+        if result == expected:
+            test_passed( "selector '%s'" % selector )
+        else:
+            test_failed( "selector '%s' (%s)" % (selector,result) )
+
+    for selector in [ "", "/amba >", "[status", ":nope(1)", "[a~=(]", "cpu@0,,cpu@1", "/cpus/cpu@0 > " ]:
+        try:
+            tree.query( selector )
+            test_failed( "malformed selector '%s' was accepted" % selector )
+        except ValueError:
+            test_passed( "malformed selector '%s'" % selector )
+
+    # descendant and child combinators match a scan of the tree
+    for combinator, child, kind in [ (" ", False, "descendant"), (" > ", True, "child") ]:
+        result = [ n.abs_path for n in tree.query( "/amba_apu%s[compatible]" % combinator ) ]
+        expected = []
+        for n in tree:
+            p = n.parent
+            while p and "compatible" in n.__props__:
+                if p.abs_path == "/amba_apu":
+                    expected.append( n.abs_path )
+                    break
+                if child:
+                    break
+                p = p.parent
+        if result and result == expected:
+            test_passed( "selector %s combinator matches a tree scan" % kind )
+        else:
+            test_failed( "selector %s combinator (%s vs %s)" % (kind,result,expected) )
+
+    # the select and output lops take selectors in their "query" property
+    lop_file = setup_selector_lops( outdir )
+    device_tree.setup( dt, [lop_file], "", True, libfdt = libfdt )
+    device_tree.perform_lops()
+    selected = [ n.abs_path for n in device_tree.tree if "selector-prop" in n.__props__ ]
+    if selected == [ "/amba/ethernet@ff0c0000", "/amba/ethernet@ff0d0000", "/amba_apu/smmu@fd800000" ]:
+        test_passed( "select lop query" )
+    else:
+        test_failed( "select lop query (%s)" % selected )
+
+    output = outdir + "/selector-output.dts"
+    if test_pattern_count( output, "cpu@2 {" ) == 1 and test_pattern_count( output, "gic-its@f9020000 {" ) == 1 and \
+       test_pattern_count( output, "ethernet@" ) == 0:
+        test_passed( "output lop query" )
+    else:
+        test_failed( "output lop query (%s)" % output )
+
+    # .. and the ReST API has /nodes?select=
+    import lopper_rest
+    lopper_rest.sdt = device_tree
+    client = lopper_rest.app.test_client()
+    r = client.get( "/nodes?select=/cpus > [reg=1]" )
+    if r.status_code == 200 and list( r.get_json().keys() ) == [ "/cpus/cpu@1", "/cpus/cpu@2" ] and \
+       r.headers.get( "X-Total-Count" ) == "2":
+        test_passed( "rest selector query" )
+    else:
+        test_failed( "rest selector query (%s: %s)" % (r.status_code,r.get_data( as_text=True )) )
+
+    r = client.get( "/nodes?select=/amba >" )
+    if r.status_code == 400:
+        test_passed( "rest malformed selector" )
+    else:
+        test_failed( "rest malformed selector (%s)" % r.status_code )
+
+def rest_sanity_test( device_tree, outdir, verbose ):
+    import lopper_rest
+
+    lop_file = setup_rest_lops( outdir )
+    edit_lop_file, assist_file = setup_edit_assist( outdir )
+
+    device_tree.setup( dt, [], "", True, libfdt = libfdt )
+    device_tree.load_paths = [ outdir ]
+    # properties loaded from yaml, or set by assists, can have scalar values
+    device_tree.tree['/cpus']['scalar-prop'] = 5
+
+    lopper_rest.sdt = device_tree
+    client = lopper_rest.app.test_client()
+
+    def state():
+        return lopper_rest.tree_state( device_tree.tree )
+
+    print( "[TEST]: ReST snapshot, lops and assists" )
+    r = client.post( "/snapshots", json={ "name": "base" } )
+    if r.status_code == 201:
+        test_passed( "rest snapshot create" )
+    else:
+        test_failed( "rest snapshot create (%s)" % r.status_code )
+    base_state = state()
+
+    with open( lop_file, "rb" ) as f:
+        r = client.post( "/lops", data=f.read() )
+    result = r.get_json()
+    if r.status_code == 200 and "/amba_apu" in result["diff"]["nodes_modified"] and \
+       device_tree.tree['/amba_apu']['compatible'].value == [ "rest-lop" ]:
+        test_passed( "rest lop" )
+    else:
+        test_failed( "rest lop (%s: %s)" % (r.status_code,result) )
+
+    r = client.post( "/assists", json={ "assist": assist_file } )
+    result = r.get_json()
+    if r.status_code == 200 and result["diff"]["nodes_deleted"] == [ "/anode_to_delete" ] and \
+       result["diff"]["nodes_added"] == [ "/amba/sanity-edit" ] and \
+       device_tree.tree['/amba']['compatible'].value == [ "changed" ]:
+        test_passed( "rest assist" )
+    else:
+        test_failed( "rest assist (%s: %s)" % (r.status_code,result) )
+
+    # the assist fails part way through its changes, they must not be kept
+    r = client.post( "/snapshots/base/rollback" )
+    if r.status_code == 200 and state() == base_state:
+        test_passed( "rest snapshot rollback" )
+    else:
+        test_failed( "rest snapshot rollback (%s: %s)" % (r.status_code,r.get_json()) )
+
+    generation = device_tree.tree.__generation__
+    r = client.post( "/assists", json={ "assist": assist_file, "args": [ "fail" ] } )
+    if r.status_code == 400 and state() == base_state and device_tree.tree.__generation__ == generation:
+        test_passed( "rest failed assist leaves the tree unchanged" )
+    else:
+        test_failed( "rest failed assist leaves the tree unchanged (%s)" % r.status_code )
+
+    with open( lop_file, "rb" ) as f:
+        r = client.post( "/lops?snapshot=base", data=f.read() )
+    if r.status_code == 200 and state() == base_state and \
+       lopper_rest.snapshots["base"]['/amba_apu']['compatible'].value == [ "rest-lop" ]:
+        test_passed( "rest lop against a snapshot" )
+    else:
+        test_failed( "rest lop against a snapshot (%s)" % r.status_code )
+
+    r = client.delete( "/snapshots/base" )
+    r2 = client.get( "/snapshots" )
+    if r.status_code == 204 and r2.get_json() == {}:
+        test_passed( "rest snapshot delete" )
+    else:
+        test_failed( "rest snapshot delete (%s: %s)" % (r.status_code,r2.get_json()) )
+
+    lopper_rest.sdt = None
+
+def rest_metrics_sanity_test( device_tree, outdir, verbose ):
+    import lopper_rest
+
+    device_tree.setup( dt, [], "", True, libfdt = libfdt )
+    lopper_rest.sdt = device_tree
+    lopper_rest.response_cache.clear()
+    client = lopper_rest.app.test_client()
+    sync = LopperTree.__dict__["sync"]
+
+    print( "[TEST]: ReST metrics" )
+    r = client.post( "/metrics", json={ "enable": True, "reset": True } )
+    enabled = r.status_code == 200 and r.get_json() == { "enabled": True, "operations": {} } and \
+              LopperTree.__dict__["sync"] is not sync
+    client.get( "/nodes?path=/cpus/.*" )
+    client.get( "/nodes?select=/amba/*" )
+    r = client.get( "/metrics" )
+    report = r.get_json()
+    if enabled and r.status_code == 200 and report["enabled"] and \
+       report["operations"]["tree.nodes"]["by"]["lopper"]["count"] == 1 and \
+       report["operations"]["tree.query"]["count"] == 1:
+        test_passed( "rest metrics enable and report" )
+    else:
+        test_failed( "rest metrics enable and report (%s %s)" % (enabled,report) )
+
+    r = client.post( "/metrics", json={ "enable": False } )
+    r2 = client.post( "/metrics", data="not json" )
+    if r.status_code == 200 and not r.get_json()["enabled"] and \
+       r.get_json()["operations"] == report["operations"] and \
+       LopperTree.sync is sync and r2.status_code == 400:
+        test_passed( "rest metrics disable" )
+    else:
+        test_failed( "rest metrics disable (%s %s)" % (r.status_code,r2.status_code) )
+
+    lopper.lopper_tree.metrics.reset()
+    lopper_rest.sdt = None
+
+def rest_lock_sanity_test( verbose ):
+    import threading
+    import time
+    import lopper_rest
+
+    print( "[TEST]: ReST tree lock" )
+    lock = lopper_rest.LopperRWLock()
+    order = []
+    release_readers = threading.Event()
+    release_writer = threading.Event()
+
+    def reader( name, holding ):
+        with lock.read():
+            order.append( name )
+            holding.set()
+            release_readers.wait( 10 )
+
+    def writer( holding ):
+        with lock.write():
+            order.append( "writer" )
+            holding.set()
+            release_writer.wait( 10 )
+
+    def wait_for( cond ):
+        for i in range( 100 ):
+            if cond():
+                return True
+            time.sleep( 0.05 )
+        return False
+
+    r1_in = threading.Event()
+    r2_in = threading.Event()
+    w_in = threading.Event()
+    r3_in = threading.Event()
+    threads = [ threading.Thread( target=reader, args=( "r1", r1_in ), daemon=True ),
+                threading.Thread( target=reader, args=( "r2", r2_in ), daemon=True ) ]
+    for t in threads:
+        t.start()
+
+    # both readers hold the lock at once
+    if r1_in.wait( 5 ) and r2_in.wait( 5 ) and lock.readers == 2:
+        test_passed( "rest lock concurrent readers" )
+    else:
+        test_failed( "rest lock concurrent readers (%s)" % order )
+
+    # a writer waits for the readers, and a reader that comes after the
+    # writer waits for the writer
+    threads.append( threading.Thread( target=writer, args=( w_in, ), daemon=True ) )
+    threads[-1].start()
+    waiting = wait_for( lambda: lock.writers_waiting == 1 )
+    threads.append( threading.Thread( target=reader, args=( "r3", r3_in ), daemon=True ) )
+    threads[-1].start()
+    blocked = not r3_in.wait( 0.5 ) and not w_in.is_set()
+
+    # the readers are released, but r3 must not get in before the writer
+    release_readers.set()
+    writer_in = w_in.wait( 5 )
+    r3_blocked = not r3_in.wait( 0.5 )
+    release_writer.set()
+    r3_after = r3_in.wait( 5 )
+
+    for t in threads:
+        t.join( 5 )
+
+    if waiting and blocked and writer_in and r3_blocked and r3_after and \
+       order[:2] in [ ["r1","r2"], ["r2","r1"] ] and order[2:] == [ "writer", "r3" ] and \
+       lock.readers == 0 and not lock.writer:
+        test_passed( "rest lock waiting writer blocks new readers" )
+    else:
+        test_failed( "rest lock waiting writer blocks new readers (%s %s %s %s %s %s)" %
+                     (order,waiting,blocked,writer_in,r3_blocked,r3_after) )
+
+def rest_query_sanity_test( device_tree, outdir, verbose ):
+    import gzip
+    import lopper_rest
+
+    device_tree.setup( dt, [], "", True, libfdt = libfdt )
+    tree = device_tree.tree
+
+    lopper_rest.sdt = device_tree
+    lopper_rest.response_cache.clear()
+    client = lopper_rest.app.test_client()
+
+    print( "[TEST]: ReST queries" )
+    amba = [ n.abs_path for n in tree.nodes( "/amba/.*" ) ]
+    r = client.get( "/nodes?path=/amba/.*&offset=1&limit=2" )
+    if r.status_code == 200 and list( r.get_json().keys() ) == amba[1:3] and \
+       r.headers.get( "X-Total-Count" ) == str( len(amba) ):
+        test_passed( "rest offset and limit" )
+    else:
+        test_failed( "rest offset and limit (%s: %s %s)" % (r.status_code,r.get_json(),r.headers.get( "X-Total-Count" )) )
+
+    r = client.get( "/nodes?path=/amba/ethernet@ff0c0000$&props=phy-mode,status,no-such-prop" )
+    if r.status_code == 200 and \
+       r.get_json() == { "/amba/ethernet@ff0c0000": { "phy-mode": 'phy-mode = "rgmii-id";',
+                                                      "status": 'status = "okay";' } }:
+        test_passed( "rest property projection" )
+    else:
+        test_failed( "rest property projection (%s: %s)" % (r.status_code,r.get_json()) )
+
+    r = client.get( "/nodes?path=/amba/ethernet@ff0c0000$&depth=1" )
+    if r.status_code == 200 and list( r.get_json().keys() ) == \
+       [ "/amba/ethernet@ff0c0000", "/amba/ethernet@ff0c0000/phy@1", "/amba/ethernet@ff0c0000/phy@2" ]:
+        test_passed( "rest subnode depth" )
+    else:
+        test_failed( "rest subnode depth (%s: %s)" % (r.status_code,r.get_json()) )
+
+    # a client with the current generation gets a 304, until the tree changes
+    r = client.get( "/nodes?path=/cpus$&details=True" )
+    etag = r.headers.get( "ETag" )
+    r2 = client.get( "/nodes?path=/cpus$&details=True", headers={ "If-None-Match": etag } )
+    tree['/cpus']['sanity-prop'] = "changed"
+    r3 = client.get( "/nodes?path=/cpus$&details=True", headers={ "If-None-Match": etag } )
+    if r.status_code == 200 and etag and r2.status_code == 304 and \
+       r3.status_code == 200 and r3.headers.get( "ETag" ) != etag and \
+       r3.get_json()["/cpus"].get( "sanity-prop" ) == 'sanity-prop = "changed";':
+        test_passed( "rest etag" )
+    else:
+        test_failed( "rest etag (%s %s %s)" % (r.status_code,r2.status_code,r3.status_code) )
+
+    r = client.get( "/nodes?path=.*&details=True" )
+    r_gz = client.get( "/nodes?path=.*&details=True", headers={ "Accept-Encoding": "gzip" } )
+    if r_gz.status_code == 200 and r_gz.headers.get( "Content-Encoding" ) == "gzip" and \
+       len( r.get_data() ) > 1024 and r.headers.get( "Content-Encoding" ) is None and \
+       json.loads( gzip.decompress( r_gz.get_data() ) ) == r.get_json():
+        test_passed( "rest gzip" )
+    else:
+        test_failed( "rest gzip (%s %s)" % (r_gz.status_code,r_gz.headers.get( "Content-Encoding" )) )
+
+    # a line per query, in order. The third has no path, select or phandle
+    queries = [ { "path": "/cpus$" },
+                { "select": "/amba > ethernet@*", "props": "phy-mode" },
+                { "depth": 1 },
+                { "phandle": "0xb" } ]
+    r = client.post( "/bulk", data="\n".join( [ json.dumps( q ) for q in queries ] ) + "\n" )
+    lines = [ json.loads( l ) for l in r.get_data( as_text=True ).splitlines() ]
+    if r.status_code == 200 and len( lines ) == 4 and \
+       [ l["query"] for l in lines ] == queries and \
+       lines[0]["nodes"] == { "/cpus": None } and \
+       lines[1]["total"] == 2 and \
+       lines[1]["nodes"]["/amba/ethernet@ff0d0000"] == { "phy-mode": 'phy-mode = "rgmii-id";' } and \
+       "error" in lines[2] and "nodes" not in lines[2] and \
+       list( lines[3]["nodes"].keys() ) == [ "/amba/ethernet@ff0c0000" ]:
+        test_passed( "rest bulk" )
+    else:
+        test_failed( "rest bulk (%s: %s)" % (r.status_code,lines) )
+
+    r = client.get( "/phandle/0xb" )
+    r2 = client.get( "/phandle/0x7777" )
+    if r.status_code == 200 and list( r.get_json().keys() ) == [ "/amba/ethernet@ff0c0000" ] and \
+       r.get_json()["/amba/ethernet@ff0c0000"]["phy-mode"] == 'phy-mode = "rgmii-id";' and \
+       r2.status_code == 404:
+        test_passed( "rest phandle" )
+    else:
+        test_failed( "rest phandle (%s %s)" % (r.status_code,r2.status_code) )
+
+    lopper_rest.sdt = None
+
+def query_sanity_test( sdt_file, outdir, verbose ):
+    import io
+    import subprocess
+    import lopper_query
+
+    cache_dir = outdir + "/query-cache"
+    shutil.rmtree( cache_dir, ignore_errors=True )
+    old_cache = os.environ.get( "LOPPER_QUERY_CACHE" )
+    os.environ["LOPPER_QUERY_CACHE"] = cache_dir
+
+    query_file = outdir + "/sanity-queries.txt"
+    with open( query_file, "w" ) as f:
+        f.write( textwrap.dedent( """\
+            # a selector, a phandle and a /nodes query
+            /cpus/cpu@*
+            0xb
+            { "path": "/amba/.*", "props": "phy-mode", "limit": 2 }
+            { "depth": 1 }
+            """ ) )
+
+    print( "[TEST]: lopper_query local queries" )
+    try:
+        results = []
+        loads = []
+        for i in range( 2 ):
+            err = io.StringIO()
+            with contextlib.redirect_stderr( err ):
+                device_tree = lopper_query.local_tree( sdt_file, libfdt, 1 )
+            loads.append( err.getvalue() )
+            with open( query_file ) as f:
+                queries = list( lopper_query.read_queries( f, True ) )
+            results.append( [ json.loads( l ) for l in lopper_query.local_bulk( device_tree, queries ) ] )
+
+        snapshots = os.listdir( cache_dir )
+        if "from snapshot" not in loads[0] and "from snapshot" in loads[1] and \
+           len( snapshots ) == 1 and snapshots[0].endswith( ".json" ):
+            test_passed( "query local snapshot" )
+        else:
+            test_failed( "query local snapshot (%s %s)" % (loads,snapshots) )
+
+        lines = results[0]
+        if results[0] == results[1] and len( lines ) == 4 and \
+           list( lines[0]["nodes"].keys() ) == [ "/cpus/cpu@0", "/cpus/cpu@1", "/cpus/cpu@2" ] and \
+           lines[0]["query"] == { "select": "/cpus/cpu@*", "details": True } and \
+           list( lines[1]["nodes"].keys() ) == [ "/amba/ethernet@ff0c0000" ] and \
+           lines[2]["total"] > 2 and len( lines[2]["nodes"] ) == 2 and \
+           "error" in lines[3]:
+            test_passed( "query local bulk" )
+        else:
+            test_failed( "query local bulk (%s)" % results )
+
+        # a snapshot that others can write is not used
+        os.chmod( cache_dir, 0o777 )
+        err = io.StringIO()
+        with contextlib.redirect_stderr( err ):
+            lopper_query.local_tree( sdt_file, libfdt, 1 )
+        os.chmod( cache_dir, 0o700 )
+        if "from snapshot" not in err.getvalue():
+            test_passed( "query snapshot ownership" )
+        else:
+            test_failed( "query snapshot ownership" )
+
+        # stdout is only the results, even when verbose
+        lopper_dir = os.path.dirname( os.path.realpath( __file__ ) )
+        query_args = [ sys.executable, lopper_dir + "/lopper_query.py", "-v", "-d", "-l", sdt_file, "-b", query_file ]
+        if not libfdt:
+            query_args.append( "--no-libfdt" )
+        shutil.rmtree( cache_dir, ignore_errors=True )
+        r = subprocess.run( query_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE )
+        try:
+            stdout_lines = [ json.loads( l ) for l in r.stdout.decode().splitlines() ]
+        except ValueError:
+            stdout_lines = None
+        if r.returncode == 0 and stdout_lines == results[0]:
+            test_passed( "query ndjson output" )
+        else:
+            test_failed( "query ndjson output (%s: %s)" % (r.returncode,r.stdout.decode()[:200]) )
+    finally:
+        if old_cache is None:
+            del os.environ["LOPPER_QUERY_CACHE"]
+        else:
+            os.environ["LOPPER_QUERY_CACHE"] = old_cache
+
+def daemon_sanity_test( outdir, verbose ):
+    import subprocess
+    import time
+    import lopper_daemon
+
+    dts, inc_dir = setup_daemon_tree( outdir, "0x1" )
+
+    # the header is only found through a cpp -I path
+    saved_ppflags = os.environ.get( "LOPPER_PPFLAGS" )
+    os.environ["LOPPER_PPFLAGS"] = "-I%s" % inc_dir
+
+    print( "[TEST]: daemon tree cache keys" )
+    key = lopper_daemon.tree_key( dts, [], libfdt, [ False, False, False ], outdir = outdir )
+    key_enhanced = lopper_daemon.tree_key( dts, [], libfdt, [ False, False, True ], outdir = outdir )
+    setup_daemon_tree( outdir, "0x2" )
+    key_changed = lopper_daemon.tree_key( dts, [], libfdt, [ False, False, False ], outdir = outdir )
+    setup_daemon_tree( outdir, "0x1" )
+    key_restored = lopper_daemon.tree_key( dts, [], libfdt, [ False, False, False ], outdir = outdir )
+
+    if key and key != key_enhanced:
+        test_passed( "daemon key includes options" )
+    else:
+        test_failed( "daemon key includes options" )
+
+    if key != key_changed and key == key_restored:
+        test_passed( "daemon key follows included files" )
+    else:
+        test_failed( "daemon key follows included files" )
+
+    # jobs through a daemon and the client
+    print( "[TEST]: daemon and client jobs" )
+    lopper_dir = os.path.dirname( os.path.realpath( __file__ ) )
+    env = dict( os.environ )
+    env["LOPPER_DAEMON_SOCKET"] = outdir + "/lopper-sanity-daemon.sock"
+    daemon_log = open( outdir + "/lopper-sanity-daemon.log", "w" )
+    daemon = subprocess.Popen( [ sys.executable, lopper_dir + "/lopper_daemon.py", "-v",
+                                 "-s", env["LOPPER_DAEMON_SOCKET"] ],
+                               env=env, stdout=daemon_log, stderr=subprocess.STDOUT )
+
+    for i in range( 100 ):
+        if os.path.exists( env["LOPPER_DAEMON_SOCKET"] ):
+            break
+        time.sleep( 0.1 )
+
+    client_args = [ sys.executable, lopper_dir + "/lopper_client.py", "-f" ]
+    if not libfdt:
+        client_args.append( "--no-libfdt" )
+
+    outputs = []
+    for value, options in [ ("0x1", []), ("0x1", []), ("0x2", []), ("0x2", [ "--enhanced" ]) ]:
+        setup_daemon_tree( outdir, value )
+        output_file = outdir + "/daemon-output.dts"
+        if os.path.exists( output_file ):
+            os.remove( output_file )
+        r = subprocess.run( client_args + options + [ dts, output_file ], env=env, cwd=outdir,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT )
+        if verbose:
+            print( r.stdout.decode() )
+        try:
+            with open( output_file ) as f:
+                output = f.read()
+        except OSError:
+            output = ""
+        outputs.append( (r.returncode, "value = <%s>;" % value in output) )
+
+    daemon.terminate()
+    daemon.wait()
+    daemon_log.close()
+    with open( outdir + "/lopper-sanity-daemon.log" ) as f:
+        log = f.read()
+
+    if outputs == [ (0,True) ] * 4:
+        test_passed( "daemon jobs" )
+    else:
+        test_failed( "daemon jobs (%s)" % outputs )
+
+    if "(1 cache hits, 3 misses)" in log:
+        test_passed( "daemon tree cache" )
+    else:
+        test_failed( "daemon tree cache: %s" % log )
+
+    if saved_ppflags is None:
+        del os.environ["LOPPER_PPFLAGS"]
+    else:
+        os.environ["LOPPER_PPFLAGS"] = saved_ppflags
+
+def subsystem_sanity_test( device_tree, domains_yaml, outdir, verbose ):
+    device_tree.setup( dt, [ domains_yaml ], "", True, libfdt = libfdt )
+
+    sys.path.append( os.path.dirname(os.path.realpath(__file__)) + "/assists" )
+    import subsystem
+
+    tree = device_tree.tree
+    # the sanity tree's labels are not loaded without --enhanced.
+    # serial01 is first, so a regex search for serial0 finds it
+    for path, label in [ ("/cpus-a72@0", "cpus_a72"), ("/cpus-r5@1", "cpus_r5"),
+                         ("/amba/serial@ff010000", "serial01"), ("/amba/serial@ff000000", "serial0"),
+                         ("/amba/ethernet@ff0c0000", "ethernet0") ]:
+        tree[path].label = label
+
+    print( "[TEST]: subsystem expand" )
+    subsystem.subsystem( "/", device_tree, { 'verbose': verbose, 'args': [] } )
+
+    # new phandles are allocated from the highest one in the tree (0x30),
+    # in the order the labels are referenced
+    a72 = tree["/cpus-a72@0"]
+    serial0 = tree["/amba/serial@ff000000"]
+    serial01 = tree["/amba/serial@ff010000"]
+    if (a72.phandle, serial0.phandle, serial01.phandle) == (0x31, 0x32, 0x33) and \
+       tree["/amba/ethernet@ff0c0000"].phandle == 0x20 and tree.pnode( 0x32 ) is serial0:
+        test_passed( "subsystem generated phandles" )
+    else:
+        test_failed( "subsystem generated phandles (%s %s %s)" % (a72.phandle,serial0.phandle,serial01.phandle) )
+
+    apu = tree.lnodes( "sanity_apu", exact = True )
+    rpu = tree.lnodes( "sanity_rpu", exact = True )
+    if apu and rpu and \
+       apu[0]["cpus"].value == [ 0x31, 0x3, 0x80000000 ] and \
+       rpu[0]["cpus"].value == [ 0x30, 0x1, 0x3 ]:
+        test_passed( "subsystem cpus cells" )
+    else:
+        test_failed( "subsystem cpus cells (%s)" % [ d["cpus"].value for d in apu + rpu ] )
+
+    # the exact label (serial0) is used before a regex match (serial01)
+    if apu and rpu and \
+       apu[0]["access"].value == [ 0x32, 0x20, 0xdeadbeef ] and \
+       rpu[0]["access"].value == [ 0x32, 0x33 ] and \
+       apu[0]["memory"].value == [ 0x0, 0x80000000 ]:
+        test_passed( "subsystem access cells" )
+    else:
+        test_failed( "subsystem access cells (%s)" % [ d["access"].value for d in apu + rpu ] )
+
+    # the firewall of the rpu blocks the apu domain
+    firewall = tree.nodes( "/domains/.*/firewallconf$" )
+    if firewall:
+        subsystem.firewall_expand( tree, firewall[0], verbose )
+    if rpu and apu and apu[0].phandle == 0x34 and \
+       rpu[0]["firewallconf"].value == [ 0x34, 0x1, 0x0 ] and \
+       not tree.nodes( "/domains/.*/firewallconf$" ):
+        test_passed( "subsystem firewallconf" )
+    else:
+        test_failed( "subsystem firewallconf (%s)" % [ d.phandle for d in apu ] )
+
+def baremetal_sanity_test( device_tree, outdir, verbose ):
+    device_tree.setup( dt, [], "", True, libfdt = libfdt )
+
+    sys.path.append( os.path.dirname(os.path.realpath(__file__)) + "/assists" )
+    import baremetalconfig_xlnx
+    import baremetallinker_xlnx
+
+    options = { 'args': [ "cortexa72-versal" ] }
+
+    print( "[TEST]: baremetal shared tree data" )
+    okay = [ n.name for n in baremetalconfig_xlnx.get_okay_nodes( device_tree, "/" ) ]
+    mapped = [ n.name for n in baremetalconfig_xlnx.get_mapped_nodes( device_tree, baremetalconfig_xlnx.get_okay_nodes( device_tree, "/" ), options ) ]
+    mem_ranges = baremetallinker_xlnx.get_memranges( "/", device_tree, options )
+    if okay == [ "serial@ff000000", "serial@ff001000", "gpio@ff000800", "i2c@ff020000" ] and \
+       mapped == [ "serial@ff000000", "serial@ff001000", "gpio@ff000800" ] and \
+       mem_ranges == { "psv_ddr_0": [ 0x0, 0x80000000 ] }:
+        test_passed( "baremetal okay, mapped nodes and memory ranges" )
+    else:
+        test_failed( "baremetal okay, mapped nodes and memory ranges (%s %s %s)" % (okay,mapped,mem_ranges) )
+
+    # the address-map has adjacent (serial0, serial1) and overlapping
+    # (gpio) ranges, and two ranges of the ddr. They are all kept.
+    amap = baremetalconfig_xlnx.get_address_map( device_tree, options )
+    ddr = device_tree.tree['/memory@0']
+    gpio = device_tree.tree['/amba/gpio@ff000800']
+    records = [ (r.address, r.size) for r in amap.records ]
+    if records == [ (0x0,0x80000000), (0xff000000,0x1000), (0xff001000,0x1000),
+                    (0xff000800,0x1000), (0x800000000,0x80000000) ]:
+        test_passed( "baremetal address-map decode" )
+    else:
+        test_failed( "baremetal address-map decode (%s)" % [ (hex(a),hex(s)) for a, s in records ] )
+
+    ddr_records = [ (r.address, r.bus_cells) for r in amap.node_records( ddr ) ]
+    gpio_records = [ (r.address, r.size) for r in amap.node_records( gpio ) ]
+    if ddr_records == [ (0x0, [0x0,0x0]), (0x800000000, [0x8,0x0]) ] and \
+       gpio_records == [ (0xff000800, 0x1000) ] and amap.is_mapped( gpio ) and \
+       not amap.is_mapped( device_tree.tree['/amba/i2c@ff020000'] ) and \
+       amap.access_phandles == set( [ n.phandle for n in device_tree.tree['/amba'].subnodes( children_only = True ) if amap.is_mapped( n ) ] ):
+        test_passed( "baremetal address-map node records" )
+    else:
+        test_failed( "baremetal address-map node records (%s %s)" % (ddr_records,gpio_records) )
+
+    # the shared data is only derived once for an unchanged tree
+    data = baremetalconfig_xlnx.get_tree_data( device_tree )
+    if data is baremetalconfig_xlnx.get_tree_data( device_tree ) and ('okay', "/") in data:
+        test_passed( "baremetal shared data reuse" )
+    else:
+        test_failed( "baremetal shared data reuse" )
+
+    # .. and is derived again when the tree is modified
+    device_tree.tree['/amba/serial@ff001000']['status'].value = [ "disabled" ]
+    device_tree.tree['/memory@0']['reg'].value = [ 0x0, 0x0, 0x0, 0x40000000 ]
+    okay = [ n.name for n in baremetalconfig_xlnx.get_okay_nodes( device_tree, "/" ) ]
+    mem_ranges = baremetallinker_xlnx.get_memranges( "/", device_tree, options )
+    if okay == [ "serial@ff000000", "gpio@ff000800", "i2c@ff020000" ] and \
+       mem_ranges == { "psv_ddr_0": [ 0x0, 0x40000000 ] }:
+        test_passed( "baremetal shared data after a tree change" )
+    else:
+        test_failed( "baremetal shared data after a tree change (%s %s)" % (okay,mem_ranges) )
+
+    # drop the gpio (the overlapping range) from the address-map
+    cluster = device_tree.tree['/cpus-a72@0']
+    cluster['address-map'].value = cluster['address-map'].value[:21] + cluster['address-map'].value[28:]
+    mapped = [ n.name for n in baremetalconfig_xlnx.get_mapped_nodes( device_tree, baremetalconfig_xlnx.get_okay_nodes( device_tree, "/" ), options ) ]
+    amap = baremetalconfig_xlnx.get_address_map( device_tree, options )
+    if mapped == [ "serial@ff000000" ] and not amap.is_mapped( gpio ) and len( amap.records ) == 4:
+        test_passed( "baremetal address-map after a tree change" )
+    else:
+        test_failed( "baremetal address-map after a tree change (%s)" % mapped )
+
+    # driver metadata, and its (json) disk cache
+    yaml_file = outdir + "/sanity-driver.yaml"
+    with open( yaml_file, "w" ) as f:
+        f.write( "properties:\n  compatible:\n    items:\n      - enum:\n          - xlnx,sanity-1.0\n          - xlnx,sanity-2.0\n" )
+    cache_dir = outdir + "/metadata-cache"
+    shutil.rmtree( cache_dir, ignore_errors=True )
+    old_cache = os.environ.get( "LOPPER_METADATA_CACHE" )
+    os.environ["LOPPER_METADATA_CACHE"] = cache_dir
+    try:
+        schema = baremetalconfig_xlnx.load_yaml( yaml_file )
+        compat = sorted( baremetalconfig_xlnx.compat_list( schema ) )
+        cache_files = os.listdir( cache_dir )
+        if compat == [ "xlnx,sanity-1.0", "xlnx,sanity-2.0" ] and \
+           baremetalconfig_xlnx.load_yaml( yaml_file ) is schema and \
+           len( cache_files ) == 1 and cache_files[0].endswith( ".json" ):
+            test_passed( "driver metadata cache" )
+        else:
+            test_failed( "driver metadata cache (%s %s)" % (compat,cache_files) )
+
+        # a changed file replaces its entries, they don't accumulate
+        entries = len( baremetalconfig_xlnx.schema_metadata )
+        with open( yaml_file, "a" ) as f:
+            f.write( "          - xlnx,sanity-3.0\n" )
+        schema = baremetalconfig_xlnx.load_yaml( yaml_file )
+        compat = sorted( baremetalconfig_xlnx.compat_list( schema ) )
+        if compat == [ "xlnx,sanity-1.0", "xlnx,sanity-2.0", "xlnx,sanity-3.0" ] and \
+           len( baremetalconfig_xlnx.schema_metadata ) == entries:
+            test_passed( "driver metadata reload" )
+        else:
+            test_failed( "driver metadata reload (%s %s entries)" % (compat,len( baremetalconfig_xlnx.schema_metadata )) )
+
+        # a cache that others can write is not read
+        os.chmod( cache_dir, 0o777 )
+        cache_file = os.path.join( cache_dir, cache_files[0] )
+        with open( cache_file ) as f:
+            cached = json.load( f )
+        cached['schema']['properties']['compatible']['items'][0]['enum'] = [ "xlnx,planted" ]
+        cached['compat'] = [ "xlnx,planted" ]
+        with open( cache_file, "w" ) as f:
+            json.dump( cached, f )
+        baremetalconfig_xlnx.driver_metadata.clear()
+        baremetalconfig_xlnx.schema_metadata.clear()
+        compat = sorted( baremetalconfig_xlnx.compat_list( baremetalconfig_xlnx.load_yaml( yaml_file ) ) )
+        if compat == [ "xlnx,sanity-1.0", "xlnx,sanity-2.0", "xlnx,sanity-3.0" ]:
+            test_passed( "driver metadata cache ownership" )
+        else:
+            test_failed( "driver metadata cache ownership (%s)" % compat )
+    finally:
+        if old_cache is None:
+            del os.environ["LOPPER_METADATA_CACHE"]
+        else:
+            os.environ["LOPPER_METADATA_CACHE"] = old_cache
+
+    # batch generation from a manifest. The generators write a file into
+    # their (current) outdir, or sys.exit(1) like the baremetal generators
+    import baremetal_bsp_xlnx
+
+    gen_dir = outdir + "/bsp-assists"
+    os.makedirs( gen_dir, exist_ok=True )
+    with open( gen_dir + "/sanity_gen_ok.py", "w" ) as f:
+        f.write( textwrap.dedent( """\
+            import os
+            def is_compat( node, compat_string_to_test ):
+                if compat_string_to_test == "module,sanity_gen_ok":
+                    return generate
+                return ""
+            def generate( tgt_node, sdt, options ):
+                with open( "generated.txt", "w" ) as f:
+                    f.write( " ".join( options['args'] ) + " " + str(os.getpid()) )
+                return True
+            """ ) )
+    with open( gen_dir + "/sanity_gen_fail.py", "w" ) as f:
+        f.write( textwrap.dedent( """\
+            import sys
+            def is_compat( node, compat_string_to_test ):
+                if compat_string_to_test == "module,sanity_gen_fail":
+                    return generate
+                return ""
+            def generate( tgt_node, sdt, options ):
+                print( "[ERROR]: sanity generator failure" )
+                sys.exit(1)
+            """ ) )
+    device_tree.load_paths.append( gen_dir )
+
+    manifest = outdir + "/bsp-manifest.yaml"
+    with open( manifest, "w" ) as f:
+        f.write( textwrap.dedent( """\
+            jobs: 1
+            generators:
+              - assist: sanity_gen_ok
+                args: [ cortexa72-versal, first ]
+                outdir: bsp/gen_a
+              - assist: sanity_gen_ok
+                args: [ cortexa72-versal, second ]
+                outdir: bsp/gen_b
+            """ ) )
+    fail_manifest = outdir + "/bsp-manifest-fail.yaml"
+    with open( fail_manifest, "w" ) as f:
+        f.write( textwrap.dedent( """\
+            generators:
+              - assist: sanity_gen_fail
+                args: [ cortexa72-versal ]
+                outdir: bsp/gen_fail
+              - assist: sanity_gen_ok
+                args: [ cortexa72-versal, after ]
+                outdir: bsp/gen_after
+            """ ) )
+
+    jobs, generators = baremetal_bsp_xlnx.read_manifest( manifest, outdir )
+    if jobs == 1 and [ (g[0], g[1], g[2]) for g in generators ] == \
+       [ ("sanity_gen_ok", ["cortexa72-versal", "first"], os.path.abspath( outdir + "/bsp/gen_a" )),
+         ("sanity_gen_ok", ["cortexa72-versal", "second"], os.path.abspath( outdir + "/bsp/gen_b" )) ]:
+        test_passed( "baremetal bsp manifest" )
+    else:
+        test_failed( "baremetal bsp manifest (%s %s)" % (jobs,generators) )
+
+    old_werror = device_tree.werror
+    device_tree.werror = False
+    cwd = os.getcwd()
+    try:
+        for job_args in [ [], [ "-j", "2" ] ]:
+            label = "(jobs=%s)" % (job_args[1] if job_args else 1)
+            shutil.rmtree( outdir + "/bsp", ignore_errors=True )
+            ret = baremetal_bsp_xlnx.xlnx_generate_bsp( "/", device_tree,
+                                                        { 'outdir': outdir, 'args': job_args + [ manifest ] } )
+            generated = []
+            for gen in [ "gen_a", "gen_b" ]:
+                try:
+                    with open( outdir + "/bsp/" + gen + "/generated.txt" ) as f:
+                        generated.append( f.read().split() )
+                except OSError:
+                    generated.append( None )
+
+            # with jobs, the generators are run in forked workers
+            forked = job_args and all( generated ) and \
+                     all( g[2] != str(os.getpid()) for g in generated )
+            if ret and os.getcwd() == cwd and all( generated ) and \
+               [ g[:2] for g in generated ] == [ ["cortexa72-versal", "first"], ["cortexa72-versal", "second"] ] and \
+               (forked or not job_args):
+                test_passed( "baremetal bsp generators %s" % label )
+            else:
+                test_failed( "baremetal bsp generators %s (%s %s)" % (label,ret,generated) )
+
+            # a generator that exits fails, the rest of the batch is run
+            try:
+                ret = baremetal_bsp_xlnx.xlnx_generate_bsp( "/", device_tree,
+                                                            { 'outdir': outdir, 'args': job_args + [ fail_manifest ] } )
+            except SystemExit:
+                ret = "exit"
+            if ret is False and os.getcwd() == cwd and \
+               os.path.exists( outdir + "/bsp/gen_after/generated.txt" ):
+                test_passed( "baremetal bsp failed generator %s" % label )
+            else:
+                test_failed( "baremetal bsp failed generator %s (%s)" % (label,ret) )
+    finally:
+        device_tree.werror = old_werror
+        os.chdir( cwd )
+
 def format_sanity_test( device_tree, verbose ):
     device_tree.setup( dt, [], "", True, libfdt = libfdt )
 
@@ -2097,6 +3721,49 @@ def format_sanity_test( device_tree, verbose ):
     device_tree.write( enhanced = True )
 
 
+def cdo_sanity_test( device_tree, outdir, verbose ):
+    device_tree.setup( dt, [], "", True, libfdt = libfdt )
+
+    sys.path.append( os.path.dirname(os.path.realpath(__file__)) + "/assists" )
+    import cdo
+
+    text_file = outdir + "/cdo-test.cdo"
+    bin_file = outdir + "/cdo-test.bin"
+
+    print( "[TEST]: writing CDO to %s and %s" % (text_file,bin_file) )
+    cdo.cdo_write( device_tree.tree["/"], device_tree,
+                   { 'verbose': verbose, 'args': [ "-b", bin_file, text_file ] } )
+
+    text_commands = []
+    with open( text_file ) as f:
+        for line in f:
+            line = line.split()
+            if not line or line[0].startswith( "#" ) or line[0] == "version":
+                continue
+            text_commands.append( (line[0], [ int(a,16) for a in line[1:] ]) )
+
+    with open( bin_file, "rb" ) as f:
+        try:
+            bin_commands = cdo.cdo_decode( f.read() )
+        except ValueError as e:
+            test_failed( "binary cdo decode: %s" % e )
+            bin_commands = []
+
+    if verbose:
+        for c in bin_commands:
+            print( "    %s %s" % (c[0], " ".join( [hex(a) for a in c[1]] )) )
+
+    if text_commands and bin_commands == text_commands:
+        test_passed( "binary cdo round trip (%s commands)" % len(bin_commands) )
+    else:
+        test_failed( "binary cdo round trip (%s vs %s commands)" % (len(bin_commands),len(text_commands)) )
+
+    reqs = [ c for c in text_commands if c[0] == "pm_add_requirement" and c[1][1] == 0x18224019 ]
+    if len(reqs) == 2 and reqs[0][1][2] & 0x3 == 0x1:
+        test_passed( "cdo shared device requirement" )
+    else:
+        test_failed( "cdo shared device requirement (%s)" % reqs )
+
 def fdt_sanity_test( device_tree, verbose ):
 
     device_tree.setup( dt, [], "", True, libfdt = libfdt )
@@ -2239,6 +3906,49 @@ def yaml_sanity_test( device_tree, yaml_file, outdir, verbose ):
     else:
         test_failed( "yaml complex struct access" )
 
+    # merge keys: earlier merged mappings and explicit keys take
+    # precedence, properties are in the order of a constructed mapping
+    merge_file = outdir + "/merge-keys.yaml"
+    with open( merge_file, "w" ) as w:
+        w.write( textwrap.dedent( """\
+            base: &base
+              a: 1
+              b: 2
+            node:
+              <<: [ *base, { extra: 1, b: 9 } ]
+              c: 3
+              a: 5
+            """ ) )
+    merge_props = [ (p.name, p.value) for p in LopperYAML( merge_file ).to_tree()["/node"] ]
+    if merge_props == [ ("extra", 1), ("b", 2), ("a", 5), ("c", 3) ]:
+        test_passed( "yaml merge keys" )
+    else:
+        test_failed( "yaml merge keys (%s)" % merge_props )
+
+    # a single phandle is a scalar in yaml, it must load and write back
+    phandle_file = outdir + "/single-phandle.yaml"
+    with open( phandle_file, "w" ) as w:
+        w.write( textwrap.dedent( """\
+            intc:
+              phandle: 2
+              interrupt-controller: true
+            dev:
+              interrupt-parent: 2
+              interrupts: [ 0, 1, 4 ]
+            """ ) )
+    try:
+        plt = LopperYAML( phandle_file ).to_tree()
+        phandle_dts = outdir + "/single-phandle.dts"
+        LopperSDT(None).write( plt, phandle_dts, True, True )
+        with open( phandle_dts ) as f:
+            phandle_out = f.read()
+    except Exception as e:
+        phandle_out = str(e)
+    if "interrupt-parent = <0x2>;" in phandle_out:
+        test_passed( "yaml single phandle" )
+    else:
+        test_failed( "yaml single phandle (%s)" % phandle_out )
+
 def usage():
     prog = os.path.basename(sys.argv[0])
     print('Usage: %s [OPTION] ...' % prog)
@@ -2248,6 +3958,10 @@ def usage():
     print('  -a, --assists       run assist tests' )
     print('  -f, --format        run format tests (dts/yaml)' )
     print('  -d, --fdt           run fdt abstraction tests' )
+    print('  -c, --cdo           run cdo output assist tests' )
+    print('  -r, --rest          run ReST API tests' )
+    print('    , --daemon        run lopper daemon and client tests' )
+    print('  -s, --selector      run selector tests' )
     print('    , --werror        treat warnings as errors' )
     print('    , --all           run all sanity tests' )
     print('  -h, --help          display this help and exit')
@@ -2264,6 +3978,10 @@ def main():
     global format
     global continue_on_error
     global fdttest
+    global cdotest
+    global resttest
+    global daemontest
+    global selectortest
     global libfdt
 
     verbose = 0
@@ -2275,10 +3993,14 @@ def main():
     assists = False
     format = False
     fdttest = False
+    cdotest = False
+    resttest = False
+    daemontest = False
+    selectortest = False
     continue_on_error = False
     libfdt = True
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "avtlhd", [ "no-libfdt", "all", "fdt", "continue", "format", "assists", "tree", "lops", "werror","verbose", "help"])
+        opts, args = getopt.getopt(sys.argv[1:], "avtlhdcrs", [ "no-libfdt", "all", "fdt", "cdo", "rest", "daemon", "selector", "continue", "format", "assists", "tree", "lops", "werror","verbose", "help"])
     except getopt.GetoptError as err:
         print('%s' % str(err))
         usage()
@@ -2310,6 +4032,14 @@ def main():
             format=True
         elif o in ( '-d', '--fdt' ):
             fdttest = True
+        elif o in ( '-c', '--cdo' ):
+            cdotest = True
+        elif o in ( '-r', '--rest' ):
+            resttest = True
+        elif o in ( '--daemon' ):
+            daemontest = True
+        elif o in ( '-s', '--selector' ):
+            selectortest = True
         elif o in ( '--no-libfdt' ):
             libfdt = False
         elif o in ( '--all' ):
@@ -2317,6 +4047,10 @@ def main():
             lops = True
             assists = True
             fdttest = True
+            cdotest = True
+            resttest = True
+            daemontest = True
+            selectortest = True
             format = True
         elif o in ( '--continue' ):
             continue_on_error = True
@@ -2343,12 +4077,34 @@ if __name__ == "__main__":
         dt = setup_device_tree( outdir )
         fdt = setup_fdt( dt, outdir )
         tree_sanity_test( fdt, verbose )
+        tree_index_sanity_test( fdt, verbose )
+        tree_metrics_sanity_test( fdt, verbose )
 
     if lops:
         dt = setup_system_device_tree( outdir )
         lop_file = setup_lops( outdir )
         lop_file_2 = setup_code_lops( outdir )
 
+        # the lops of the lops test need libfdt (dtlib can't compile them)
+        if libfdt:
+            trace_lop_file = lop_file
+        else:
+            trace_lop_file = setup_selector_lops( outdir )
+
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.output_file = outdir + "/trace-output.dts"
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.enhanced = True
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        trace_sanity_test( device_tree, trace_lop_file, outdir, verbose )
+
         device_tree = LopperSDT( dt )
 
         device_tree.dryrun = False
@@ -2397,6 +4153,51 @@ if __name__ == "__main__":
 
         assists_sanity_test( device_tree, lop_file, verbose )
 
+        assist_timeout_sanity_test( dt, outdir, verbose )
+
+        domains_sanity_test( dt, outdir, verbose )
+
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.output_file = outdir + "/staging-output.dts"
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        node_staging_sanity_test( device_tree, outdir, verbose )
+
+        dt, domains_yaml = setup_subsystem_tree( outdir )
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.output_file = outdir + "/subsystem-output.dts"
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        subsystem_sanity_test( device_tree, domains_yaml, outdir, verbose )
+
+        dt = setup_baremetal_tree( outdir )
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.output_file = outdir + "/baremetal-output.dts"
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        baremetal_sanity_test( device_tree, outdir, verbose )
+
     if format:
         dt = setup_format_tree( outdir )
         yt =  setup_yaml( outdir )
@@ -2434,3 +4235,56 @@ if __name__ == "__main__":
         fdt_sanity_test( device_tree, verbose )
 
         device_tree.tree.print()
+
+    if cdotest:
+        dt = setup_cdo_tree( outdir )
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.output_file = outdir + "/cdo-output.dts"
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.enhanced = True
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        cdo_sanity_test( device_tree, outdir, verbose )
+
+    if resttest:
+        dt = setup_system_device_tree( outdir )
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.output_file = outdir + "/rest-output.dts"
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        rest_sanity_test( device_tree, outdir, verbose )
+        rest_query_sanity_test( device_tree, outdir, verbose )
+        rest_lock_sanity_test( verbose )
+        rest_metrics_sanity_test( device_tree, outdir, verbose )
+        query_sanity_test( dt, outdir, verbose )
+
+    if daemontest:
+        daemon_sanity_test( outdir, verbose )
+
+    if selectortest:
+        dt = setup_system_device_tree( outdir )
+        device_tree = LopperSDT( dt )
+
+        device_tree.dryrun = False
+        device_tree.verbose = verbose
+        device_tree.werror = werror
+        device_tree.output_file = outdir + "/selector-output.dts"
+        device_tree.cleanup_flag = True
+        device_tree.save_temps = False
+        device_tree.outdir = outdir
+        device_tree.use_libfdt = libfdt
+
+        selector_sanity_test( device_tree, outdir, verbose )
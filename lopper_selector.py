@@ -0,0 +1,594 @@
+#/*
+# * Copyright (c) 2021 Xilinx Inc. All rights reserved.
+# *
+# * SPDX-License-Identifier: BSD-3-Clause
+# */
+
+import re
+from functools import lru_cache
+
+# Node selectors: a small CSS like language for finding nodes in a
+# LopperTree. A selector is compiled once (and the compiled selector is
+# memoized), and each part of it is planned against the tree's indexes
+# (paths, phandles, labels, names and compatible strings), so that only a
+# query that has nothing indexed to start from scans the tree.
+#
+#   selectors  := selector ( "," selector )*
+#   selector   := compound ( combinator compound )*
+#   combinator := <whitespace>    descendant: nodes below the previous match
+#               | ">"             child: nodes directly below the previous match
+#               | "->"            reference: nodes referenced (by phandle) from
+#                                 the properties of the previous match
+#   compound   := [ path | name ] filter*
+#   path       := an absolute node path. A path segment can use * and ?
+#                 wildcards, and a "**" segment matches any number of segments
+#   name       := a node name (i.e. serial@ff000000), * and ? wildcards are
+#                 allowed. "*" is any node
+#   filter     := "#" label               the node has this label
+#               | "[" prop "]"            the node has the property
+#               | "[!" prop "]"           the node does not have the property
+#               | "[" prop op value "]"   a value of the property matches:
+#                    =  equals             != no value equals
+#                    ^= starts with        $= ends with
+#                    *= contains           ~= matches a regex
+#                 numbers compare as numbers for = and !=, and in hex otherwise
+#               | ":compatible(" string ")"  same as [compatible=string]
+#               | ":phandle(" number ")"     the node has this phandle
+#               | ":label(" label ")"        same as #label
+#
+# Names and paths that contain a "," (the selector separator) can be
+# quoted. Values can be quoted, and otherwise run to the closing "]".
+#
+# Examples:
+#
+#   /cpus/cpu@*                          the cpu nodes
+#   /amba [compatible=xlnx,zynqmp-ipi-mailbox] > *[reg]
+#   #cpus_r5 -> *                        nodes referenced by the cpus_r5 node
+#   serial@ff000000, [status=okay][!interrupts]
+
+_path_re = re.compile( r'/[A-Za-z0-9_.+@*?/\-]*' )
+_name_re = re.compile( r'[A-Za-z0-9_.+@*?\-]+' )
+_label_re = re.compile( r'[A-Za-z0-9_]+' )
+_prop_re = re.compile( r'[#A-Za-z0-9_,.+@?\-]+' )
+_pseudo_re = re.compile( r'[a-z-]+' )
+_attr_ops = [ "!=", "^=", "$=", "*=", "~=", "=" ]
+
+def _glob( pattern, path = False ):
+    """Translate a wildcard pattern to a regex
+
+    Args:
+       pattern (string): the pattern
+       path (boolean,optional): the pattern is a node path ("**" segments
+                                match any number of segments)
+
+    Returns:
+       string: the regex
+    """
+    if not path:
+        return re.escape( pattern ).replace( r'\*', '[^/]*' ).replace( r'\?', '[^/]' ) + "$"
+
+    segments = []
+    for s in pattern.split( "/" )[1:]:
+        if s == "**":
+            segments.append( "(/[^/]+)*" )
+        else:
+            segments.append( "/" + _glob( s )[:-1] )
+
+    return "".join( segments ) + "$"
+
+def _values_match( values, op, value ):
+    """Test if the values of a property match a selector value
+
+    Args:
+       values (list): the property values
+       op (string): the comparison (=, !=, ^=, $=, *= or ~=)
+       value (string): the selector value
+
+    Returns:
+       boolean: True if the values match
+    """
+    if op == "!=":
+        return not _values_match( values, "=", value )
+
+    try:
+        number = int( value, 0 )
+    except ValueError:
+        number = None
+
+    for v in values:
+        if type(v) == int:
+            if op == "=":
+                if v == number:
+                    return True
+                continue
+            v = hex(v)
+        else:
+            v = str(v)
+
+        if op == "=" and v == value:
+            return True
+        if op == "^=" and v.startswith( value ):
+            return True
+        if op == "$=" and v.endswith( value ):
+            return True
+        if op == "*=" and value in v:
+            return True
+        if op == "~=" and re.search( value, v ):
+            return True
+
+    return False
+
+class LopperSelectorCompound:
+    """One step of a selector: a node path or name, and filters
+
+    The compound is planned when it is compiled: the most selective of its
+    indexed terms is used to find the candidate nodes, and all of the terms
+    are then tested against each candidate.
+
+    Attributes:
+       - path, name, label, phandle, compat: indexed terms (or None)
+       - path_re, name_re: wildcard terms (compiled regex or None)
+       - path_prefix: the path before the first wildcard of path_re
+       - props: list of (property, negate, op, value) filters
+       - any: the compound was "*"
+       - seed: the term used to find candidates ("all" if none)
+    """
+    def __init__( self ):
+        self.path = None
+        self.path_re = None
+        self.path_prefix = None
+        self.name = None
+        self.name_re = None
+        self.label = None
+        self.phandle = None
+        self.compat = None
+        self.props = []
+        self.any = False
+        self.seed = "all"
+
+    def empty( self ):
+        return not self.any and self.path == None and self.path_re == None and self.name == None and \
+               self.name_re == None and self.label == None and self.phandle == None and \
+               self.compat == None and not self.props
+
+    def plan( self ):
+        """Choose the term that finds the candidate nodes"""
+        for term in [ "phandle", "path", "label", "name", "compat", "path_re" ]:
+            if getattr( self, term ) != None:
+                self.seed = term
+                return
+
+    def seeds( self, tree ):
+        """Return the candidate nodes
+
+        Args:
+           tree (LopperTree): the tree to search
+
+        Returns:
+           list (LopperNode): the candidates, or None if every node of the
+                              tree is a candidate
+        """
+        if self.seed == "phandle":
+            node = tree.pnode( self.phandle )
+            return [ node ] if node else []
+        if self.seed == "path":
+            node = tree.__nodes__.get( self.path )
+            return [ node ] if node else []
+        if self.seed == "label":
+            return tree.lnodes( self.label, exact=True )
+        if self.seed == "name":
+            return tree.name_nodes( self.name )
+        if self.seed == "compat":
+            return tree.cnodes( self.compat )
+        if self.seed == "path_re" and self.path_prefix:
+            try:
+                return walk( [ tree.__nodes__[self.path_prefix] ], True )
+            except KeyError:
+                return []
+
+        return None
+
+    def match( self, node ):
+        """Test a node against all of the terms of the compound
+
+        Args:
+           node (LopperNode): the node to test
+
+        Returns:
+           boolean: True if the node matches
+        """
+        if self.path != None and node.abs_path != self.path:
+            return False
+        if self.path_re != None and not self.path_re.match( node.abs_path ):
+            return False
+        if self.name != None and node.name != self.name:
+            return False
+        if self.name_re != None and not self.name_re.match( node.name ):
+            return False
+        if self.label != None and node.label != self.label:
+            return False
+        if self.phandle != None and node.phandle != self.phandle:
+            return False
+        if self.compat != None:
+            try:
+                if not self.compat in node.__props__["compatible"].value:
+                    return False
+            except KeyError:
+                return False
+
+        for prop, negate, op, value in self.props:
+            try:
+                values = node.__props__[prop].value
+            except KeyError:
+                if negate or op == "!=":
+                    continue
+                return False
+
+            if negate:
+                return False
+            if op and not _values_match( values, op, value ):
+                return False
+
+        return True
+
+def walk( nodes, include_self = False, children_only = False ):
+    """Return the nodes below a list of nodes
+
+    Args:
+       nodes (list of LopperNode): the starting nodes
+       include_self (boolean,optional): include the starting nodes
+       children_only (boolean,optional): only the direct children
+
+    Returns:
+       list (LopperNode): the nodes, each node once
+    """
+    found = []
+    added = set()
+    expanded = set()
+
+    def add( n ):
+        if not id(n) in added:
+            added.add( id(n) )
+            found.append( n )
+
+    for start in nodes:
+        if include_self:
+            add( start )
+
+        if children_only:
+            for c in start.child_nodes.values():
+                add( c )
+            continue
+
+        # a start node below an earlier one has already been walked
+        if id(start) in expanded:
+            continue
+        expanded.add( id(start) )
+
+        to_visit = list( reversed( list( start.child_nodes.values() ) ) )
+        while to_visit:
+            n = to_visit.pop()
+            add( n )
+            if id(n) in expanded:
+                continue
+            expanded.add( id(n) )
+            to_visit.extend( reversed( list( n.child_nodes.values() ) ) )
+
+    return found
+
+class LopperSelector:
+    """A compiled node selector
+
+    See the top of this file for the selector syntax. Use selector_compile()
+    (or LopperTree.query()) rather than creating these directly, so the
+    compiled selectors are shared.
+
+    Attributes:
+       - text: the selector
+       - selectors: list of selectors, each a list of (combinator, LopperSelectorCompound)
+    """
+    def __init__( self, text ):
+        self.text = text
+        self.pos = 0
+        self.selectors = []
+
+        self.parse()
+
+    def error( self, msg ):
+        raise ValueError( "invalid selector '%s' at %s: %s" % (self.text, self.pos, msg) )
+
+    def skip_ws( self ):
+        start = self.pos
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+        return self.pos != start
+
+    def peek( self, s ):
+        return self.text.startswith( s, self.pos )
+
+    def token( self, regex ):
+        m = regex.match( self.text, self.pos )
+        if not m:
+            return None
+        self.pos = m.end()
+        return m.group(0)
+
+    def quoted( self ):
+        end = self.text.find( '"', self.pos + 1 )
+        if end < 0:
+            self.error( "unterminated string" )
+        s = self.text[self.pos + 1:end]
+        self.pos = end + 1
+        return s
+
+    def value( self, terminator ):
+        """a quoted value, or everything up to the terminator"""
+        self.skip_ws()
+        if self.peek( '"' ):
+            v = self.quoted()
+            self.skip_ws()
+        else:
+            end = self.text.find( terminator, self.pos )
+            if end < 0:
+                self.error( "missing '%s'" % terminator )
+            v = self.text[self.pos:end].strip()
+            self.pos = end
+        if not self.peek( terminator ):
+            self.error( "missing '%s'" % terminator )
+        self.pos += 1
+        return v
+
+    def parse( self ):
+        while True:
+            self.skip_ws()
+            self.selectors.append( self.parse_selector() )
+            self.skip_ws()
+            if self.pos >= len(self.text):
+                break
+            if not self.peek( "," ):
+                self.error( "unexpected '%s'" % self.text[self.pos] )
+            self.pos += 1
+
+    def parse_selector( self ):
+        steps = []
+        combinator = None
+        while True:
+            compound = self.parse_compound()
+            if compound.empty():
+                self.error( "expected a node" )
+            steps.append( (combinator, compound) )
+
+            ws = self.skip_ws()
+            if self.pos >= len(self.text) or self.peek( "," ):
+                break
+            if self.peek( "->" ):
+                combinator = "->"
+                self.pos += 2
+            elif self.peek( ">" ):
+                combinator = ">"
+                self.pos += 1
+            elif ws:
+                combinator = " "
+            else:
+                self.error( "unexpected '%s'" % self.text[self.pos] )
+            self.skip_ws()
+
+        return steps
+
+    def parse_compound( self ):
+        c = LopperSelectorCompound()
+
+        node = None
+        if self.peek( '"' ):
+            node = self.quoted()
+        elif self.peek( "/" ):
+            node = self.token( _path_re )
+        else:
+            node = self.token( _name_re )
+
+        if node and node.startswith( "/" ):
+            if len(node) > 1:
+                node = node.rstrip( "/" )
+            if "*" in node or "?" in node:
+                c.path_re = re.compile( _glob( node, True ) )
+                prefix = []
+                for s in node.split( "/" )[1:]:
+                    if "*" in s or "?" in s:
+                        break
+                    prefix.append( s )
+                c.path_prefix = "/" + "/".join( prefix )
+            else:
+                c.path = node
+        elif node == "*":
+            c.any = True
+        elif node:
+            if "*" in node or "?" in node:
+                c.name_re = re.compile( _glob( node ) )
+            else:
+                c.name = node
+
+        while self.pos < len(self.text):
+            if self.peek( "#" ):
+                self.pos += 1
+                c.label = self.token( _label_re )
+                if not c.label:
+                    self.error( "expected a label" )
+            elif self.peek( "[" ):
+                self.pos += 1
+                self.skip_ws()
+                negate = False
+                if self.peek( "!" ) and not self.peek( "!=" ):
+                    negate = True
+                    self.pos += 1
+                prop = self.token( _prop_re )
+                if not prop:
+                    self.error( "expected a property name" )
+                self.skip_ws()
+                op = None
+                value = None
+                for o in _attr_ops:
+                    if self.peek( o ):
+                        op = o
+                        break
+                if op:
+                    if negate:
+                        self.error( "a negated property can't have a value" )
+                    self.pos += len(op)
+                    value = self.value( "]" )
+                    if op == "~=":
+                        try:
+                            re.compile( value )
+                        except re.error as e:
+                            self.error( "invalid regex: %s" % e )
+                elif self.peek( "]" ):
+                    self.pos += 1
+                else:
+                    self.error( "expected ']'" )
+
+                if prop == "compatible" and op == "=" and c.compat == None:
+                    c.compat = value
+                else:
+                    c.props.append( (prop, negate, op, value) )
+            elif self.peek( ":" ):
+                self.pos += 1
+                pseudo = self.token( _pseudo_re )
+                if not self.peek( "(" ):
+                    self.error( "expected '('" )
+                self.pos += 1
+                arg = self.value( ")" )
+                if pseudo == "compatible":
+                    c.compat = arg
+                elif pseudo == "label":
+                    c.label = arg
+                elif pseudo == "phandle":
+                    try:
+                        c.phandle = int( arg, 0 )
+                    except ValueError:
+                        self.error( "invalid phandle %s" % arg )
+                else:
+                    self.error( "unknown filter :%s" % pseudo )
+            else:
+                break
+
+        c.plan()
+
+        return c
+
+    def explain( self ):
+        """Describe how the selector is evaluated
+
+        Args:
+           None
+
+        Returns:
+           list (string): a line per step of each selector
+        """
+        lines = []
+        for steps in self.selectors:
+            for combinator, c in steps:
+                step = { None: "start", " ": "descendants", ">": "children", "->": "references" }[combinator]
+                if combinator == "->":
+                    how = "follow phandles"
+                elif combinator and c.seed in [ "all", "path_re" ]:
+                    how = "walk"
+                elif c.seed == "all":
+                    how = "scan"
+                elif c.seed == "path_re":
+                    how = "walk %s" % c.path_prefix
+                else:
+                    how = "index: %s" % c.seed
+                lines.append( "%s: %s" % (step, how) )
+            lines.append( "" )
+
+        return lines[:-1]
+
+    def step( self, tree, nodes, combinator, c ):
+        """Evaluate a step of a selector
+
+        Args:
+           tree (LopperTree): the tree
+           nodes (list of LopperNode): the result of the previous step
+           combinator (string): how the step relates to the previous one
+           c (LopperSelectorCompound): the step
+
+        Returns:
+           list (LopperNode): the nodes that match the step
+        """
+        if combinator == "->":
+            found = []
+            seen = set()
+            for n in nodes:
+                for p in n.__props__.values():
+                    for r in p.resolve_phandles():
+                        if r is n or id(r) in seen:
+                            continue
+                        seen.add( id(r) )
+                        if c.match( r ):
+                            found.append( r )
+            return found
+
+        if combinator == None:
+            seeds = c.seeds( tree )
+            if seeds == None:
+                seeds = tree.__nodes__.values()
+            return [ n for n in seeds if c.match( n ) ]
+
+        if not c.seed in [ "all", "path_re" ]:
+            # an indexed step: find the candidates, and check where they are
+            seeds = c.seeds( tree )
+            scope = set( n.abs_path for n in nodes )
+            found = []
+            for n in seeds:
+                if n.abs_path == "/" or not c.match( n ):
+                    continue
+                parent = n.abs_path.rsplit( "/", 1 )[0] or "/"
+                if combinator == ">":
+                    if parent in scope:
+                        found.append( n )
+                else:
+                    while True:
+                        if parent in scope:
+                            found.append( n )
+                            break
+                        if parent == "/":
+                            break
+                        parent = parent.rsplit( "/", 1 )[0] or "/"
+            return found
+
+        return [ n for n in walk( nodes, False, combinator == ">" ) if c.match( n ) ]
+
+    def nodes( self, tree ):
+        """Find the nodes of a tree that match the selector
+
+        Args:
+           tree (LopperTree): the tree to search
+
+        Returns:
+           list (LopperNode): the matching nodes, in tree order
+        """
+        matches = {}
+        for steps in self.selectors:
+            nodes = []
+            for combinator, c in steps:
+                nodes = self.step( tree, nodes, combinator, c )
+                if not nodes:
+                    break
+            for n in nodes:
+                matches[id(n)] = n
+
+        return tree._tree_order( matches.values() )
+
+@lru_cache( maxsize=256 )
+def selector_compile( text ):
+    """Compile a selector
+
+    Compiled selectors are memoized, so repeated queries only pay for the
+    compilation once.
+
+    Args:
+       text (string): the selector
+
+    Returns:
+       LopperSelector: the compiled selector. ValueError if the selector is invalid
+    """
+    return LopperSelector( text )
@@ -0,0 +1,267 @@
+#/*
+# * Copyright (c) 2021 Xilinx Inc. All rights reserved.
+# *
+# * SPDX-License-Identifier: BSD-3-Clause
+# */
+
+import os
+import sys
+import json
+import time
+import atexit
+import resource
+import functools
+import contextlib
+
+# Timing and memory instrumentation of lopper runs.
+#
+# A trace is started with start(), and the phases of a run (setup, lops,
+# output) record themselves with:
+#
+#     with lopper_trace.phase( "compile", "setup" ):
+#         ...
+#
+# or by decorating a function with @lopper_trace.traced( "cpp", "setup" ).
+# When no trace is running, phases are a shared no-op context, so the
+# instrumentation costs a global lookup.
+#
+# Each phase records its wall time, cpu time and the growth of the peak
+# resident memory of the process. Phases that are passed a LopperSDT also
+# record the size of its tree before and after, the number of nodes that
+# were changed (touched), and the number of tree syncs. The trace is written
+# when it is stopped (or at exit) as json, or as a chrome trace (which can be
+# loaded in chrome://tracing or https://ui.perfetto.dev).
+
+tracer = None
+
+def _maxrss():
+    # peak resident set size, in KiB
+    return resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+
+class LopperTrace:
+    """A trace of the phases of a lopper run
+
+    Attributes:
+       - events (list): the recorded phases (dicts), in completion order
+       - origin (float): the start of the trace (perf_counter)
+    """
+    def __init__( self ):
+        self.events = []
+        self.origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase( self, name, category, args = None, sdt = None ):
+        """Record a phase
+
+        Args:
+           name (string): the name of the phase (i.e. a lop path)
+           category (string): the kind of phase (setup, lop, output ..)
+           args (dict,optional): extra details to record with the phase
+           sdt (LopperSDT,optional): record the changes to this tree
+
+        Returns:
+           context manager
+        """
+        tree = None
+        if sdt is not None:
+            tree = sdt.tree
+
+        if tree is not None:
+            nodes_before = len( tree.__nodes__ )
+            syncs_before = tree.__syncs__
+            touched_outer = tree.__touched__
+            tree.__touched__ = set()
+
+        rss = _maxrss()
+        cpu = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = { "name": name,
+                      "category": category,
+                      "start": start - self.origin,
+                      "wall": end - start,
+                      "cpu": time.process_time() - cpu,
+                      # the growth of the process' peak rss, 0 for any
+                      # phase that doesn't raise the peak. Not the memory
+                      # used by the phase.
+                      "maxrss_growth_kb": _maxrss() - rss }
+            if tree is not None:
+                # the tree may have been replaced during the phase (i.e. by
+                # an assist worker), the replacement carries the counts on
+                tree = sdt.tree
+                touched = tree.__touched__ or set()
+                # an enclosing phase sees the nodes touched by this one
+                tree.__touched__ = touched_outer
+                if touched_outer is not None:
+                    touched_outer.update( touched )
+
+                event["nodes_before"] = nodes_before
+                event["nodes_after"] = len( tree.__nodes__ )
+                event["nodes_touched"] = len( touched )
+                event["syncs"] = tree.__syncs__ - syncs_before
+            if args:
+                event["args"] = args
+
+            self.events.append( event )
+
+    def summary( self ):
+        """Summarize the trace, by phase
+
+        Args:
+           None
+
+        Returns:
+           list: a dict per phase (category, name and lop file), with the
+                 count, wall and cpu totals of the phase. Sorted by wall
+                 time, largest first.
+        """
+        totals = {}
+        for e in self.events:
+            key = (e["category"], e["name"], e.get( "args", {} ).get( "file" ))
+            try:
+                t = totals[key]
+            except KeyError:
+                t = { "category": e["category"], "name": e["name"],
+                      "count": 0, "wall": 0.0, "cpu": 0.0 }
+                if key[2]:
+                    t["file"] = key[2]
+                totals[key] = t
+            t["count"] += 1
+            t["wall"] += e["wall"]
+            t["cpu"] += e["cpu"]
+
+        return sorted( totals.values(), key=lambda t: t["wall"], reverse=True )
+
+    def chrome( self ):
+        """Return the trace in the chrome trace event format
+
+        Args:
+           None
+
+        Returns:
+           dict: the trace
+        """
+        pid = os.getpid()
+        trace_events = []
+        for e in sorted( self.events, key=lambda e: e["start"] ):
+            args = dict( e.get( "args", {} ) )
+            for k in [ "cpu", "maxrss_growth_kb", "nodes_before", "nodes_after", "nodes_touched", "syncs" ]:
+                if k in e:
+                    args[k] = e[k]
+
+            trace_events.append( { "name": e["name"],
+                                   "cat": e["category"],
+                                   "ph": "X",
+                                   "ts": round( e["start"] * 1000000, 3 ),
+                                   "dur": round( e["wall"] * 1000000, 3 ),
+                                   "pid": pid,
+                                   "tid": 1,
+                                   "args": args } )
+
+        return { "traceEvents": trace_events, "displayTimeUnit": "ms" }
+
+    def write( self, output_filename, fmt = "json" ):
+        """Write the trace to a file
+
+        Args:
+           output_filename (string): the file to write
+           fmt (string,optional): "json" (phases and summary) or "chrome"
+
+        Returns:
+           Nothing
+        """
+        if fmt == "chrome":
+            data = self.chrome()
+        else:
+            data = { "events": sorted( self.events, key=lambda e: e["start"] ),
+                     "summary": self.summary() }
+
+        with open( output_filename, "w" ) as f:
+            json.dump( data, f, indent=1 )
+
+_trace_output = None
+_trace_format = "json"
+
+def start( output_filename, fmt = "json" ):
+    """Start a trace
+
+    The trace is written by stop(), or when the process exits.
+
+    Args:
+       output_filename (string): the file to write the trace to
+       fmt (string,optional): "json" or "chrome"
+
+    Returns:
+       LopperTrace: the trace
+    """
+    global tracer
+    global _trace_output
+    global _trace_format
+
+    if fmt not in [ "json", "chrome" ]:
+        raise ValueError( "unknown trace format: %s" % fmt )
+
+    if _trace_output is None:
+        atexit.register( stop )
+
+    tracer = LopperTrace()
+    _trace_output = output_filename
+    _trace_format = fmt
+
+    return tracer
+
+def stop():
+    """Stop the running trace (if any), and write it
+
+    Args:
+       None
+
+    Returns:
+       Nothing
+    """
+    global tracer
+
+    if tracer is None:
+        return
+
+    trace = tracer
+    tracer = None
+    try:
+        trace.write( _trace_output, _trace_format )
+    except OSError as e:
+        print( "[WARNING]: could not write trace %s: %s" % (_trace_output,e), file=sys.stderr )
+
+def phase( name, category, args = None, sdt = None ):
+    """Record a phase in the running trace
+
+    See LopperTrace.phase(). If no trace is running, nothing is recorded.
+    """
+    if tracer is None:
+        return contextlib.nullcontext()
+
+    return tracer.phase( name, category, args, sdt )
+
+def traced( name, category ):
+    """Decorate a function, so its calls are recorded as a phase
+
+    Args:
+       name (string): the phase name
+       category (string): the phase category
+
+    Returns:
+       decorator
+    """
+    def decorate( fn ):
+        @functools.wraps( fn )
+        def wrapper( *args, **kwargs ):
+            if tracer is None:
+                return fn( *args, **kwargs )
+            with tracer.phase( name, category ):
+                return fn( *args, **kwargs )
+
+        return wrapper
+
+    return decorate
@@ -22,9 +22,13 @@ from collections import UserDict
 from collections import OrderedDict
 from collections import Counter
 import copy
+import time
+import threading
+import contextlib
 import json
 
 from lopper_fmt import LopperFmt
+from lopper_selector import selector_compile
 
 # must be set to the Lopper class to call
 global Lopper
@@ -306,6 +310,19 @@ class LopperProp():
                 self.__modified__ = True
 
             self.resolve()
+
+            # the tree has changed (this invalidates cached views of it)
+            try:
+                self.node.tree._changed( self.node )
+            except AttributeError:
+                pass
+
+            # keep the tree's compatible string index up to date
+            if self.__dict__.get( "name" ) == "compatible":
+                try:
+                    self.node.tree._index_node( self.node )
+                except AttributeError:
+                    pass
         else:
             self.__dict__[name] = value
 
@@ -596,10 +613,15 @@ class LopperProp():
         if idx == 0:
             return phandle_targets
 
+        # a single value can be a scalar (i.e. loaded from yaml)
+        values = self.value
+        if type(values) != list:
+            values = [ values ]
+
         # we need the values in hex. This could be a utility routine in the
         # future .. convert to hex.
         prop_val = []
-        for f in self.value:
+        for f in values:
             if type(f) == str:
                 prop_val.append( f )
             else:
@@ -632,7 +654,9 @@ class LopperProp():
                         # was it a label ? If it was converted to an int above,
                         # we'll throw an exception and catch it below for proper
                         # processing. If it is a string, we'll try the lookup.
-                        lnode = self.node.tree.lnodes( re.escape(i) )
+                        if type(i) != str:
+                            raise TypeError( "phandle %s is not a label" % i )
+                        lnode = self.node.tree.lnodes( i, exact = True )
                         if lnode:
                             phandle_targets.extend( lnode )
                         else:
@@ -833,7 +857,10 @@ class LopperProp():
         phandle_idx, phandle_field_count = self.phandle_params()
         phandle_tgts = self.resolve_phandles( True )
 
-        if phandle_field_count and len(prop_val) % phandle_field_count != 0:
+        # a scalar (i.e. a single phandle loaded from yaml) is printed as a
+        # number, the field counts only apply to lists
+        if phandle_field_count and type(prop_val) == list and \
+           len(prop_val) % phandle_field_count != 0:
             # if the property values and the expected field counts do not match
             # zero phandles out to avoid processing below.
             phandle_idx = 0
@@ -1250,6 +1277,13 @@ class LopperNode(object):
                         #
                         self.tree.__pnodes__[value] = self
 
+            if name == "name" or name == "label":
+                # keep the tree's name and label indexes up to date
+                tree = self.__dict__.get( "tree" )
+                if tree:
+                    tree._index_node( self )
+                    tree._changed( self )
+
             # we could restrict this to only some attributes in the future
             self.__dict__["__modified__"] = True
 
@@ -1483,6 +1517,12 @@ class LopperNode(object):
             # thing to assign.
             # raise TypeError( "LopperProp was not passed as value" )
 
+        if self.tree:
+            self.tree._changed( self )
+
+        if key == "compatible" and self.tree:
+            self.tree._index_node( self )
+
     @property
     def ref(self):
         """Node reference count getter
@@ -1603,7 +1643,7 @@ class LopperNode(object):
 
         return all_kids
 
-    def print( self, output=None, strict=None ):
+    def print( self, output=None, strict=None, max_depth=None ):
         """print a node
 
         Print a node to the passed output stream. If it isn't passed, then
@@ -1615,6 +1655,9 @@ class LopperNode(object):
 
         Args:
            output (optional, output stream).
+           strict (boolean,optional): resolve properties with this strictness
+           max_depth (int,optional): levels of child nodes to print. If not
+                                     passed, all child nodes are printed.
 
         Returns:
            Nothing
@@ -1674,8 +1717,12 @@ class LopperNode(object):
             p.print( output )
 
         # child nodes
-        for cn in self.child_nodes.values():
-            cn.print( output )
+        if max_depth == None:
+            for cn in self.child_nodes.values():
+                cn.print( output )
+        elif max_depth > 0:
+            for cn in self.child_nodes.values():
+                cn.print( output, max_depth=max_depth - 1 )
 
         # end the node
         outstring = "};"
@@ -1863,6 +1910,12 @@ class LopperNode(object):
         except Exception as e:
             raise e
 
+        if prop_to_delete.name == "compatible" and self.tree:
+            self.tree._index_node( self )
+
+        if self.tree:
+            self.tree._changed( self )
+
     def props( self, name ):
         """Access a property or list of properties described by a name/regex
 
@@ -2017,6 +2070,12 @@ class LopperNode(object):
 
             # indicates that we should be sync'd
             self.__modified__ = True
+
+            if prop.name == "compatible" and self.tree:
+                self.tree._index_node( self )
+
+            if self.tree:
+                self.tree._changed( self )
         elif isinstance( prop, LopperNode):
             node = prop
             # this isn't ideal. We don't have a path, but are getting
@@ -2101,7 +2160,9 @@ class LopperNode(object):
         # resolve the rest of the references based on the passed device tree
         # self.number must be set before calling this routine.
 
-        self.dct = dct
+        # Note: the passed dictionary is not stored in the node. It is part of
+        #       a (potentially very large) tree export, and keeping a reference
+        #       keeps the entire export alive for the life of the node.
 
         #
         # tree add currently takes care of this, but it might be better if
@@ -2122,9 +2183,6 @@ class LopperNode(object):
         if dct:
             strict = self.tree.strict
 
-            # we may not need to save this, temp.
-            self.dct = dct
-
             self.abs_path = dct['__path__']
 
             if clear_children:
@@ -2271,6 +2329,10 @@ class LopperNode(object):
             self.__nstate__ = "resolved"
             self.__modified__ = False
 
+            # the properties may have changed, refresh the tree's index
+            if self.tree:
+                self.tree._index_node( self )
+
         if self.__dbg__ > 2:
             print( "[DGB++]: node resolution end: %s" % self)
 
@@ -2364,6 +2426,9 @@ class LopperTree:
        - __nodes__: The nodes of the tree, ordered by absolute path indexing
        - __nnodes__: The nodes of the tree, ordered by node number
        - __pnodes__: The nodes of the tree, ordered by phandle
+       - __lnodes__: The nodes of the tree, indexed by label
+       - __namenodes__: The nodes of the tree, indexed by name
+       - __cnodes__: The nodes of the tree, indexed by compatible string
        - __dbg__: treewide debug level
        - __must_sync__: flag, true when the tree must be syncd to the FDT
        - __current_node__: The current node in an iteration
@@ -2386,6 +2451,23 @@ class LopperTree:
         self.__pnodes__ = OrderedDict()
         # nodes, indexed by label
         self.__lnodes__ = OrderedDict()
+        # nodes, indexed by compatible string
+        self.__cnodes__ = {}
+        # nodes, indexed by name
+        self.__namenodes__ = {}
+        # (compatible strings, name, label) indexed by node (all nodes in the tree)
+        self.__nindex__ = {}
+        # node positions (tree order), built on demand
+        self.__norder__ = None
+        # modification generation, bumped on every change to the tree
+        # (nodes added, deleted or loaded, properties added, deleted or
+        # changed). Views of the tree can be cached against it.
+        self.__generation__ = 0
+        # paths of the changed nodes, recorded while it is a set (see
+        # _changed() and lopper_trace)
+        self.__touched__ = None
+        # number of syncs of the tree
+        self.__syncs__ = 0
         # nodes. selected. default/fallback for some operations
         self.__selected__ = []
 
@@ -2406,8 +2488,6 @@ class LopperTree:
         self.__new_iteration__ = True
         self.__node_iter__ = None
 
-        self.dct = None
-
         # type
         self.depth_first = depth_first
 
@@ -2877,8 +2957,11 @@ class LopperTree:
         # Note: this no longer writes to the FDT, that should be done by the
         #       Lopper.sync() call.
         #
-        new_dct = self.export()
-        self.load( new_dct )
+        # The nodes are exported and loaded one at a time, so a full nested
+        # export of the tree is never built.
+        #
+        self.__syncs__ += 1
+        self.load( self._node_records( self["/"] ) )
 
         if self.__dbg__ > 2:
             print( "[DBG++][%s]: tree sync end: %s" % (fdt,self) )
@@ -2960,6 +3043,10 @@ class LopperTree:
             except:
                 pass
 
+            self._unindex_node( n )
+            self.__norder__ = None
+            self._changed( n )
+
             # snip the link if we are the first call, otherwise, the
             # recursive call above, will clear the delete flag. Otherwise, we
             # can't snip a node + subnodes and maintain them for another
@@ -3072,12 +3159,24 @@ class LopperTree:
         # later.
         saved_child_nodes = list(node.child_nodes.values())
 
+        # the phandle of a new node is set as a property. A sync through
+        # a FDT picks it up, but an in memory sync doesn't, so it is taken
+        # from the property here.
+        try:
+            phandle = node.__props__['phandle'].value
+            if type(phandle) == list:
+                phandle = phandle[0]
+            if type(phandle) != int:
+                phandle = 0
+        except (KeyError, IndexError):
+            phandle = 0
+
         # TODO: To be complete, we could add the properites of the node
         #       into the dictionary when calling load, that way we don't
         #       count on the current behaviour to not drop the properties.
         node.load( { '__path__' : node.abs_path,
                      '__fdt_name__' : node.name,
-                     '__fdt_phandle__' : 0 },
+                     '__fdt_phandle__' : phandle },
                    parent_path )
 
         if self.__dbg__ > 2:
@@ -3093,6 +3192,9 @@ class LopperTree:
             self.__pnodes__[node.phandle] = node
         if node.label:
             self.__lnodes__[node.label] = node
+        self._index_node( node, True )
+        self.__norder__ = None
+        self._changed( node )
 
         # Check to see if the node has any children. If it does, are they already in
         # our node dictionary ? If they aren't, it means we are not just adding one
@@ -3227,6 +3329,27 @@ class LopperTree:
 
         return matches
 
+    def query( self, selector ):
+        """Find the nodes that match a selector
+
+        Selectors are a CSS like language over node paths, names, labels,
+        phandles, compatible strings and properties (see lopper_selector for
+        the syntax), i.e.:
+
+             tree.query( "/amba [compatible=xlnx,zynqmp-ipi-mailbox] > *[reg]" )
+
+        The selector is compiled once, and evaluated against the tree's
+        indexes where possible.
+
+        Args:
+           selector (string): the selector
+
+        Returns:
+           list: the matching nodes, in tree order. ValueError if the selector is invalid
+
+        """
+        return selector_compile( selector ).nodes( self )
+
     def pnode( self, phandle ):
         """Find a node in a tree by phandle
 
@@ -3246,19 +3369,30 @@ class LopperTree:
             return None
 
 
-    def lnodes( self, label ):
+    def lnodes( self, label, exact = False ):
         """Find nodes in a tree by label
 
         Safely (no exception raised) returns the node that can be found
         at a given label value.
 
+        The label is a regex, and is checked against every label in the
+        tree. If exact is set, the label must match exactly and is looked
+        up directly in the tree's label index.
+
         Args:
            label (string): node string  to check
+           exact (boolean,optional): label is a name, not a regex. Default is False
 
         Returns:
            list (LopperNode): the matching nodes if found, [] otherwise
 
         """
+        if exact:
+            try:
+                return [ self.__lnodes__[label] ]
+            except:
+                return []
+
         nodes = []
         try:
             for l in self.__lnodes__.keys():
@@ -3269,6 +3403,210 @@ class LopperTree:
 
         return nodes
 
+    def name_nodes( self, name ):
+        """Find nodes in a tree by name
+
+        Safely (no exception raised) returns the nodes with a given name
+        (i.e. "serial@ff000000"). The name must match exactly, and is looked
+        up in the tree's name index.
+
+        Args:
+           name (string): node name to check
+
+        Returns:
+           list (LopperNode): the matching nodes (in tree order) if found, [] otherwise
+
+        """
+        try:
+            nodes = self.__namenodes__[name].values()
+        except KeyError:
+            return []
+
+        return self._tree_order( nodes )
+
+    def cnodes( self, compat ):
+        """Find nodes in a tree by compatible string
+
+        Safely (no exception raised) returns the nodes that have a given
+        string in their compatible property. The string must match exactly.
+
+        Args:
+           compat (string): compatible string to check
+
+        Returns:
+           list (LopperNode): the matching nodes (in tree order) if found, [] otherwise
+
+        """
+        return self.compat_nodes( [ compat ] )
+
+    def compat_nodes( self, compat_list, nodes = None, substring = False ):
+        """Find the nodes that match any of a list of compatible strings
+
+        The tree maintains an index from compatible strings to nodes, so
+        matching (for example) a driver's list of compatible strings costs a
+        lookup per string, rather than a scan of every node and every value
+        of its compatible property.
+
+        If substring is set, a compatible string matches a node if it is
+        contained in any of the node's compatible strings (the index keys are
+        scanned, not the nodes).
+
+        Args:
+           compat_list (string or list of strings): compatible strings to match
+           nodes (list of LopperNode,optional): restrict the result to these
+                                                nodes, returned in their order
+           substring (boolean,optional): match contained strings, not only
+                                         exact ones. Default is False
+
+        Returns:
+           list (LopperNode): the matching nodes, in tree order (or the order
+                              of 'nodes', if passed). [] if nothing matches
+
+        """
+        if type(compat_list) == str:
+            compat_list = [ compat_list ]
+
+        if substring:
+            keys = [ k for k in self.__cnodes__ if any( c in k for c in compat_list ) ]
+        else:
+            keys = compat_list
+
+        matches = {}
+        for k in keys:
+            try:
+                matches.update( self.__cnodes__[k] )
+            except KeyError:
+                pass
+
+        if nodes is not None:
+            return [ n for n in nodes if id(n) in matches ]
+
+        return self._tree_order( matches.values() )
+
+    def _tree_order( self, nodes ):
+        """sort nodes into tree order
+
+        Args:
+           nodes (iterable of LopperNode): nodes to sort
+
+        Returns:
+           list (LopperNode): the nodes, in the order of the tree's node dictionary
+
+        """
+        if self.__norder__ is None:
+            self.__norder__ = { id(n): i for i, n in enumerate( self.__nodes__.values() ) }
+
+        return sorted( nodes, key=lambda n: self.__norder__.get( id(n), -1 ) )
+
+    def _changed( self, node = None ):
+        """record a change to the tree
+
+        The modification generation is bumped, and if changes are being
+        tracked (__touched__ is a set), the path of the changed node is
+        recorded.
+
+        Args:
+           node (LopperNode,optional): the node that changed
+
+        Returns:
+           Nothing
+
+        """
+        self.__generation__ += 1
+        if self.__touched__ is not None and node is not None:
+            self.__touched__.add( node.abs_path )
+
+    def _index_node( self, node, attach = False ):
+        """update the name, label and compatible string indexes for a node
+
+        Called when a node is added to (or loaded into) the tree, and when
+        the name, label or compatible property of a node in the tree is
+        changed.
+
+        Args:
+           node (LopperNode): the node to index
+           attach (boolean,optional): the node is being added to the tree.
+                                      If False, only nodes that are already
+                                      in the tree are updated.
+
+        Returns:
+           Nothing
+
+        """
+        try:
+            old_compat, old_name, old_label = self.__nindex__[id(node)]
+        except KeyError:
+            if not attach:
+                return
+            old_compat, old_name, old_label = (), None, None
+
+        try:
+            compat = node.__props__['compatible'].value
+        except KeyError:
+            compat = []
+        compat = tuple( dict.fromkeys( [ c for c in compat if type(c) == str ] ) )
+        name = node.name
+        label = node.label
+
+        if compat != old_compat:
+            self._index_drop( self.__cnodes__, old_compat, node )
+            for c in compat:
+                self.__cnodes__.setdefault( c, {} )[id(node)] = node
+
+        if name != old_name:
+            if old_name is not None:
+                self._index_drop( self.__namenodes__, [ old_name ], node )
+            self.__namenodes__.setdefault( name, {} )[id(node)] = node
+
+        if label != old_label:
+            if old_label and self.__lnodes__.get( old_label ) is node:
+                del self.__lnodes__[old_label]
+            if label:
+                self.__lnodes__[label] = node
+
+        self.__nindex__[id(node)] = ( compat, name, label )
+
+    def _unindex_node( self, node ):
+        """remove a node from the name, label and compatible string indexes
+
+        Args:
+           node (LopperNode): the node to remove
+
+        Returns:
+           Nothing
+
+        """
+        try:
+            compat, name, label = self.__nindex__.pop( id(node) )
+        except KeyError:
+            return
+
+        self._index_drop( self.__cnodes__, compat, node )
+        self._index_drop( self.__namenodes__, [ name ], node )
+        if label and self.__lnodes__.get( label ) is node:
+            del self.__lnodes__[label]
+
+    @staticmethod
+    def _index_drop( index, keys, node ):
+        """remove a node from the entries of an index
+
+        Args:
+           index (dict): index of key -> { id(node): node }
+           keys (list): the keys the node is indexed under
+           node (LopperNode): the node to remove
+
+        Returns:
+           Nothing
+
+        """
+        for k in keys:
+            try:
+                del index[k][id(node)]
+                if not index[k]:
+                    del index[k]
+            except KeyError:
+                pass
+
     def exec_cmd( self, node, cmd, env = None, module_list=[], module_load_paths=[] ):
         """Execute a (limited) code block against a node
 
@@ -3618,6 +3956,73 @@ class LopperTree:
         self.__current_node__ = 0
         self.__new_iteration__ = True
 
+    @staticmethod
+    def _dict_records( dct ):
+        """generate node records from a nested tree dictionary
+
+        Walks a nested dictionary (as produced by a lopper_fdt export, or a
+        tree export) and yields one record per node, in the order that the
+        nodes should be loaded.
+
+        The walk is iterative and lazy, so no ordered copy of the nodes is
+        built up front.
+
+        Args:
+           dct (Dictionary): nested tree dictionary
+
+        Returns:
+           generator of (node dictionary, parent path) tuples
+
+        """
+        # we have a list of: value, containing dict
+        dwalk = [ [dct,dct] ]
+        while dwalk:
+            node_dct, parent_dct = dwalk.pop()
+            if type(node_dct) is OrderedDict:
+                for value in reversed(node_dct.values()):
+                    if type(value) is OrderedDict or type(value) is dict:
+                        dwalk.append( [value,node_dct] )
+            elif type(node_dct) is dict:
+                for value in node_dct.values():
+                    if type(value) is OrderedDict or type(value) is dict:
+                        dwalk.append( [value,node_dct] )
+            else:
+                continue
+
+            yield node_dct, parent_dct['__path__']
+
+    @staticmethod
+    def _node_records( start_node ):
+        """generate node records from the nodes of a tree
+
+        Exports the nodes at and below start_node one at a time, and yields a
+        record per node in depth first order. This is the streaming equivalent
+        of a tree export() followed by a walk of the nested dictionary.
+
+        The child list of a node is captured before the node's record is
+        yielded, since loading a node clears (and then rebuilds) its children.
+
+        Args:
+           start_node (LopperNode): node to start the export
+
+        Returns:
+           generator of (node dictionary, parent path) tuples
+
+        """
+        nwalk = [ [start_node,None] ]
+        while nwalk:
+            node, parent_path = nwalk.pop()
+            children = list(node.child_nodes.values())
+
+            node_dct = node.export()
+            if parent_path == None:
+                parent_path = node_dct['__path__']
+
+            for c in reversed(children):
+                nwalk.append( [c,node_dct['__path__']] )
+
+            yield node_dct, parent_path
+
     def load(self, dct = None ):
         """load a tree
 
@@ -3629,38 +4034,32 @@ class LopperTree:
         is added to ensure that iterations will see the new node in tree order,
         versus added order.
 
+        The input is consumed as a stream of node records and is not retained
+        by the tree (or its nodes) once the load is complete.
+
         Args:
-           dct (Dictionary): dictionary from a lopper_fdt export, or a tree export
+           dct (Dictionary or iterable,optional): dictionary from a lopper_fdt
+                  export, or a tree export. An iterable of (node dictionary,
+                  parent path) records can also be passed. If not passed, the
+                  tree is reloaded from its own nodes.
 
         Returns:
            Nothing
 
         """
-        if dct:
-            self.dct = dct
-        else:
-            dct = self.dct
-
         # take the dictionary format, which is a series of nested dicts
         # representing nodes and properties. We'd rather not recurse to do our
-        # processing below, so we unroll the recursion into an ordered list of
-        # nodes and properties.
+        # processing below, so we unroll the recursion into a stream of node
+        # records.
+        if dct is None:
+            node_records = self._node_records( self["/"] )
+        elif isinstance( dct, dict ):
+            node_records = self._dict_records( dct )
+        else:
+            node_records = dct
 
-        # we have a list of: containing dict, value, parent
-        dwalk = [ [dct,dct,None]  ]
-        node_ordered_list = []
-        while dwalk:
-            firstitem = dwalk.pop()
-            if type(firstitem[1]) is OrderedDict: # or type(firstitem[1]) is dict:
-                node_ordered_list.append( [firstitem[1], firstitem[0]] )
-                for item,value in reversed(firstitem[1].items()):
-                    dwalk.append([firstitem[1],value,firstitem[0]])
-            elif type(firstitem[1]) is dict:
-                node_ordered_list.append( [firstitem[1], firstitem[0]] )
-                for item,value in firstitem[1].items():
-                    dwalk.append([firstitem[1],value,firstitem[0]])
-            else:
-                pass
+        # drop our reference, the records are all we need
+        dct = None
 
         # We are checking the __must_sync__ flag. Since this routine will throw
         # away unsync'd nodes, due to the fact that it reads from the FDT
@@ -3676,6 +4075,10 @@ class LopperTree:
         if self.depth_first:
             nodes_saved = dict(self.__nodes__)
 
+            # a (re)load doesn't change the nodes, don't record them as touched
+            touched = self.__touched__
+            self.__touched__ = None
+
             # clear the old dictionaries, we want to track the order by this
             # resolution, since it may be a re-resolve
 
@@ -3687,13 +4090,18 @@ class LopperTree:
             self.__pnodes__ = OrderedDict()
             # nodes, indexed by label
             self.__lnodes__ = OrderedDict()
+            # nodes, indexed by compatible string
+            self.__cnodes__ = {}
+            # nodes, indexed by name
+            self.__namenodes__ = {}
+            self.__nindex__ = {}
+            self.__norder__ = None
+            self._changed()
 
             if self.__dbg__ > 2:
                 print( "[DGB+]: tree load start: %s" % self )
 
-            for n_item in node_ordered_list:
-                node_in = n_item[0]
-                node_in_parent = n_item[1]
+            for node_in, node_in_parent_path in node_records:
                 node_path = node_in['__path__']
                 abs_path = node_path
                 nn =  node_in['__fdt_number__']
@@ -3708,7 +4116,7 @@ class LopperTree:
                 node.__dbg__ = self.__dbg__
 
                 # resolve the details against the dictionary
-                node.load( node_in, node_in_parent['__path__'] )
+                node.load( node_in, node_in_parent_path )
 
                 try:
                     node_check = self.__nodes__[node.abs_path]
@@ -3730,6 +4138,7 @@ class LopperTree:
                     self.__pnodes__[node.phandle] = node
                 if node.label:
                     self.__lnodes__[node.label] = node
+                self._index_node( node, True )
 
             for node_abs_path in nodes_saved:
                 # invalidate nodes, in case someone is holding a reference
@@ -3739,6 +4148,13 @@ class LopperTree:
                 except:
                     # the node didn't get copied over, invalidate the state
                     nodes_saved[node_abs_path].__nstate__ = "*invalid*"
+
+            # release the old node references (and any records we were
+            # handed), so they can be reclaimed while the tree lives on
+            nodes_saved = None
+            node_records = None
+
+            self.__touched__ = touched
         else:
             # breadth first. not currently implemented
             pass
@@ -3990,3 +4406,203 @@ class LopperTreePrinter( LopperTree ):
 
         if self.output != sys.stdout:
             self.output.close()
+
+class LopperMetrics:
+    """Counters and cumulative timers of tree operations
+
+    Metrics are opt-in. When enabled, the hot tree operations (sync, export,
+    load, node searches and property resolution) are wrapped to count their
+    calls and time them, and the counts are broken down by the context they
+    ran in (the lop or assist being executed, see scope()). When disabled,
+    the operations are not wrapped, so there is no overhead.
+
+    Timers are inclusive, i.e. the time of a sync includes the load that it
+    triggers.
+
+    Attributes:
+       - enabled (boolean): metrics are being collected
+       - context (string): the context that operations are counted against
+       - ops (dict): [count, seconds] by (operation, context)
+    """
+    # (class name, method, operation name)
+    operations = [ ( "LopperTree", "sync", "tree.sync" ),
+                   ( "LopperTree", "export", "tree.export" ),
+                   ( "LopperTree", "load", "tree.load" ),
+                   ( "LopperTree", "nodes", "tree.nodes" ),
+                   ( "LopperTree", "lnodes", "tree.lnodes" ),
+                   ( "LopperTree", "query", "tree.query" ),
+                   ( "LopperNode", "export", "node.export" ),
+                   ( "LopperNode", "resolve_all_refs", "node.resolve_all_refs" ),
+                   ( "LopperProp", "resolve", "prop.resolve" ) ]
+
+    default_context = "lopper"
+
+    def __init__( self ):
+        self.enabled = False
+        self.context = self.default_context
+        self.ops = {}
+        self.lock = threading.Lock()
+        self.__originals__ = {}
+
+    def enable( self ):
+        """Start collecting metrics
+
+        Args:
+           None
+
+        Returns:
+           Nothing
+        """
+        if self.enabled:
+            return
+
+        for cls_name, method, op in self.operations:
+            cls = globals()[cls_name]
+            fn = cls.__dict__[method]
+            self.__originals__[(cls_name,method)] = fn
+            setattr( cls, method, self._meter( fn, op ) )
+
+        self.enabled = True
+
+    def disable( self ):
+        """Stop collecting metrics (the collected metrics are kept)
+
+        Args:
+           None
+
+        Returns:
+           Nothing
+        """
+        for (cls_name, method), fn in self.__originals__.items():
+            setattr( globals()[cls_name], method, fn )
+
+        self.__originals__ = {}
+        self.enabled = False
+
+    def reset( self ):
+        """Clear the collected metrics
+
+        Args:
+           None
+
+        Returns:
+           Nothing
+        """
+        with self.lock:
+            self.ops = {}
+
+    def _meter( self, fn, op ):
+        metrics = self
+        def metered( *args, **kwargs ):
+            start = time.perf_counter()
+            try:
+                return fn( *args, **kwargs )
+            finally:
+                metrics.add( op, time.perf_counter() - start )
+
+        metered.__name__ = fn.__name__
+        metered.__doc__ = fn.__doc__
+        return metered
+
+    def add( self, op, seconds ):
+        """Count an operation, against the current context
+
+        Args:
+           op (string): the operation
+           seconds (float): the time taken by the operation
+
+        Returns:
+           Nothing
+        """
+        key = (op, self.context)
+        with self.lock:
+            try:
+                m = self.ops[key]
+            except KeyError:
+                m = [ 0, 0.0 ]
+                self.ops[key] = m
+            m[0] += 1
+            m[1] += seconds
+
+    def merge( self, ops ):
+        """Add metrics collected elsewhere (i.e. in an assist worker)
+
+        Args:
+           ops (dict): [count, seconds] by (operation, context), as ops
+
+        Returns:
+           Nothing
+        """
+        with self.lock:
+            for key, (count, seconds) in ops.items():
+                try:
+                    m = self.ops[key]
+                except KeyError:
+                    m = [ 0, 0.0 ]
+                    self.ops[key] = m
+                m[0] += count
+                m[1] += seconds
+
+    @contextlib.contextmanager
+    def scope( self, context ):
+        """Count operations against a context (i.e. a lop or an assist)
+
+        Scopes nest, operations are counted against the innermost one.
+
+        Args:
+           context (string): the context
+
+        Returns:
+           context manager
+        """
+        outer = self.context
+        self.context = context
+        try:
+            yield
+        finally:
+            self.context = outer
+
+    def report( self ):
+        """Return the collected metrics
+
+        Args:
+           None
+
+        Returns:
+           dict: by operation, the total count and seconds, and the count and
+                 seconds by context ("by")
+        """
+        report = OrderedDict()
+        with self.lock:
+            ops = sorted( self.ops.items() )
+
+        for (op, context), (count, seconds) in ops:
+            try:
+                r = report[op]
+            except KeyError:
+                r = { "count": 0, "seconds": 0.0, "by": OrderedDict() }
+                report[op] = r
+            r["count"] += count
+            r["seconds"] += seconds
+            r["by"][context] = { "count": count, "seconds": seconds }
+
+        return { "enabled": self.enabled, "operations": report }
+
+    def dump( self, output_filename ):
+        """Write the collected metrics to a file, as json
+
+        Args:
+           output_filename (string): the file to write ("-" for stdout)
+
+        Returns:
+           Nothing
+        """
+        if output_filename == "-":
+            json.dump( self.report(), sys.stdout, indent=1 )
+            print( "" )
+        else:
+            with open( output_filename, "w" ) as f:
+                json.dump( self.report(), f, indent=1 )
+
+# the metrics registry
+metrics = LopperMetrics()
@@ -8,6 +8,22 @@
 # */
 
 import ruamel.yaml as yaml
+from ruamel.yaml.events import StreamStartEvent, StreamEndEvent
+from ruamel.yaml.events import DocumentStartEvent, DocumentEndEvent
+from ruamel.yaml.events import MappingStartEvent, MappingEndEvent
+from ruamel.yaml.events import SequenceStartEvent, SequenceEndEvent
+from ruamel.yaml.events import ScalarEvent, AliasEvent
+from ruamel.yaml.nodes import ScalarNode, SequenceNode, MappingNode
+
+# use the libyaml backed loader when it is available, it produces the same
+# events and values as the python loader. Output always uses the python
+# emitter: libyaml quotes some plain scalars in flow collections (for
+# example 'serial0:115200n8') that the python emitter does not, and the
+# yaml we write must not depend on what is installed.
+try:
+    from ruamel.yaml import CSafeLoader as LopperSafeLoader
+except ImportError:
+    LopperSafeLoader = yaml.SafeLoader
 
 import json
 import sys
@@ -28,6 +44,77 @@ from anytree import PreOrderIter
 from anytree import AnyNode
 from anytree import Node
 
+def yaml_prop_value( node, prop, verbose = 0 ):
+    """Convert a LopperProp value to the value used in yaml output
+
+    If the node is from a yaml source, or the property is json encoded, the
+    value is decoded. A property with no value is an encoded boolean "true".
+    Otherwise, single element lists are unwrapped to their element, since
+    everything is a list in a LopperProp.
+
+    Args:
+       node (LopperNode): node containing the property
+       prop (LopperProp): property to convert
+       verbose (int,optional): verbosity level
+
+    Returns:
+       The python value of the property
+    """
+    boolean_encode_as_int = False
+
+    # if the node is from a yaml source, it may have been json encoded,
+    # so try that first and otherwise assign it directly.
+    if node._source == "yaml" or prop.pclass == "json":
+        # property with no value is an encoded boolean "true" as an
+        # empty list. So check for a value, try json, fallback to
+        # assignment.
+        decode = False
+        if boolean_encode_as_int:
+            decode = True
+        else:
+            if prop.value:
+                decode = True
+            else:
+                decode = False
+
+        if decode:
+            try:
+                if verbose:
+                    print( "[DBG++]: yaml: json load for prop %s : %s" % (prop.name,prop.value))
+
+                decode_val = ""
+                val = []
+                if type(prop.value) == list and len(prop.value) == 1:
+                    decode_val = prop.value[0]
+                    val = json.loads(decode_val)
+                else:
+                    if type(prop.value) == list:
+                        for item in prop.value:
+                            val.append( json.loads(item) )
+                    else:
+                        decode_val = prop.value
+                        val = json.loads(decode_val)
+
+            except Exception as e:
+                val = prop.value
+
+            if type(val) == int:
+                if val == 1:
+                    val = True
+                else:
+                    val = False
+        else:
+            val = True
+    else:
+        # everything is a list in a LopperProp, if the length is one, just grab the
+        # element. We'll have better yaml in the end if this is done.
+        if type(prop.value) == list and len(prop.value) == 1:
+            val = prop.value[0]
+        else:
+            val = prop.value
+
+    return val
+
 class LopperTreeImporter(object):
 
     def __init__(self, nodecls=AnyNode):
@@ -51,7 +138,6 @@ class LopperTreeImporter(object):
         assert isinstance(node, LopperNode)
 
         attrs = OrderedDict()
-        boolean_encode_as_int = False
 
         name = node.name
         if not name:
@@ -59,58 +145,7 @@ class LopperTreeImporter(object):
 
         attrs['name'] = name
         for p in node.__props__:
-            # if the node is from a yaml source, it may have been json encoded,
-            # so try that first and otherwise assign it directly.
-            if node._source == "yaml" or node.__props__[p].pclass == "json":
-                # property with no value is an encoded boolean "true" as an
-                # empty list. So check for a value, try json, fallback to
-                # assignment.
-                decode = False
-                if boolean_encode_as_int:
-                    decode = True
-                else:
-                    if node.__props__[p].value:
-                        decode = True
-                    else:
-                        decode = False
-
-                if decode:
-                    try:
-                        if verbose:
-                            print( "[DBG++]: LopperTreeImporter: json load for prop %s : %s" % (p,node.__props__[p].value))
-
-                        decode_val = ""
-                        val = []
-                        if type(node.__props__[p].value) == list and len(node.__props__[p].value) == 1:
-                            decode_val = node.__props__[p].value[0]
-                            val = json.loads(decode_val)
-                        else:
-                            if type(node.__props__[p].value) == list:
-                                for item in node.__props__[p].value:
-                                    val.append( json.loads(item) )
-                            else:
-                                decode_val = node.__props__[p].value
-                                val = json.loads(decode_val)
-
-                    except Exception as e:
-                        val = node.__props__[p].value
-
-                    if type(val) == int:
-                        if val == 1:
-                            val = True
-                        else:
-                            val = False
-                else:
-                    val = True
-            else:
-                # everything is a list in a LopperProp, if the length is one, just grab the
-                # element. We'll have better yaml in the end if this is done.
-                if type(node.__props__[p].value) == list and len(node.__props__[p].value) == 1:
-                    val = node.__props__[p].value[0]
-                else:
-                    val = node.__props__[p].value
-
-            attrs[p] = val
+            attrs[p] = yaml_prop_value( node, node.__props__[p], verbose )
 
         nnode = self.nodecls(parent=parent, **attrs)
 
@@ -269,6 +304,390 @@ class LopperDictImporter(object):
 
         return node
 
+class LopperYAMLStreamImporter(object):
+    def __init__(self, loadercls=LopperSafeLoader):
+        """
+        Import a LopperTree directly from a YAML event stream
+
+        Nodes and properties are created as the mapping events are parsed,
+        there is no intermediate python object or anytree representation
+        of the full document.
+
+        A mapping value is a child node, anything else is a property of
+        the node being parsed. Only property values (and anchored mappings,
+        since they can be referenced later) are built as python objects.
+
+        New nodes are staged in a detached subtree and added to the
+        LopperTree in one pass, with a single sync when the document
+        is complete.
+
+        Keyword Args:
+            loadercls: yaml loader class used to parse the stream.
+
+        """
+        self.loadercls = loadercls
+        self.excluded_props = [ "name", "fdt_name" ]
+        self.verbose = 0
+
+    def import_(self, stream):
+        """Import tree from the yaml `stream`.
+
+        Returns:
+           LopperTreePrinter, or None if the document is not a mapping
+        """
+        loader = self.loadercls( stream )
+
+        self.anchors = {}
+        self.staged_nodes = []
+
+        # StreamStartEvent
+        loader.get_event()
+        if loader.check_event( StreamEndEvent ):
+            return None
+
+        # DocumentStartEvent
+        loader.get_event()
+        if not loader.check_event( MappingStartEvent ):
+            return None
+
+        loader.get_event()
+
+        lt = LopperTreePrinter()
+        root = lt["/"]
+        root._source = "yaml"
+
+        self.root = root
+        self.__import_mapping( loader, self.__frame( root ) )
+
+        # graft the staged nodes, their children are added with them
+        for ln in self.staged_nodes:
+            lt.add( ln, dont_sync = True )
+
+        lt.sync()
+
+        # the nodes are now in the tree, so properties can be resolved
+        # against it.
+        for ln in lt:
+            for lp in ln.__props__.values():
+                lp.resolve()
+
+        self.anchors = {}
+        self.staged_nodes = []
+        self.root = None
+
+        return lt
+
+    def __frame(self, node):
+        return { 'node': node, 'keys': [], 'children': False,
+                 'children_extra': None, 'merges': [] }
+
+    def __import_mapping(self, loader, frame):
+        # iterative walk of the mapping events, one stack entry per
+        # open node.
+        stack = [ frame ]
+        while stack:
+            frame = stack[-1]
+            if loader.check_event( MappingEndEvent ):
+                loader.get_event()
+                self.__finish( frame )
+                stack.pop()
+                continue
+
+            key = self.__value( loader )
+            event = loader.peek_event()
+            if key != "<<" and isinstance( event, MappingStartEvent ) and not event.anchor:
+                # a child node, stream it
+                loader.get_event()
+                frame['keys'].append( key )
+                stack.append( self.__frame( self.__node( frame, key ) ) )
+            else:
+                self.__assign( frame, key, self.__value( loader ) )
+
+    def __node(self, frame, name):
+        parent = frame['node']
+        frame['children'] = True
+
+        name = str(name)
+        ln = LopperNode( -1, name )
+        ln.name = name
+        ln._source = "yaml"
+        if parent is self.root:
+            ln.abs_path = "/" + name
+            self.staged_nodes.append( ln )
+        else:
+            parent.add( ln )
+
+        if self.verbose:
+            print( "[DBG+]: yaml import: node: %s" % ln.abs_path )
+
+        return ln
+
+    def __dict_node(self, frame, name, dct):
+        nframe = self.__frame( self.__node( frame, name ) )
+        for k,v in dct.items():
+            self.__assign( nframe, k, v )
+        self.__finish( nframe )
+
+    def __assign(self, frame, key, value):
+        if key == "<<":
+            # merge key, explicit keys take precedence, so these are
+            # applied when the node is complete
+            if type(value) == list:
+                frame['merges'].extend( value )
+            else:
+                frame['merges'].append( value )
+            return
+
+        frame['keys'].append( key )
+        if type(value) == dict:
+            self.__dict_node( frame, key, value )
+        elif key == "children":
+            # compatibility with anytree exported yaml, only used if
+            # there are no other child nodes.
+            frame['children_extra'] = value
+        else:
+            self.__prop( frame['node'], str(key), value )
+
+    def __finish(self, frame):
+        merges = [ m for m in frame['merges'] if type(m) == dict ]
+        # earlier merged mappings take precedence over later ones, and
+        # explicit keys over all of them
+        for m in merges:
+            for k,v in m.items():
+                if not k in frame['keys']:
+                    self.__assign( frame, k, v )
+
+        # merged properties are ordered before the explicit ones, in the
+        # order of a constructed mapping: the keys of the last merged
+        # mapping first.
+        merged_keys = []
+        for m in reversed( merges ):
+            for k in m:
+                if not k in merged_keys:
+                    merged_keys.append( k )
+
+        props = frame['node'].__props__
+        for k in reversed( merged_keys ):
+            if str(k) in props:
+                props.move_to_end( str(k), last=False )
+
+        if not frame['children'] and frame['children_extra']:
+            for c in frame['children_extra']:
+                if type(c) != dict:
+                    continue
+                try:
+                    name = c['name']
+                except:
+                    name = list(c.values())[0]
+                self.__dict_node( frame, name, c )
+
+    def __prop(self, node, name, value):
+        if name in self.excluded_props:
+            return
+
+        use_json = False
+        if type(value) == list:
+            for v in value:
+                if type(v) == list or type(v) == dict:
+                    use_json = True
+        elif type(value) == bool:
+            # don't encode false bool, and a true is just an empty list
+            if value:
+                value = None
+            else:
+                return
+
+        if use_json:
+            value = json.dumps( value )
+
+        lp = LopperProp( name, -1, node, value )
+        if use_json:
+            lp.pclass = "json"
+
+        node + lp
+
+    def __value(self, loader):
+        # build the python value of the next yaml node in the event stream
+        event = loader.get_event()
+        if isinstance( event, AliasEvent ):
+            try:
+                return self.anchors[event.anchor]
+            except KeyError:
+                print( "[ERROR]: yaml: found undefined alias: %s" % event.anchor )
+                sys.exit(1)
+
+        if isinstance( event, ScalarEvent ):
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = loader.resolve( ScalarNode, event.value, event.implicit )
+            if tag == "tag:yaml.org,2002:merge":
+                # merge keys are handled by the mapping that contains them
+                return "<<"
+            value =loader.construct_object( ScalarNode( tag, event.value, event.start_mark,
+                                                         event.end_mark, event.style ), deep=True )
+            # nodes are never reused, don't let the constructor cache them
+            loader.constructed_objects = {}
+        elif isinstance( event, SequenceStartEvent ):
+            value = []
+            if event.anchor:
+                self.anchors[event.anchor] = value
+            while not loader.check_event( SequenceEndEvent ):
+                value.append( self.__value( loader ) )
+            loader.get_event()
+        elif isinstance( event, MappingStartEvent ):
+            value = {}
+            if event.anchor:
+                self.anchors[event.anchor] = value
+            merges = []
+            while not loader.check_event( MappingEndEvent ):
+                k = self.__value( loader )
+                v = self.__value( loader )
+                if k == "<<":
+                    if type(v) == list:
+                        merges.extend( v )
+                    else:
+                        merges.append( v )
+                else:
+                    value[k] = v
+            loader.get_event()
+
+            if merges:
+                # earlier merged mappings take precedence over later ones,
+                # and explicit keys over all of them
+                merged = {}
+                for m in reversed(merges):
+                    merged.update( m )
+                merged.update( value )
+                value.clear()
+                value.update( merged )
+        else:
+            value = None
+
+        if event.anchor and not isinstance( event, (SequenceStartEvent,MappingStartEvent) ):
+            self.anchors[event.anchor] = value
+
+        return value
+
+class LopperYAMLStreamExporter(object):
+    def __init__(self, dumpercls=yaml.Dumper):
+        """
+        Export a LopperTree directly to a YAML event stream
+
+        The tree is walked and yaml events are emitted as nodes are visited,
+        there is no intermediate anytree or dictionary representation of
+        the full tree. Only the properties of the nodes on the current path
+        are held while writing.
+
+        The output is the same as dumping the dictionary export of the tree:
+        property values are converted with yaml_prop_value() (json encoded
+        properties are expanded inline), child nodes are mappings and the
+        keys of each mapping are sorted.
+
+        Keyword Args:
+            dumpercls: yaml dumper class used to represent values and emit
+                       the stream.
+
+        """
+        self.dumpercls = dumpercls
+        self.verbose = 0
+
+    def export(self, tree, stream):
+        """Export `tree` as yaml to `stream`.
+
+        Args:
+           tree (LopperTree): tree to export
+           stream (file): text stream to write the yaml to
+
+        Returns:
+           Nothing
+        """
+        dumper = self.dumpercls( stream )
+
+        dumper.emit( StreamStartEvent() )
+        dumper.emit( DocumentStartEvent() )
+
+        # iterative walk, one stack entry per open node (mapping)
+        stack = [ self.__start_node( dumper, tree["/"] ) ]
+        while stack:
+            try:
+                key, value, child = next( stack[-1] )
+            except StopIteration:
+                dumper.emit( MappingEndEvent() )
+                stack.pop()
+                continue
+
+            self.__emit( dumper, key )
+            if child:
+                stack.append( self.__start_node( dumper, value ) )
+            else:
+                self.__emit( dumper, value )
+
+        dumper.emit( DocumentEndEvent() )
+        dumper.emit( StreamEndEvent() )
+
+    def __start_node(self, dumper, node):
+        # represent the properties of a node, and start its mapping. Returns
+        # an iterator over the (key,value,is_child) entries of the mapping.
+        if self.verbose:
+            print( "[DBG+]: yaml export: node: %s" % node.abs_path )
+
+        entries = {}
+        for p in node.__props__.values():
+            if p.name == "name":
+                continue
+            val = yaml_prop_value( node, p, self.verbose )
+            entries[p.name] = ( self.__represent( dumper, val ), False )
+
+        # a child node replaces a property of the same name
+        for c in node.child_nodes.values():
+            entries[c.name] = ( c, True )
+
+        # a mapping of only plain scalars is written in flow style
+        flow_style = dumper.default_flow_style
+        if flow_style is None:
+            flow_style = True
+            for v, child in entries.values():
+                if child or not isinstance( v, ScalarNode ) or v.style:
+                    flow_style = False
+                    break
+
+        dumper.emit( MappingStartEvent( None, None, True, flow_style = flow_style ) )
+
+        return ( ( self.__represent( dumper, k ), entries[k][0], entries[k][1] )
+                 for k in sorted( entries ) )
+
+    def __represent(self, dumper, value):
+        ynode = dumper.represent_data( value )
+        # values are not aliased, don't let the representer track them
+        dumper.represented_objects = {}
+        dumper.object_keeper = []
+        dumper.alias_key = None
+        return ynode
+
+    def __emit(self, dumper, ynode):
+        # emit the events for a represented value, the same way the
+        # serializer does (without anchors)
+        tag = getattr( ynode, "ctag", ynode.tag )
+        if isinstance( ynode, ScalarNode ):
+            detected_tag = dumper.resolve( ScalarNode, ynode.value, (True, False) )
+            default_tag = dumper.resolve( ScalarNode, ynode.value, (False, True) )
+            implicit = ( tag == detected_tag, tag == default_tag,
+                         ynode.tag.startswith( "tag:yaml.org,2002:" ) )
+            dumper.emit( ScalarEvent( None, tag, implicit, ynode.value, style = ynode.style ) )
+        elif isinstance( ynode, SequenceNode ):
+            implicit = tag == dumper.resolve( SequenceNode, ynode.value, True )
+            dumper.emit( SequenceStartEvent( None, tag, implicit, flow_style = ynode.flow_style ) )
+            for item in ynode.value:
+                self.__emit( dumper, item )
+            dumper.emit( SequenceEndEvent() )
+        elif isinstance( ynode, MappingNode ):
+            implicit = tag == dumper.resolve( MappingNode, ynode.value, True )
+            dumper.emit( MappingStartEvent( None, tag, implicit, flow_style = ynode.flow_style ) )
+            for k, v in ynode.value:
+                self.__emit( dumper, k )
+                self.__emit( dumper, v )
+            dumper.emit( MappingEndEvent() )
+
 class LopperDumper(yaml.Dumper):
     """Lopper specific dumper
 
@@ -290,10 +709,11 @@ class LopperYAML():
     creating a LopperTree. It is also capabable of taking a
     LopperTree and creating a yaml description of that tree.
 
-    This is done by internally storing either a yaml or lopper tree input as a
-    generic tree structure. The generic tree structure can be converted to a
-    LopperTree or Yaml file on demand. Hence we have the capability of
-    converting between the two formats as required.
+    A yaml input is streamed directly into a LopperTree. Other operations
+    (yaml output, printing and dumping) work on a generic tree structure,
+    which is created on demand from either the yaml or lopper tree input.
+    Hence we have the capability of converting between the two formats as
+    required.
     """
     def __init__( self, yaml_file = None, tree = None ):
         """
@@ -307,7 +727,6 @@ class LopperYAML():
         Returns:
            LopperYAML object: self
         """
-        self.dct = None
         self.yaml_source = yaml_file
         self.anytree = None
         self.tree = tree
@@ -319,19 +738,32 @@ class LopperYAML():
         if self.yaml_source:
             self.load_yaml( self.yaml_source )
 
-        if self.tree:
-            self.load_tree( self.tree )
-
     def to_yaml( self, outfile = None, verbose = 0 ):
         """ Export LopperYAML tree to a yaml output file
 
+        If the input was a LopperTree, it is streamed directly to the output
+        (see LopperYAMLStreamExporter).
+
         Args:
            outfile (string): path to a yaml output file
 
         Returns:
            Nothing
         """
-        if self.anytree:
+        if self.tree and not self.yaml_source:
+            if not outfile or verbose > 1:
+                if verbose > 1:
+                    print( "[DBG++]: dumping generated yaml to stdout:" )
+                LopperYAMLStreamExporter().export( self.tree, sys.stdout )
+                print( "" )
+
+            if outfile:
+                with open( outfile, "w") as file:
+                    LopperYAMLStreamExporter().export( self.tree, file )
+
+            return
+
+        if self.load_anytree():
             # if there's only one child, we use that, which allows us to skip the Anytree
             # "root" node, without any tricks.
             no_root = False
@@ -426,115 +858,20 @@ class LopperYAML():
     def to_tree( self ):
         """ Export LopperYAML to a LopperTree
 
+        The tree is created when the yaml input is loaded (see load_yaml()),
+        so this returns that tree.
+
         Args:
            None
 
         Returns:
           LopperTree object representation of YAML object
         """
-        if not self.anytree:
+        if not self.tree:
             print( "[ERROR]: cannot export tree, nothing is loaded" )
             return None
 
-        lt = LopperTreePrinter()
-
-        excluded_props = [ "name", "fdt_name" ]
-        serialize_json = True
-        verbose = 0
-        boolean_encode_as_int = False
-
-        for node in PreOrderIter(self.anytree):
-            if node.name == "root":
-                ln = lt["/"]
-                #ln = LopperNode( -1, None )
-                #ln.abs_path = "/"
-            else:
-                ln = LopperNode( -1, node.name )
-                ln.abs_path = self.path( node )
-
-            if verbose:
-                lt.__dbg__ = 4
-                ln.__dbg__ = 4
-
-            ln._source = "yaml"
-
-            # add the node to the tree
-            lt = lt + ln
-
-            props = self.props( node )
-            for p in props:
-                if verbose:
-                    print( "[DBG+]: prop: %s (%s)" % (p,props[p]) )
-                if serialize_json:
-                    use_json = False
-                    skip = False
-                    if type(props[p]) == list:
-                        for p2 in props[p]:
-                            if type(p2) == list or type(p2) == dict:
-                                use_json = True
-                    elif type(props[p]) == dict:
-                        for p2 in props[p].values():
-                            if type(p2) == list or type(p2) == dict:
-                                use_json = True
-                    elif type(props[p]) == bool:
-                        # don't encode false bool, and a true is just an empty list
-                        if props[p]:
-                            if boolean_encode_as_int:
-                                props[p] = 1
-                            else:
-                                props[p] = None
-                        else:
-                            if boolean_encode_as_int:
-                                props[p] = 0
-                            else:
-                                skip = True
-
-                    if use_json:
-                        x = json.dumps(props[p])
-                    else:
-                        x = props[p]
-
-                    if not skip:
-                        if not p in excluded_props:
-                            lp = LopperProp( p, -1, ln, x )
-                            lp.resolve()
-                            if use_json:
-                                lp.pclass = "json"
-                            # add the property to the node
-                            ln + lp
-                else:
-                    if type(props[p]) == list:
-                        # we need to check if there are embedded dictionaries, and if so, expand them.
-                        # since a dictionary doesn't map directly to device tree output.
-                        prop_list = self.prop_expand( props[p] )
-                        lp = LopperProp( p, -1, ln, prop_list )
-                        lp.resolve()
-                        ln + lp
-                    elif type(props[p]) == bool:
-                        if props[p]:
-                            lp = LopperProp( p, -1, ln, [] )
-                            lp.resolve()
-                            # add the prop the node
-                            ln + lp
-                        else:
-                            print( "[INFO]: not encoding false boolean type: %s" % p)
-                    elif type(props[p]) == dict:
-                        # we need to check if there are embedded dictionaries, and if so, expand them.
-                        # since a dictionary doesn't map directly to device tree output.
-                        prop_list = self.prop_expand( props[p] )
-                        lp = LopperProp( p, -1, ln, prop_list )
-                        lp.resolve()
-                        ln + lp
-                    else:
-                        if not p in excluded_props:
-                            lp = LopperProp( p, -1, ln, props[p] )
-                            lp.resolve()
-                            ln + lp
-
-        lt.resolve()
-        lt.sync()
-
-        return lt
+        return self.tree
 
     def print( self ):
         """ Print/Render tree representation of the YAML input
@@ -545,7 +882,7 @@ class LopperYAML():
         Returns:
             Nothing
         """
-        print( RenderTree( self.anytree ) )
+        print( RenderTree( self.load_anytree() ) )
 
     def props( self, node ):
         """Create a dictionary representation of Node attributes
@@ -609,7 +946,7 @@ class LopperYAML():
         Returns:
             None
         """
-        for node in PreOrderIter(self.anytree):
+        for node in PreOrderIter(self.load_anytree()):
             print( "node: %s depth: %s" % (node.name,node.depth) )
             print( "   raw: %s" % node )
             print( "   attributes:" )
@@ -630,9 +967,12 @@ class LopperYAML():
     def load_yaml( self, filename = None ):
         """Load/Read a YAML file into tree structure
 
-        Create an internal tree object from an input YAML file. The file can be
-        passed directly to this routine, or already be part of the object
-        through initialization.
+        Create a LopperTree from an input YAML file. The file can be passed
+        directly to this routine, or already be part of the object through
+        initialization.
+
+        The file is parsed as a stream of yaml events, and nodes are created
+        as they are parsed (see LopperYAMLStreamImporter).
 
         Args:
             filename (string,optional): path to yaml file to read
@@ -647,14 +987,39 @@ class LopperYAML():
         if not in_name:
             print( "[ERROR]: no yaml source provided" )
 
-        iny = open( in_name )
-        self.dct = yaml.safe_load( iny )
+        with open( in_name ) as iny:
+            self.tree = LopperYAMLStreamImporter().import_( iny )
 
-        if not self.dct:
+        if not self.tree:
             print( "[ERROR]: no data available to load" )
             sys.exit(1)
 
-        self.anytree = LopperDictImporter(Node).import_(self.dct)
+        # any generic tree is now stale
+        self.anytree = None
+
+    def load_anytree( self ):
+        """Create the generic tree representation of the input
+
+        The generic (anytree) representation is only created on demand, since
+        the yaml input is loaded directly into a LopperTree. If the input was
+        yaml, it is re-read so the representation matches the source exactly.
+
+        Args:
+            None
+
+        Returns:
+            The anytree root node, or None if nothing is loaded
+        """
+        if not self.anytree:
+            if self.yaml_source:
+                with open( self.yaml_source ) as iny:
+                    dct = yaml.load( iny, Loader=LopperSafeLoader )
+                if dct:
+                    self.anytree = LopperDictImporter(Node).import_(dct)
+            elif self.tree:
+                self.load_tree( self.tree )
+
+        return self.anytree
 
     def load_tree( self, tree = None ):
         """Load/Read a LopperTree into a YAML representation
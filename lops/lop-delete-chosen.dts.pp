@@ -0,0 +1,16 @@
+# 0 "/root/package/lops/lop-delete-chosen.dts"
+# 0 "<built-in>"
+# 0 "<command-line>"
+# 1 "/root/package/lops/lop-delete-chosen.dts"
+# 10 "/root/package/lops/lop-delete-chosen.dts"
+/dts-v1/;
+
+/ {
+        compatible = "system-device-tree-v1";
+        lops {
+                lop_1 {
+                        compatible = "system-device-tree-v1,lop,modify";
+                        modify = "/chosen::";
+                };
+        };
+};
@@ -0,0 +1,66 @@
+# 0 "/root/package/lops/lop-domain-r5.dts"
+# 0 "<built-in>"
+# 0 "<command-line>"
+# 1 "/root/package/lops/lop-domain-r5.dts"
+# 10 "/root/package/lops/lop-domain-r5.dts"
+/dts-v1/;
+
+/ {
+        compatible = "system-device-tree-v1,lop";
+        lops {
+                compatible = "system-device-tree-v1,lop";
+                lop_0_0 {
+                        compatible = "system-device-tree-v1,lop,meta-v1","phandle-desc-v1";
+                        address-map = "#ranges-address-cells phandle #ranges-address-cells #ranges-size-cells";
+                        interrupt-parent = "phandle";
+                        iommus = "phandle field";
+                        interrupt-map = "#interrupt-cells phandle #interrupt-cells";
+                        access = "phandle flags";
+                        cpus = "phandle mask mode";
+                };
+                lop_2 {
+
+                        compatible = "system-device-tree-v1,lop,modify";
+
+                        modify = "/cpus-cluster@0/::/cpus/";
+
+                };
+                lop_3 {
+                        compatible = "system-device-tree-v1,lop,modify";
+
+
+
+                        modify = "/cpus/:access:";
+                };
+                lop_4 {
+
+                        compatible = "system-device-tree-v1,lop,modify";
+                        modify = "/cpus:no-access:";
+                };
+                  lop_15 {
+                         compatible = "system-device-tree-v1,lop,output";
+                         outfile = "r5.dts";
+
+                         nodes = "ps_ipi_*", "channel*", "cpus*","fpga*", "amba_rpu","tcm","memory_r5@0";
+                  };
+
+                  lop_16 {
+                         compatible = "system-device-tree-v1,lop,modify";
+                         modify = "/amba/.*ethernet.*phy.*:testprop:testvalue";
+
+                  };
+                  lop_17 {
+                         compatible = "system-device-tree-v1,lop,modify";
+
+                         modify = "/bus@f1000000/.*ethernet.*phy.*:testprop:testvaluenew";
+
+
+
+
+                  };
+                  lop_18 {
+                         compatible = "system-device-tree-v1,lop,modify";
+                         modify = "/bus@f1000000:testprop:testvalue";
+                  };
+        };
+};
@@ -0,0 +1,39 @@
+# 0 "/root/package/lops/lop-load.dts"
+# 0 "<built-in>"
+# 0 "<command-line>"
+# 1 "/root/package/lops/lop-load.dts"
+# 10 "/root/package/lops/lop-load.dts"
+/dts-v1/;
+
+/ {
+        compatible = "system-device-tree-v1";
+
+        priority = <1>;
+        lops {
+
+                lop_0 {
+                        compatible = "system-device-tree-v1,lop,load";
+                        load = "assists/openamp.py";
+                };
+                lop_1 {
+                        compatible = "system-device-tree-v1,lop,load";
+                        load = "assists/cdo.py";
+
+
+                        props = "id", "file_ext";
+
+
+                        file_ext = ".cdo";
+
+                        id = "xlnx,output,cdo";
+                };
+                lop_2 {
+                        compatible = "system-device-tree-v1,lop,load";
+                        load = "assists/openamp-xlnx.py";
+                };
+                lop_3 {
+                        compatible = "system-device-tree-v1,lop,load";
+                        load = "assists/openamp-xlnx-zynq.py";
+                };
+        };
+};